@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+benchmark_image_ingest.py
+요청 이미지 전처리: 기존 경로(풀 해상도 디코딩 + JPEG q95 재인코딩) vs image_ingest(축소 디코딩) 비교
+
+사용법:
+docker compose -f docker-compose.dev.yml exec ai-service-api \\
+    python /app/scripts/benchmark_image_ingest.py --image /app/static/samples/photo.jpg
+
+- --image 를 지정하지 않으면 12MP(4000x3000) 합성 JPEG을 사용합니다.
+- 피크 메모리는 Pillow의 C 버퍼까지 포함하도록 경로별로 새 프로세스를 띄워 ru_maxrss 증가량으로 측정합니다.
+"""
+
+import io
+import os
+import sys
+import time
+import base64
+import resource
+import argparse
+import multiprocessing as mp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+
+def make_sample() -> bytes:
+    image = Image.effect_noise((4000, 3000), 48).convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def legacy_path(data: bytes):
+    # 기존: main._decode_image + rag_orchestrator._image_to_base64 + CLIP processor 리사이즈
+    image = Image.open(io.BytesIO(data)).convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=95)
+    b64 = base64.b64encode(buffer.getvalue())
+    clip = image.resize((224, 224), Image.Resampling.BICUBIC)
+    return image.size, len(b64), clip.size
+
+
+def ingest_path(data: bytes):
+    from src.core.image_ingest import ingest_bytes, prepare_clip_input
+    ingested = ingest_bytes(data)
+    b64 = ingested.jpeg_b64
+    return ingested.image.size, len(b64), prepare_clip_input(ingested.image).size
+
+
+PATHS = {"legacy": legacy_path, "ingest": ingest_path}
+
+
+def _worker(name: str, data: bytes, repeat: int, queue):
+    fn = PATHS[name]
+    if name == "ingest":
+        import src.core.image_ingest  # noqa: F401  (import 비용은 측정에서 제외)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(data)
+        timings.append(time.perf_counter() - started)
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    queue.put((name, min(timings), sum(timings) / len(timings), peak_kb, result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이미지 ingest 벤치마크")
+    parser.add_argument("--image", default="", help="측정할 이미지 파일 (미지정 시 12MP 합성 JPEG)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.image:
+        with open(args.image, "rb") as f:
+            data = f.read()
+    else:
+        data = make_sample()
+
+    with Image.open(io.BytesIO(data)) as probe:
+        print(f"📦 input: {probe.format} {probe.size[0]}x{probe.size[1]} ({len(data) / 1024:.0f} KB)")
+
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    rows = []
+    for name in PATHS:
+        proc = ctx.Process(target=_worker, args=(name, data, args.repeat, queue))
+        proc.start()
+        rows.append(queue.get())
+        proc.join()
+
+    print(f"\n{'path':>7} | {'best(ms)':>8} | {'avg(ms)':>8} | {'peak(MB)':>8} | {'decoded':>10} | {'b64(KB)':>7}")
+    print("-" * 66)
+    for name, best, avg, peak_kb, (size, b64_len, _) in rows:
+        print(
+            f"{name:>7} | {best * 1000:>8.1f} | {avg * 1000:>8.1f} | {peak_kb / 1024:>8.1f} | "
+            f"{size[0]:>4}x{size[1]:<5} | {b64_len / 1024:>7.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+benchmark_intent_matcher.py
+검색어 의도 감지: 기존 단어 목록 반복 검사 vs Aho–Corasick 1회 스캔 비교
+
+사용법:
+docker compose -f docker-compose.dev.yml exec ai-service-api \\
+    python /app/scripts/benchmark_intent_matcher.py --iterations 20000 --extra-names 0 1000 5000
+
+- 모델/Redis 없이 실행됩니다 (intent_matcher 모듈만 사용).
+- --extra-names 로 합성 인물 이름을 추가해 사전 크기에 따른 비용 변화를 봅니다.
+- 두 방식의 판정 결과가 같은지 먼저 확인한 뒤 시간을 측정합니다.
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+from functools import partial
+from typing import Dict, List, Optional, Set
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.intent_matcher import DEFAULT_DICTIONARIES, IntentMatcher
+
+QUERIES = [
+    "장원영 공항패션",
+    "허경영 패션",
+    "김철수 스타일",
+    "겨울 남자옷 추천",
+    "상갓집 옷 추천",
+    "격식있는 식사자리 옷",
+    "어른들과 함께하는 결혼식 하객룩 추천해줘",
+    "주말 데이트룩 원피스 보여줘",
+    "티모시샬라메 시사회 착장",
+    "요즘 유행하는 빈티지 레트로 자켓",
+]
+
+NAME_PATTERN = re.compile(r'^[가-힣]{2,3}$')
+PARTICLES = r'(은|는|이|가|을|를|의|에|로|으로|와|과|도|만|처럼|같은)$'
+
+
+def legacy_contains_celebrity(query: str, dictionaries: Dict[str, Set[str]]) -> Optional[str]:
+    """기존 AIOrchestrator._contains_celebrity 로직 (사전마다 반복 검사)"""
+    celebrity_names = dictionaries["celebrity"]
+    common_words = dictionaries["common_word"]
+    fashion_context = dictionaries["fashion_context"]
+
+    query_normalized = query.replace(" ", "")
+    for name in celebrity_names:
+        if name in query_normalized:
+            return name
+
+    potential_names: List[str] = []
+    for word in query.split():
+        clean_word = re.sub(PARTICLES, '', word)
+        if not NAME_PATTERN.match(clean_word) or clean_word in common_words:
+            continue
+        if any(clean_word in common or common in clean_word for common in common_words):
+            continue
+        potential_names.append(clean_word)
+
+    if potential_names and any(k in query for k in fashion_context):
+        return potential_names[0]
+    return None
+
+
+def matcher_contains_celebrity(query: str, intent_matcher: IntentMatcher) -> Optional[str]:
+    """AIOrchestrator._contains_celebrity 와 같은 판정 (intent_matcher 사용)"""
+    name = intent_matcher.first(query.replace(" ", ""), "celebrity")
+    if name:
+        return name
+
+    common_spans = None
+    potential_names: List[str] = []
+    for word in re.finditer(r'\S+', query):
+        clean_word = re.sub(PARTICLES, '', word.group())
+        if not NAME_PATTERN.match(clean_word):
+            continue
+        if common_spans is None:
+            common_spans = [(m.start, m.end) for m in intent_matcher.scan(query) if m.label == "common_word"]
+        start, end = word.start(), word.start() + len(clean_word)
+        if any(start <= s and e <= end for s, e in common_spans):
+            continue
+        if intent_matcher.is_fragment("common_word", clean_word):
+            continue
+        potential_names.append(clean_word)
+
+    if potential_names and "fashion_context" in intent_matcher.labels(query):
+        return potential_names[0]
+    return None
+
+
+def timed(func, iterations: int) -> float:
+    started = time.perf_counter()
+    for i in range(iterations):
+        func(QUERIES[i % len(QUERIES)])
+    return time.perf_counter() - started
+
+
+def with_extra_names(count: int) -> Dict[str, Set[str]]:
+    """기본 사전 + 합성 4글자 이름 (검색어와 겹치지 않도록 드문 음절 사용)"""
+    random.seed(count)
+    syllables = [chr(c) for c in range(0xD000, 0xD7A3)]
+    dictionaries = {label: set(words) for label, words in DEFAULT_DICTIONARIES.items()}
+    while len(dictionaries["celebrity"]) < len(DEFAULT_DICTIONARIES["celebrity"]) + count:
+        dictionaries["celebrity"].add("".join(random.choices(syllables, k=4)))
+    return dictionaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="의도 감지 매처 벤치마크")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--extra-names", type=int, nargs="+", default=[0, 1000, 5000])
+    args = parser.parse_args()
+
+    print(f"\n{'names':>6} | {'method':>8} | {'best(s)':>8} | {'us/query':>9} | {'speedup':>7}")
+    print("-" * 54)
+    for extra in args.extra_names:
+        dictionaries = with_extra_names(extra)
+        started = time.perf_counter()
+        matcher = IntentMatcher(dictionaries)
+        build_ms = (time.perf_counter() - started) * 1000
+        legacy = partial(legacy_contains_celebrity, dictionaries=dictionaries)
+        compiled = partial(matcher_contains_celebrity, intent_matcher=matcher)
+
+        # 판정 일치 확인 (연예인 이름은 집합 순회 순서에 따라 달라질 수 있어 감지 여부만 비교)
+        for query in QUERIES:
+            if (legacy(query) is None) != (compiled(query) is None):
+                print(f"❌ Mismatch for '{query}': legacy={legacy(query)} matcher={compiled(query)}")
+                sys.exit(1)
+
+        names = len(dictionaries["celebrity"])
+        baseline = None
+        for name, func in (("legacy", legacy), ("matcher", compiled)):
+            best = min(timed(func, args.iterations) for _ in range(args.repeat))
+            baseline = baseline or best
+            print(f"{names:>6} | {name:>8} | {best:>8.3f} | {best / args.iterations * 1e6:>9.1f} | {baseline / best:>6.2f}x")
+        print(f"{'':>6} | build {build_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
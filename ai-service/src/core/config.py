@@ -16,16 +16,62 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL_NAME: str = Field("sentence-transformers/all-mpnet-base-v2", description="768차원 임베딩 모델 이름")
     EMBEDDING_DIMENSION: int = Field(768, description="벡터 차원 (768D)")
     EMBEDDING_DEVICE: str = Field(os.getenv("EMBEDDING_DEVICE", "cpu"), description="임베딩 모델 실행 장치 (cpu/cuda)")
+
+    # YOLO Settings
+    YOLO_CACHE_SIZE: int = Field(int(os.getenv("YOLO_CACHE_SIZE", 32)), description="이미지별 YOLO 분석 결과 LRU 캐시 크기")
+    YOLO_BATCH_SIZE: int = Field(int(os.getenv("YOLO_BATCH_SIZE", 8)), description="배치 추론 시 forward pass당 이미지 수")
+    YOLO_IMGSZ: int = Field(int(os.getenv("YOLO_IMGSZ", 640)), description="배치 추론 letterbox 입력 크기")
+
+    # Image Ingest Settings (요청 이미지 디코딩/축소)
+    INGEST_MAX_SIDE: int = Field(int(os.getenv("INGEST_MAX_SIDE", 1280)), description="디코딩 직후 적용할 긴 변 최대 크기 (px)")
+    CLIP_INPUT_SIZE: int = Field(224, description="CLIP 입력 해상도 (짧은 변 기준)")
+    VLM_MAX_SIDE: int = Field(int(os.getenv("VLM_MAX_SIDE", 1024)), description="VLM/base64 전송용 JPEG 긴 변 최대 크기 (px)")
+    VLM_JPEG_QUALITY: int = Field(int(os.getenv("VLM_JPEG_QUALITY", 85)), description="VLM/base64 전송용 JPEG 품질")
+    MASK_CACHE_TTL: int = Field(int(os.getenv("MASK_CACHE_TTL", 86400)), description="가상 피팅 마스크 캐시 TTL (초)")
+    VLM_CACHE_TTL: int = Field(int(os.getenv("VLM_CACHE_TTL", 30 * 86400)), description="VLM 분석 응답 캐시 TTL (초)")
+
+    # Debug Capture Settings (YOLO 크롭 진단 이미지, 운영 기본 비활성)
+    DEBUG_CAPTURE_ENABLED: bool = Field(os.getenv("DEBUG_CAPTURE_ENABLED", "false").lower() == "true", description="진단 이미지 캡처 활성화")
+    DEBUG_CAPTURE_SAMPLE_RATE: int = Field(int(os.getenv("DEBUG_CAPTURE_SAMPLE_RATE", 100)), description="N개 요청 중 1개 캡처 (헤더 요청은 항상 캡처)")
+    DEBUG_CAPTURE_DIR: str = Field(os.getenv("DEBUG_CAPTURE_DIR", os.path.join("static", "debug")), description="캡처 저장 디렉터리")
+    DEBUG_CAPTURE_QUEUE_SIZE: int = Field(int(os.getenv("DEBUG_CAPTURE_QUEUE_SIZE", 64)), description="쓰기 대기 큐 크기 (초과분은 버림)")
+    DEBUG_CAPTURE_MAX_MB: int = Field(int(os.getenv("DEBUG_CAPTURE_MAX_MB", 200)), description="캡처 디렉터리 최대 용량 (MB)")
+    DEBUG_CAPTURE_MAX_AGE_HOURS: int = Field(int(os.getenv("DEBUG_CAPTURE_MAX_AGE_HOURS", 24)), description="캡처 파일 최대 보관 시간")
     
     # LLM Settings (Groq, WatsonX 등 LLM 연동 설정)
     GROQ_API_KEY: str = Field(os.getenv("GROQ_API_KEY", ""), description="Groq API 키 (LLM 추론용)")
     LLM_MODEL_NAME: str = Field("llama3-8b-8192", description="텍스트 추론에 사용할 LLM 모델 이름")
     
+    # Watsonx 호출 제한 (0: 제한 없음)
+    WATSONX_DAILY_QUOTA: int = Field(int(os.getenv("WATSONX_DAILY_QUOTA", 0)), description="Watsonx 일일 허용 호출 수")
+    WATSONX_RATE_PER_SEC: float = Field(float(os.getenv("WATSONX_RATE_PER_SEC", 2.0)), description="Watsonx 초당 허용 호출 수")
+    WATSONX_BURST: int = Field(int(os.getenv("WATSONX_BURST", 4)), description="Watsonx 순간 최대 호출 수")
+
+    # Replicate 호출 제한 (호출은 backend-core가 수행, /quota 현황 보고용으로 같은 값 사용)
+    REPLICATE_DAILY_QUOTA: int = Field(int(os.getenv("REPLICATE_DAILY_QUOTA", 0)), description="Replicate 일일 허용 호출 수")
+    REPLICATE_RATE_PER_SEC: float = Field(float(os.getenv("REPLICATE_RATE_PER_SEC", 1.0)), description="Replicate 초당 허용 호출 수")
+    REPLICATE_BURST: int = Field(int(os.getenv("REPLICATE_BURST", 3)), description="Replicate 순간 최대 호출 수")
+
     # Google API Settings (RAG용)
     GOOGLE_API_KEY: str = Field(os.getenv("GOOGLE_API_KEY", ""), description="Google Custom Search API 키")
     GOOGLE_SEARCH_ENGINE_ID: str = Field(os.getenv("GOOGLE_SEARCH_ENGINE_ID", ""), description="Google Custom Search Engine ID (CX)")
     GOOGLE_API_DAILY_QUOTA: int = Field(int(os.getenv("GOOGLE_API_DAILY_QUOTA", 100)), description="Google Search API 일일 허용 쿼터")
+    GOOGLE_CSE_RATE_PER_SEC: float = Field(float(os.getenv("GOOGLE_CSE_RATE_PER_SEC", 1.0)), description="Google CSE 초당 허용 호출 수 (토큰 보충 속도)")
+    GOOGLE_CSE_BURST: int = Field(int(os.getenv("GOOGLE_CSE_BURST", 5)), description="Google CSE 순간 최대 호출 수 (버킷 용량)")
+    RAG_SEARCH_CACHE_TTL: int = Field(int(os.getenv("RAG_SEARCH_CACHE_TTL", 6 * 3600)), description="외부 이미지 검색 응답 캐시 TTL (초)")
+    RAG_IMAGE_CACHE_TTL: int = Field(int(os.getenv("RAG_IMAGE_CACHE_TTL", 7 * 86400)), description="후보 이미지/CLIP 벡터 캐시 TTL (초)")
     
+    # HTTP Pool Settings (외부 이미지 다운로드 / 외부 API 공용 커넥션 풀)
+    HTTP_POOL_LIMIT: int = Field(int(os.getenv("HTTP_POOL_LIMIT", 100)), description="전체 동시 연결 수 상한")
+    HTTP_POOL_LIMIT_PER_HOST: int = Field(int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", 8)), description="호스트별 동시 연결 수 상한")
+    HTTP_DNS_CACHE_TTL: int = Field(int(os.getenv("HTTP_DNS_CACHE_TTL", 300)), description="DNS 조회 결과 캐시 시간 (초)")
+
+    # Routing Dictionary Settings (연예인/일반 명사/카테고리 사전 핫 리로드)
+    INTENT_DICT_POLL_SECONDS: float = Field(float(os.getenv("INTENT_DICT_POLL_SECONDS", 5)), description="사전 버전 확인 주기 (초)")
+
+    # Embedding Model Promotion (재임베딩 스왑 후 모델 승격 동기화)
+    MODEL_SYNC_POLL_SECONDS: float = Field(float(os.getenv("MODEL_SYNC_POLL_SECONDS", 2)), description="모델 승격 버전 확인 주기 (초)")
+
     # Vision API Settings (Llama Vision, YOLO/DINOv2 분석 결과 전송용)
     # Vision 모델이 별도 마이크로서비스로 분리되어 있다고 가정합니다.
     VISION_API_URL: str = Field(os.getenv("VISION_API_URL", "http://vision-service:8000/analyze"), description="Vision 분석 마이크로서비스 URL")
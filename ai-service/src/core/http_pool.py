@@ -0,0 +1,54 @@
+import logging
+from typing import Optional
+
+import aiohttp
+import httpx
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPPool:
+    """
+    프로세스 공용 HTTP 커넥션 풀 (lifespan에서 종료)
+    - image_session: 외부 이미지 다운로드용 aiohttp 세션 (DNS 캐시 + 호스트별 연결 수 제한)
+    - api_client: Google Custom Search 등 외부 API 호출용 httpx 클라이언트 (keep-alive 재사용)
+    요청마다 세션을 만들면 TCP/TLS 핸드셰이크와 DNS 조회가 매번 반복됩니다.
+    """
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def image_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.HTTP_POOL_LIMIT,
+                limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+                ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def api_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=15.0,
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_POOL_LIMIT,
+                    max_keepalive_connections=settings.HTTP_POOL_LIMIT_PER_HOST,
+                ),
+            )
+        return self._client
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._session = None
+        self._client = None
+        logger.info("🔌 HTTP pools closed")
+
+
+http_pool = HTTPPool()
@@ -0,0 +1,131 @@
+import io
+import base64
+import hashlib
+import logging
+from typing import Optional, Tuple
+
+from PIL import Image
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# Image Ingest (요청당 1회 디코딩 + 조기 다운샘플)
+# - JPEG은 Image.draft()로 DCT 단계에서 1/2~1/8 축소 디코딩 (12MP 원본을 풀 해상도로 펼치지 않음)
+# - 다운스트림 모델이 필요로 하는 해상도(INGEST_MAX_SIDE)로 한 번만 축소
+# - VLM용 JPEG은 처음 요청될 때 만들고 재사용
+#   (YOLO는 원본 좌표계 bbox로 크롭하므로 축소 이미지를 그대로 받고,
+#    CLIP 입력은 크롭마다 prepare_clip_input()으로 만듦)
+# --------------------------------------------------------------------------
+
+def _strip_data_uri(image_b64: str) -> str:
+    if "base64," in image_b64:
+        return image_b64.split("base64,", 1)[1]
+    return image_b64
+
+
+def _fit_within(image: Image.Image, max_side: int) -> Image.Image:
+    """긴 변이 max_side 이하가 되도록 축소 (확대는 하지 않음)"""
+    if max(image.size) <= max_side:
+        return image
+    scale = max_side / max(image.size)
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    # reducing_gap: 정수배 box 축소 후 LANCZOS → 큰 축소비에서도 빠름
+    return image.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+
+def to_jpeg_bytes(image: Image.Image, max_side: Optional[int] = None, quality: Optional[int] = None) -> bytes:
+    image = _fit_within(image, max_side or settings.VLM_MAX_SIDE)
+    buffer = io.BytesIO()
+    image.convert("RGB").save(buffer, format="JPEG", quality=quality or settings.VLM_JPEG_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+def to_jpeg_data_uri(image: Image.Image) -> str:
+    """VLM / 프론트 응답용 축소 JPEG data URI"""
+    return f"data:image/jpeg;base64,{base64.b64encode(to_jpeg_bytes(image)).decode('utf-8')}"
+
+
+def prepare_clip_input(image: Image.Image) -> Image.Image:
+    """
+    CLIP 전처리(짧은 변 224 리사이즈 + center crop)에 들어가기 전에 미리 축소.
+    짧은 변을 CLIP_INPUT_SIZE로 맞춰 두면 processor는 crop만 수행합니다.
+    """
+    short = min(image.size)
+    target = settings.CLIP_INPUT_SIZE
+    if short <= target:
+        return image
+    scale = target / short
+    size = (max(target, round(image.width * scale)), max(target, round(image.height * scale)))
+    return image.resize(size, Image.Resampling.BICUBIC, reducing_gap=3.0)
+
+
+def perceptual_hash(image: Image.Image) -> str:
+    """dHash (64bit): 재인코딩/리사이즈된 같은 이미지는 같은 값 → 캐시 키로 사용"""
+    small = image.convert("L").resize((9, 8), Image.Resampling.BILINEAR)
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left, right = pixels[row * 9 + col], pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (1 if left > right else 0)
+    return f"{bits:016x}"
+
+
+def pixel_digest(image: Image.Image) -> str:
+    """디코딩된 RGB 픽셀의 해시: 한 픽셀만 달라도 다른 값 (색상 차이가 작은 컬러웨이도 구분)"""
+    return hashlib.blake2b(image.convert("RGB").tobytes(), digest_size=16).hexdigest()
+
+
+def color_signature(image: Image.Image) -> str:
+    """2x2 영역별 평균 RGB (채널당 16단계): dHash가 구분 못 하는 같은 디자인의 색상 차이 구분용"""
+    small = image.convert("RGB").resize((2, 2), Image.Resampling.BOX)
+    return "".join(f"{channel >> 4:x}" for pixel in small.getdata() for channel in pixel)
+
+
+class IngestedImage:
+    """디코딩된 요청 이미지 + VLM 전송용 JPEG 캐시"""
+
+    def __init__(self, image: Image.Image, original_size: Tuple[int, int], digest: str):
+        self.image = image
+        self.original_size = original_size
+        self.digest = digest
+        self._jpeg: Optional[bytes] = None
+
+    @property
+    def downscaled(self) -> bool:
+        return self.image.size != self.original_size
+
+    @property
+    def jpeg_bytes(self) -> bytes:
+        if self._jpeg is None:
+            self._jpeg = to_jpeg_bytes(self.image)
+        return self._jpeg
+
+    @property
+    def jpeg_b64(self) -> str:
+        return base64.b64encode(self.jpeg_bytes).decode("utf-8")
+
+    @property
+    def data_uri(self) -> str:
+        return f"data:image/jpeg;base64,{self.jpeg_b64}"
+
+
+def ingest_bytes(data: bytes, max_side: Optional[int] = None) -> IngestedImage:
+    """원본 바이트 → 축소 디코딩된 RGB 이미지. 디코딩 실패 시 예외를 그대로 전달합니다."""
+    max_side = max_side or settings.INGEST_MAX_SIDE
+    image = Image.open(io.BytesIO(data))
+    original_size = image.size
+
+    # JPEG: 목표 크기 이상을 유지하는 가장 작은 스케일로 디코딩 (이후 정밀 축소)
+    if image.format == "JPEG":
+        image.draft("RGB", (max_side, max_side))
+
+    image = _fit_within(image.convert("RGB"), max_side)
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    return IngestedImage(image, original_size, digest)
+
+
+def ingest_b64(image_b64: str, max_side: Optional[int] = None) -> IngestedImage:
+    return ingest_bytes(base64.b64decode(_strip_data_uri(image_b64)), max_side=max_side)
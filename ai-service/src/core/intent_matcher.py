@@ -0,0 +1,249 @@
+import logging
+from collections import deque
+from typing import Callable, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# Intent Matcher (Aho–Corasick)
+# - 사전(연예인/일반 명사/패션 컨텍스트 등)을 시작 시 1회 오토마톤으로 컴파일
+# - 검색어를 한 번만 훑어서 모든 사전의 매칭 결과를 반환 (사전 크기와 무관한 선형 시간)
+# - reload()는 새 오토마톤을 만든 뒤 참조만 교체 → 요청 경로에 락 없음
+# backend-core(src/utils/intent_matcher.py)와 같은 구현을 사용합니다.
+# --------------------------------------------------------------------------
+
+
+class Match(NamedTuple):
+    label: str
+    term: str
+    start: int
+    end: int
+
+
+class _Automaton:
+    """label별 단어 목록 → goto/fail/output 테이블"""
+
+    def __init__(self, dictionaries: Mapping[str, Iterable[str]]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[tuple] = [()]
+        self.terms: Dict[str, FrozenSet[str]] = {}
+        self.fragments: Dict[str, FrozenSet[str]] = {}
+
+        for label, words in dictionaries.items():
+            terms = frozenset(w for w in words if w)
+            self.terms[label] = terms
+            for term in terms:
+                self._insert(term, label)
+        self._build_fail_links()
+
+    def _insert(self, term: str, label: str):
+        state = 0
+        for ch in term:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+            state = nxt
+        self.output[state] += ((label, term, len(term)),)
+
+    def _build_fail_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                # 접미사 상태의 출력도 함께 보고 (예: "출근룩" 안의 "룩")
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def hits(self, text: str) -> List[Tuple[int, int]]:
+        """출력이 있는 (끝 위치, 상태) 목록. Match 객체 생성 없이 상태 전이만 수행"""
+        goto, fail, output = self.goto, self.fail, self.output
+        hits = []
+        state = 0
+        for i, ch in enumerate(text):
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            if output[state]:
+                hits.append((i, state))
+        return hits
+
+class IntentMatcher:
+    def __init__(self, dictionaries: Mapping[str, Iterable[str]]):
+        self._automaton = _Automaton(dictionaries)
+
+    def reload(self, dictionaries: Mapping[str, Iterable[str]]):
+        """새 사전으로 재컴파일 후 원자적으로 교체"""
+        automaton = _Automaton(dictionaries)
+        self._automaton = automaton
+        logger.info(f"🔁 Intent matcher reloaded: { {k: len(v) for k, v in automaton.terms.items()} }")
+
+    def scan(self, text: str) -> List[Match]:
+        """text 안의 모든 사전 단어 매칭 (겹치는 매칭 포함, 끝 위치 순)"""
+        if not text:
+            return []
+        output = self._automaton.output
+        return [
+            tuple.__new__(Match, (label, term, end - size + 1, end + 1))
+            for end, state in self._automaton.hits(text)
+            for label, term, size in output[state]
+        ]
+
+    def labels(self, text: str) -> Set[str]:
+        """text에 등장한 사전 label 집합"""
+        if not text:
+            return set()
+        output = self._automaton.output
+        return {label for _, state in self._automaton.hits(text) for label, _, _ in output[state]}
+
+    def first(self, text: str, label: str) -> Optional[str]:
+        """label 사전 단어 중 text에서 가장 먼저 끝나는 것"""
+        match = self.first_match(text, lambda match_label: match_label == label)
+        return match.term if match else None
+
+    def first_match(self, text: str, predicate: Callable[[str], bool]) -> Optional[Match]:
+        """label이 predicate를 만족하는 첫 매칭 (예: "category:" 접두사 묶음)"""
+        if not text:
+            return None
+        output = self._automaton.output
+        for end, state in self._automaton.hits(text):
+            for label, term, size in output[state]:
+                if predicate(label):
+                    return Match(label, term, end - size + 1, end + 1)
+        return None
+
+    def first_label(self, text: str, predicate: Callable[[str], bool]) -> Optional[str]:
+        """text에 등장한 label 중 사전 등록 순서가 가장 앞선 것 (text 내 위치와 무관)"""
+        found = self.labels(text)
+        for label in self._automaton.terms:
+            if label in found and predicate(label):
+                return label
+        return None
+
+    def label_of(self, word: str, predicate: Callable[[str], bool]) -> Optional[str]:
+        """word와 정확히 일치하는 사전 단어의 label"""
+        for label, terms in self._automaton.terms.items():
+            if predicate(label) and word in terms:
+                return label
+        return None
+
+    def terms(self, label: str) -> FrozenSet[str]:
+        return self._automaton.terms.get(label, frozenset())
+
+    def is_term(self, label: str, word: str) -> bool:
+        return word in self.terms(label)
+
+    def is_fragment(self, label: str, word: str) -> bool:
+        """word가 label 사전 단어의 부분 문자열인지 ('겨울' in '겨울에' 같은 역방향 검사)"""
+        automaton = self._automaton
+        fragments = automaton.fragments.get(label)
+        if fragments is None:
+            fragments = frozenset(
+                t[i:j] for t in automaton.terms.get(label, ()) for i in range(len(t)) for j in range(i + 1, len(t) + 1)
+            )
+            automaton.fragments[label] = fragments
+        return word in fragments
+
+
+# --------------------------------------------------------------------------
+# 기본 사전
+# --------------------------------------------------------------------------
+DEFAULT_DICTIONARIES: Dict[str, Set[str]] = {
+    # ✅ 유명인/연예인 이름 목록
+    "celebrity": {
+        # 남자 아티스트/래퍼
+        "지드래곤", "GD", "권지용", "지디",
+        "빅뱅", "태양", "대성", "탑", "승리",
+        "지코", "박재범", "사이먼도미닉", "그레이", "로꼬",
+        # 여자 아이돌
+        "장원영", "안유진", "이서", "가을", "레이",
+        "카리나", "윈터", "지젤", "닝닝",
+        "제니", "지수", "로제", "리사",
+        "민지", "하니", "다니엘", "해린", "혜인",
+        "카즈하", "사쿠라", "김채원", "허윤진", "홍은채",
+        "태연", "윤아", "서현", "티파니", "제시카",
+        "나연", "정연", "모모", "사나", "지효", "미나", "다현", "채영", "쯔위",
+        "아이린", "슬기", "웬디", "조이", "예리",
+        "츄", "희진", "현진", "고원", "김립",
+        # 여자 배우
+        "아이유", "수지", "송혜교", "김태리", "한소희", "전지현", "김고은",
+        "신세경", "박보영", "설현", "박신혜", "손예진",
+        "김유정", "김소현", "이성경", "서예지", "문가영",
+        # 남자 아이돌
+        "뷔", "정국", "지민", "RM", "슈가", "진", "제이홉",
+        "민호", "태민", "온유", "키",
+        "마크", "재현", "도영", "태용", "쟈니",
+        "방찬", "리노", "창빈", "필릭스", "승민", "아이엔",
+        "수빈", "연준", "범규", "태현", "휴닝카이",
+        # 남자 배우
+        "차은우", "공유", "현빈", "이종석", "박서준", "송강", "이도현",
+        "박보검", "김수현", "이민호", "남주혁", "서강준",
+        "송중기", "이준기", "지창욱", "박형식",
+        # 해외 연예인
+        "테일러스위프트", "아리아나그란데", "비욘세", "리한나",
+        "젠데이아", "티모시샬라메", "톰홀랜드",
+    },
+    # ✅ 일반 명사 목록 (이름으로 오인하면 안 되는 단어들)
+    "common_word": {
+        # 계절
+        "겨울", "여름", "봄", "가을", "겨울에", "여름에", "봄에", "가을에",
+        # 성별
+        "남자", "여자", "남성", "여성", "남자옷", "여자옷", "남성복", "여성복",
+        # 의류 종류
+        "옷", "코트", "패딩", "자켓", "바지", "치마", "원피스", "셔츠", "니트",
+        "가디건", "맨투맨", "후드", "티셔츠", "청바지", "슬랙스", "레깅스",
+        "정장", "수트", "블라우스", "스커트", "조끼", "베스트", "점퍼",
+        # 장소/상황
+        "상갓집", "장례식", "결혼식", "식사", "식사자리", "모임", "파티",
+        "출근", "퇴근", "데이트", "소개팅", "면접", "회사", "학교",
+        "교회", "성당", "절", "명절", "추석", "설날", "크리스마스",
+        # 형용사/부사
+        "격식", "격식있는", "캐주얼", "편한", "따뜻한", "시원한", "가벼운",
+        "무거운", "고급", "저렴한", "예쁜", "멋진", "세련된",
+        # 동사/조사 어근
+        "입을", "입을만한", "만한", "추천", "추천해줘", "보여줘", "찾아줘",
+        "어울리는", "맞는", "좋은", "괜찮은",
+        # 기타 일반 명사
+        "어른", "어른들", "어른들과", "부모님", "친구", "동료", "선배", "후배",
+        "함께", "함께하는", "같이", "혼자",
+        "스타일", "패션", "코디", "룩", "착장", "차림",
+        "상의", "하의", "아우터", "이너", "신발", "가방", "액세서리",
+        # 시간
+        "오늘", "내일", "주말", "평일", "아침", "저녁", "밤",
+        # 조사/어미가 붙은 형태
+        "에서", "에서의", "때", "때의", "용", "위한",
+        # 자주 오인되는 일반 명사
+        "자동차", "비행기", "기차", "버스", "지하철", "택시",
+        "공항", "역", "터미널", "정류장",
+        "사진", "이미지", "영상", "동영상", "뮤비",
+        "콘서트", "공연", "무대", "행사", "이벤트",
+        "브랜드", "명품", "빈티지", "레트로", "클래식",
+        "트렌드", "유행", "인기", "핫한", "요즘",
+    },
+    # ✅ 패션 컨텍스트 키워드
+    "fashion_context": {
+        "패션", "스타일", "코디", "룩", "착용", "의상",
+        "공항", "시사회", "무대", "화보", "입은", "착장",
+        "사복", "출근룩", "퇴근룩", "데이트룩",
+    },
+    # ✅ VLM 카테고리 → 표준 카테고리 (label = "category:{표준 카테고리}")
+    "category:Tops": {"상의", "티셔츠", "니트", "셔츠"},
+    "category:Bottoms": {"하의", "바지", "치마", "스커트", "팬츠", "진"},
+    "category:Outerwear": {"아우터", "자켓", "코트", "패딩"},
+    "category:Dresses": {"원피스", "드레스"},
+    "category:Shoes": {"신발", "슈즈"},
+    "category:Accessories": {"액세서리", "모자", "가방"},
+}
+
+
+intent_matcher = IntentMatcher(DEFAULT_DICTIONARIES)
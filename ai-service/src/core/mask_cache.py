@@ -0,0 +1,43 @@
+import logging
+from typing import Optional
+
+import redis
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# 가상 피팅 마스크 캐시 (Redis, PNG 바이트 그대로 저장)
+# key = mask:v{MASK_VERSION}:{target}:{사람 이미지 digest}
+# - 같은 사진으로 옷만 바꿔 입히는 경우 seg/pose 추론을 다시 하지 않음
+# - 마스크 생성 로직이 바뀌면 MASK_VERSION을 올려 기존 캐시 무효화
+# --------------------------------------------------------------------------
+MASK_VERSION = 1
+CACHE_KEY = "mask:v{version}:{target}:{digest}"
+
+
+class MaskCache:
+    def __init__(self):
+        # 바이너리 저장이므로 decode_responses=False
+        self.redis = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=0)
+
+    @staticmethod
+    def make_key(digest: str, target: str) -> str:
+        return CACHE_KEY.format(version=MASK_VERSION, target=target, digest=digest)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.redis.get(key)
+        except Exception as e:
+            logger.warning(f"⚠️ Mask cache lookup failed: {e}")
+            return None
+
+    def set(self, key: str, png: bytes):
+        try:
+            self.redis.set(key, png, ex=settings.MASK_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"⚠️ Mask cache store failed: {e}")
+
+
+mask_cache = MaskCache()
@@ -1,7 +1,5 @@
 import os
 import logging
-import base64
-import io
 import threading
 import json
 import re
@@ -17,6 +15,8 @@ from langchain_ibm import ChatWatsonx
 from langchain_core.messages import HumanMessage
 
 from src.core.prompts import VISION_ANALYSIS_PROMPT
+from src.core.image_ingest import ingest_b64, prepare_clip_input
+from src.core.vlm_cache import vlm_cache
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +26,17 @@ CLIP_MODEL_NAME = "sentence-transformers/clip-ViT-B-32-multilingual-v1"
 CLIP_VISION_MODEL_NAME = "sentence-transformers/clip-ViT-B-32"
 VISION_MODEL_ID = "meta-llama/llama-3-2-11b-vision-instruct" 
 
+# [재임베딩] 모델 업그레이드 대상 (shadow 컬럼 채우기용) - 미설정 시 해당 공간 마이그레이션 비활성
+BERT_NEXT_MODEL_NAME = os.getenv("BERT_NEXT_MODEL_NAME")
+CLIP_VISION_NEXT_MODEL_NAME = os.getenv("CLIP_VISION_NEXT_MODEL_NAME")
+CLIP_NEXT_MODEL_NAME = os.getenv("CLIP_NEXT_MODEL_NAME")  # 텍스트→이미지 검색용 (Vision 모델과 쌍)
+
+# 승격(promote)된 모델명은 Redis에 저장해 재시작/다른 프로세스에서도 유지
+# - embedding_model:active  : hash (space → 활성 모델명), backend-core 스왑 커밋 후 기록
+# - embedding_model:version : 승격할 때마다 INCR → 각 프로세스의 ModelWatcher가 감지해 모델 교체
+ACTIVE_MODEL_REDIS_KEY = "embedding_model:active"
+ACTIVE_MODEL_VERSION_KEY = "embedding_model:version"
+
 class ModelEngine:
     _instance: Optional['ModelEngine'] = None
     _lock = threading.Lock() 
@@ -49,6 +60,15 @@ class ModelEngine:
         
         self.project_id = os.getenv("WATSONX_PROJECT_ID")
         self.device = os.getenv("EMBEDDING_DEVICE", "cpu")
+
+        # [재임베딩] 공간별 활성/다음 모델명 및 지연 로딩된 다음 모델
+        self.model_names = {"bert": BERT_MODEL_NAME, "clip": CLIP_VISION_MODEL_NAME, "clip_text": CLIP_MODEL_NAME}
+        self.next_model_names = {
+            "bert": BERT_NEXT_MODEL_NAME,
+            "clip": CLIP_VISION_NEXT_MODEL_NAME,
+            "clip_text": CLIP_NEXT_MODEL_NAME,
+        }
+        self._next_models: Dict[str, object] = {}
         self.is_initialized = False
 
     def initialize(self):
@@ -58,26 +78,164 @@ class ModelEngine:
             if self.is_initialized: return
             logger.info(f"🚀 Initializing Hybrid Model Engine on [{self.device}]...")
             self._init_watsonx()
+            self._load_promoted_model_names()
             
             try:
-                self.bert_model = HuggingFaceEmbeddings(
-                    model_name=BERT_MODEL_NAME,
-                    model_kwargs={'device': self.device},
-                    encode_kwargs={'normalize_embeddings': True}
-                )
+                self.bert_model = self._load_bert(self.model_names["bert"])
             except Exception: pass
 
             try:
-                self.clip_text_model = SentenceTransformer(CLIP_MODEL_NAME, device=self.device)
+                self.clip_text_model = SentenceTransformer(self.model_names["clip_text"], device=self.device)
             except Exception: pass
 
             try:
-                self.clip_vision_model = SentenceTransformer(CLIP_VISION_MODEL_NAME, device=self.device)
+                self.clip_vision_model = SentenceTransformer(self.model_names["clip"], device=self.device)
             except Exception: pass
 
             self.is_initialized = True
             logger.info("✅ All Models Initialized.")
 
+    def _load_bert(self, model_name: str) -> HuggingFaceEmbeddings:
+        return HuggingFaceEmbeddings(
+            model_name=model_name,
+            model_kwargs={'device': self.device},
+            encode_kwargs={'normalize_embeddings': True}
+        )
+
+    # -----------------------------------------------------------
+    # [Re-embedding] 모델 버전 관리 (활성 ↔ 다음 모델)
+    # -----------------------------------------------------------
+    def _redis(self):
+        import redis
+        from src.core.config import settings
+        return redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=0, decode_responses=True)
+
+    def _load_promoted_model_names(self):
+        try:
+            promoted = self._redis().hgetall(ACTIVE_MODEL_REDIS_KEY)
+            for key in ("bert", "clip"):
+                name = promoted.get(key)
+                if not name or name == self.model_names[key]:
+                    continue
+                # 이미 승격된 모델이 다음 모델로 남아있으면 비활성화
+                if self.next_model_names.get(key) == name:
+                    if key == "clip":
+                        self._promote_clip_text_name()
+                    self.next_model_names[key] = None
+                self.model_names[key] = name
+            text_name = promoted.get("clip_text")
+            if text_name:
+                self.model_names["clip_text"] = text_name
+                if self.next_model_names.get("clip_text") == text_name:
+                    self.next_model_names["clip_text"] = None
+        except Exception as e:
+            logger.warning(f"⚠️ Promoted model lookup skipped: {e}")
+
+    def _promote_clip_text_name(self) -> Optional[str]:
+        """CLIP Vision 승격 시 쌍이 되는 텍스트 모델명도 함께 승격"""
+        text_name = self.next_model_names.get("clip_text")
+        if text_name:
+            self.model_names["clip_text"] = text_name
+            self.next_model_names["clip_text"] = None
+        return text_name
+
+    def _get_model(self, space: str, model: str = "active"):
+        """space('bert'|'clip')와 model('active'|'next')에 맞는 인코더 반환"""
+        if model == "active":
+            if not self.is_initialized: self.initialize()
+            return self.bert_model if space == "bert" else self.clip_vision_model
+
+        name = self.next_model_names.get(space)
+        if not name:
+            raise ValueError(f"No next model configured for '{space}'")
+        if space not in self._next_models:
+            with self._lock:
+                if space not in self._next_models:
+                    logger.info(f"📦 Loading next {space} model: {name}")
+                    self._next_models[space] = (
+                        self._load_bert(name) if space == "bert"
+                        else SentenceTransformer(name, device=self.device)
+                    )
+        return self._next_models[space]
+
+    def _model_dimension(self, space: str, model: str) -> Optional[int]:
+        try:
+            encoder = self._get_model(space, model)
+            if space == "bert":
+                return len(encoder.embed_query("dimension probe"))
+            return encoder.get_sentence_embedding_dimension()
+        except Exception:
+            return None
+
+    def get_model_info(self) -> Dict[str, Dict[str, Optional[Union[str, int]]]]:
+        """공간별 활성/다음 모델 ID와 차원"""
+        info = {}
+        for space in ("bert", "clip"):
+            next_name = self.next_model_names.get(space)
+            info[space] = {
+                "active": self.model_names[space],
+                "dimension": self._model_dimension(space, "active"),
+                "next": next_name,
+                "next_dimension": self._model_dimension(space, "next") if next_name else None,
+            }
+        return info
+
+    def request_promotion(self, space: str) -> str:
+        """
+        다음 모델 승격 플래그 기록 (수동 승격용, 보통은 backend-core 스왑 커밋 후 직접 기록)
+        실제 모델 교체는 각 프로세스의 ModelWatcher가 sync_promoted_models()로 수행
+        """
+        name = self.next_model_names.get(space)
+        if not name:
+            raise ValueError(f"No next model configured for '{space}'")
+        client = self._redis()
+        client.hset(ACTIVE_MODEL_REDIS_KEY, space, name)
+        client.incr(ACTIVE_MODEL_VERSION_KEY)
+        return name
+
+    def _activate_next(self, space: str) -> str:
+        """이 프로세스에서 다음 모델을 활성 모델로 교체 (모델 로딩 포함 → 스레드에서 호출)"""
+        encoder = self._get_model(space, "next")
+        name = self.next_model_names[space]
+        text_encoder = None
+        if space == "clip" and self.next_model_names.get("clip_text"):
+            text_encoder = SentenceTransformer(self.next_model_names["clip_text"], device=self.device)
+        # 로딩은 락 밖에서 끝내고, 참조 교체만 락 안에서 수행
+        with self._lock:
+            if space == "bert":
+                self.bert_model = encoder
+            else:
+                self.clip_vision_model = encoder
+                if text_encoder is not None:
+                    self.clip_text_model = text_encoder
+                    self._promote_clip_text_name()
+            self.model_names[space] = name
+            self.next_model_names[space] = None
+            self._next_models.pop(space, None)
+        if text_encoder is not None:
+            # 재시작한 프로세스가 같은 텍스트 모델을 쓰도록 기록 (모든 프로세스가 같은 값을 씀)
+            try:
+                self._redis().hset(ACTIVE_MODEL_REDIS_KEY, "clip_text", self.model_names["clip_text"])
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to persist promoted CLIP text model: {e}")
+        logger.info(f"✅ Promoted {space} model -> {name}")
+        return name
+
+    def sync_promoted_models(self) -> List[str]:
+        """Redis 승격 플래그와 이 프로세스의 활성 모델을 맞춤. 교체한 공간 목록 반환"""
+        promoted = self._redis().hgetall(ACTIVE_MODEL_REDIS_KEY)
+        changed = []
+        for space in ("bert", "clip"):
+            name = promoted.get(space)
+            if not name or name == self.model_names[space]:
+                continue
+            if name != self.next_model_names.get(space):
+                logger.error(f"❌ Promoted {space} model '{name}' is not the configured next model; ignored")
+                continue
+            self._activate_next(space)
+            changed.append(space)
+        return changed
+
     def _init_watsonx(self):
         """
         [수정됨] 이전에 성공했던 '정확도 중심' 설정으로 복구
@@ -249,31 +407,58 @@ class ModelEngine:
     # -----------------------------------------------------------
     # [Core] AI Generation
     # -----------------------------------------------------------
-    def generate_with_image(self, text_prompt: str, image_b64: str) -> str:
+    def generate_with_image(
+        self, text_prompt: str, image_b64: str, use_cache: bool = True, near_duplicate: bool = False
+    ) -> str:
+        """
+        이미지 + 프롬프트 VLM 호출.
+        원본 응답은 이미지 hash/프롬프트 버전/모델 기준으로 캐시 (use_cache=False: 재생성 후 캐시 갱신)
+        near_duplicate=True: 비슷한 이미지(재인코딩 등)의 응답도 재사용 (perceptual key, vlm_cache 참고)
+        """
         if not self.vision_model: self.initialize()
-        
-        if self.vision_model is None:
-            return json.dumps({
-                "name": "연결 실패", "category": "Error", "gender": "Unisex",
-                "description": "AI 모델 연결 실패", "price": 0
-            }, ensure_ascii=False)
+
+        final_prompt = text_prompt
+        if "Analyze" in text_prompt or "JSON" in text_prompt:
+            final_prompt = VISION_ANALYSIS_PROMPT
+
+        cache_key = vlm_cache.make_key(final_prompt, image_b64, VISION_MODEL_ID, exact=not near_duplicate)
+        raw_content = vlm_cache.get(cache_key) if use_cache else None
+        cache_hit = raw_content is not None
+
+        if cache_hit:
+            logger.info("⚡ VLM cache hit")
+        else:
+            if self.vision_model is None:
+                return json.dumps({
+                    "name": "연결 실패", "category": "Error", "gender": "Unisex",
+                    "description": "AI 모델 연결 실패", "price": 0
+                }, ensure_ascii=False)
+
+            from src.services.quota_monitor import quota_monitor
+            if not quota_monitor.reserve_sync("watsonx", max_wait=10.0).allowed:
+                logger.warning("⚠️ Watsonx quota/rate limit reached")
+                return json.dumps(self._create_fallback_json(""), ensure_ascii=False)
+
+            try:
+                message = HumanMessage(content=[
+                    {"type": "text", "text": final_prompt},
+                    {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{image_b64}"}}
+                ])
+                
+                response = self.vision_model.invoke([message])
+                raw_content = self._fix_encoding(response.content)
+            except Exception as e:
+                logger.error(f"Vision Error: {e}")
+                quota_monitor.refund_sync("watsonx")
+                return json.dumps(self._create_fallback_json(""), ensure_ascii=False)
 
         try:
-            final_prompt = text_prompt
-            if "Analyze" in text_prompt or "JSON" in text_prompt:
-                final_prompt = VISION_ANALYSIS_PROMPT
-
-            message = HumanMessage(content=[
-                {"type": "text", "text": final_prompt},
-                {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{image_b64}"}}
-            ])
-            
-            response = self.vision_model.invoke([message])
-            raw_content = self._fix_encoding(response.content)
-            
             if "JSON" in final_prompt:
                 parsed_data = self._clean_and_parse_json(raw_content)
                 if parsed_data:
+                    # 파싱에 성공한 응답만 캐시 (실패 응답이 TTL 동안 재사용되지 않도록)
+                    if not cache_hit:
+                        vlm_cache.set(cache_key, raw_content)
                     tier = parsed_data.get("luxury_tier", 3)
                     category = parsed_data.get("category", "")
                     parsed_data["price"] = self._calculate_dynamic_price(tier, category)
@@ -283,7 +468,9 @@ class ModelEngine:
                 else:
                     logger.error(f"❌ JSON Parse Failed. Raw: {raw_content[:100]}...")
                     return json.dumps(self._create_fallback_json(raw_content), ensure_ascii=False)
-            
+
+            if not cache_hit:
+                vlm_cache.set(cache_key, raw_content)
             return raw_content
 
         except Exception as e:
@@ -300,9 +487,18 @@ class ModelEngine:
             if not model_to_use:
                 return "AI 모델이 초기화되지 않았습니다."
 
-            messages = [HumanMessage(content=prompt)]
-            response = model_to_use.invoke(messages)
-            return response.content
+            from src.services.quota_monitor import quota_monitor
+            if not quota_monitor.reserve_sync("watsonx", max_wait=10.0).allowed:
+                logger.warning("⚠️ Watsonx quota/rate limit reached")
+                return "죄송합니다. 답변을 생성할 수 없습니다."
+
+            try:
+                messages = [HumanMessage(content=prompt)]
+                response = model_to_use.invoke(messages)
+                return response.content
+            except Exception:
+                quota_monitor.refund_sync("watsonx")
+                raise
             
         except Exception as e:
             logger.error(f"❌ Text Generation Error: {e}")
@@ -316,6 +512,15 @@ class ModelEngine:
         try: return self.bert_model.embed_query(text)
         except: return [0.0] * 768
 
+    def generate_embeddings_batch(self, texts: List[str], model: str = "active") -> List[List[float]]:
+        """여러 텍스트를 한 번의 forward pass로 임베딩 (배치 복구/대량 적재/재임베딩용)"""
+        if not texts: return []
+        encoder = self._get_model("bert", model)
+        try: return encoder.embed_documents(texts)
+        except Exception as e:
+            logger.error(f"Batch Embedding Error: {e}")
+            return [[0.0] * 768 for _ in texts]
+
     def generate_dual_embedding(self, text: str) -> Dict[str, List[float]]:
         if not self.bert_model or not self.clip_text_model: self.initialize()
         result = {"bert": [0.0] * 768, "clip": [0.0] * 512}
@@ -327,11 +532,28 @@ class ModelEngine:
         except: pass
         return result
 
+    def encode_clip_text(self, text: str) -> List[float]:
+        if not self.clip_text_model: self.initialize()
+        vec = self.clip_text_model.encode(text)
+        return vec.tolist() if hasattr(vec, "tolist") else list(vec)
+
+    def encode_clip_image(self, image: Image.Image) -> List[float]:
+        """YOLO 크롭 없이 원본 이미지 CLIP 벡터 (후보 이미지 채점용)"""
+        if not self.clip_vision_model: self.initialize()
+        vec = self.clip_vision_model.encode(prepare_clip_input(image))
+        return vec.tolist() if hasattr(vec, "tolist") else list(vec)
+
+    @staticmethod
+    def cosine_similarity(a: List[float], b: List[float]) -> float:
+        try:
+            return util.cos_sim(torch.tensor(a), torch.tensor(b)).item()
+        except: return 0.0
+
     def calculate_similarity(self, text: str, image: Image.Image) -> float:
         if not self.clip_text_model or not self.clip_vision_model: self.initialize()
         try:
             text_emb = self.clip_text_model.encode(text, convert_to_tensor=True)
-            img_emb = self.clip_vision_model.encode(image, convert_to_tensor=True)
+            img_emb = self.clip_vision_model.encode(prepare_clip_input(image), convert_to_tensor=True)
             return util.cos_sim(text_emb, img_emb).item()
         except: return 0.0
 
@@ -341,8 +563,7 @@ class ModelEngine:
         try:
             pil_image = image_data
             if isinstance(image_data, str):
-                if "base64," in image_data: image_data = image_data.split("base64,")[1]
-                pil_image = Image.open(io.BytesIO(base64.b64decode(image_data)))
+                pil_image = ingest_b64(image_data).image
             
             if use_yolo:
                 try:
@@ -352,7 +573,7 @@ class ModelEngine:
                 except: pass
 
             if self.clip_vision_model:
-                vector = self.clip_vision_model.encode(pil_image)
+                vector = self.clip_vision_model.encode(prepare_clip_input(pil_image))
                 return {"clip": vector.tolist() if hasattr(vector, "tolist") else list(vector)}
             return {"clip": default_vector}
         except: return {"clip": default_vector}
@@ -364,20 +585,19 @@ class ModelEngine:
         try:
             pil_image = image_data
             if isinstance(image_data, str):
-                if "base64," in image_data: image_data = image_data.split("base64,")[1]
-                pil_image = Image.open(io.BytesIO(base64.b64decode(image_data)))
+                pil_image = ingest_b64(image_data).image
             
             try:
                 from src.core.yolo_detector import yolo_detector
                 features = yolo_detector.extract_fashion_features(pil_image)
                 for k, img_crop in features.items():
                     if img_crop and self.clip_vision_model:
-                        vec = self.clip_vision_model.encode(img_crop)
+                        vec = self.clip_vision_model.encode(prepare_clip_input(img_crop))
                         result[k] = vec.tolist() if hasattr(vec, "tolist") else list(vec)
             except Exception as e:
                 logger.error(f"Fashion Feature Extraction Failed: {e}")
                 if self.clip_vision_model:
-                    vec = self.clip_vision_model.encode(pil_image)
+                    vec = self.clip_vision_model.encode(prepare_clip_input(pil_image))
                     result["full"] = vec.tolist() if hasattr(vec, "tolist") else list(vec)
 
         except Exception as e: 
@@ -385,4 +605,66 @@ class ModelEngine:
             
         return result
 
+    def generate_image_embeddings_batch(self, images: List[Optional[Image.Image]], use_yolo: bool = True) -> List[List[float]]:
+        """
+        여러 이미지를 CLIP 배치 인코딩 (대량 적재용)
+        - 디코딩 실패(None) 항목은 빈 리스트로 반환해 입력 순서를 유지
+        """
+        if not self.clip_vision_model: self.initialize()
+        results: List[List[float]] = [[] for _ in images]
+        valid = [(i, img) for i, img in enumerate(images) if img is not None]
+        if not valid or not self.clip_vision_model: return results
+
+        crops = [img for _, img in valid]
+        if use_yolo:
+            try:
+                from src.core.yolo_detector import yolo_detector
+                # 배치 추론 결과로 바로 크롭 (분석 캐시 재조회 없음)
+                crops = yolo_detector.crop_fashion_regions_batch(crops, target="full")
+            except Exception as e:
+                logger.error(f"Batch YOLO Crop Failed: {e}")
+
+        try:
+            crops = [prepare_clip_input(c) for c in crops]
+            vectors = self.clip_vision_model.encode(crops, batch_size=len(crops))
+            for (i, _), vec in zip(valid, vectors):
+                results[i] = vec.tolist() if hasattr(vec, "tolist") else list(vec)
+        except Exception as e:
+            logger.error(f"Batch CLIP Encode Error: {e}")
+        return results
+
+    def generate_fashion_embeddings_batch(self, images: List[Optional[Image.Image]], model: str = "active") -> List[Dict[str, List[float]]]:
+        """
+        full/upper/lower 벡터 배치 생성 (재임베딩용)
+        - 이미지 N장 → YOLO 크롭 3N장 → CLIP 1회 배치 인코딩
+        - 디코딩 실패(None) 항목은 빈 dict로 반환
+        """
+        encoder = self._get_model("clip", model)
+        results: List[Dict[str, List[float]]] = [{} for _ in images]
+        valid = [(i, img) for i, img in enumerate(images) if img is not None]
+        if not valid: return results
+
+        targets = ("full", "upper", "lower")
+        valid_images = [img for _, img in valid]
+        try:
+            from src.core.yolo_detector import yolo_detector
+            features_list = yolo_detector.extract_fashion_features_batch(valid_images)
+        except Exception as e:
+            logger.error(f"Fashion Feature Extraction Failed: {e}")
+            features_list = [{} for _ in valid_images]
+
+        crops = []
+        for img, features in zip(valid_images, features_list):
+            crops.extend(features.get(t) or img for t in targets)
+
+        try:
+            crops = [prepare_clip_input(c) for c in crops]
+            vectors = encoder.encode(crops, batch_size=len(crops))
+            for n, (i, _) in enumerate(valid):
+                chunk = vectors[n * 3:(n + 1) * 3]
+                results[i] = {t: v.tolist() if hasattr(v, "tolist") else list(v) for t, v in zip(targets, chunk)}
+        except Exception as e:
+            logger.error(f"Batch Fashion Encode Error: {e}")
+        return results
+
 model_engine = ModelEngine()
\ No newline at end of file
@@ -1,5 +1,8 @@
 # ai-service/src/core/prompts.py
 
+# 프롬프트 템플릿을 바꾸면 올려서 VLM 응답 캐시를 무효화
+PROMPT_VERSION = 1
+
 VISION_ANALYSIS_PROMPT = """
 You are a Creative Fashion Editor.
 Analyze the image and create a unique, trendy product entry for a Korean shopping mall.
@@ -0,0 +1,67 @@
+import hashlib
+import logging
+from typing import Optional
+
+import redis
+
+from src.core.config import settings
+from src.core.image_ingest import color_signature, ingest_b64, perceptual_hash, pixel_digest
+from src.core.prompts import PROMPT_VERSION
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# VLM 응답 캐시 (Redis)
+# key = vlm:{model_id}:v{PROMPT_VERSION}:{prompt hash}:{image key}
+# - 이미지 (exact=True, 기본): 정규화(긴 변 PIXEL_DIGEST_SIDE) 픽셀 digest
+#   상품 분석처럼 속성(색상 등)이 정확해야 하는 경로 → 실루엣/색감이 비슷한 다른 컬러웨이와 공유하지 않음
+# - 이미지 (exact=False): dHash + 2x2 평균 색상 → 재업로드/재인코딩된 같은 이미지도 적중
+#   근사 중복 재사용이 의도된 경로에서만 사용 (rag_orchestrator 이미지 상세 질의)
+# - 프롬프트: 최종 프롬프트 텍스트 hash + 템플릿 버전
+# - 후처리(JSON 파싱, 가격 산정)는 캐시 이후 단계에서 매번 수행
+#   단, JSON 파싱에 실패한 응답은 캐시하지 않음 (호출 측에서 파싱 성공 후 set)
+# --------------------------------------------------------------------------
+CACHE_KEY = "vlm:{model}:v{version}:{prompt}:{image}"
+PIXEL_DIGEST_SIDE = 256
+STATS_KEY = "vlm:cache:stats"
+
+
+class VLMCache:
+    def __init__(self):
+        self.redis = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=0, decode_responses=True)
+
+    def make_key(self, prompt: str, image_b64: str, model_id: str, exact: bool = True) -> Optional[str]:
+        try:
+            if exact:
+                image_hash = "px" + pixel_digest(ingest_b64(image_b64, max_side=PIXEL_DIGEST_SIDE).image)
+            else:
+                # dHash는 9x8 픽셀만 필요하므로 최소 크기로 축소 디코딩
+                image = ingest_b64(image_b64, max_side=64).image
+                image_hash = perceptual_hash(image) + color_signature(image)
+        except Exception as e:
+            logger.warning(f"⚠️ VLM cache key skipped (decode failed): {e}")
+            return None
+        prompt_hash = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:16]
+        return CACHE_KEY.format(model=model_id, version=PROMPT_VERSION, prompt=prompt_hash, image=image_hash)
+
+    def get(self, key: Optional[str]) -> Optional[str]:
+        if not key:
+            return None
+        try:
+            value = self.redis.get(key)
+            self.redis.hincrby(STATS_KEY, "hit" if value is not None else "miss", 1)
+            return value
+        except Exception as e:
+            logger.warning(f"⚠️ VLM cache lookup failed: {e}")
+            return None
+
+    def set(self, key: Optional[str], value: str):
+        if not key or not value:
+            return
+        try:
+            self.redis.set(key, value, ex=settings.VLM_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"⚠️ VLM cache store failed: {e}")
+
+
+vlm_cache = VLMCache()
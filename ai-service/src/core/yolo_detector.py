@@ -1,12 +1,85 @@
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional, Tuple
 from PIL import Image, ImageDraw
 import numpy as np
 import torch
 import torch.nn as nn
 
+from src.core.config import settings
+
 logger = logging.getLogger(__name__)
 
+
+def image_digest(image: Image.Image) -> str:
+    """픽셀 데이터 기반 이미지 해시 (같은 이미지를 다른 요청에서 보내도 동일)"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{image.mode}:{image.size}".encode())
+    h.update(image.tobytes())
+    return h.hexdigest()
+
+
+class ImageAnalysis:
+    """
+    이미지 1장에 대한 YOLO 분석 결과 묶음
+    - detect / pose / seg 모델은 처음 필요할 때 한 번만 실행 (Lazy)
+    - 크롭/마스크/임베딩 등 모든 소비자가 같은 결과를 공유
+    """
+
+    def __init__(self, detector: "YOLOFashionDetector", image: Image.Image):
+        self.detector = detector
+        # 🚨 [FIX] 4채널(RGBA) 이미지가 들어오면 3채널(RGB)로 변환
+        self.image = image if image.mode == "RGB" else image.convert("RGB")
+        self._lock = threading.Lock()
+        self._persons: Optional[List[Dict[str, Any]]] = None
+        self._keypoints: Optional[np.ndarray] = None
+        self._pose_done = False
+        self._segmentation: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._seg_done = False
+        self._array: Optional[np.ndarray] = None
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.image.size
+
+    def _np(self) -> np.ndarray:
+        # PIL -> numpy 변환도 한 번만
+        if self._array is None:
+            self._array = np.array(self.image)
+        return self._array
+
+    @property
+    def persons(self) -> List[Dict[str, Any]]:
+        """사람 감지 결과 (면적 내림차순)"""
+        if self._persons is None:
+            with self._lock:
+                if self._persons is None:
+                    self._persons = self.detector._run_detect(self._np())
+        return self._persons
+
+    @property
+    def keypoints(self) -> Optional[np.ndarray]:
+        """첫 번째 사람의 Pose keypoints (17x2, 미감지 좌표는 0)"""
+        if not self._pose_done:
+            with self._lock:
+                if not self._pose_done:
+                    self._keypoints = self.detector._run_pose(self.image)
+                    self._pose_done = True
+        return self._keypoints
+
+    @property
+    def segmentation(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """첫 번째 사람의 (마스크[0~1], bbox xyxy) - 마스크는 모델 출력 해상도"""
+        if not self._seg_done:
+            with self._lock:
+                if not self._seg_done:
+                    self._segmentation = self.detector._run_seg(self.image)
+                    self._seg_done = True
+        return self._segmentation
+
+
 class YOLOFashionDetector:
     """
     YOLO 기반 패션 아이템 감지기
@@ -19,6 +92,10 @@ class YOLOFashionDetector:
         self.pose_model = None
         self.seg_model = None       # [추가] 세그멘테이션용 (가상 피팅)
         self.initialized = False
+
+        # 이미지 해시 → ImageAnalysis LRU 캐시
+        self._cache: "OrderedDict[str, ImageAnalysis]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         
         # COCO 클래스 ID (person = 0)
         self.PERSON_CLASS_ID = 0
@@ -75,67 +152,169 @@ class YOLOFashionDetector:
             logger.error(f"❌ YOLO initialization failed: {e}")
             return False
     
-    def detect_person(self, image: Image.Image) -> List[Dict[str, Any]]:
+    # ---------------------------------------------------
+    # [Analysis Cache] 이미지 해시 기반 LRU
+    # ---------------------------------------------------
+    def analyze(self, image: Image.Image, key: Optional[str] = None) -> ImageAnalysis:
         """
-        이미지에서 사람 감지
+        이미지 분석 객체 반환 (같은 이미지는 캐시된 객체 재사용)
+        key: 호출 측에서 이미 계산한 콘텐츠 해시가 있으면 전달 (해시 재계산 생략)
         """
         if not self.initialized:
-            if not self.initialize(): return []
-        
-        try:
-            # 🚨 [FIX] 4채널(RGBA) 이미지가 들어오면 3채널(RGB)로 변환
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            self.initialize()
+        key = key or image_digest(image)
+        with self._cache_lock:
+            analysis = self._cache.get(key)
+            if analysis is not None:
+                self._cache.move_to_end(key)
+                return analysis
+            analysis = ImageAnalysis(self, image)
+            self._cache[key] = analysis
+            while len(self._cache) > settings.YOLO_CACHE_SIZE:
+                self._cache.popitem(last=False)
+            return analysis
 
-            # PIL -> numpy
-            img_array = np.array(image)
-            
+    def _run_detect(self, img_array: np.ndarray) -> List[Dict[str, Any]]:
+        if self.model is None: return []
+        try:
             # YOLO 추론
             results = self.model(img_array, classes=[self.PERSON_CLASS_ID], verbose=False)
-            
-            persons = []
-            for result in results:
-                if result.boxes is None: continue
-                for box in result.boxes:
-                    x1, y1, x2, y2 = box.xyxy[0].tolist()
-                    conf = float(box.conf[0])
-                    area = (x2 - x1) * (y2 - y1)
-                    
-                    persons.append({
-                        "bbox": (int(x1), int(y1), int(x2), int(y2)),
-                        "confidence": conf,
-                        "area": area
-                    })
-            
-            persons.sort(key=lambda x: x["area"], reverse=True)
-            return persons
-            
+            return self._parse_persons(results)
         except Exception as e:
             logger.error(f"❌ Person detection failed: {e}")
             return []
-    
-    def get_keypoints(self, image: Image.Image) -> Optional[Dict[str, Tuple[int, int]]]:
+
+    def _parse_persons(self, results) -> List[Dict[str, Any]]:
+        persons = []
+        for result in results:
+            if result.boxes is None: continue
+            for box in result.boxes:
+                x1, y1, x2, y2 = box.xyxy[0].tolist()
+                conf = float(box.conf[0])
+                area = (x2 - x1) * (y2 - y1)
+                
+                persons.append({
+                    "bbox": (int(x1), int(y1), int(x2), int(y2)),
+                    "confidence": conf,
+                    "area": area
+                })
+        persons.sort(key=lambda x: x["area"], reverse=True)
+        return persons
+
+    def _run_pose(self, image: Image.Image) -> Optional[np.ndarray]:
         if self.pose_model is None: return None
         try:
-            # 🚨 [FIX] 포즈 추정 시에도 RGB 변환 확인
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-                
-            img_array = np.array(image)
-            results = self.pose_model(img_array, verbose=False)
-            
-            KEYPOINT_NAMES = {5: "left_shoulder", 6: "right_shoulder", 11: "left_hip", 12: "right_hip"}
+            results = self.pose_model(image, verbose=False)
             for result in results:
-                if result.keypoints is None: continue
-                keypoints = result.keypoints.xy[0].tolist()
-                kp_dict = {}
-                for idx, name in KEYPOINT_NAMES.items():
-                    if idx < len(keypoints):
-                        x, y = keypoints[idx]
-                        if x > 0 and y > 0: kp_dict[name] = (int(x), int(y))
-                if kp_dict: return kp_dict
+                if result.keypoints is None or len(result.keypoints.xy) == 0: continue
+                return result.keypoints.xy.cpu().numpy()[0]
+            return None
+        except Exception as e:
+            logger.error(f"❌ Pose estimation failed: {e}")
+            return None
+
+    def _run_seg(self, image: Image.Image) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if self.seg_model is None: return None
+        try:
+            seg_results = self.seg_model(image, classes=[0], verbose=False) # 0: Person
+            # 보통 YOLO는 confidence 순으로 정렬되어 있음 → 첫 번째 감지된 객체 사용
+            if seg_results and seg_results[0].masks:
+                masks = seg_results[0].masks.data.cpu().numpy()
+                boxes = seg_results[0].boxes.xyxy.cpu().numpy()
+                return masks[0], boxes[0]
+            return None
+        except Exception as e:
+            logger.error(f"❌ Segmentation failed: {e}")
             return None
-        except: return None
+
+    # ---------------------------------------------------
+    # [Batch API] 대량 적재/백필용 다중 이미지 추론
+    # ---------------------------------------------------
+    def detect_persons_batch(
+        self,
+        images: List[Image.Image],
+        batch_size: Optional[int] = None,
+        imgsz: Optional[int] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        N장을 batch_size 단위로 묶어 한 번의 forward pass로 사람 감지.
+        - 크기가 다른 이미지는 ultralytics가 imgsz 정사각형으로 letterbox 후 배치 구성
+        - 반환값(이미지별 감지 결과)을 그대로 크롭에 사용할 것
+          배치가 YOLO_CACHE_SIZE보다 크면 앞쪽 분석 결과는 캐시에서 밀려나므로
+          이미지별 crop_fashion_regions()로 다시 조회하면 단건 추론이 반복됨
+        """
+        if not images: return []
+        if not self.initialized:
+            if not self.initialize(): return [[] for _ in images]
+
+        batch_size = batch_size or settings.YOLO_BATCH_SIZE
+        imgsz = imgsz or settings.YOLO_IMGSZ
+        analyses = [self.analyze(img) for img in images]
+        # 이미 감지 결과가 있는 이미지(캐시 히트)는 제외
+        todo = [a for a in analyses if a._persons is None]
+
+        for start in range(0, len(todo), batch_size):
+            chunk = todo[start:start + batch_size]
+            try:
+                results = self.model(
+                    [a._np() for a in chunk],
+                    classes=[self.PERSON_CLASS_ID],
+                    imgsz=imgsz,
+                    verbose=False,
+                )
+                for analysis, result in zip(chunk, results):
+                    analysis._persons = self._parse_persons([result])
+            except Exception as e:
+                logger.error(f"❌ Batch person detection failed: {e}")
+                for analysis in chunk:
+                    analysis._persons = []
+
+        return [a.persons for a in analyses]
+
+    def extract_fashion_features_batch(
+        self,
+        images: List[Image.Image],
+        batch_size: Optional[int] = None,
+        imgsz: Optional[int] = None,
+    ) -> List[Dict[str, Optional[Image.Image]]]:
+        """extract_fashion_features의 배치 버전 (감지는 배치, 크롭은 배치 감지 결과로)"""
+        persons_list = self.detect_persons_batch(images, batch_size=batch_size, imgsz=imgsz)
+        return [self._features_from_persons(img, persons) for img, persons in zip(images, persons_list)]
+
+    def crop_fashion_regions_batch(
+        self,
+        images: List[Image.Image],
+        target: str = "full",
+        batch_size: Optional[int] = None,
+        imgsz: Optional[int] = None,
+    ) -> List[Image.Image]:
+        """crop_fashion_regions의 배치 버전 (사람 미감지 시 원본 반환)"""
+        persons_list = self.detect_persons_batch(images, batch_size=batch_size, imgsz=imgsz)
+        return [self._crop_from_persons(img, persons, target) for img, persons in zip(images, persons_list)]
+
+    # ---------------------------------------------------
+    # [Public API] 기존 시그니처 유지 (내부적으로 분석 캐시 사용)
+    # ---------------------------------------------------
+    def detect_person(self, image: Image.Image) -> List[Dict[str, Any]]:
+        """
+        이미지에서 사람 감지
+        """
+        if not self.initialized:
+            if not self.initialize(): return []
+        return self.analyze(image).persons
+    
+    def get_keypoints(self, image: Image.Image) -> Optional[Dict[str, Tuple[int, int]]]:
+        if self.pose_model is None: return None
+        keypoints = self.analyze(image).keypoints
+        if keypoints is None: return None
+
+        KEYPOINT_NAMES = {5: "left_shoulder", 6: "right_shoulder", 11: "left_hip", 12: "right_hip"}
+        kp_dict = {}
+        for idx, name in KEYPOINT_NAMES.items():
+            if idx < len(keypoints):
+                x, y = keypoints[idx]
+                if x > 0 and y > 0: kp_dict[name] = (int(x), int(y))
+        return kp_dict or None
     
     def _crop_from_bbox(self, image: Image.Image, bbox: Tuple[int,int,int,int], target: str) -> Image.Image:
         x1, y1, x2, y2 = bbox
@@ -158,26 +337,26 @@ class YOLOFashionDetector:
              
         return image.crop(crop_box)
 
-    def crop_fashion_regions(self, image: Image.Image, target: str = "full") -> Optional[Image.Image]:
-        persons = self.detect_person(image)
+    def _crop_from_persons(self, image: Image.Image, persons: List[Dict[str, Any]], target: str) -> Image.Image:
         if not persons: return image
         return self._crop_from_bbox(image, persons[0]["bbox"], target)
+
+    def crop_fashion_regions(self, image: Image.Image, target: str = "full") -> Optional[Image.Image]:
+        return self._crop_from_persons(image, self.detect_person(image), target)
     
     def extract_fashion_features(self, image: Image.Image) -> Dict[str, Optional[Image.Image]]:
+        return self._features_from_persons(image, self.detect_person(image))
+
+    def _features_from_persons(self, image: Image.Image, persons: List[Dict[str, Any]]) -> Dict[str, Optional[Image.Image]]:
         result = {"full": None, "upper": None, "lower": None}
         
-        persons = self.detect_person(image)
         if not persons:
             result["full"] = image 
             return result
             
         main_bbox = persons[0]["bbox"]
         
-        # 원본 이미지가 RGBA라면 여기서도 변환된 버전을 사용하는 게 안전하지만,
-        # crop은 모드 상관없이 동작하므로 괜찮습니다.
-        # 다만 detect_person 내부에서 변환된 이미지를 리턴하지 않으므로, 
-        # 원본 image를 그대로 씁니다.
-        
+        # crop은 모드 상관없이 동작하므로 원본 image를 그대로 씁니다.
         result["full"] = self._crop_from_bbox(image, main_bbox, "full")
         result["upper"] = self._crop_from_bbox(image, main_bbox, "upper")
         result["lower"] = self._crop_from_bbox(image, main_bbox, "lower")
@@ -199,40 +378,26 @@ class YOLOFashionDetector:
             if image.mode != "RGB": image = image.convert("RGB")
             w, h = image.size
 
-            # 1. Segmentation 추론 (사람 모양 따기)
-            seg_results = self.seg_model(image, classes=[0], verbose=False) # 0: Person
-
-            final_mask = None
-            person_box = None   # 사람 위치(박스) 저장용
+            analysis = self.analyze(image)
 
-            # 가장 큰 사람(주인공)의 마스크 찾기
-            if seg_results and seg_results[0].masks:
-                # 면적이 가장 큰 사람 선택
-                masks = seg_results[0].masks.data.cpu().numpy()
-                boxes = seg_results[0].boxes.xyxy.cpu().numpy()
-                
-                # (여러 명일 경우 가장 중앙에 있거나 큰 사람을 찾는 로직이 좋으나, 여기선 첫 번째 감지된 객체 사용)
-                # 보통 YOLO는 confidence 순으로 정렬되어 있음
-                mask_tensor = masks[0]
-                person_box = boxes[0] # x1, y1, x2, y2
+            # 1. Segmentation (사람 모양 따기) - 분석 캐시 공유
+            segmentation = analysis.segmentation
+            if segmentation is None: return None
+            mask_tensor, person_box = segmentation  # person_box: x1, y1, x2, y2
 
-                # 마스크 리사이징 (YOLO 마스크 -> 원본 이미지 크기)
-                final_mask = Image.fromarray((mask_tensor * 255).astype(np.uint8)).resize((w, h))
-            
-            if final_mask is None: return None
+            # 마스크 리사이징 (YOLO 마스크 -> 원본 이미지 크기)
+            # 새 이미지로 만들어지므로 캐시된 마스크는 변경되지 않음
+            final_mask = Image.fromarray((mask_tensor * 255).astype(np.uint8)).resize((w, h))
 
             draw = ImageDraw.Draw(final_mask)
 
-            # 2. Pose 추론 (관절 위치 찾기)
-            pose_results = self.pose_model(image, verbose=False)
+            # 2. Pose (관절 위치) - 골반/머리 계산에 한 번만 실행
+            keypoints = analysis.keypoints
 
             # 골반(Hip) 위치 찾기 (Keypoint Index : 11=Left Hip, 12=Right Hip)
             hip_y = int(h * 0.6)    # 기본값 : 못 찾으면 60% 지점 (Fallback)
 
-            if pose_results and pose_results[0].keypoints is not None:
-                # xy 좌표 가져오기
-                keypoints = pose_results[0].keypoints.xy.cpu().numpy()[0]
-                
+            if keypoints is not None:
                 # 11번(왼쪽 골반), 12번(오른쪽 골반)이 존재하는지 확인
                 # 좌표가 (0,0)이면 감지 안 된 것
                 left_hip = keypoints[11]
@@ -258,9 +423,7 @@ class YOLOFashionDetector:
             # 코(Nose)와 어깨(Shoulder) 사이의 목 찾기
             head_limit = 0  # 기본값
 
-            if pose_results and pose_results[0].keypoints is not None:
-                keypoints = pose_results[0].keypoints.xy.cpu().numpy()[0]
-                
+            if keypoints is not None:
                 # Keypoint Index: 0=코, 5=왼쪽 어깨, 6=오른쪽 어깨
                 nose = keypoints[0]
                 left_shoulder = keypoints[5]
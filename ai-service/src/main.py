@@ -2,22 +2,32 @@ import logging
 import json
 import re
 import base64
-import os
-import uuid
+import time
 import traceback
 import io
 from PIL import Image  # ✅ 이미지 처리를 위해 최상단으로 이동
 
-from fastapi import FastAPI, HTTPException, APIRouter, UploadFile, File
+from fastapi import FastAPI, HTTPException, APIRouter, UploadFile, File, Header, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal, Tuple
 from contextlib import asynccontextmanager
 
 # Core Modules
 from src.core.model_engine import model_engine
+from src.core.http_pool import http_pool
+from src.core.intent_matcher import intent_matcher
+from src.core.image_ingest import IngestedImage, ingest_b64, ingest_bytes
+from src.core.mask_cache import mask_cache
 from src.core.prompts import VISION_ANALYSIS_PROMPT
 from src.core.yolo_detector import yolo_detector  # ✅ 여기서 미리 import
 from src.services.rag_orchestrator import rag_orchestrator
+from src.services.debug_capture import debug_capture
+from src.services.search_cache import search_cache
+from src.services.quota_monitor import quota_monitor
+from src.services.dictionary_store import dictionary_watcher
+from src.services.model_sync import model_watcher
 
 # Logging Setup
 logging.basicConfig(level=logging.INFO)
@@ -39,8 +49,16 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"⚠️ Model init warning: {e}")
         logger.error(traceback.format_exc())
+
+    debug_capture.start()
+    dictionary_watcher.start()
+    model_watcher.start()
     
     yield
+    await model_watcher.stop()
+    await dictionary_watcher.stop()
+    debug_capture.stop()
+    await http_pool.close()
     logger.info("💤 AI Service Shutting down...")
 
 app = FastAPI(title="Modify AI Service", version="1.0.0", lifespan=lifespan)
@@ -52,11 +70,19 @@ class EmbedRequest(BaseModel):
 
 class AnalyzeRequest(BaseModel):
     image_b64: str
-    query: str   
+    query: str
+    regenerate: bool = False  # True: VLM 캐시 무시하고 재분석   
 
 class EmbedResponse(BaseModel):
     vector: List[float]
 
+class EmbedBatchRequest(BaseModel):
+    texts: List[str]
+    model: Literal["active", "next"] = "active"  # "next": 재임베딩 대상 모델
+
+class EmbedBatchResponse(BaseModel):
+    vectors: List[List[float]]
+
 class ImageAnalysisResponse(BaseModel):
     name: str
     category: str
@@ -82,6 +108,22 @@ class ClipVectorResponse(BaseModel):
     vector: List[float]
     dimension: int
 
+class ClipVectorBatchRequest(BaseModel):
+    images_b64: List[str]
+
+class ClipVectorBatchResponse(BaseModel):
+    vectors: List[List[float]]  # 실패한 이미지는 빈 리스트
+
+class FashionClipBatchRequest(BaseModel):
+    images_b64: List[str]
+    model: Literal["active", "next"] = "active"
+
+class FashionClipBatchResponse(BaseModel):
+    vectors: List[Dict[str, List[float]]]  # {"full", "upper", "lower"}, 실패 시 빈 dict
+
+class ModelPromoteRequest(BaseModel):
+    space: Literal["bert", "clip"]
+
 class ImageSearchRequest(BaseModel):
     image_b64: str
     limit: int = 12
@@ -109,26 +151,38 @@ def _fix_encoding(text: str) -> str:
         pass
     return text
 
-def _decode_image(image_b64: str) -> Image.Image:
-    """✅ Base64 문자열을 PIL Image로 변환하는 공통 함수"""
+def _ingest_image(image_b64: str) -> IngestedImage:
+    """✅ Base64 문자열을 축소 디코딩 (모델별 입력/VLM JPEG 재사용)"""
     try:
-        if "base64," in image_b64:
-            image_b64 = image_b64.split("base64,")[1]
-        
-        image_data = base64.b64decode(image_b64)
-        return Image.open(io.BytesIO(image_data)).convert("RGB")
+        return ingest_b64(image_b64)
     except Exception as e:
         logger.error(f"❌ Image decoding failed: {e}")
         raise HTTPException(status_code=400, detail="Invalid image data")
 
-CATEGORY_MAP = {
-    "상의": "Tops", "티셔츠": "Tops", "니트": "Tops", "셔츠": "Tops",
-    "하의": "Bottoms", "바지": "Bottoms", "치마": "Bottoms", "스커트": "Bottoms", "팬츠": "Bottoms", "진": "Bottoms",
-    "아우터": "Outerwear", "자켓": "Outerwear", "코트": "Outerwear", "패딩": "Outerwear",
-    "원피스": "Dresses", "드레스": "Dresses",
-    "신발": "Shoes", "슈즈": "Shoes",
-    "액세서리": "Accessories", "모자": "Accessories", "가방": "Accessories"
-}
+def _decode_image(image_b64: str) -> Image.Image:
+    """✅ Base64 문자열을 PIL Image로 변환하는 공통 함수"""
+    return _ingest_image(image_b64).image
+
+def _decode_images(images_b64: List[str]) -> List[Optional[Image.Image]]:
+    """배치 요청용 디코딩 - 디코딩 실패한 이미지는 None (모델 엔진이 빈 벡터로 반환)"""
+    images = []
+    for image_b64 in images_b64:
+        try:
+            images.append(_decode_image(image_b64))
+        except HTTPException:
+            images.append(None)
+    return images
+
+def _is_category(label: str) -> bool:
+    return label.startswith("category:")
+
+def _map_category(raw_category: str) -> Optional[str]:
+    """VLM 카테고리 → 표준 카테고리 (사전: intent_matcher "category:*", 핫 리로드 대상)"""
+    label = intent_matcher.label_of(raw_category, _is_category)
+    if not label:
+        # 기존 CATEGORY_MAP과 같은 우선순위: 등장 위치가 아니라 사전 순서(Tops → Bottoms → ...)
+        label = intent_matcher.first_label(raw_category, _is_category)
+    return label.split(":", 1)[1] if label else None
 
 # --- Endpoints ---
 
@@ -140,17 +194,50 @@ async def embed_text(request: EmbedRequest):
     except:
         return {"vector": [0.0] * 768} 
 
+@api_router.post("/embed-text-batch", response_model=EmbedBatchResponse)
+async def embed_text_batch(request: EmbedBatchRequest):
+    # 배치 임베딩: 백엔드 복구 큐/대량 적재에서 N번의 왕복 대신 1번 호출
+    # model="next" 첫 호출은 모델 로딩까지 포함하므로 스레드에서 실행 (/model-info 와 동일)
+    try:
+        vectors = await run_in_threadpool(model_engine.generate_embeddings_batch, request.texts, model=request.model)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"vectors": vectors}
+
+@api_router.get("/model-info")
+async def model_info():
+    """벡터 공간별 활성/다음 모델 ID와 차원 (백엔드 재임베딩 엔진이 참조)"""
+    # 차원 확인을 위해 다음 모델을 로딩할 수 있으므로 스레드에서 실행
+    return await run_in_threadpool(model_engine.get_model_info)
+
+@api_router.post("/model-promote", status_code=202)
+async def model_promote(request: ModelPromoteRequest):
+    """
+    다음 모델 승격 플래그 기록 (수동 복구용 - 재임베딩 스왑은 backend-core가 커밋 후 직접 기록)
+    각 프로세스가 MODEL_SYNC_POLL_SECONDS 안에 모델을 교체합니다.
+    """
+    try:
+        name = await run_in_threadpool(model_engine.request_promotion, request.space)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"space": request.space, "active": name}
+
 @api_router.post("/analyze-image", response_model=ImageAnalysisResponse)
-async def analyze_image(file: UploadFile = File(...)):
+async def analyze_image(file: UploadFile = File(...), regenerate: bool = Query(False)):
     filename = file.filename
     try:
         contents = await file.read()
-        image_b64 = base64.b64encode(contents).decode("utf-8")
+        # 원본 업로드 대신 축소 JPEG을 VLM에 전달하고, 같은 디코딩 결과를 CLIP에 재사용
+        ingested = ingest_bytes(contents)
         
         logger.info(f"👁️ Analyzing image: {filename}...")
         
         # 1. Text Generation (Llama)
-        generated_text = model_engine.generate_with_image(VISION_ANALYSIS_PROMPT, image_b64)
+        # regenerate=True: 관리자 재분석 요청 → 캐시를 건너뛰고 새 응답으로 갱신
+        # 동기 VLM 호출 + 쿼터 대기(time.sleep)가 이벤트 루프를 막지 않도록 스레드풀에서 실행
+        generated_text = await run_in_threadpool(
+            model_engine.generate_with_image, VISION_ANALYSIS_PROMPT, ingested.jpeg_b64, use_cache=not regenerate
+        )
         
         # JSON Parsing
         try:
@@ -164,13 +251,7 @@ async def analyze_image(file: UploadFile = File(...)):
 
         # 카테고리 매핑 로직
         raw_category = product_data.get("category", "Etc")
-        standard_category = CATEGORY_MAP.get(raw_category)
-        
-        if not standard_category:
-            for kr_key, en_val in CATEGORY_MAP.items():
-                if kr_key in raw_category:
-                    standard_category = en_val
-                    break
+        standard_category = _map_category(raw_category)
         
         final_category = standard_category if standard_category else "Etc"
         product_data["category"] = final_category
@@ -182,7 +263,7 @@ async def analyze_image(file: UploadFile = File(...)):
         vector_bert = model_engine.generate_embedding(meta_text)
         
         # CLIP (512 x 3)
-        fashion_vectors = model_engine.generate_fashion_embeddings(image_b64)
+        fashion_vectors = model_engine.generate_fashion_embeddings(ingested.image)
         
         logger.info(f"✅ Analysis Success: {product_data.get('name')}")
         
@@ -213,7 +294,7 @@ async def llm_generate(body: Dict[str, str]):
     logger.info(f"📝 LLM Prompt received: {prompt[:100]}...")
     try:
         korean_prompt = f"질문: {prompt}\n답변 (한국어):"
-        answer = model_engine.generate_text(korean_prompt)
+        answer = await run_in_threadpool(model_engine.generate_text, korean_prompt)
         return {"answer": answer}
     except Exception as e:
         logger.error(f"❌ LLM Generation Failed: {e}")
@@ -221,7 +302,7 @@ async def llm_generate(body: Dict[str, str]):
     
 @api_router.post("/analyze-image-detail")
 async def analyze_image_detail(req: AnalyzeRequest):
-    result = await rag_orchestrator.analyze_specific_image(req.image_b64, req.query)
+    result = await rag_orchestrator.analyze_specific_image(req.image_b64, req.query, use_cache=not req.regenerate)
     return {"analysis": result}    
 
 @api_router.post("/generate-clip-vector", response_model=ClipVectorResponse)
@@ -243,8 +324,30 @@ async def generate_clip_vector(request: ClipVectorRequest):
         logger.error(f"❌ CLIP vector generation failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.post("/generate-clip-vector-batch", response_model=ClipVectorBatchResponse)
+async def generate_clip_vector_batch(request: ClipVectorBatchRequest):
+    """CLIP 벡터 배치 생성 (CSV 대량 등록용) - 이미지 단위 실패는 빈 벡터로 반환"""
+    # 배치 전체 디코딩 + YOLO + CLIP 은 수 초 걸리므로 스레드에서 실행 (이벤트 루프 차단 방지)
+    images = await run_in_threadpool(_decode_images, request.images_b64)
+    vectors = await run_in_threadpool(model_engine.generate_image_embeddings_batch, images, use_yolo=True)
+    return {"vectors": vectors}
+
+@api_router.post("/generate-fashion-clip-vectors-batch", response_model=FashionClipBatchResponse)
+async def generate_fashion_clip_vectors_batch(request: FashionClipBatchRequest):
+    """full/upper/lower CLIP 벡터 배치 생성 (재임베딩용)"""
+    # 디코딩 + (model="next" 첫 호출 시) 모델 로딩 + 배치 추론은 스레드에서 실행
+    images = await run_in_threadpool(_decode_images, request.images_b64)
+    try:
+        vectors = await run_in_threadpool(model_engine.generate_fashion_embeddings_batch, images, model=request.model)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"vectors": vectors}
+
 @api_router.post("/generate-fashion-clip-vector")
-async def generate_fashion_clip_vector(request: FashionClipRequest):
+async def generate_fashion_clip_vector(
+    request: FashionClipRequest,
+    x_debug_capture: Optional[str] = Header(None)
+):
     """
     ✅ 패션 특화 CLIP 벡터 생성 (YOLO 크롭 적용)
     """
@@ -261,13 +364,9 @@ async def generate_fashion_clip_vector(request: FashionClipRequest):
                 logger.info(f"✂️ YOLO cropped '{target}' region: {cropped.size}")
                 pil_image = cropped
 
-                # [DEBUG] 디버그 이미지 저장 (경로 안전하게 처리)
-                debug_dir = os.path.join(os.getcwd(), "static", "debug")
-                os.makedirs(debug_dir, exist_ok=True)
-                
-                debug_filename = os.path.join(debug_dir, f"{uuid.uuid4()}_{target}.jpg")
-                pil_image.save(debug_filename)
-                logger.info(f"📸 Debug Image Saved: {debug_filename}")
+                # [DEBUG] 샘플링된 요청만 백그라운드로 저장
+                force = (x_debug_capture or "").strip().lower() in ("1", "true", "yes", "on")
+                debug_capture.capture(pil_image, target, force=force)
             else:
                 logger.warning(f"⚠️ YOLO crop failed for '{target}', using original")
                 
@@ -315,33 +414,98 @@ async def search_by_image(request: ImageSearchRequest):
         logger.error(f"❌ Image search failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _build_fitting_mask(ingested: IngestedImage, target: str) -> Tuple[Optional[bytes], bool, Dict[str, float]]:
+    """
+    가상 피팅 마스크 PNG 생성 (스레드풀에서 실행)
+    - 마스크 캐시: 사람 이미지 digest + target (옷만 바뀌면 seg/pose 재사용)
+    반환: (PNG 바이트 또는 None, 캐시 적중 여부, 단계별 소요 시간 ms)
+    """
+    timings: Dict[str, float] = {}
+    key = mask_cache.make_key(ingested.digest, target)
+
+    started = time.perf_counter()
+    cached = mask_cache.get(key)
+    timings["cache"] = (time.perf_counter() - started) * 1000
+    if cached:
+        return cached, True, timings
+
+    started = time.perf_counter()
+    mask_pil = yolo_detector.generate_mask_for_fitting(ingested.image, target=target)
+    timings["yolo"] = (time.perf_counter() - started) * 1000
+    if mask_pil is None:
+        return None, False, timings
+
+    started = time.perf_counter()
+    # 축소 디코딩된 경우 요청 이미지 크기로 복원 (Replicate 입력과 크기 일치)
+    if ingested.downscaled:
+        mask_pil = mask_pil.resize(ingested.original_size, Image.Resampling.NEAREST)
+    buffer = io.BytesIO()
+    # 흑백 1채널 + compress_level 1: 마스크는 단순해서 압축률 차이가 작고 인코딩이 빠름
+    mask_pil.convert("L").save(buffer, format="PNG", compress_level=1)
+    png = buffer.getvalue()
+    timings["encode"] = (time.perf_counter() - started) * 1000
+
+    mask_cache.set(key, png)
+    return png, False, timings
+
+def _server_timing(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{name};dur={duration:.1f}" for name, duration in timings.items())
+
 @api_router.post("/generate-mask")
 async def generate_mask_endpoint(request: MaskRequest):
     """
-    [내부용 API] 백엔드에서 요청받은 이미지의 마스크를 생성해서 반환
+    [내부용 API] 백엔드에서 요청받은 이미지의 마스크를 생성해서 반환 (base64 JSON, 하위 호환용)
     """
     try:
-        # 1. Base64 -> PIL Image 변환 (기존 함수 활용)
-        pil_image = _decode_image(request.image_b64)
+        ingested = await run_in_threadpool(_ingest_image, request.image_b64)
+        png, _, _ = await run_in_threadpool(_build_fitting_mask, ingested, request.target)
         
-        # 2. YOLO 실행 (이미 ai-service에는 로드되어 있음)
-        # (주의: yolo_detector에 generate_mask_for_fitting 메소드가 추가되어 있어야 함)
-        mask_pil = yolo_detector.generate_mask_for_fitting(pil_image, target=request.target)
-        
-        if mask_pil is None:
+        if png is None:
             return {"mask_b64": None, "status": "failed"}
 
-        # 3. 마스크 -> Base64 변환 (PNG 포맷)
-        buffer = io.BytesIO()
-        mask_pil.save(buffer, format="PNG")
-        mask_b64 = base64.b64encode(buffer.getvalue()).decode("utf-8")
-        
+        mask_b64 = base64.b64encode(png).decode("utf-8")
         return {"mask_b64": f"data:image/png;base64,{mask_b64}", "status": "success"}
 
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Mask Generation Failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.post("/generate-mask-raw")
+async def generate_mask_raw_endpoint(request: Request, target: str = Query("upper")):
+    """
+    [내부용 API] 바이너리 전송 버전
+    - 요청 본문: 사람 이미지 원본 바이트 (image/jpeg 등), 응답: 마스크 PNG 바이트
+    - 마스크를 만들 수 없으면 204
+    - 단계별 소요 시간은 Server-Timing 헤더, 캐시 적중 여부는 X-Mask-Cache 헤더
+    """
+    started = time.perf_counter()
+    body = await request.body()
+    if not body:
+        raise HTTPException(status_code=400, detail="Empty image body")
+
+    try:
+        ingested = await run_in_threadpool(ingest_bytes, body)
+    except Exception as e:
+        logger.error(f"❌ Image decoding failed: {e}")
+        raise HTTPException(status_code=400, detail="Invalid image data")
+    decode_ms = (time.perf_counter() - started) * 1000
+
+    try:
+        png, hit, timings = await run_in_threadpool(_build_fitting_mask, ingested, target)
     except Exception as e:
         logger.error(f"❌ Mask Generation Failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    timings = {"decode": decode_ms, **timings}
+    headers = {"Server-Timing": _server_timing(timings), "X-Mask-Cache": "hit" if hit else "miss"}
+    logger.info(f"🎭 Mask ({target}, cache={'hit' if hit else 'miss'}): {_server_timing(timings)}")
+
+    if png is None:
+        return Response(status_code=204, headers=headers)
+    return Response(content=png, media_type="image/png", headers=headers)
+
 # --- RAG Orchestrator ---
 
 @api_router.post("/determine-path")
@@ -368,6 +532,45 @@ async def process_external(request: InternalSearchRequest):
         logger.error(f"External processing failed: {e}")
         return await rag_orchestrator.process_internal_search(request.query)
 
+@api_router.get("/cache-stats")
+async def cache_stats():
+    """외부 RAG 캐시(검색 응답/후보 이미지/CLIP 벡터) 적중률"""
+    try:
+        return await search_cache.get_stats()
+    except Exception as e:
+        logger.error(f"Cache stats failed: {e}")
+        raise HTTPException(status_code=503, detail="Redis unavailable")
+
+@api_router.get("/quota")
+async def quota_status():
+    """외부 API(Google CSE, Watsonx) 일일 잔여량 / 초당 토큰 현황"""
+    try:
+        return await quota_monitor.remaining()
+    except Exception as e:
+        logger.error(f"Quota status failed: {e}")
+        raise HTTPException(status_code=503, detail="Redis unavailable")
+
+@api_router.post("/process-external-stream")
+async def process_external_stream(request: InternalSearchRequest):
+    """외부 RAG 단계별 결과 스트리밍 (NDJSON: candidates → summary, 또는 fallback)"""
+    logger.info(f"🌍 Streaming External: {request.query}")
+
+    async def event_stream():
+        sent = False
+        try:
+            async for event in rag_orchestrator.stream_external_rag(request.query):
+                sent = True
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        except Exception as e:
+            logger.error(f"External streaming failed: {e}")
+            if sent:
+                yield json.dumps({"event": "error", "detail": str(e)}, ensure_ascii=False) + "\n"
+            else:
+                fallback = await rag_orchestrator.process_internal_search(request.query)
+                yield json.dumps({"event": "fallback", **fallback}, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
 app.include_router(api_router)
 
 @app.get("/")
@@ -0,0 +1,116 @@
+import os
+import time
+import queue
+import uuid
+import logging
+import itertools
+import threading
+from typing import Optional
+
+from PIL import Image
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DebugCapture:
+    """
+    YOLO 크롭 등 진단용 이미지 캡처.
+    - 샘플링: 1/N 요청 또는 X-Debug-Capture 헤더로 강제
+    - 저장: 백그라운드 스레드가 bounded queue에서 꺼내 JPEG 인코딩/디스크 쓰기 (요청 경로는 put만 수행)
+    - 보존 정책: 최대 보관 시간 + 디렉터리 총 용량 초과 시 오래된 파일부터 삭제
+    - 기본값 비활성 (DEBUG_CAPTURE_ENABLED)
+    """
+    def __init__(self):
+        self.enabled = settings.DEBUG_CAPTURE_ENABLED
+        self.directory = settings.DEBUG_CAPTURE_DIR
+        self.sample_rate = max(1, settings.DEBUG_CAPTURE_SAMPLE_RATE)
+        self.max_bytes = settings.DEBUG_CAPTURE_MAX_MB * 1024 * 1024
+        self.max_age = settings.DEBUG_CAPTURE_MAX_AGE_HOURS * 3600
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=settings.DEBUG_CAPTURE_QUEUE_SIZE)
+        self._counter = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._writes = 0
+        self.dropped = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self):
+        if not self.enabled or self._thread is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="debug-capture", daemon=True)
+        self._thread.start()
+        logger.info(f"📸 Debug capture enabled (1/{self.sample_rate}, dir={self.directory})")
+
+    def stop(self, timeout: float = 5.0):
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Request path
+    # ------------------------------------------------------------------
+    def should_capture(self, force: bool = False) -> bool:
+        if not self.enabled or self._thread is None:
+            return False
+        return force or next(self._counter) % self.sample_rate == 0
+
+    def capture(self, image: Image.Image, tag: str, force: bool = False) -> bool:
+        """샘플링에 걸리면 큐에 적재. 큐가 가득 차면 버림 (요청을 막지 않음)"""
+        if not self.should_capture(force):
+            return False
+        try:
+            self._queue.put_nowait((image, tag))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            image, tag = item
+            try:
+                path = os.path.join(self.directory, f"{int(time.time())}_{uuid.uuid4().hex[:8]}_{tag}.jpg")
+                image.convert("RGB").save(path, format="JPEG", quality=85)
+                self._writes += 1
+                # 보존 정책은 매번이 아니라 주기적으로 적용 (디렉터리 스캔 비용)
+                if self._writes % 20 == 1:
+                    self._apply_retention()
+            except Exception as e:
+                logger.warning(f"⚠️ Debug capture write failed: {e}")
+
+    def _apply_retention(self):
+        now = time.time()
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or not entry.name.endswith(".jpg"):
+                continue
+            stat = entry.stat()
+            if now - stat.st_mtime > self.max_age:
+                os.remove(entry.path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+
+debug_capture = DebugCapture()
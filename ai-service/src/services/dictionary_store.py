@@ -0,0 +1,98 @@
+import json
+import asyncio
+import logging
+from typing import Callable, Dict, Mapping, Optional, Set
+
+import redis.asyncio as aioredis
+
+from src.core.config import settings
+from src.core.intent_matcher import DEFAULT_DICTIONARIES, IntentMatcher, intent_matcher
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# 라우팅 사전 핫 리로드 (Redis)
+# - intent:dict          : hash (label → JSON 단어 목록), 관리자 API(backend-core)가 갱신
+# - intent:dict:version  : 갱신할 때마다 INCR 되는 버전
+# - 각 프로세스는 버전만 주기적으로 조회하고, 바뀌었을 때만 사전을 읽어 재컴파일
+# - 재컴파일은 스레드에서 수행한 뒤 intent_matcher.reload()로 참조 교체 (요청 경로 락 없음)
+# - Redis에 없는 label은 코드의 기본 사전을 사용
+# backend-core(src/services/dictionary_store.py)와 같은 키를 사용합니다.
+# --------------------------------------------------------------------------
+DICT_KEY = "intent:dict"
+VERSION_KEY = "intent:dict:version"
+
+
+def _owned_label(label: str) -> bool:
+    """이 서비스가 사용하는 label만 컴파일 (backend 전용 사전은 제외)"""
+    return label in DEFAULT_DICTIONARIES or label.startswith("category:")
+
+
+class DictionaryWatcher:
+    def __init__(
+        self,
+        matcher: IntentMatcher,
+        defaults: Mapping[str, Set[str]],
+        accepts: Callable[[str], bool],
+    ):
+        self.matcher = matcher
+        self.defaults = defaults
+        self.accepts = accepts
+        self.redis = aioredis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=0, decode_responses=True)
+        self.version: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _merge(self, stored: Mapping[str, str]) -> Dict[str, Set[str]]:
+        dictionaries = {label: set(words) for label, words in self.defaults.items()}
+        for label, raw in stored.items():
+            if not self.accepts(label):
+                continue
+            try:
+                dictionaries[label] = {str(w) for w in json.loads(raw) if w}
+            except (ValueError, TypeError) as e:
+                logger.warning(f"⚠️ Invalid dictionary '{label}' ignored: {e}")
+        return dictionaries
+
+    async def refresh(self) -> bool:
+        """버전이 바뀌었으면 사전을 다시 읽어 매처 교체. 교체 여부 반환"""
+        version = await self.redis.get(VERSION_KEY)
+        if version == self.version:
+            return False
+
+        # 버전과 사전을 같은 트랜잭션에서 읽어 짝이 어긋나지 않도록 함
+        async with self.redis.pipeline(transaction=True) as pipe:
+            version, stored = await pipe.get(VERSION_KEY).hgetall(DICT_KEY).execute()
+
+        dictionaries = self._merge(stored)
+        await asyncio.to_thread(self.matcher.reload, dictionaries)
+        self.version = version
+        logger.info(f"📚 Routing dictionaries loaded (version={version or 0})")
+        return True
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Redis 장애 시 기존 매처 유지
+                logger.warning(f"⚠️ Dictionary refresh failed, keeping current version: {e}")
+            await asyncio.sleep(settings.INTENT_DICT_POLL_SECONDS)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.redis.close()
+
+
+dictionary_watcher = DictionaryWatcher(intent_matcher, DEFAULT_DICTIONARIES, _owned_label)
@@ -1,9 +1,11 @@
 import os
-import httpx
 import logging
 import re
 from typing import List, Dict, Any
 
+from src.core.http_pool import http_pool
+from src.services.quota_monitor import quota_monitor
+
 logger = logging.getLogger(__name__)
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
@@ -72,43 +74,52 @@ class GoogleSearchClient:
             logger.error(f"❌ Google Search not ready - API Key exists: {bool(GOOGLE_API_KEY)}, CSE ID exists: {bool(GOOGLE_CSE_ID)}")
             return []
 
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            try:
-                safe_params = params.copy()
-                safe_params['key'] = 'HIDDEN'
-                logger.info(f"📤 Google Request: {safe_params}")
-
-                response = await client.get(SEARCH_URL, params=params)
-                if response.status_code != 200:
-                    error_body = response.text
-                    logger.error(f"❌ Google API Error {response.status_code}: {error_body}")
-                    return []
-
-                data = response.json()
-                items = data.get("items", [])
-
-                if not items:
-                    logger.warning(f"⚠️ Google API returned 0 items for query: {params.get('q', '')}")
-                    logger.debug(f"Response data: {data}")
-
-                # [적용] 필터링 수행
-                query = params.get("q", "")
-                valid_items = self._filter_irrelevant_results(items, query)
-                
-                results = []
-                for item in valid_items:
-                    results.append({
-                        "title": item.get("title", ""),
-                        "link": item.get("link", ""),
-                        "snippet": item.get("snippet", ""),
-                        "thumbnail": item.get("image", {}).get("thumbnailLink", item.get("link", ""))
-                    })
-                return results
-
-            except Exception as e:
-                logger.error(f"❌ Google Search Failed: {e}")
+        # 일일 쿼터 + 초당 제한 선차감 (실패 시 반환)
+        reservation = await quota_monitor.reserve("google_cse", max_wait=2.0)
+        if not reservation.allowed:
+            logger.warning(f"⚠️ Google CSE quota/rate limit reached (remaining: {reservation.remaining})")
+            return []
+
+        # 공용 클라이언트 재사용 (요청마다 연결/TLS 핸드셰이크 생략)
+        client = http_pool.api_client()
+        try:
+            safe_params = params.copy()
+            safe_params['key'] = 'HIDDEN'
+            logger.info(f"📤 Google Request: {safe_params}")
+
+            response = await client.get(SEARCH_URL, params=params)
+            if response.status_code != 200:
+                error_body = response.text
+                logger.error(f"❌ Google API Error {response.status_code}: {error_body}")
+                await quota_monitor.refund("google_cse")
                 return []
 
+            data = response.json()
+            items = data.get("items", [])
+
+            if not items:
+                logger.warning(f"⚠️ Google API returned 0 items for query: {params.get('q', '')}")
+                logger.debug(f"Response data: {data}")
+
+            # [적용] 필터링 수행
+            query = params.get("q", "")
+            valid_items = self._filter_irrelevant_results(items, query)
+            
+            results = []
+            for item in valid_items:
+                results.append({
+                    "title": item.get("title", ""),
+                    "link": item.get("link", ""),
+                    "snippet": item.get("snippet", ""),
+                    "thumbnail": item.get("image", {}).get("thumbnailLink", item.get("link", ""))
+                })
+            return results
+
+        except Exception as e:
+            logger.error(f"❌ Google Search Failed: {e}")
+            await quota_monitor.refund("google_cse")
+            return []
+
     async def search(self, query: str, num_results: int = 5) -> List[Dict[str, Any]]:
         params = {
             "key": GOOGLE_API_KEY, "cx": GOOGLE_CSE_ID, "q": query, "num": num_results
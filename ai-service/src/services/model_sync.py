@@ -0,0 +1,62 @@
+import asyncio
+import logging
+from typing import Optional
+
+import redis.asyncio as aioredis
+
+from src.core.config import settings
+from src.core.model_engine import ACTIVE_MODEL_VERSION_KEY, model_engine
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# 임베딩 모델 승격 동기화
+# - backend-core 재임베딩 스왑이 커밋된 뒤 embedding_model:active / :version 을 기록
+# - 각 프로세스는 버전만 주기적으로 조회하고, 바뀌었을 때만 다음 모델을 스레드에서 로딩해 교체
+#   (요청 처리 루프를 막지 않고, 승격 상태가 한 프로세스에만 남지 않음)
+# --------------------------------------------------------------------------
+
+
+class ModelWatcher:
+    def __init__(self):
+        self.redis = aioredis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=0, decode_responses=True)
+        self.version: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> bool:
+        version = await self.redis.get(ACTIVE_MODEL_VERSION_KEY)
+        if version == self.version:
+            return False
+        changed = await asyncio.to_thread(model_engine.sync_promoted_models)
+        self.version = version
+        if changed:
+            logger.info(f"🔁 Embedding models promoted in this process: {changed} (version={version})")
+        return bool(changed)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 로딩 실패 시 버전을 갱신하지 않았으므로 다음 주기에 재시도
+                logger.warning(f"⚠️ Model promotion sync failed, retrying: {e}")
+            await asyncio.sleep(settings.MODEL_SYNC_POLL_SECONDS)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.redis.close()
+
+
+model_watcher = ModelWatcher()
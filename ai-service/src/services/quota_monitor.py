@@ -1,55 +1,208 @@
-import redis
+import time
+import asyncio
 import logging
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Tuple
+from typing import Dict, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
 from src.core.config import settings # 설정 파일에서 값들을 가져오기 위해 임포트
 
 logger = logging.getLogger(__name__)
 
+# --------------------------------------------------------------------------
+# 외부 API 쿼터/속도 제한 (Redis Lua 스크립트 1회 호출로 원자적 처리)
+# - 일일 쿼터: quota:{provider}:daily:{YYYY-MM-DD} (Google CSE 리셋 주기와 동일한 일 단위)
+# - 초당 속도: quota:{provider}:bucket 토큰 버킷 (연속 보충 → 슬라이딩 윈도우처럼 동작)
+# - reserve로 선차감 → 호출 실패 시 refund로 반환
+# backend-core(src/services/rate_limiter.py)와 같은 키/스크립트를 사용합니다.
+#   두 서비스는 빌드 컨텍스트가 달라 모듈을 공유할 수 없으므로 RESERVE/REFUND 스크립트는 복제본입니다.
+#   한쪽을 수정하면 반드시 다른 쪽도 같이 수정하세요 (같은 키를 서로 다른 규칙으로 갱신하면 쿼터가 어긋남).
+# --------------------------------------------------------------------------
+
+# KEYS: daily, bucket
+# ARGV: daily_limit, daily_ttl, cost, rate(tokens/s), capacity, now_ms
+# return: {allowed(1/0), daily_remaining(-1=무제한), retry_after_ms(-1=일일 쿼터 소진)}
+RESERVE_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local cost = tonumber(ARGV[3])
+local rate = tonumber(ARGV[4])
+local capacity = tonumber(ARGV[5])
+local now = tonumber(ARGV[6])
+
+local used = tonumber(redis.call('GET', KEYS[1]) or '0')
+if limit > 0 and used + cost > limit then
+    return {0, limit - used, -1}
+end
+
+if rate > 0 then
+    local state = redis.call('HMGET', KEYS[2], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) / 1000 * rate)
+    local ttl = math.ceil(capacity / rate * 1000) + 1000
+    if tokens < cost then
+        redis.call('HSET', KEYS[2], 'tokens', tokens, 'ts', now)
+        redis.call('PEXPIRE', KEYS[2], ttl)
+        local remaining = -1
+        if limit > 0 then remaining = limit - used end
+        return {0, remaining, math.ceil((cost - tokens) / rate * 1000)}
+    end
+    redis.call('HSET', KEYS[2], 'tokens', tokens - cost, 'ts', now)
+    redis.call('PEXPIRE', KEYS[2], ttl)
+end
+
+if limit > 0 then
+    used = redis.call('INCRBY', KEYS[1], cost)
+    if used == cost then redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2])) end
+    return {1, limit - used, 0}
+end
+return {1, -1, 0}
+"""
+
+# KEYS: daily, bucket / ARGV: cost, capacity
+REFUND_SCRIPT = """
+local cost = tonumber(ARGV[1])
+local used = tonumber(redis.call('GET', KEYS[1]) or '0')
+if used > 0 then
+    redis.call('DECRBY', KEYS[1], math.min(cost, used))
+end
+local tokens = tonumber(redis.call('HGET', KEYS[2], 'tokens'))
+if tokens then
+    redis.call('HSET', KEYS[2], 'tokens', math.min(tonumber(ARGV[2]), tokens + cost))
+end
+return 1
+"""
+
+DAILY_TTL = 86400 + 3600  # 24시간 + 여유분 1시간
+
+
+@dataclass
+class Reservation:
+    allowed: bool
+    remaining: int          # 일일 잔여량 (-1: 무제한)
+    retry_after: float      # 초당 제한에 걸린 경우 대기 시간(초), 일일 쿼터 소진 시 -1
+
+    @property
+    def exhausted(self) -> bool:
+        return not self.allowed and self.retry_after < 0
+
+
+def _limits() -> Dict[str, Tuple[int, float, float]]:
+    """provider → (일일 쿼터, 초당 보충 토큰, 버킷 용량). 0은 제한 없음"""
+    return {
+        "google_cse": (settings.GOOGLE_API_DAILY_QUOTA, settings.GOOGLE_CSE_RATE_PER_SEC, settings.GOOGLE_CSE_BURST),
+        "watsonx": (settings.WATSONX_DAILY_QUOTA, settings.WATSONX_RATE_PER_SEC, settings.WATSONX_BURST),
+        # 차감은 backend-core(가상 피팅)에서 하고 여기서는 /quota 현황만 보고
+        "replicate": (settings.REPLICATE_DAILY_QUOTA, settings.REPLICATE_RATE_PER_SEC, settings.REPLICATE_BURST),
+    }
+
+
 class QuotaMonitor:
     """
-    Google Search API 호출 쿼터를 Redis를 사용하여 실시간으로 관리하는 클래스입니다.
+    외부 API(Google CSE, Watsonx) 호출 쿼터를 Redis로 관리하는 클래스입니다.
+    비동기 경로는 reserve/refund, 스레드에서 실행되는 동기 경로(Watsonx)는 reserve_sync/refund_sync를 사용합니다.
+    reserve_sync는 time.sleep으로 대기하므로 이벤트 루프에서 직접 호출하지 마세요 (run_in_threadpool 경유).
     """
     def __init__(self):
         # Redis 연결 정보는 settings.py에서 가져옵니다.
-        self.redis = redis.Redis(
-            host=settings.REDIS_HOST, 
-            port=settings.REDIS_PORT, 
-            db=0, 
-            decode_responses=True
-        )
+        self.redis = aioredis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=0, decode_responses=True)
+        self.redis_sync = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=0, decode_responses=True)
+        self._reserve = self.redis.register_script(RESERVE_SCRIPT)
+        self._refund = self.redis.register_script(REFUND_SCRIPT)
+        self._reserve_sync = self.redis_sync.register_script(RESERVE_SCRIPT)
+        self._refund_sync = self.redis_sync.register_script(REFUND_SCRIPT)
         logger.info(f"QuotaMonitor initialized. Redis Host: {settings.REDIS_HOST}")
 
-    def check_and_increment(self) -> Tuple[bool, int]:
+    @staticmethod
+    def _keys(provider: str):
+        today = datetime.now().strftime("%Y-%m-%d")
+        return [f"quota:{provider}:daily:{today}", f"quota:{provider}:bucket"]
+
+    @staticmethod
+    def _reserve_args(provider: str, cost: int):
+        daily, rate, burst = _limits()[provider]
+        return [daily, DAILY_TTL, cost, rate, max(burst, cost), int(time.time() * 1000)]
+
+    @staticmethod
+    def _result(provider: str, raw) -> Reservation:
+        allowed, remaining, retry_ms = (int(v) for v in raw)
+        reservation = Reservation(bool(allowed), remaining, retry_ms / 1000 if retry_ms >= 0 else -1)
+        if reservation.exhausted:
+            logger.warning(f"⚠️ {provider} daily quota exceeded!")
+        return reservation
+
+    # ------------------------------------------------------------------
+    # Async
+    # ------------------------------------------------------------------
+    async def reserve(self, provider: str, cost: int = 1, max_wait: float = 0.0) -> Reservation:
         """
-        Google API 일일 할당량을 체크하고 사용량을 증가시킵니다.
-        Returns: (사용가능여부, 남은횟수)
+        토큰 선차감. 초당 제한에 걸리면 max_wait 이내에서 대기 후 재시도합니다.
+        Redis 장애 시에는 호출을 막지 않습니다 (fail-open).
         """
-        if settings.GOOGLE_API_DAILY_QUOTA <= 0:
-            # 쿼터가 0 이하라면 무제한으로 간주 (또는 기능 비활성화)
-            return True, 9999 
-            
-        today = datetime.now().strftime("%Y-%m-%d")
-        key = f"google_api_quota:{today}"
-        
-        # Redis 트랜잭션 사용
-        with self.redis.pipeline() as pipe:
-            pipe.get(key)
-            results = pipe.execute()
-            
-            current_usage = int(results[0]) if results[0] else 0
-            
-            if current_usage >= settings.GOOGLE_API_DAILY_QUOTA:
-                logger.warning(f"⚠️ Google API Quota Exceeded! Used: {current_usage}/{settings.GOOGLE_API_DAILY_QUOTA}")
-                return False, 0
-                
-            # 사용량 증가 및 TTL 설정 (24시간 + 여유분 1시간 = 86400 + 3600초)
-            pipe.incr(key)
-            pipe.expire(key, 86400 + 3600) 
-            new_usage = pipe.execute()[0]
-            
-            remaining = settings.GOOGLE_API_DAILY_QUOTA - new_usage
-            
-            return True, remaining
-
-quota_monitor = QuotaMonitor()
\ No newline at end of file
+        deadline = time.monotonic() + max_wait
+        while True:
+            try:
+                raw = await self._reserve(keys=self._keys(provider), args=self._reserve_args(provider, cost))
+            except Exception as e:
+                logger.error(f"❌ Quota reserve failed ({provider}), allowing call: {e}")
+                return Reservation(True, -1, 0)
+            reservation = self._result(provider, raw)
+            if reservation.allowed or reservation.exhausted:
+                return reservation
+            if time.monotonic() + reservation.retry_after > deadline:
+                return reservation
+            await asyncio.sleep(reservation.retry_after)
+
+    async def refund(self, provider: str, cost: int = 1):
+        """호출 실패 시 선차감한 토큰 반환"""
+        try:
+            _, _, burst = _limits()[provider]
+            await self._refund(keys=self._keys(provider), args=[cost, max(burst, cost)])
+        except Exception as e:
+            logger.error(f"❌ Quota refund failed ({provider}): {e}")
+
+    async def remaining(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """provider별 일일 잔여량 / 버킷 토큰 현황"""
+        report = {}
+        for provider, (daily, rate, burst) in _limits().items():
+            daily_key, bucket_key = self._keys(provider)
+            used = int(await self.redis.get(daily_key) or 0)
+            tokens = await self.redis.hget(bucket_key, "tokens")
+            report[provider] = {
+                "daily_limit": daily or None,
+                "daily_used": used,
+                "daily_remaining": max(daily - used, 0) if daily > 0 else None,
+                "rate_per_sec": rate or None,
+                "bucket_tokens": round(float(tokens), 2) if tokens is not None else burst,
+            }
+        return report
+
+    # ------------------------------------------------------------------
+    # Sync (asyncio.to_thread 등 스레드에서 실행되는 호출용)
+    # ------------------------------------------------------------------
+    def reserve_sync(self, provider: str, cost: int = 1, max_wait: float = 0.0) -> Reservation:
+        deadline = time.monotonic() + max_wait
+        while True:
+            try:
+                raw = self._reserve_sync(keys=self._keys(provider), args=self._reserve_args(provider, cost))
+            except Exception as e:
+                logger.error(f"❌ Quota reserve failed ({provider}), allowing call: {e}")
+                return Reservation(True, -1, 0)
+            reservation = self._result(provider, raw)
+            if reservation.allowed or reservation.exhausted:
+                return reservation
+            if time.monotonic() + reservation.retry_after > deadline:
+                return reservation
+            time.sleep(reservation.retry_after)
+
+    def refund_sync(self, provider: str, cost: int = 1):
+        try:
+            _, _, burst = _limits()[provider]
+            self._refund_sync(keys=self._keys(provider), args=[cost, max(burst, cost)])
+        except Exception as e:
+            logger.error(f"❌ Quota refund failed ({provider}): {e}")
+
+quota_monitor = QuotaMonitor()
@@ -1,14 +1,15 @@
 import asyncio
 import logging
 import aiohttp
-import base64
 import re
-from io import BytesIO
-from typing import List, Dict, Any, Optional, Set
+from typing import AsyncIterator, List, Dict, Any, Optional
 from PIL import Image
 
 from src.core.model_engine import model_engine
-from src.services.quota_monitor import quota_monitor
+from src.core.http_pool import http_pool
+from src.core.intent_matcher import intent_matcher
+from src.core.image_ingest import ingest_b64, ingest_bytes, to_jpeg_bytes, to_jpeg_data_uri
+from src.services.search_cache import search_cache
 from src.services.google_search_client import GoogleSearchClient
 
 logger = logging.getLogger(__name__)
@@ -19,85 +20,8 @@ class AIOrchestrator:
         self.search_client = GoogleSearchClient()
         self.semaphore = asyncio.Semaphore(5)
         
-        # ✅ 유명인/연예인 이름 목록 (빠른 체크용)
-        self.celebrity_names: Set[str] = {
-            # 남자 아티스트/래퍼
-            "지드래곤", "GD", "권지용", "지디",
-            "빅뱅", "태양", "대성", "탑", "승리",
-            "지코", "박재범", "사이먼도미닉", "그레이", "로꼬",
-            # 여자 아이돌
-            "장원영", "안유진", "이서", "가을", "레이",
-            "카리나", "윈터", "지젤", "닝닝",
-            "제니", "지수", "로제", "리사",
-            "민지", "하니", "다니엘", "해린", "혜인",
-            "카즈하", "사쿠라", "김채원", "허윤진", "홍은채",
-            "태연", "윤아", "서현", "티파니", "제시카",
-            "나연", "정연", "모모", "사나", "지효", "미나", "다현", "채영", "쯔위",
-            "아이린", "슬기", "웬디", "조이", "예리",
-            "츄", "희진", "현진", "고원", "김립",
-            # 여자 배우
-            "아이유", "수지", "송혜교", "김태리", "한소희", "전지현", "김고은",
-            "신세경", "박보영", "설현", "박신혜", "손예진",
-            "김유정", "김소현", "이성경", "서예지", "문가영",
-            # 남자 아이돌
-            "뷔", "정국", "지민", "RM", "슈가", "진", "제이홉",
-            "민호", "태민", "온유", "키",
-            "마크", "재현", "도영", "태용", "쟈니",
-            "방찬", "리노", "창빈", "필릭스", "승민", "아이엔",
-            "수빈", "연준", "범규", "태현", "휴닝카이",
-            # 남자 배우
-            "차은우", "공유", "현빈", "이종석", "박서준", "송강", "이도현",
-            "박보검", "김수현", "이민호", "남주혁", "서강준",
-            "송중기", "이준기", "지창욱", "박형식",
-            # 해외 연예인
-            "테일러스위프트", "아리아나그란데", "비욘세", "리한나",
-            "젠데이아", "티모시샬라메", "톰홀랜드"
-        }
-        
-        # ✅ 일반 명사 목록 (이름으로 오인하면 안 되는 단어들)
-        self.common_words: Set[str] = {
-            # 계절
-            "겨울", "여름", "봄", "가을", "겨울에", "여름에", "봄에", "가을에",
-            # 성별
-            "남자", "여자", "남성", "여성", "남자옷", "여자옷", "남성복", "여성복",
-            # 의류 종류
-            "옷", "코트", "패딩", "자켓", "바지", "치마", "원피스", "셔츠", "니트",
-            "가디건", "맨투맨", "후드", "티셔츠", "청바지", "슬랙스", "레깅스",
-            "정장", "수트", "블라우스", "스커트", "조끼", "베스트", "점퍼",
-            # 장소/상황
-            "상갓집", "장례식", "결혼식", "식사", "식사자리", "모임", "파티",
-            "출근", "퇴근", "데이트", "소개팅", "면접", "회사", "학교",
-            "교회", "성당", "절", "명절", "추석", "설날", "크리스마스",
-            # 형용사/부사
-            "격식", "격식있는", "캐주얼", "편한", "따뜻한", "시원한", "가벼운",
-            "무거운", "고급", "저렴한", "예쁜", "멋진", "세련된",
-            # 동사/조사 어근
-            "입을", "입을만한", "만한", "추천", "추천해줘", "보여줘", "찾아줘",
-            "어울리는", "맞는", "좋은", "괜찮은",
-            # 기타 일반 명사
-            "어른", "어른들", "어른들과", "부모님", "친구", "동료", "선배", "후배",
-            "함께", "함께하는", "같이", "혼자",
-            "스타일", "패션", "코디", "룩", "착장", "차림",
-            "상의", "하의", "아우터", "이너", "신발", "가방", "액세서리",
-            # 시간
-            "오늘", "내일", "주말", "평일", "아침", "저녁", "밤",
-            # 조사/어미가 붙은 형태
-            "에서", "에서의", "때", "때의", "용", "위한",
-            # ✅ 추가: 자주 오인되는 일반 명사
-            "자동차", "비행기", "기차", "버스", "지하철", "택시",
-            "공항", "역", "터미널", "정류장",
-            "사진", "이미지", "영상", "동영상", "뮤비",
-            "콘서트", "공연", "무대", "행사", "이벤트",
-            "브랜드", "명품", "빈티지", "레트로", "클래식",
-            "트렌드", "유행", "인기", "핫한", "요즘"
-        }
-        
-        # ✅ 패션 컨텍스트 키워드
-        self.fashion_context_keywords = [
-            "패션", "스타일", "코디", "룩", "착용", "의상",
-            "공항", "시사회", "무대", "화보", "입은", "착장",
-            "사복", "출근룩", "퇴근룩", "데이트룩"
-        ]
+        # ✅ 연예인/일반 명사/패션 컨텍스트 사전은 intent_matcher(Aho–Corasick)로 한 번에 매칭
+        self.matcher = intent_matcher
         
         # ✅ 한글 이름 패턴 (2-3글자, 성+이름)
         self.korean_name_pattern = re.compile(r'^[가-힣]{2,3}$')
@@ -113,9 +37,10 @@ class AIOrchestrator:
                 async with session.get(url, headers=headers, timeout=timeout) as response:
                     if response.status == 200:
                         data = await response.read()
-                        image = Image.open(BytesIO(data)).convert("RGB")
-                        if image.width < 250 or image.height < 250: return None
-                        return image
+                        # 축소 디코딩: 검색 결과 원본(수 MB)을 풀 해상도로 펼치지 않음
+                        ingested = ingest_bytes(data)
+                        if min(ingested.original_size) < 250: return None
+                        return ingested.image
             except Exception as e:
                 logger.debug(f"Image download failed: {url} - {e}")
                 return None
@@ -123,10 +48,7 @@ class AIOrchestrator:
 
     def _image_to_base64(self, image: Image.Image) -> str:
         try:
-            buffered = BytesIO()
-            image.save(buffered, format="JPEG", quality=95)
-            img_str = base64.b64encode(buffered.getvalue()).decode("utf-8")
-            return f"data:image/jpeg;base64,{img_str}"
+            return to_jpeg_data_uri(image)
         except Exception: return ""
 
     def _optimize_query_for_celebrity(self, user_query: str) -> str:
@@ -159,101 +81,164 @@ class AIOrchestrator:
         normalized = (raw_score - 0.15) * 450
         return int(min(max(normalized, 60), 99))
 
-    async def process_external_rag(self, query: str) -> Dict[str, Any]:
-        """외부 이미지 검색 + VLM 분석 (연예인/유명인 검색 전용)"""
+    async def _load_candidate(self, session: aiohttp.ClientSession, url: str) -> Optional[Dict[str, Any]]:
+        """후보 이미지 로드 (캐시 적중 시 다운로드 생략). 반환: {"image", "digest"} 또는 None"""
+        cached = await search_cache.get_image(url)
+        if cached is not None:
+            if not cached["digest"]:
+                return None
+            return {"image": ingest_bytes(cached["data"]).image, "digest": cached["digest"]}
+
+        img = await self._download_image(session, url)
+        if not img:
+            await search_cache.set_image(url, None)
+            return None
+        # 축소 JPEG으로 저장 → 이후 요청은 다운로드/디코딩 없이 사용
+        data = await asyncio.to_thread(to_jpeg_bytes, img)
+        digest = await search_cache.set_image(url, data)
+        return {"image": img, "digest": digest}
+
+    async def _clip_vector(self, kind: str, candidate: Dict[str, Any], encode) -> List[float]:
+        """content hash 기준 CLIP 벡터 캐시"""
+        model = self.engine.model_names["clip"]
+        digest = candidate.get("digest")
+        if digest:
+            cached = await search_cache.get_vector(kind, model, digest)
+            if cached:
+                return cached
+        vector = await asyncio.to_thread(encode, candidate["image"])
+        if digest:
+            await search_cache.set_vector(kind, model, digest, vector)
+        return vector
+
+    async def _fetch_and_score(self, session: aiohttp.ClientSession, item: Dict[str, Any], text_vector: List[float]) -> Optional[Dict[str, Any]]:
+        """다운로드가 끝나는 즉시 채점 (CLIP 연산은 스레드에서 실행해 다른 다운로드를 막지 않음)"""
+        candidate = await self._load_candidate(session, item['link'])
+        if not candidate:
+            return None
+
+        img = candidate["image"]
+        image_vector = await self._clip_vector("score", candidate, self.engine.encode_clip_image)
+        base_score = self.engine.cosine_similarity(text_vector, image_vector)
+        ratio_bonus = 0.05 if img.height > img.width else 0.0
+        final_score = base_score + ratio_bonus
+        if final_score <= 0.18:
+            return None
+        return {
+            **candidate,
+            "url": item['link'],
+            "raw_score": final_score,
+            "display_score": self._normalize_score(final_score)
+        }
+
+    async def stream_external_rag(self, query: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        외부 이미지 검색 + VLM 분석을 단계별 이벤트로 생성
+        - candidates: 대표 이미지 CLIP 벡터 + 후보 이미지 (백엔드가 바로 DB 검색 시작)
+        - summary: VLM 요약 + BERT 벡터 (VLM은 candidates 단계와 병렬로 진행)
+        - fallback: 외부 경로 불가 시 내부 검색 결과
+        """
         logger.info(f"🌍 Processing EXTERNAL RAG: {query}")
-        
-        allowed, reason = quota_monitor.check_and_increment()
-        if not allowed:
-            logger.warning(f"⚠️ Quota exceeded: {reason}")
-            return await self.process_internal_search(query)
 
         optimized_query = self._optimize_query_for_celebrity(query)
-        
-        logger.info(f"🔎 Searching Google Images: '{optimized_query}'")
-        search_results = await self.search_client.search_images(
-            optimized_query, num_results=15, start_index=1
-        )
+
+        # 같은 쿼리는 캐시된 검색 결과 사용 (쿼터는 캐시 미스로 실제 호출할 때만 차감)
+        search_results = await search_cache.get_search(optimized_query)
+        if search_results is not None:
+            logger.info(f"⚡ Search cache hit: '{optimized_query}'")
+        else:
+            # 쿼터/속도 제한 초과 시 빈 결과 → 아래에서 내부 검색으로 fallback
+            logger.info(f"🔎 Searching Google Images: '{optimized_query}'")
+            search_results = await self.search_client.search_images(
+                optimized_query, num_results=15, start_index=1
+            )
+            await search_cache.set_search(optimized_query, search_results)
         
         if not search_results:
             logger.warning("❌ No search results from Google")
-            return await self.process_internal_search(query)
+            yield {"event": "fallback", **await self.process_internal_search(query)}
+            return
             
         logger.info(f"✅ Found {len(search_results)} images")
 
-        best_image = None
-        candidates_data = []
-
-        async with aiohttp.ClientSession() as session:
-            tasks = [self._download_image(session, item['link']) for item in search_results]
-            downloaded_images = await asyncio.gather(*tasks)
-
-            scored_candidates = []
-            clip_prompt = f"{optimized_query} {self._get_scoring_context(optimized_query)}"
-
-            for i, img in enumerate(downloaded_images):
-                if img:
-                    base_score = self.engine.calculate_similarity(clip_prompt, img)
-                    ratio_bonus = 0.05 if img.height > img.width else 0.0
-                    final_score = base_score + ratio_bonus
-
-                    if final_score > 0.18:
-                        scored_candidates.append({
-                            "image": img,
-                            "url": search_results[i]['link'],
-                            "raw_score": final_score,
-                            "display_score": self._normalize_score(final_score)
-                        })
-
-            scored_candidates.sort(key=lambda x: x['raw_score'], reverse=True)
-            top_candidates = scored_candidates[:4]
-
-            if top_candidates:
-                best_candidate = top_candidates[0]
-                best_image = best_candidate['image']
-                
-                for cand in top_candidates:
-                    candidates_data.append({
-                        "image_base64": self._image_to_base64(cand['image']),
-                        "score": cand['display_score']
-                    })
-                    
+        clip_prompt = f"{optimized_query} {self._get_scoring_context(optimized_query)}"
+        # 프롬프트 텍스트 벡터는 한 번만 계산하고 후보 이미지 벡터와 비교
+        text_vector = await asyncio.to_thread(self.engine.encode_clip_text, clip_prompt)
+        # 공용 세션 (DNS 캐시 + keep-alive): 쿼리마다 세션을 새로 만들지 않음
+        session = http_pool.image_session()
+        scored = await asyncio.gather(
+            *[self._fetch_and_score(session, item, text_vector) for item in search_results]
+        )
+
+        scored_candidates = sorted((c for c in scored if c), key=lambda x: x['raw_score'], reverse=True)
         logger.info(f"📊 Valid candidates: {len(scored_candidates)}")
 
-        if not best_image:
+        if not scored_candidates:
             logger.warning("❌ No valid images after scoring")
-            return await self.process_internal_search(query)
+            yield {"event": "fallback", **await self.process_internal_search(query)}
+            return
 
-        summary = await self._analyze_image_with_vlm(best_image, query)
-        final_data_uri = self._image_to_base64(best_image)
+        best_candidate = scored_candidates[0]
+        best_image = best_candidate['image']
 
-        vectors = {
-            "bert": self.engine.generate_dual_embedding(summary)["bert"],
-            "clip": self.engine.generate_image_embedding(best_image)["clip"]
-        }
+        # VLM(외부 API 대기)을 먼저 시작하고, 그동안 CLIP 벡터를 만들어 내보냄
+        vlm_task = asyncio.create_task(self._analyze_image_with_vlm(best_image, query))
+        try:
+            clip_vector = await self._clip_vector(
+                "full", best_candidate, lambda img: self.engine.generate_image_embedding(img)["clip"]
+            )
+            candidates_data = [
+                {"image_base64": self._image_to_base64(cand['image']), "score": cand['display_score']}
+                for cand in scored_candidates[:4]
+            ]
+            final_data_uri = candidates_data[0]["image_base64"]
 
-        return {
-            "vectors": vectors,
-            "search_path": "EXTERNAL",
-            "strategy": "visual_rag_vlm",
-            "ai_analysis": {
-                "summary": summary,
-                "reference_image": final_data_uri,
-                "candidates": candidates_data
-            },
-            "description": summary,
-            "ref_image": final_data_uri
-        }
+            yield {
+                "event": "candidates",
+                "vectors": {"bert": None, "clip": clip_vector},
+                "search_path": "EXTERNAL",
+                "strategy": "visual_rag_vlm",
+                "ai_analysis": {
+                    "summary": None,
+                    "reference_image": final_data_uri,
+                    "candidates": candidates_data
+                },
+                "description": None,
+                "ref_image": final_data_uri
+            }
+
+            summary = await vlm_task
+        finally:
+            # 클라이언트 연결 종료 등으로 중단되면 VLM 호출도 취소
+            if not vlm_task.done():
+                vlm_task.cancel()
+
+        bert_vector = (await asyncio.to_thread(self.engine.generate_dual_embedding, summary))["bert"]
+        yield {"event": "summary", "summary": summary, "vectors": {"bert": bert_vector}}
 
-    async def analyze_specific_image(self, image_b64: str, query: str) -> str:
+    async def process_external_rag(self, query: str) -> Dict[str, Any]:
+        """외부 이미지 검색 + VLM 분석 (연예인/유명인 검색 전용) - 전체 완료 후 한 번에 반환"""
+        result: Dict[str, Any] = {}
+        async for event in self.stream_external_rag(query):
+            kind = event.pop("event")
+            if kind == "fallback":
+                return event
+            if kind == "candidates":
+                result = event
+            elif kind == "summary" and result:
+                result["vectors"]["bert"] = event["vectors"]["bert"]
+                result["ai_analysis"]["summary"] = event["summary"]
+                result["description"] = event["summary"]
+        return result
+
+    async def analyze_specific_image(self, image_b64: str, query: str, use_cache: bool = True) -> str:
         try:
-            if "base64," in image_b64:
-                image_b64 = image_b64.split("base64,")[1]
-            return await self._analyze_image_with_vlm(image_b64, query)
+            # 원본 대신 축소 JPEG 전송 (VLM 토큰/업로드 크기 절감)
+            return await self._analyze_image_with_vlm(ingest_b64(image_b64).jpeg_b64, query, use_cache=use_cache)
         except Exception:
             return "이미지 분석에 실패했습니다."
 
-    async def _analyze_image_with_vlm(self, image_data: Any, query: str) -> str:
+    async def _analyze_image_with_vlm(self, image_data: Any, query: str, use_cache: bool = True) -> str:
         """VLM을 이용한 이미지 분석"""
         try:
             if isinstance(image_data, Image.Image):
@@ -275,7 +260,11 @@ class AIOrchestrator:
             
             반드시 한국어로 작성하세요.
             """
-            return self.engine.generate_with_image(vlm_prompt, img_b64)
+            # 동기 HTTP 호출이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+            # 사용자가 같은 사진을 다시 올리는 경우가 많은 상세 질의 → 근사 중복 캐시 재사용
+            return await asyncio.to_thread(
+                self.engine.generate_with_image, vlm_prompt, img_b64, use_cache, near_duplicate=True
+            )
         except Exception as e:
             logger.error(f"VLM analysis failed: {e}")
             return "분석 불가"
@@ -298,31 +287,30 @@ class AIOrchestrator:
         쿼리에서 잠재적인 인물 이름 추출
         - 2-3글자 한글 단어 중 일반 명사가 아닌 것
         """
-        # 공백으로 분리
-        words = query.split()
+        common_spans = None
         potential_names = []
         
-        for word in words:
+        # 공백으로 분리 (원문 위치 유지)
+        for word in re.finditer(r'\S+', query):
             # 조사 제거
-            clean_word = re.sub(r'(은|는|이|가|을|를|의|에|로|으로|와|과|도|만|처럼|같은)$', '', word)
+            clean_word = re.sub(r'(은|는|이|가|을|를|의|에|로|으로|와|과|도|만|처럼|같은)$', '', word.group())
             
             # 2-3글자 한글인지 체크
             if not self.korean_name_pattern.match(clean_word):
                 continue
             
-            # 일반 명사인지 체크
-            if clean_word in self.common_words:
+            # 일반 명사를 포함하는지 체크 (예: "겨울옷" ⊃ "겨울"), 후보가 있을 때만 쿼리 1회 스캔
+            if common_spans is None:
+                common_spans = [(m.start, m.end) for m in self.matcher.scan(query) if m.label == "common_word"]
+            start, end = word.start(), word.start() + len(clean_word)
+            if any(start <= s and e <= end for s, e in common_spans):
                 continue
             
-            # 일반 명사의 일부인지 체크 (예: "겨울에" → "겨울")
-            is_common = False
-            for common in self.common_words:
-                if clean_word in common or common in clean_word:
-                    is_common = True
-                    break
+            # 일반 명사의 일부인지 체크 (예: "겨울" ⊂ "겨울에")
+            if self.matcher.is_fragment("common_word", clean_word):
+                continue
             
-            if not is_common:
-                potential_names.append(clean_word)
+            potential_names.append(clean_word)
         
         return potential_names
 
@@ -330,23 +318,23 @@ class AIOrchestrator:
         """
         ✅ 스마트한 연예인/유명인 감지
         
-        1단계: 알려진 연예인 목록에서 체크 (빠름)
+        1단계: 알려진 연예인 목록에서 체크 (공백 제거 쿼리 1회 스캔)
         2단계: 한글 이름 패턴(2-3글자) 중 일반 명사 아닌 것 감지 (허경영 같은 경우)
         """
         query_normalized = query.replace(" ", "")
         
         # 1단계: 알려진 연예인 이름 체크
-        for name in self.celebrity_names:
-            if name in query_normalized:
-                logger.info(f"🎯 Known celebrity found: '{name}'")
-                return name
+        name = self.matcher.first(query_normalized, "celebrity")
+        if name:
+            logger.info(f"🎯 Known celebrity found: '{name}'")
+            return name
         
         # 2단계: 잠재적 이름 추출 (일반 명사 제외)
         potential_names = self._extract_potential_names(query)
         
         if potential_names:
             # 패션 컨텍스트 키워드가 있는지 확인
-            has_fashion_context = any(k in query for k in self.fashion_context_keywords)
+            has_fashion_context = "fashion_context" in self.matcher.labels(query)
             
             if has_fashion_context:
                 logger.info(f"🎯 Potential person name detected: {potential_names} with fashion context")
@@ -0,0 +1,159 @@
+import json
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import redis.asyncio as aioredis
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# External RAG 캐시 (Redis)
+# - 검색 응답: 정규화된 최적화 쿼리 → Google 이미지 검색 결과 (TTL)
+# - 이미지 blob: content hash → 축소 JPEG (URL → hash 매핑으로 같은 이미지는 한 번만 저장)
+# - 벡터: content hash + 모델 ID → CLIP 벡터 (float32 bytes)
+# - 적중률 통계: rag:cache:stats HASH ({kind}:hit / {kind}:miss)
+# --------------------------------------------------------------------------
+SEARCH_KEY = "rag:search:{key}"
+URL_KEY = "rag:img:url:{key}"
+BLOB_KEY = "rag:img:blob:{digest}"
+VECTOR_KEY = "rag:vec:{kind}:{model}:{digest}"
+STATS_KEY = "rag:cache:stats"
+
+# 다운로드 실패/부적합 이미지 표시 (짧게 보관)
+NEGATIVE = b"-"
+NEGATIVE_TTL = 3600
+
+
+def _hash(value: str) -> str:
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class SearchCache:
+    def __init__(self):
+        self.redis = aioredis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=0)
+
+    async def _record(self, kind: str, hit: bool):
+        try:
+            await self.redis.hincrby(STATS_KEY, f"{kind}:{'hit' if hit else 'miss'}", 1)
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # [Search] Google 이미지 검색 응답
+    # ------------------------------------------------------------------
+    async def get_search(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        try:
+            raw = await self.redis.get(SEARCH_KEY.format(key=_hash(normalize_query(query))))
+        except Exception as e:
+            logger.warning(f"⚠️ Search cache lookup failed: {e}")
+            return None
+        await self._record("search", raw is not None)
+        return json.loads(raw) if raw is not None else None
+
+    async def set_search(self, query: str, results: List[Dict[str, Any]]):
+        # 빈 결과는 일시적 장애일 수 있으므로 저장하지 않음
+        if not results:
+            return
+        try:
+            await self.redis.set(
+                SEARCH_KEY.format(key=_hash(normalize_query(query))),
+                json.dumps(results, ensure_ascii=False),
+                ex=settings.RAG_SEARCH_CACHE_TTL,
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Search cache store failed: {e}")
+
+    # ------------------------------------------------------------------
+    # [Image] URL → content hash → 축소 JPEG
+    # ------------------------------------------------------------------
+    async def get_image(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시된 후보 이미지 조회
+        - None: 캐시 없음 (다운로드 필요)
+        - {"digest": None}: 이전에 실패/부적합 판정된 URL
+        - {"digest": ..., "data": bytes}: 캐시 적중
+        """
+        try:
+            digest = await self.redis.get(URL_KEY.format(key=_hash(url)))
+            if digest == NEGATIVE:
+                await self._record("image", True)
+                return {"digest": None}
+            if digest:
+                data = await self.redis.get(BLOB_KEY.format(digest=digest.decode()))
+                if data:
+                    await self._record("image", True)
+                    return {"digest": digest.decode(), "data": data}
+        except Exception as e:
+            logger.warning(f"⚠️ Image cache lookup failed: {e}")
+            return None
+        await self._record("image", False)
+        return None
+
+    async def set_image(self, url: str, data: Optional[bytes]) -> Optional[str]:
+        """축소 JPEG 저장 후 content hash 반환 (data=None이면 실패 URL로 기록)"""
+        try:
+            if data is None:
+                await self.redis.set(URL_KEY.format(key=_hash(url)), NEGATIVE, ex=NEGATIVE_TTL)
+                return None
+            digest = content_digest(data)
+            ttl = settings.RAG_IMAGE_CACHE_TTL
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.set(BLOB_KEY.format(digest=digest), data, ex=ttl)
+                pipe.set(URL_KEY.format(key=_hash(url)), digest, ex=ttl)
+                await pipe.execute()
+            return digest
+        except Exception as e:
+            logger.warning(f"⚠️ Image cache store failed: {e}")
+            return content_digest(data) if data else None
+
+    # ------------------------------------------------------------------
+    # [Vector] content hash + 모델 ID → CLIP 벡터
+    # ------------------------------------------------------------------
+    async def get_vector(self, kind: str, model: str, digest: str) -> Optional[List[float]]:
+        try:
+            raw = await self.redis.get(VECTOR_KEY.format(kind=kind, model=model, digest=digest))
+        except Exception:
+            return None
+        await self._record(f"vector_{kind}", raw is not None)
+        return np.frombuffer(raw, dtype=np.float32).tolist() if raw else None
+
+    async def set_vector(self, kind: str, model: str, digest: str, vector: List[float]):
+        if not vector or not any(vector):
+            return
+        try:
+            await self.redis.set(
+                VECTOR_KEY.format(kind=kind, model=model, digest=digest),
+                np.asarray(vector, dtype=np.float32).tobytes(),
+                ex=settings.RAG_IMAGE_CACHE_TTL,
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Vector cache store failed: {e}")
+
+    # ------------------------------------------------------------------
+    # [Metrics]
+    # ------------------------------------------------------------------
+    async def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        raw = await self.redis.hgetall(STATS_KEY)
+        counts: Dict[str, Dict[str, int]] = {}
+        for field, value in raw.items():
+            kind, _, outcome = field.decode().rpartition(":")
+            counts.setdefault(kind, {"hit": 0, "miss": 0})[outcome] = int(value)
+        return {
+            kind: {**c, "hit_rate": round(c["hit"] / (c["hit"] + c["miss"]) * 100, 2) if c["hit"] + c["miss"] else 0.0}
+            for kind, c in counts.items()
+        }
+
+
+search_cache = SearchCache()
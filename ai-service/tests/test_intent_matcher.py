@@ -0,0 +1,32 @@
+# ai-service/tests/test_intent_matcher.py
+# VLM 카테고리 매핑 우선순위: 기존 CATEGORY_MAP과 같이 사전 순서(Tops → Bottoms → ...)를 따르는지 확인
+
+from src.core.intent_matcher import DEFAULT_DICTIONARIES, IntentMatcher
+
+
+def _is_category(label: str) -> bool:
+    return label.startswith("category:")
+
+
+def test_first_label_follows_dictionary_order_not_position():
+    matcher = IntentMatcher(DEFAULT_DICTIONARIES)
+    # "원피스"가 먼저 등장해도 Tops 사전이 앞서므로 Tops
+    assert matcher.first_label("원피스 위에 니트", _is_category) == "category:Tops"
+    # "자켓"(Outerwear)보다 "바지"(Bottoms)가 우선
+    assert matcher.first_label("자켓과 바지 셋업", _is_category) == "category:Bottoms"
+
+
+def test_first_label_respects_predicate_and_missing_text():
+    matcher = IntentMatcher(DEFAULT_DICTIONARIES)
+    assert matcher.first_label("가방", _is_category) == "category:Accessories"
+    assert matcher.first_label("무지 에코백", _is_category) is None
+    assert matcher.first_label("", _is_category) is None
+
+
+def test_reloaded_labels_keep_default_order():
+    matcher = IntentMatcher(DEFAULT_DICTIONARIES)
+    # 관리자 API로 교체된 사전도 기본 사전 순서 위치를 유지 (DictionaryWatcher._merge)
+    dictionaries = {label: set(words) for label, words in DEFAULT_DICTIONARIES.items()}
+    dictionaries["category:Tops"] = {"블라우스"}
+    matcher.reload(dictionaries)
+    assert matcher.first_label("드레스형 블라우스", _is_category) == "category:Tops"
@@ -0,0 +1,40 @@
+# ai-service/tests/test_vlm_cache.py
+# VLM 캐시 키: 기본(exact)은 픽셀 digest → 비슷한 컬러웨이와 공유하지 않음 / near-duplicate 키는 재인코딩도 적중
+
+import base64
+import io
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+pytest.importorskip("redis")
+
+from src.core.vlm_cache import vlm_cache
+
+PROMPT = "Analyze this product. Return JSON."
+MODEL = "vision-model"
+
+
+def _b64(color, quality=95) -> str:
+    image = Image.new("RGB", (400, 300), (240, 240, 240))
+    image.paste(Image.new("RGB", (200, 200), color), (100, 50))
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=quality)
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def test_exact_key_separates_near_identical_colourways():
+    navy, darker_navy = _b64((20, 30, 90)), _b64((22, 30, 90))
+    assert vlm_cache.make_key(PROMPT, navy, MODEL) == vlm_cache.make_key(PROMPT, navy, MODEL)
+    assert vlm_cache.make_key(PROMPT, navy, MODEL) != vlm_cache.make_key(PROMPT, darker_navy, MODEL)
+    # perceptual 키였다면 같은 캐시를 공유하는 조합
+    assert vlm_cache.make_key(PROMPT, navy, MODEL, exact=False) == vlm_cache.make_key(
+        PROMPT, darker_navy, MODEL, exact=False
+    )
+
+
+def test_near_duplicate_key_matches_reencoded_image():
+    original, reencoded = _b64((20, 30, 90), quality=95), _b64((20, 30, 90), quality=70)
+    assert vlm_cache.make_key(PROMPT, original, MODEL, exact=False) == vlm_cache.make_key(
+        PROMPT, reencoded, MODEL, exact=False
+    )
@@ -0,0 +1,85 @@
+# ai-service/tests/test_yolo_batch.py
+# 배치 감지 결과를 그대로 크롭에 사용하는지 (분석 캐시보다 큰 배치에서 단건 재추론이 없는지) 확인
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("torch")
+Image = pytest.importorskip("PIL.Image")
+
+from src.core.config import settings
+from src.core.yolo_detector import YOLOFashionDetector
+
+
+class _Box:
+    def __init__(self, xyxy):
+        self.xyxy = [np.array(xyxy, dtype=float)]
+        self.conf = [0.9]
+
+
+class _Result:
+    def __init__(self, boxes):
+        self.boxes = boxes
+
+
+class CountingModel:
+    """YOLO 모델 대역: forward pass 횟수와 처리한 이미지 수를 기록"""
+
+    def __init__(self):
+        self.calls = 0
+        self.images = 0
+
+    def __call__(self, inputs, **kwargs):
+        batch = inputs if isinstance(inputs, list) else [inputs]
+        self.calls += 1
+        self.images += len(batch)
+        return [_Result([_Box([10, 20, 110, 220])]) for _ in batch]
+
+
+@pytest.fixture
+def detector(monkeypatch):
+    monkeypatch.setattr(settings, "YOLO_CACHE_SIZE", 4)
+    monkeypatch.setattr(settings, "YOLO_BATCH_SIZE", 8)
+    d = YOLOFashionDetector()
+    d.model = CountingModel()
+    d.initialized = True
+    return d
+
+
+def _images(count):
+    # 픽셀이 모두 달라야 분석 캐시 키(이미지 해시)가 겹치지 않음
+    return [Image.new("RGB", (300, 400), (i, 255 - i, i * 3 % 256)) for i in range(count)]
+
+
+def test_crop_batch_larger_than_cache_runs_one_pass_per_chunk(detector):
+    images = _images(20)
+
+    crops = detector.crop_fashion_regions_batch(images, target="full")
+
+    # 20장 / 배치 8장 → forward pass 3회, 단건 재추론 없음
+    assert detector.model.calls == 3
+    assert detector.model.images == 20
+    assert len(crops) == 20
+    assert all(crop.size != image.size for crop, image in zip(crops, images))
+
+
+def test_features_batch_larger_than_cache_runs_one_pass_per_chunk(detector):
+    images = _images(20)
+
+    features = detector.extract_fashion_features_batch(images)
+
+    assert detector.model.calls == 3
+    assert detector.model.images == 20
+    assert all(f["full"] is not None and f["upper"] is not None and f["lower"] is not None for f in features)
+
+
+def test_batch_skips_images_already_in_cache(detector):
+    images = _images(3)
+    detector.detect_person(images[0])
+    assert detector.model.calls == 1
+
+    detector.crop_fashion_regions_batch(images)
+
+    # 캐시에 있던 1장은 제외하고 나머지 2장만 한 번에 추론
+    assert detector.model.calls == 2
+    assert detector.model.images == 3
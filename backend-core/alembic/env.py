@@ -15,6 +15,8 @@ from src.models.user import User
 from src.models.fitting import FittingResult
 from src.models.wishlist import Wishlist
 from src.models.order import Order, OrderItem
+from src.models.embedding_space import EmbeddingSpace
+from src.models.product_stats import ProductStats
 from src.config.settings import settings
 
 config = context.config
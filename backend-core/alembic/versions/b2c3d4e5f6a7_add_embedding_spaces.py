@@ -0,0 +1,65 @@
+"""add_embedding_spaces_and_shadow_columns
+
+Revision ID: b2c3d4e5f6a7
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2c3d4e5f6a7'
+down_revision: Union[str, None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 현재 ai-service에서 사용 중인 모델 (model_engine.py 상수 기준)
+BERT_MODEL_NAME = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+CLIP_VISION_MODEL_NAME = "sentence-transformers/clip-ViT-B-32"
+
+
+def upgrade() -> None:
+    # 1. 벡터 컬럼별 모델 버전/진행 상황 테이블
+    embedding_spaces = op.create_table('embedding_spaces',
+    sa.Column('column_name', sa.String(length=64), nullable=False),
+    sa.Column('space', sa.String(length=32), nullable=False),
+    sa.Column('model_id', sa.String(length=255), nullable=False),
+    sa.Column('target_model_id', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.String(length=20), server_default='idle', nullable=False),
+    sa.Column('processed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('total', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('items_per_sec', sa.Float(), server_default='0', nullable=False),
+    sa.Column('started_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('swapped_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('column_name')
+    )
+    op.create_index(op.f('ix_embedding_spaces_space'), 'embedding_spaces', ['space'], unique=False)
+
+    op.bulk_insert(embedding_spaces, [
+        {"column_name": "embedding", "space": "bert", "model_id": BERT_MODEL_NAME},
+        {"column_name": "embedding_clip", "space": "clip", "model_id": CLIP_VISION_MODEL_NAME},
+        {"column_name": "embedding_clip_upper", "space": "clip", "model_id": CLIP_VISION_MODEL_NAME},
+        {"column_name": "embedding_clip_lower", "space": "clip", "model_id": CLIP_VISION_MODEL_NAME},
+    ])
+
+    # 2. Shadow 컬럼 (인덱스 없음 - 스왑 시 원본 컬럼의 HNSW 인덱스가 갱신됨)
+    op.add_column('products', sa.Column('embedding_next', Vector(768), nullable=True))
+    op.add_column('products', sa.Column('embedding_clip_next', Vector(512), nullable=True))
+    op.add_column('products', sa.Column('embedding_clip_upper_next', Vector(512), nullable=True))
+    op.add_column('products', sa.Column('embedding_clip_lower_next', Vector(512), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('products', 'embedding_clip_lower_next')
+    op.drop_column('products', 'embedding_clip_upper_next')
+    op.drop_column('products', 'embedding_clip_next')
+    op.drop_column('products', 'embedding_next')
+
+    op.drop_index(op.f('ix_embedding_spaces_space'), table_name='embedding_spaces')
+    op.drop_table('embedding_spaces')
@@ -0,0 +1,64 @@
+"""add_product_stats
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, None] = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 찜 수는 products 가 아닌 좁은 테이블에 보관 (토글마다 벡터 컬럼이 있는 products 행을 다시 쓰지 않음)
+    op.create_table(
+        'product_stats',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('wishlist_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('product_id'),
+    )
+    op.create_index(op.f('ix_product_stats_wishlist_count'), 'product_stats', ['wishlist_count'], unique=False)
+
+    # 기존 찜 데이터로 초기값 채우기
+    op.execute("""
+        INSERT INTO product_stats (product_id, wishlist_count)
+        SELECT product_id, COUNT(*) FROM wishlists GROUP BY product_id
+    """)
+
+    # 찜 추가/삭제(토글, 사용자 탈퇴 CASCADE 포함) 시 product_stats.wishlist_count 갱신
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_product_wishlist_count() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO product_stats (product_id, wishlist_count) VALUES (NEW.product_id, 1)
+                ON CONFLICT (product_id) DO UPDATE SET wishlist_count = product_stats.wishlist_count + 1;
+            ELSE
+                UPDATE product_stats SET wishlist_count = GREATEST(wishlist_count - 1, 0)
+                WHERE product_id = OLD.product_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_wishlists_count
+        AFTER INSERT OR DELETE ON wishlists
+        FOR EACH ROW EXECUTE FUNCTION update_product_wishlist_count()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_wishlists_count ON wishlists")
+    op.execute("DROP FUNCTION IF EXISTS update_product_wishlist_count()")
+    op.drop_index(op.f('ix_product_stats_wishlist_count'), table_name='product_stats')
+    op.drop_table('product_stats')
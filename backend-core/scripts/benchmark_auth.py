@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+benchmark_auth.py
+인증 주체 캐시 부하 테스트: 요청당 DB 쿼리 수 / 처리량 비교 (캐시 OFF vs ON)
+
+사용법:
+docker compose -f docker-compose.dev.yml exec backend-core \\
+    python /app/scripts/benchmark_auth.py --requests 500 --concurrency 20
+
+- 실제 앱(ASGI)에 httpx ASGITransport 로 요청합니다 (네트워크/uvicorn 제외).
+- 대상: GET /api/v1/wishlist/check/{product_id} (인증 + 단순 조회 1회인 대표적인 hot path)
+- SQLAlchemy before_cursor_execute 이벤트로 실행된 SQL 수를 세고, users 테이블 조회 수를 따로 집계합니다.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+from typing import Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import event, select
+
+from src.config.settings import settings
+from src.core.security import create_access_token
+from src.db.session import async_session_maker, engine
+from src.main import app
+from src.models.product import Product
+from src.models.user import User
+from src.services import principal_cache
+
+counters = {"total": 0, "users": 0}
+
+
+def count_queries(conn, cursor, statement, parameters, context, executemany):
+    counters["total"] += 1
+    if "FROM users" in statement:
+        counters["users"] += 1
+
+
+async def pick_targets(user_id: int = None) -> Tuple[int, int]:
+    async with async_session_maker() as session:
+        if user_id is None:
+            user_id = (await session.execute(
+                select(User.id).where(User.is_active == True).order_by(User.id).limit(1)
+            )).scalar_one_or_none()
+        product_id = (await session.execute(select(Product.id).order_by(Product.id).limit(1))).scalar_one_or_none()
+    if user_id is None or product_id is None:
+        print("❌ 활성 사용자와 상품이 최소 1개씩 필요합니다.")
+        sys.exit(1)
+    return user_id, product_id
+
+
+async def run(client: httpx.AsyncClient, url: str, headers: dict, total: int, concurrency: int) -> Tuple[float, int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            res = await client.get(url, headers=headers)
+            if res.status_code != 200:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - started, failures
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="인증 주체 캐시 부하 테스트")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--user-id", type=int, default=None, help="토큰을 발급할 사용자 (기본: 첫 활성 사용자)")
+    args = parser.parse_args()
+
+    user_id, product_id = await pick_targets(args.user_id)
+    headers = {"Authorization": f"Bearer {create_access_token(user_id)}"}
+    url = f"{settings.API_V1_STR}/wishlist/check/{product_id}"
+    event.listen(engine.sync_engine, "before_cursor_execute", count_queries)
+
+    cache_ttl = settings.PRINCIPAL_CACHE_TTL or 300
+    print(f"📦 user={user_id} url={url} requests={args.requests} concurrency={args.concurrency}")
+    print(f"\n{'cache':>6} | {'req/s':>8} | {'queries/req':>11} | {'users/req':>9} | {'failed':>6}")
+    print("-" * 52)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for label, ttl in (("off", 0), ("on", cache_ttl)):
+            settings.PRINCIPAL_CACHE_TTL = ttl
+            await principal_cache.invalidate_principal(user_id)
+            # 워밍업 (커넥션 풀, 캐시 채우기)
+            await run(client, url, headers, args.concurrency, args.concurrency)
+
+            counters.update(total=0, users=0)
+            elapsed, failures = await run(client, url, headers, args.requests, args.concurrency)
+            print(
+                f"{label:>6} | {args.requests / elapsed:>8.1f} | {counters['total'] / args.requests:>11.2f} "
+                f"| {counters['users'] / args.requests:>9.2f} | {failures:>6}"
+            )
+
+    await principal_cache.invalidate_principal(user_id)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+benchmark_storage.py
+StorageService 동시 업로드 벤치마크: 기존 블로킹 구현 vs 논블로킹 구현
+
+사용법:
+# 로컬 저장소
+docker compose -f docker-compose.dev.yml exec backend-core \\
+    python /app/scripts/benchmark_storage.py --backend local --concurrency 32 --size-kb 512
+
+# S3 (moto 서버를 스크립트가 직접 띄움: pip install "moto[server]")
+docker compose -f docker-compose.dev.yml exec backend-core \\
+    python /app/scripts/benchmark_storage.py --backend s3 --moto
+
+# S3 (MinIO 등 외부 S3 호환 서버)
+    python /app/scripts/benchmark_storage.py --backend s3 --endpoint http://minio:9000 --bucket bench
+
+- 업로드 결과를 다시 읽어 내용이 같은지 먼저 검증합니다 (multipart 크기 파일 포함).
+- 업로드와 동시에 5ms 주기 heartbeat 코루틴을 돌려 이벤트 루프 지연(최대/p99)을 측정합니다.
+  기존 구현은 업로드 중 루프가 멈추므로 지연이 업로드 시간만큼 커집니다.
+"""
+
+import io
+import os
+import sys
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+from statistics import quantiles
+from typing import Awaitable, Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from starlette.datastructures import Headers, UploadFile
+
+from src.config.settings import settings
+from src.services.storage import S3_PART_SIZE, LocalStorage, S3Storage
+
+
+def make_upload(data: bytes, name: str) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=name, headers=Headers({"content-type": "image/jpeg"}))
+
+
+# ------------------------------------------------------------------
+# 기존 구현 (async def 안에서 블로킹 호출)
+# ------------------------------------------------------------------
+async def legacy_local_upload(base_path: str, file: UploadFile, destination: str) -> str:
+    full_path = os.path.join(base_path, destination)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+    return destination
+
+
+async def legacy_s3_upload(client, bucket: str, file: UploadFile, destination: str) -> str:
+    client.upload_fileobj(
+        file.file, bucket, destination,
+        ExtraArgs={'ServerSideEncryption': 'AES256', 'ContentType': file.content_type},
+    )
+    return destination
+
+
+# ------------------------------------------------------------------
+# 측정
+# ------------------------------------------------------------------
+async def heartbeat(lags: List[float], stop: asyncio.Event, interval: float = 0.005):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - started - interval) * 1000)
+
+
+async def run(upload: Callable[[UploadFile, str], Awaitable[str]], payload: bytes, concurrency: int, tag: str) -> Tuple[float, float, float]:
+    lags: List[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(0.02)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        upload(make_upload(payload, f"{i}.jpg"), f"bench/{tag}/{i}.jpg") for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await ticker
+    p99 = quantiles(lags, n=100, method="inclusive")[98] if len(lags) >= 2 else max(lags, default=0.0)
+    return elapsed, max(lags, default=0.0), p99
+
+
+async def verify(storage, read_back: Callable[[str], Awaitable[bytes]]):
+    """작은 파일(단일 요청) + multipart 크기 파일 왕복 검증"""
+    for size in (200 * 1024, S3_PART_SIZE * 2 + 12345):
+        payload = os.urandom(size)
+        path = await storage.upload(make_upload(payload, "verify.jpg"), f"bench/verify/{size}.jpg")
+        if await read_back(path) != payload:
+            print(f"❌ Round-trip mismatch for {size} bytes")
+            sys.exit(1)
+        if not await storage.exists(path) or not await storage.delete(path):
+            print(f"❌ exists/delete failed for {path}")
+            sys.exit(1)
+    print("✅ Round-trip verified (single request + multipart)")
+
+
+def start_moto() -> str:
+    try:
+        from moto.server import ThreadedMotoServer
+    except ImportError:
+        print('❌ moto is not installed: pip install "moto[server]"')
+        sys.exit(1)
+    server = ThreadedMotoServer(port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    return f"http://{host}:{port}"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="StorageService 동시 업로드 벤치마크")
+    parser.add_argument("--backend", choices=["local", "s3"], default="local")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--size-kb", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--moto", action="store_true", help="moto S3 서버를 띄워 사용")
+    parser.add_argument("--endpoint", default=None, help="S3 호환 서버 주소 (MinIO 등)")
+    parser.add_argument("--bucket", default="modify-bench")
+    args = parser.parse_args()
+
+    payload = os.urandom(args.size_kb * 1024)
+
+    if args.backend == "local":
+        tmp_dir = tempfile.mkdtemp(prefix="storage-bench-")
+        settings.LOCAL_STORAGE_PATH = tmp_dir
+        storage = LocalStorage()
+
+        async def read_back(path: str) -> bytes:
+            with open(os.path.join(tmp_dir, path), "rb") as f:
+                return f.read()
+
+        legacy = lambda file, dest: legacy_local_upload(tmp_dir, file, dest)
+    else:
+        endpoint = start_moto() if args.moto else args.endpoint
+        settings.S3_ENDPOINT_URL = endpoint
+        settings.AWS_BUCKET_NAME = args.bucket
+        settings.AWS_ACCESS_KEY_ID = settings.AWS_ACCESS_KEY_ID or "bench"
+        settings.AWS_SECRET_ACCESS_KEY = settings.AWS_SECRET_ACCESS_KEY or "bench"
+        storage = S3Storage()
+        try:
+            storage.client.create_bucket(
+                Bucket=args.bucket,
+                CreateBucketConfiguration={"LocationConstraint": settings.AWS_REGION},
+            )
+        except storage.client.exceptions.BucketAlreadyOwnedByYou:
+            pass
+
+        async def read_back(path: str) -> bytes:
+            response = await asyncio.to_thread(storage.client.get_object, Bucket=args.bucket, Key=path)
+            return response["Body"].read()
+
+        legacy = lambda file, dest: legacy_s3_upload(storage.client, args.bucket, file, dest)
+
+    print(f"📦 backend={args.backend} concurrency={args.concurrency} size={args.size_kb}KB")
+    await verify(storage, read_back)
+
+    print(f"\n{'method':>8} | {'best(s)':>8} | {'files/s':>8} | {'loop max(ms)':>12} | {'loop p99(ms)':>12}")
+    print("-" * 62)
+    for name, upload in (("legacy", legacy), ("async", storage.upload)):
+        results = [await run(upload, payload, args.concurrency, name) for _ in range(args.repeat)]
+        elapsed, max_lag, p99 = min(results)
+        print(f"{name:>8} | {elapsed:>8.3f} | {args.concurrency / elapsed:>8.1f} | {max_lag:>12.1f} | {p99:>12.1f}")
+
+    if args.backend == "local":
+        shutil.rmtree(settings.LOCAL_STORAGE_PATH, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,4 +1,4 @@
-from typing import Generator
+from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
@@ -7,45 +7,79 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.db.session import AsyncSessionLocal
 from src.core.security import settings
 from src.models.user import User
-from src.schemas.token import TokenPayload
+from src.services.principal_cache import Principal, get_principal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/v1/auth/login")
+# 비로그인도 허용하는 API용 (토큰 없으면 401 대신 None)
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/v1/auth/login", auto_error=False)
 
 async def get_db() -> Generator:
     async with AsyncSessionLocal() as session:
         yield session
 
-async def get_current_user(
-    db: AsyncSession = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def decode_user_id(token: str) -> int:
+    """JWT 검증 후 사용자 ID 반환 (DB 조회 없음)"""
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
-            raise credentials_exception
+            raise _credentials_exception()
     except JWTError as e:
         # 💡 토큰 디코딩 실패 이유를 로그에 기록하여 디버깅에 활용
         print(f"DEBUG: JWT Decode Error: {e}")
-        raise credentials_exception
-    
-    # 실제 구현에서는 DB 조회가 필요합니다.
-    user = await db.get(User, int(user_id))
+        raise _credentials_exception()
+    return int(user_id)
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> User:
+    """전체 User 객체가 필요한 경우(내 정보 조회/수정 등)에만 사용"""
+    user = await db.get(User, decode_user_id(token))
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
 
+# [추가됨] 권한 판단용 인증 주체 (id, is_active, is_superuser)
+# 캐시(프로세스 LRU → Redis → DB)에서 조회하므로 대부분의 요청은 users 테이블을 조회하지 않음
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme)
+) -> Principal:
+    principal = await get_principal(decode_user_id(token))
+    if principal is None:
+        raise _credentials_exception()
+    if not principal.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return principal
+
+# [추가됨] 로그인 여부에 따라 응답만 달라지는 공개 API용 (상품 목록의 찜 여부 등)
+# 토큰이 없거나 유효하지 않으면 비로그인으로 처리
+async def get_optional_principal(
+    token: Optional[str] = Depends(optional_oauth2_scheme)
+) -> Optional[Principal]:
+    if not token:
+        return None
+    try:
+        principal = await get_principal(decode_user_id(token))
+    except HTTPException:
+        return None
+    if principal is None or not principal.is_active:
+        return None
+    return principal
+
 # [추가됨] 관리자 권한 확인 함수
 def get_current_superuser(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_principal),
+) -> Principal:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="The user doesn't have enough privileges"
         )
-    return current_user
\ No newline at end of file
+    return current_user
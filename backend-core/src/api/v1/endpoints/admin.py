@@ -2,17 +2,23 @@ from typing import Any, List, Optional, Literal
 from fastapi import APIRouter, Depends, Query, HTTPException, status, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 import httpx
+import asyncio
 import logging
 import json
 import re
 
 from src.schemas.email import EmailBroadcastRequest, EmailStatusResponse 
 from src.core.celery_app import broadcast_email_task 
-from src.api.deps import get_db, get_current_user
-from src.schemas.admin import DashboardStatsResponse, SalesData
-from src.models.user import User
+from src.api.deps import get_db, get_current_principal
+from src.schemas.admin import DashboardStatsResponse, SalesData, EmbeddingRepairMetrics, EmbeddingSpaceStatus, DictionaryUpdate, DictionaryState
+from src.services.principal_cache import Principal
 from src.schemas.product import ProductCreate
 from src.crud.crud_product import crud_product
+from src.services.embedding_repair import get_repair_backlog
+from src.services import reembedding, dictionary_store
+from src.services.storage import get_storage_service
+from src.services.image_variants import schedule_variants
+from src.core.http_client import pooled_client
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -20,7 +26,7 @@ logger = logging.getLogger(__name__)
 # AI Service URL
 AI_SERVICE_URL = "http://ai-service-api:8000"
 
-def check_superuser(current_user: User = Depends(get_current_user)) -> User:
+def check_superuser(current_user: Principal = Depends(get_current_principal)) -> Principal:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, 
@@ -60,7 +66,7 @@ def _ensure_vector_dim(vector: Optional[List[float]], dim: int) -> List[float]:
 async def get_admin_dashboard_stats(
     time_range: Literal["daily", "weekly", "monthly"] = Query("weekly"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(check_superuser),
+    current_user: Principal = Depends(check_superuser),
 ) -> Any:
     # [Mock Data]
     sales_trend = []
@@ -102,7 +108,7 @@ async def get_admin_dashboard_stats(
 @router.post("/broadcast-email", response_model=EmailStatusResponse, status_code=status.HTTP_202_ACCEPTED)
 async def send_broadcast_email(
     email_req: EmailBroadcastRequest,
-    current_user: User = Depends(check_superuser),
+    current_user: Principal = Depends(check_superuser),
 ) -> Any:
     task = broadcast_email_task.delay(
         subject=email_req.subject,
@@ -114,11 +120,80 @@ async def send_broadcast_email(
         task_id=str(task.id)
     )
 
+@router.get("/metrics/embedding-repair", response_model=EmbeddingRepairMetrics)
+async def get_embedding_repair_metrics(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(check_superuser),
+) -> Any:
+    """손상 상품(임베딩/설명 누락) 백로그 현황"""
+    return EmbeddingRepairMetrics(**await get_repair_backlog(db))
+
+@router.get("/embeddings", response_model=List[EmbeddingSpaceStatus])
+async def get_embedding_spaces(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(check_superuser),
+) -> Any:
+    """벡터 컬럼별 모델 버전 및 재임베딩 진행률/처리량"""
+    return await reembedding.get_status(db)
+
+@router.post("/embeddings/{space}/migrate", response_model=List[EmbeddingSpaceStatus], status_code=status.HTTP_202_ACCEPTED)
+async def start_embedding_migration(
+    space: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(check_superuser),
+) -> Any:
+    """ai-service의 다음 모델로 shadow 컬럼 재임베딩 시작 (백그라운드 배치)"""
+    return await reembedding.start_migration(db, space)
+
+@router.post("/embeddings/{space}/swap", response_model=List[EmbeddingSpaceStatus])
+async def swap_embedding_space(
+    space: str,
+    force: bool = Query(False, description="재임베딩 실패 상품이 있어도 스왑 (해당 상품 벡터는 NULL로 초기화)"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(check_superuser),
+) -> Any:
+    """커버리지 100% 도달 시 원본 ↔ shadow 컬럼 원자적 교체 + ai-service 모델 승격"""
+    return await reembedding.swap(db, space, force=force)
+
+@router.get("/dictionaries", response_model=DictionaryState)
+async def get_routing_dictionaries(
+    current_user: Principal = Depends(check_superuser),
+) -> Any:
+    """검색 라우팅 사전 현황 (연예인/일반 명사/카테고리/불용어 등)"""
+    return await dictionary_store.get_dictionaries()
+
+@router.put("/dictionaries/{label}", response_model=DictionaryState)
+async def update_routing_dictionary(
+    label: str,
+    payload: DictionaryUpdate,
+    current_user: Principal = Depends(check_superuser),
+) -> Any:
+    """사전 교체 → 각 서비스가 다음 폴링 주기에 재컴파일 (재배포 불필요)"""
+    if not dictionary_store.is_known_label(label):
+        raise HTTPException(status_code=404, detail=f"Unknown dictionary label: {label}")
+    try:
+        await dictionary_store.put_dictionary(label, payload.words)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await dictionary_store.get_dictionaries()
+
+@router.delete("/dictionaries/{label}", response_model=DictionaryState)
+async def reset_routing_dictionary(
+    label: str,
+    current_user: Principal = Depends(check_superuser),
+) -> Any:
+    """저장된 사전 삭제 (코드 기본값으로 복귀)"""
+    if not dictionary_store.is_known_label(label):
+        raise HTTPException(status_code=404, detail=f"Unknown dictionary label: {label}")
+    await dictionary_store.delete_dictionary(label)
+    return await dictionary_store.get_dictionaries()
+
 @router.post("/products/upload-ai", status_code=status.HTTP_201_CREATED)
 async def upload_product_image(
     file: UploadFile = File(...),
+    regenerate: bool = Query(False, description="AI 분석 캐시를 무시하고 재분석"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(check_superuser),
+    current_user: Principal = Depends(check_superuser),
 ) -> Any:
     """
     [관리자] 이미지 업로드 -> AI 분석 -> DB 자동 등록
@@ -127,13 +202,22 @@ async def upload_product_image(
         raise HTTPException(status_code=400, detail="이미지 파일만 업로드 가능합니다.")
 
     ai_response = None
+    await file.seek(0)
+    file_content = await file.read()
+
+    # 이미지 저장은 AI 분석과 동시에 진행 (StorageService: 논블로킹 쓰기)
+    storage = get_storage_service()
+    save_task = asyncio.create_task(storage.upload_content(
+        file_content, "images", file.filename, file.content_type
+    ))
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            await file.seek(0)
-            files = {"file": (file.filename, await file.read(), file.content_type)}
+        async with pooled_client(60.0) as client:
+            files = {"file": (file.filename, file_content, file.content_type)}
             
             logger.info(f"📤 Sending image to AI Service: {file.filename}")
-            response = await client.post(f"{AI_SERVICE_URL}/api/v1/analyze-image", files=files)
+            response = await client.post(
+                f"{AI_SERVICE_URL}/api/v1/analyze-image", files=files, params={"regenerate": regenerate}
+            )
             
             if response.status_code != 200:
                 logger.error(f"❌ AI Service Error: {response.text}")
@@ -145,7 +229,17 @@ async def upload_product_image(
             
     except httpx.RequestError as exc:
         logger.error(f"❌ AI Connection Failed: {exc}")
+        save_task.cancel()
         raise HTTPException(status_code=503, detail=f"AI 서비스 연결 실패: {exc}")
+    except HTTPException:
+        save_task.cancel()
+        raise
+
+    try:
+        image_url = storage.public_url(await save_task)
+    except Exception as e:
+        logger.error(f"❌ File Save Error: {e}")
+        raise HTTPException(status_code=500, detail="서버 파일 저장 실패")
 
     try:
         # (1) 텍스트 인코딩 복구
@@ -174,7 +268,7 @@ async def upload_product_image(
             stock_quantity=100,
             category=category,
             gender=gender,
-            image_url=f"/static/images/{file.filename}", 
+            image_url=image_url, 
             is_active=True,
             embedding=safe_bert,
             embedding_clip=safe_clip,
@@ -184,6 +278,7 @@ async def upload_product_image(
 
         product = await crud_product.create(db, obj_in=product_in)
         logger.info(f"✅ Product Created: {product.name} (ID: {product.id})")
+        schedule_variants([product.id])
         return product
 
     except Exception as e:
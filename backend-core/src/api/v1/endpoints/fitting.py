@@ -1,33 +1,47 @@
 import os
 import base64
 import io
-import httpx
+import json
+import time
 from PIL import Image
-from typing import List, Any
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from typing import List, Any, Optional, Tuple
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-import replicate
 from pydantic import BaseModel
 from datetime import datetime
 
+from src.config.settings import settings
 from src.db.session import get_db
-from src.models.user import User
+from src.services.principal_cache import Principal
 from src.models.fitting import FittingResult
 from src.api import deps    # 로그인 유저 확인용
+from src.core.http_client import pooled_client
+from src.core.redis_client import redis_client
+from src.services import fitting_jobs, rate_limiter
+from src.tasks.fitting import poll_fitting_job_task
 
 router = APIRouter()
 
+FITTING_MODEL_ID = "cuuupid/idm-vton:0513734a452173b8173e907e3a59d19a36266e55b48528559432bd21c7d7e985"
+
 # 응답 스키마 (Schemas)
-class FittingResponse(BaseModel):
-    image_url: str
-    id: int # 저장된 ID도 반환
+class FittingJobStatus(BaseModel):
+    job_id: str
+    status: str                     # queued / processing / succeeded / failed
+    image_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None   # 자체 저장소 복사 후 채워짐
+    id: Optional[int] = None        # 저장된 FittingResult ID
+    error: Optional[str] = None
 
 class FittingHistoryResponse(BaseModel):
     id: int
     result_image_url: str
+    thumbnail_url: str | None = None   # 목록용 썸네일 (복사 전이면 None → 원본 사용)
     category: str | None
     created_at: datetime
     
@@ -75,13 +89,27 @@ def preprocess_image(image_bytes: bytes) -> Image.Image:
     
     return new_img
 
-# Helper Function 2 : PIL 이미지 -> Base64 문자열 변환 (API 전송용)
-def image_to_base64(img: Image.Image) -> str:
+# Helper Function 2 : PIL 이미지 -> JPEG 바이트 (AI Service 바이너리 전송 / Replicate data URI 공용)
+def image_to_jpeg(img: Image.Image) -> bytes:
     buffer = io.BytesIO()
     # JPEG 포맷, 퀄리티 85
     img.save(buffer, format="JPEG", quality=85)
-    encoded = base64.b64encode(buffer.getvalue()).decode("utf-8")
-    return f"data:image/jpeg;base64,{encoded}"
+    return buffer.getvalue()
+
+def to_data_uri(data: bytes, mime: str = "image/jpeg") -> str:
+    return f"data:{mime};base64,{base64.b64encode(data).decode('utf-8')}"
+
+def prepare_fitting_inputs(human_bytes: bytes, garm_bytes: bytes, category: str, garment_desc: str) -> Tuple[bytes, bytes, str]:
+    """
+    CPU 작업 묶음 (스레드풀에서 실행): 전처리(LANCZOS) → JPEG 인코딩 → 결과 캐시 키
+    반환: (사람 JPEG, 의류 JPEG, 캐시 키)
+    """
+    human_pil = preprocess_image(human_bytes)
+    garm_pil = preprocess_image(garm_bytes)
+    cache_key = fitting_jobs.fitting_cache_key(
+        human_pil.tobytes(), garm_pil.tobytes(), category, garment_desc, FITTING_MODEL_ID
+    )
+    return image_to_jpeg(human_pil), image_to_jpeg(garm_pil), cache_key
 
 # Helper Function 3 : 의류 이미지 파일명 분석 -> 영문 프롬프트 생성
 def get_detailed_garment_prompt(filename: str, category: str) -> str:
@@ -211,34 +239,51 @@ def get_detailed_garment_prompt(filename: str, category: str) -> str:
 
     return desc + base_suffix
 
-# 1. 가상 피팅 생성 및 저장 엔드포인트
+# 1. 가상 피팅 작업 제출 엔드포인트
 # .env 파일이나 settings.py에 REPLICATE_API_TOKEN이 있어야 합니다.
-@router.post("/generate", response_model=FittingResponse)
+@router.post("/generate", response_model=FittingJobStatus, status_code=status.HTTP_202_ACCEPTED)
 async def generate_fitting(
     human_img: UploadFile = File(...),
     garm_img: UploadFile = File(...),
     category: str = Form("upper_body"),  # 프론트에서 보낸 값이 여기로 들어온다.
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)  # 로그인 유저 필수
+    current_user: Principal = Depends(deps.get_current_principal)  # 로그인 유저 필수
 ):
     """
-    [가상 피팅 생성 API (YOLO Segmentation 적용)]
+    [가상 피팅 작업 제출 API (YOLO Segmentation 적용)]
     1. 이미지 전처리 (3:4 비율 맞춤)
     2. YOLO를 사용하여 사람 영역 마스크(Mask) 생성
-    3. Replicate IDM-VTON 모델에 원본+마스크 전송
+    3. Replicate IDM-VTON prediction 생성 후 작업 ID 즉시 반환
+       (완료는 webhook/워커 폴링이 처리 → /jobs/{job_id}, /jobs/{job_id}/events 로 확인)
+       - 같은 입력의 결과가 캐시에 있으면 완료 상태(succeeded)로 즉시 반환
+       - 같은 유저의 동일 작업이 진행 중이면 그 작업을 반환
     """
+    timings = {}
+    started = time.perf_counter()
     try:
         # 1. 파일 읽기 (바이트 변환)
         human_bytes = await human_img.read()
         garm_bytes = await garm_img.read()
+        timings["read"] = (time.perf_counter() - started) * 1000
+
+        # 2. 이미지 전처리 + JPEG 인코딩 + 캐시 키 (CPU 작업은 이벤트 루프 밖에서)
+        started = time.perf_counter()
+        garment_desc = get_detailed_garment_prompt(garm_img.filename, category)
+        human_jpeg, garm_jpeg, cache_key = await run_in_threadpool(
+            prepare_fitting_inputs, human_bytes, garm_bytes, category, garment_desc
+        )
+        timings["preprocess"] = (time.perf_counter() - started) * 1000
 
-        # 2. 이미지 전처리 (PIL 객체 생성)
-        human_pil = preprocess_image(human_bytes)
-        garm_pil = preprocess_image(garm_bytes)
+        # 3. 중복 요청 확인 (seed 고정 → 같은 입력이면 같은 결과)
+        cached = await fitting_jobs.get_cached_result(cache_key)
+        if cached:
+            print("♻️ 동일 입력 피팅 결과 재사용")
+            job = await fitting_jobs.create_cached_job(current_user.id, category, cache_key, cached)
+            return fitting_jobs.public_view(job)
 
-        # Base64 변환 (AI Service에 보내기 위해 필요)
-        human_uri = image_to_base64(human_pil)
-        garm_uri = image_to_base64(garm_pil)
+        inflight = await fitting_jobs.find_inflight(current_user.id, cache_key)
+        if inflight:
+            print(f"⏳ 진행 중인 동일 작업 반환 (Job: {inflight['job_id']})")
+            return fitting_jobs.public_view(inflight)
 
         if category == "lower_body":
             target_part = "lower"
@@ -247,41 +292,43 @@ async def generate_fitting(
         else:
             target_part = "upper"
 
-        # 3. AI Service에 마스크 생성 요청 보내기
+        # 4. AI Service에 마스크 생성 요청 (JPEG 바이트 그대로 전송, PNG 바이트 수신)
+        # 같은 사진이면 ai-service 마스크 캐시가 seg/pose 추론을 건너뜀
         print("📡 AI Service에 마스크 생성 요청 중...")
+        started = time.perf_counter()
         
         mask_uri = None
-        ai_service_url = "http://ai-service-api:8000/api/v1/generate-mask" # 도커 서비스명 사용
+        ai_service_url = "http://ai-service-api:8000/api/v1/generate-mask-raw" # 도커 서비스명 사용
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with pooled_client() as client:
                 response = await client.post(
                     ai_service_url,
-                    json={"image_b64": human_uri, "target": target_part},
+                    params={"target": target_part},
+                    content=human_jpeg,
+                    headers={"Content-Type": "image/jpeg"},
                     timeout=10.0 # 10초 대기
                 )
                 
                 if response.status_code == 200:
-                    result = response.json()
-                    if result.get("status") == "success":
-                        mask_uri = result.get("mask_b64")
-                        print("✅ AI Service로부터 마스크 수신 완료")
-                    else:
-                        print("⚠️ AI Service: 마스크 생성 실패")
+                    mask_uri = to_data_uri(response.content, "image/png")
+                    print(f"✅ AI Service로부터 마스크 수신 완료 (cache: {response.headers.get('X-Mask-Cache')}, {response.headers.get('Server-Timing')})")
+                elif response.status_code == 204:
+                    print("⚠️ AI Service: 마스크 생성 실패")
                 else:
                     print(f"⚠️ AI Service 통신 오류: {response.status_code}")
                     
         except Exception as e:
             print(f"❌ AI Service 연결 실패: {e}")
             # 마스크 없이 진행 (Fallback)
+        timings["mask"] = (time.perf_counter() - started) * 1000
         
-        garment_desc = get_detailed_garment_prompt(garm_img.filename, category)
         print(f"📝 생성된 프롬프트: {garment_desc}")
 
-        # 4. Replicate 입력 데이터 구성
+        # 5. Replicate 입력 데이터 구성
         input_data = {
-            "human_img": human_uri,   
-            "garm_img": garm_uri,
+            "human_img": to_data_uri(human_jpeg),   
+            "garm_img": to_data_uri(garm_jpeg),
             "category": category,       
             "garment_des": garment_desc,  
             "crop": False,
@@ -292,39 +339,113 @@ async def generate_fitting(
         if mask_uri:
             input_data["mask_img"] = mask_uri
 
-        # 5. Replicate 모델 실행
-        model_id = "cuuupid/idm-vton:0513734a452173b8173e907e3a59d19a36266e55b48528559432bd21c7d7e985"
+    except HTTPException:
+        raise
 
-        output = replicate.run(
-            model_id, 
-            input=input_data
-        )
+    except Exception as e:
+        print(f"❌ General Error: {e}")
+        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
 
-        result_url = str(output)
-        print(f"✅ 생성 완료: {result_url}")
+    # 6. Replicate prediction 생성 (완료를 기다리지 않음)
+    # 일일 쿼터 + 초당 제한 선차감 (실패 시 반환)
+    await rate_limiter.reserve_or_429("replicate")
+    job_id = await fitting_jobs.create_job(current_user.id, category, cache_key)
+
+    # 동시에 들어온 중복 요청(더블 클릭)은 먼저 등록된 작업으로 합침
+    existing_id = await fitting_jobs.claim_inflight(current_user.id, cache_key, job_id)
+    if existing_id:
+        await rate_limiter.refund("replicate")
+        await fitting_jobs.discard_job(job_id)
+        existing = await fitting_jobs.get_job(existing_id)
+        if existing:
+            return fitting_jobs.public_view(existing)
+        raise HTTPException(status_code=409, detail="동일한 피팅 작업이 이미 처리 중입니다.")
+
+    started = time.perf_counter()
+    try:
+        async with pooled_client(timeout=30.0) as client:
+            await fitting_jobs.create_prediction(client, job_id, FITTING_MODEL_ID, input_data)
+    except Exception as e:
+        print(f"❌ Replicate API Error: {e}")
+        await fitting_jobs.fail_job(job_id, str(e))
+        raise HTTPException(status_code=502, detail=f"AI 모델 오류: {str(e)}")
+    timings["submit"] = (time.perf_counter() - started) * 1000
+    print("⏱️ 피팅 단계별 소요(ms): " + ", ".join(f"{k}={v:.0f}" for k, v in timings.items()))
 
-        # 6. DB 저장 로직
-        history = FittingResult(
-            user_id=current_user.id,
-            result_image_url=result_url,
-            category=category,
-            created_at=datetime.utcnow()
-        )
-        db.add(history)
-        await db.commit()
-        await db.refresh(history)
+    # 7. 완료 폴링 (webhook 누락 대비) → 완료 시 DB 저장 + 결과 캐시
+    poll_fitting_job_task.apply_async(
+        args=[job_id, fitting_jobs.poll_deadline()], countdown=settings.FITTING_POLL_INTERVAL
+    )
+    print(f"🚀 가상 피팅 작업 제출 완료 (Job: {job_id})")
 
-        print(f"✅ DB 저장 완료 (ID: {history.id})")
+    return {"job_id": job_id, "status": "processing"}
 
-        return {"image_url": result_url, "id": history.id}
-    
-    except replicate.exceptions.ReplicateError as e:
-        print(f"❌ Replicate API Error: {e}")
-        raise HTTPException(status_code=500, detail=f"AI 모델 오류: {str(e)}")
-    
-    except Exception as e:
-        print(f"❌ General Error: {e}")
-        raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
+
+async def _get_own_job(job_id: str, user: Principal) -> dict:
+    job = await fitting_jobs.get_job(job_id)
+    if not job or job["user_id"] != user.id:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=FittingJobStatus)
+async def get_fitting_job(
+    job_id: str,
+    current_user: Principal = Depends(deps.get_current_principal)
+):
+    """가상 피팅 작업 상태 조회 (polling 클라이언트용)"""
+    return fitting_jobs.public_view(await _get_own_job(job_id, current_user))
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_fitting_job(
+    job_id: str,
+    current_user: Principal = Depends(deps.get_current_principal)
+):
+    """
+    가상 피팅 작업 상태 SSE
+    - 구독 직후 현재 상태를 보내고, 완료/실패 이벤트를 받으면 종료
+    - 완료 전에는 15초마다 keep-alive 주석 전송
+    """
+    await _get_own_job(job_id, current_user)
+
+    async def event_stream():
+        pubsub = redis_client.pubsub()
+        await pubsub.subscribe(fitting_jobs.JOB_CHANNEL.format(job_id=job_id))
+        try:
+            # 구독 이후 상태를 읽어야 사이에 끝난 작업도 놓치지 않음
+            job = await fitting_jobs.get_job(job_id)
+            if job is None:
+                return
+            state = fitting_jobs.public_view(job)
+            yield f"event: status\ndata: {json.dumps(state)}\n\n"
+
+            while state["status"] not in fitting_jobs.TERMINAL_STATUSES:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=15.0)
+                if message is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                state = json.loads(message["data"])
+                yield f"event: status\ndata: {message['data']}\n\n"
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/webhook/{job_id}", include_in_schema=False)
+async def replicate_webhook(job_id: str, request: Request, token: str = Query("")):
+    """Replicate prediction 완료 webhook (작업별 HMAC 토큰으로 검증)"""
+    if not fitting_jobs.verify_webhook_token(job_id, token):
+        raise HTTPException(status_code=403, detail="Invalid webhook token")
+    prediction = await request.json()
+    await fitting_jobs.complete_job(job_id, prediction)
+    return {"ok": True}
 
 
 # 2. 가상 피팅 히스토리 목록 조회 엔드포인트
@@ -333,12 +454,13 @@ async def get_fitting_history(
     skip: int = 0,
     limit: int = 20,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)  # 로그인 유저 필수
+    current_user: Principal = Depends(deps.get_current_principal)  # 로그인 유저 필수
 ):
     """
     [가상 피팅 히스토리 조회 API]
     1. 로그인한 유저의 가상 피팅 히스토리를 조회합니다.
     2. 최신 순으로 정렬하여 반환합니다.
+    3. 목록에는 thumbnail_url(자체 저장소 썸네일)을 사용하고, 크게 보기에만 result_image_url을 사용합니다.
     """
     query = select(FittingResult)\
         .where(FittingResult.user_id == current_user.id)\
@@ -6,14 +6,14 @@ from sqlalchemy.orm import selectinload
 from datetime import datetime, timedelta
 import uuid
 
-from src.api.deps import get_db, get_current_user
-from src.models.user import User
+from src.api.deps import get_db, get_current_principal
+from src.services.principal_cache import Principal
 from src.models.order import Order, OrderItem
 from src.schemas.order import OrderCreate, OrderResponse, OrderListResponse
 
 router = APIRouter()
 
-def check_superuser(current_user: User = Depends(get_current_user)) -> User:
+def check_superuser(current_user: Principal = Depends(get_current_principal)) -> Principal:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -32,7 +32,7 @@ def generate_order_number() -> str:
 @router.post("/", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
 async def create_order(
     order_data: OrderCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """주문 생성"""
@@ -82,7 +82,7 @@ async def create_order(
 
 @router.get("/", response_model=List[OrderListResponse])
 async def get_my_orders(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
     status_filter: Optional[str] = Query(None, description="주문 상태 필터"),
     skip: int = Query(0, ge=0),
@@ -117,7 +117,7 @@ async def get_all_orders_admin(
     start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY-MM-DD)"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(check_superuser),
+    current_user: Principal = Depends(check_superuser),
 ):
     """관리자용 전체 주문 목록 조회"""
     offset = (page - 1) * limit
@@ -196,7 +196,7 @@ async def update_order_status_admin(
     order_id: int,
     status_data: dict,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(check_superuser),
+    current_user: Principal = Depends(check_superuser),
 ):
     """관리자용 주문 상태 업데이트"""
     new_status = status_data.get("status")
@@ -231,7 +231,7 @@ async def update_order_status_admin(
 @router.get("/{order_id}", response_model=OrderResponse)
 async def get_order_detail(
     order_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """주문 상세 조회"""
@@ -253,7 +253,7 @@ async def get_order_detail(
 @router.patch("/{order_id}/cancel", response_model=OrderResponse)
 async def cancel_order(
     order_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """주문 취소"""
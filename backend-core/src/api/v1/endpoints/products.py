@@ -1,20 +1,26 @@
+import asyncio
 import logging
-import csv
-import io
 import shutil
-import os
-import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
-import httpx
 
 # 의존성 및 모듈 임포트
 from src.api import deps
 from src.crud.crud_product import crud_product
 from src.config.settings import settings
-from src.schemas.user import UserResponse as User
+from src.constants import SAFE_AI_URL
+from src.core.http_client import pooled_client
+from src.services.embedding_repair import enqueue_if_broken
+from src.services import product_import
+from src.services.storage import get_storage_service
+from src.services.image_variants import needs_variants, schedule_variants
+from src.tasks.product_import import import_products_csv_task
+from src.utils.text import sanitize_string
+from src.services.principal_cache import Principal
+from src.services.wishlist_cache import mark_wished
 from src.schemas.product import (
     ProductResponse, 
     ProductCreate, 
@@ -25,81 +31,15 @@ from src.schemas.product import (
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# 🚨 [CRITICAL FIX] ECS 환경에서 DNS 이슈 방지를 위한 강제 로컬호스트 주소
-# settings.py가 환경변수를 잘못 읽더라도, 코드는 무조건 127.0.0.1을 바라봅니다.
-SAFE_AI_URL = "http://127.0.0.1:8001/api/v1"
-
-# ------------------------------------------------------------------
-# [Helper] 문자열 정리
-# ------------------------------------------------------------------
-def sanitize_string(value: Any) -> Any:
-    if isinstance(value, str):
-        return value.replace("\x00", "").strip()
-    return value
-
-# ------------------------------------------------------------------
-# [Helper] Self-Healing
-# ------------------------------------------------------------------
-async def _heal_product_embedding(db: AsyncSession, product: Any) -> Any:
-    """상품 데이터(임베딩, 설명) 누락 시 AI 서비스로 복구"""
-    
-    is_broken = (
-        product.embedding is None or 
-        (isinstance(product.embedding, list) and len(product.embedding) == 0) or
-        product.description == "AI 분석 실패" or 
-        not product.description
-    )
-    
-    if not is_broken:
-        return product 
-
-    logger.warning(f"🚑 [Self-Healing] Product ID {product.id} data missing. Attempting recovery...")
-
-    new_description = product.description
-    # 1. 텍스트 생성 복구
-    if not product.description or product.description == "AI 분석 실패":
-        try:
-            async with httpx.AsyncClient(timeout=20.0) as client:
-                prompt = f"상품명: {product.name}, 카테고리: {product.category}. 매력적인 쇼핑몰 상세 설명을 5문장 작성해줘."
-                # SAFE_AI_URL 사용
-                res = await client.post(f"{SAFE_AI_URL}/llm-generate-response", json={"prompt": prompt})
-                if res.status_code == 200:
-                    new_description = res.json().get("answer", product.name)
-        except Exception as e:
-            logger.error(f"Heal Description Failed: {e}")
-
-    # 2. 임베딩 복구
-    new_vector = product.embedding
-    try:
-        text_to_embed = f"{product.name} {product.category} {new_description}"
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # SAFE_AI_URL 사용
-            res = await client.post(f"{SAFE_AI_URL}/embed-text", json={"text": text_to_embed})
-            if res.status_code == 200:
-                new_vector = res.json().get("vector", [])
-    except Exception as e:
-        logger.error(f"Heal Embedding Failed: {e}")
-
-    # 3. DB 업데이트
-    if new_vector and len(new_vector) > 0:
-        update_data = {"embedding": new_vector}
-        if new_description != product.description:
-            update_data["description"] = new_description
-            
-        product = await crud_product.update(db, db_obj=product, obj_in=update_data)
-        logger.info(f"✅ Product {product.id} healed.")
-    
-    return product
-
-
 # =========================================================
 # 1️⃣ [API] 이미지 자동 분석 업로드 (단일) - 수정 완료 ✅
 # =========================================================
 @router.post("/upload/image-auto", response_model=ProductResponse)
 async def upload_product_image_auto(
     file: UploadFile = File(...),
+    regenerate: bool = Query(False, description="AI 분석 캐시를 무시하고 재분석"),
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ):
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다.")
@@ -110,9 +50,15 @@ async def upload_product_image_auto(
     # 1. 파일 내용 읽기
     await file.seek(0)
     file_content = await file.read()
+
+    # [Step B] 저장소 저장은 AI 분석과 동시에 진행 (StorageService: 논블로킹 쓰기)
+    storage = get_storage_service()
+    save_task = asyncio.create_task(storage.upload_content(
+        file_content, "images", file.filename, file.content_type or "application/octet-stream"
+    ))
     
     # [Step A] AI 서비스로 이미지 전송 (파일 내용 그대로 전송)
-    async with httpx.AsyncClient(timeout=60.0) as client:
+    async with pooled_client(60.0) as client:
         try:
             # multipart/form-data로 전송 (파일 자체를 보냄)
             files = {"file": (file.filename, file_content, file.content_type)}
@@ -120,7 +66,8 @@ async def upload_product_image_auto(
             # 🚨 [FIX] SAFE_AI_URL 사용 (DNS 에러 해결)
             response = await client.post(
                 f"{SAFE_AI_URL}/analyze-image",
-                files=files 
+                files=files,
+                params={"regenerate": regenerate}
             )
             
             if response.status_code == 200:
@@ -130,19 +77,9 @@ async def upload_product_image_auto(
         except Exception as e:
             logger.error(f"AI Connection Error: {e}")
 
-    # [Step B] 로컬 저장
+    # [Step B] 저장 완료 대기
     try:
-        UPLOAD_DIR = "/app/src/static/images"
-        os.makedirs(UPLOAD_DIR, exist_ok=True)
-        
-        file_ext = os.path.splitext(file.filename)[1]
-        unique_filename = f"{uuid.uuid4()}{file_ext}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-        
-        with open(file_path, "wb") as buffer:
-            buffer.write(file_content)
-            
-        final_image_url = f"/static/images/{unique_filename}"
+        final_image_url = storage.public_url(await save_task)
         
     except Exception as e:
         logger.error(f"File Save Error: {e}")
@@ -194,9 +131,12 @@ async def upload_product_image_auto(
     try:
         new_product = await crud_product.create(db, obj_in=product_in_data)
         
-        # 벡터가 없으면 나중에라도 복구 시도 (옵션)
+        # 벡터가 없으면 복구 큐에 등록 (워커가 백그라운드에서 처리)
         if vector is None:
-            new_product = await _heal_product_embedding(db, new_product)
+            await enqueue_if_broken(new_product)
+
+        # 썸네일/카드/상세/모델 입력 파생본은 워커에서 생성
+        schedule_variants([new_product.id])
             
         logger.info(f"✅ Product created with ID {new_product.id}")
         return new_product
@@ -209,112 +149,60 @@ async def upload_product_image_auto(
 # =========================================================
 # 2️⃣ [Mode 2] CSV 대량 업로드
 # =========================================================
-@router.post("/upload/csv")
+@router.post("/upload/csv", status_code=202)
 async def upload_products_csv(
     file: UploadFile = File(...),
-    db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ):
+    """
+    CSV 대량 등록 작업 생성.
+    파일은 디스크로 스트리밍 저장하고, 실제 처리는 Celery 워커가 배치 단위로 수행합니다.
+    """
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다.")
 
-    content = await file.read()
+    job_id, path = product_import.new_job_path(file.filename)
     try:
-        decoded_content = content.decode("utf-8")
-    except UnicodeDecodeError:
-        try:
-            decoded_content = content.decode("cp949")
-        except UnicodeDecodeError:
-            decoded_content = content.decode("euc-kr", errors="ignore")
+        with open(path, "wb") as buffer:
+            await run_in_threadpool(shutil.copyfileobj, file.file, buffer, 1024 * 1024)
+    except Exception as e:
+        logger.error(f"CSV Save Error: {e}")
+        raise HTTPException(status_code=500, detail="CSV 파일 저장 실패")
 
-    csv_reader = csv.DictReader(io.StringIO(decoded_content))
-    results = {"success": 0, "failed": 0, "errors": []}
-    
-    # SAFE_AI_URL 사용
-    AI_SERVICE_API_URL = SAFE_AI_URL
+    await product_import.create_job(job_id, file.filename)
+    import_products_csv_task.delay(job_id, path)
+    return {"job_id": job_id, "status": "queued"}
 
-    for row in csv_reader:
-        try:
-            name = row.get("name") or row.get("상품명")
-            if not name: continue 
 
-            category = row.get("category") or row.get("카테고리") or "Uncategorized"
-            description = row.get("description") or row.get("설명") or ""
-            gender = row.get("gender") or row.get("성별") or "Unisex"
-            
-            price_raw = row.get("price") or row.get("가격") or "0"
-            try:
-                price = int(str(price_raw).replace(",", "").strip())
-            except:
-                price = 0
-
-            stock_raw = row.get("stock_quantity") or row.get("재고") or "100"
-            try:
-                stock = int(str(stock_raw).replace(",", "").strip())
-            except:
-                stock = 100
-            
-            image_url = row.get("image_url") or row.get("이미지") or "https://placehold.co/400x500?text=No+Image"
+@router.get("/upload/csv/{job_id}")
+async def get_csv_import_status(
+    job_id: str,
+    current_user: Principal = Depends(deps.get_current_principal),
+):
+    """CSV 대량 등록 진행 상황 (total/processed/success/failed)"""
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다.")
 
-            # BERT 벡터 생성
-            vector = None # 기본값 None
-            text_for_vector = f"[{gender}] {name} {category} {description}"
-            
-            async with httpx.AsyncClient(timeout=3.0) as client:
-                try:
-                    res = await client.post(
-                        f"{AI_SERVICE_API_URL}/embed-text", 
-                        json={"text": text_for_vector}
-                    )
-                    if res.status_code == 200:
-                        v_data = res.json().get("vector", [])
-                        if v_data and len(v_data) == 768:
-                            vector = v_data
-                except Exception:
-                    pass 
-
-            # CLIP 벡터 생성
-            vector_clip = None # 기본값 None
-            if image_url and not image_url.startswith("https://placehold"):
-                try:
-                    async with httpx.AsyncClient(timeout=10.0) as client:
-                        img_response = await client.get(image_url)
-                        if img_response.status_code == 200:
-                            import base64
-                            image_b64 = base64.b64encode(img_response.content).decode("utf-8")
-                            
-                            clip_res = await client.post(
-                                f"{AI_SERVICE_API_URL}/generate-clip-vector",
-                                json={"image_b64": image_b64}
-                            )
-                            if clip_res.status_code == 200:
-                                v_clip_data = clip_res.json().get("vector", [])
-                                if v_clip_data and len(v_clip_data) == 512:
-                                    vector_clip = v_clip_data
-                except Exception as e:
-                    logger.warning(f"⚠️ CLIP vector generation failed for {name}: {e}")
-
-            product_in = {
-                "name": sanitize_string(name),
-                "category": sanitize_string(category),
-                "description": sanitize_string(description),
-                "price": price,
-                "stock_quantity": stock,
-                "image_url": image_url,
-                "embedding": vector,              
-                "embedding_clip": vector_clip,    
-                "gender": gender,
-                "is_active": True
-            }
-            
-            await crud_product.create(db, obj_in=product_in)
-            results["success"] += 1
+    job = await product_import.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
 
-        except Exception as e:
-            results["failed"] += 1
-            results["errors"].append(f"{name}: {str(e)}")
 
-    return results
+@router.get("/upload/csv/{job_id}/errors")
+async def get_csv_import_errors(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: Principal = Depends(deps.get_current_principal),
+):
+    """행 단위 에러 리포트 (row: CSV 행 번호)"""
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다.")
+
+    if not await product_import.get_job(job_id):
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return {"job_id": job_id, "errors": await product_import.get_job_errors(job_id, offset, limit)}
 
 
 # =========================================================
@@ -326,7 +214,7 @@ async def create_product(
     *,
     db: AsyncSession = Depends(deps.get_db),
     product_in: ProductCreate,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """단일 상품 직접 생성"""
     if not current_user.is_superuser:
@@ -344,7 +232,7 @@ async def create_product(
     AI_SERVICE_API_URL = SAFE_AI_URL
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with pooled_client(10.0) as client:
             response = await client.post(
                 f"{AI_SERVICE_API_URL}/embed-text",
                 json={"text": text_to_embed}
@@ -359,6 +247,8 @@ async def create_product(
     product_data["embedding"] = embedding_vector
 
     product = await crud_product.create(db, obj_in=product_data)
+    if needs_variants(product):
+        schedule_variants([product.id])
     return product
 
 # =========================================================
@@ -366,6 +256,7 @@ async def create_product(
 # =========================================================
 from sqlalchemy import select as sql_select, func as sql_func, desc as sql_desc, case as sql_case
 from src.models.product import Product
+from src.models.product_stats import ProductStats
 
 @router.get("/admin/list", response_model=dict)
 async def get_products_admin(
@@ -374,7 +265,7 @@ async def get_products_admin(
     category: Optional[str] = Query(None, description="카테고리 필터"),
     is_active: Optional[bool] = Query(None, description="활성화 상태 필터"),
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ):
     """관리자용 상품 목록 조회"""
     if not current_user.is_superuser:
@@ -432,7 +323,7 @@ async def update_product_admin(
     product_id: int,
     product_data: ProductCreate,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ):
     """관리자용 상품 정보 업데이트"""
     if not current_user.is_superuser:
@@ -443,6 +334,9 @@ async def update_product_admin(
         raise HTTPException(status_code=404, detail="상품을 찾을 수 없습니다.")
 
     updated_product = await crud_product.update(db, db_obj=product, obj_in=product_data.model_dump(exclude_unset=True))
+    # 이미지가 교체됐으면 파생본 재생성 (그 전까지는 원본으로 서비스)
+    if needs_variants(updated_product):
+        schedule_variants([updated_product.id])
     return ProductResponse.model_validate(updated_product)
 
 
@@ -450,7 +344,7 @@ async def update_product_admin(
 async def delete_product_admin(
     product_id: int,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ):
     """관리자용 상품 삭제 (소프트 삭제)"""
     if not current_user.is_superuser:
@@ -477,9 +371,11 @@ async def get_products(
     limit: int = Query(12, ge=1, le=100),
     category: Optional[str] = Query(None, description="카테고리 필터"),
     search: Optional[str] = Query(None, description="상품명 검색"),
+    sort: Literal["latest", "popular"] = Query("latest", description="정렬 (latest: 최신순, popular: 찜 많은 순)"),
     db: AsyncSession = Depends(deps.get_db),
+    current_user: Optional[Principal] = Depends(deps.get_optional_principal),
 ):
-    """일반 사용자용 상품 목록 조회 (활성화된 상품만)"""
+    """일반 사용자용 상품 목록 조회 (활성화된 상품만, 로그인 시 찜 여부 포함)"""
     offset = (page - 1) * limit
 
     # 전체 상품 수 조회 (활성화된 상품만)
@@ -504,7 +400,14 @@ async def get_products(
         query = query.where(Product.category == category)
     if search:
         query = query.where(Product.name.ilike(f"%{search}%"))
-    query = query.order_by(sql_desc(Product.created_at)).offset(offset).limit(limit)
+    if sort == "popular":
+        # 집계 없이 product_stats.wishlist_count 인덱스로 정렬 (찜이 없던 상품은 뒤로)
+        query = query.outerjoin(ProductStats, ProductStats.product_id == Product.id).order_by(
+            sql_desc(ProductStats.wishlist_count).nullslast(), sql_desc(Product.created_at)
+        )
+    else:
+        query = query.order_by(sql_desc(Product.created_at))
+    query = query.offset(offset).limit(limit)
 
     result = await db.execute(query)
     products = result.scalars().all()
@@ -522,11 +425,14 @@ async def get_products(
     stats_result = await db.execute(stats_query)
     stats_row = stats_result.one()
 
+    product_responses = [ProductResponse.model_validate(p) for p in products]
+    await mark_wished(db, current_user, product_responses)
+
     return {
         "total": total,
         "page": page,
         "limit": limit,
-        "products": [ProductResponse.model_validate(p) for p in products],
+        "products": product_responses,
         "stats": {
             "total": stats_row.total or 0,
             "selling": stats_row.selling or 0,
@@ -545,7 +451,8 @@ async def read_product(
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
-    product = await _heal_product_embedding(db, product)
+    # 손상 데이터는 복구 큐에만 등록하고 즉시 응답 (Non-blocking)
+    await enqueue_if_broken(product)
     return product
 
 
@@ -553,7 +460,7 @@ async def read_product(
 async def delete_product(
     product_id: int,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ):
     """상품 삭제 (관리자 전용 - 소프트 삭제)"""
     if not current_user.is_superuser:
@@ -575,13 +482,13 @@ async def llm_query_product(
     product_id: int,
     query_body: LLMQueryBody,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> Dict[str, str]:
     product = await crud_product.get(db, product_id=product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
-    product = await _heal_product_embedding(db, product)
+    await enqueue_if_broken(product)
 
     context = (
         f"상품명: {product.name}, 카테고리: {product.category}, 가격: {product.price}원, "
@@ -595,7 +502,7 @@ async def llm_query_product(
     # SAFE_AI_URL 사용
     AI_SERVICE_API_URL = SAFE_AI_URL
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with pooled_client(30.0) as client:
         try:
             ai_response = await client.post(
                 f"{AI_SERVICE_API_URL}/llm-generate-response", 
@@ -613,14 +520,14 @@ async def llm_query_product(
 async def get_ai_coordination_products(
     product_id: int, 
     db: AsyncSession = Depends(deps.get_db),
-    current_user: Any = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> CoordinationResponse:
     
     product = await crud_product.get(db, product_id=product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
-    product = await _heal_product_embedding(db, product)
+    await enqueue_if_broken(product)
     
     
     has_embedding = (
@@ -641,7 +548,7 @@ async def get_ai_coordination_products(
     AI_SERVICE_API_URL = SAFE_AI_URL
     coordination_keywords = ["추천", "베이직", "데일리"]
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with pooled_client(10.0) as client:
         try:
             llm_res = await client.post(
                 f"{AI_SERVICE_API_URL}/llm-generate-response", 
@@ -659,7 +566,7 @@ async def get_ai_coordination_products(
     embedding_text = f"{product.name} 코디 {' '.join(coordination_keywords)}"
     coordination_vector = list(product.embedding) if product.embedding is not None else []
     
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with pooled_client(10.0) as client:
         try:
             vector_res = await client.post(
                 f"{AI_SERVICE_API_URL}/embed-text", 
@@ -693,10 +600,10 @@ async def get_ai_coordination_products(
 async def get_related_by_price(
     product_id: int, 
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> CoordinationResponse:
     product = await crud_product.get(db, product_id=product_id)
-    product = await _heal_product_embedding(db, product) 
+    await enqueue_if_broken(product)
     
     if not product or not product.embedding:
         raise HTTPException(status_code=404, detail="AI Analysis Required")
@@ -728,10 +635,10 @@ async def get_related_by_price(
 async def get_related_by_color(
     product_id: int, 
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> CoordinationResponse:
     product = await crud_product.get(db, product_id=product_id)
-    product = await _heal_product_embedding(db, product)
+    await enqueue_if_broken(product)
     
     if not product or not product.embedding:
         raise HTTPException(status_code=404, detail="AI Analysis Required")
@@ -742,7 +649,7 @@ async def get_related_by_color(
     AI_SERVICE_API_URL = SAFE_AI_URL
     target_color = "유사색상"
     
-    async with httpx.AsyncClient(timeout=5.0) as client:
+    async with pooled_client(5.0) as client:
         try:
             llm_res = await client.post(
                 f"{AI_SERVICE_API_URL}/llm-generate-response", 
@@ -756,7 +663,7 @@ async def get_related_by_color(
     embedding_text = f"{product.name} 디자인 {target_color} 색상"
     color_vector = product.embedding 
     
-    async with httpx.AsyncClient(timeout=5.0) as client:
+    async with pooled_client(5.0) as client:
         try:
             vector_res = await client.post(
                 f"{AI_SERVICE_API_URL}/embed-text", 
@@ -783,10 +690,10 @@ async def get_related_by_color(
 async def get_related_by_brand(
     product_id: int, 
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> CoordinationResponse:
     product = await crud_product.get(db, product_id=product_id)
-    product = await _heal_product_embedding(db, product)
+    await enqueue_if_broken(product)
     
     if not product or not product.embedding:
         raise HTTPException(status_code=404, detail="AI Analysis Required")
@@ -797,7 +704,7 @@ async def get_related_by_brand(
     AI_SERVICE_API_URL = SAFE_AI_URL
     style_keywords = ["유사 스타일"]
     
-    async with httpx.AsyncClient(timeout=5.0) as client:
+    async with pooled_client(5.0) as client:
         try:
             llm_res = await client.post(
                 f"{AI_SERVICE_API_URL}/llm-generate-response", 
@@ -812,7 +719,7 @@ async def get_related_by_brand(
     embedding_text = f"다른 브랜드 {product.category} {', '.join(style_keywords)}"
     brand_vector = product.embedding 
     
-    async with httpx.AsyncClient(timeout=5.0) as client:
+    async with pooled_client(5.0) as client:
         try:
             vector_res = await client.post(
                 f"{AI_SERVICE_API_URL}/embed-text", 
@@ -1,9 +1,12 @@
 import logging
 import base64
 import asyncio
+import json
 import re
 from typing import Optional, List, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 import httpx
 from pydantic import BaseModel, ValidationError 
@@ -13,6 +16,11 @@ from src.crud.crud_product import crud_product
 from src.schemas.product import ProductResponse
 from src.config.settings import settings
 from src.constants import ProductCategory
+from src.db.session import async_session_maker
+from src.core.http_client import pooled_client
+from src.services.principal_cache import Principal
+from src.services.wishlist_cache import mark_wished
+from src.utils.intent_matcher import intent_matcher
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -39,10 +47,10 @@ def detect_gender_intent(query: str) -> Optional[str]:
     """검색어에서 성별 키워드 추출"""
     if not query:
         return None
-    q = query.lower()
-    if any(x in q for x in ["남자", "남성", "맨", "men", "male", "boy"]):
+    labels = intent_matcher.labels(query.lower())
+    if "gender_male" in labels:
         return "Male"
-    elif any(x in q for x in ["여자", "여성", "우먼", "women", "female", "girl"]):
+    elif "gender_female" in labels:
         return "Female"
     return None
 
@@ -50,18 +58,13 @@ def extract_core_keyword(query: str) -> str:
     """검색어에서 핵심 상품 키워드 추출 (성별/수식어 제거)"""
     if not query:
         return ""
-        
-    # 제거할 단어들
-    remove_words = [
-        "남자", "여자", "남성", "여성", "남성용", "여성용",
-        "추천", "해줘", "보여줘", "찾아줘", "알려줘",
-        "스타일", "패션", "의류", "용"
-    ]
-    # "옷"은 제거하지 않음 - 검색어로 유의미함
     
-    result = query
-    for word in remove_words:
-        result = result.replace(word, "")
+    # 제거할 단어 위치를 한 번에 찾아서 잘라냄
+    removed = [False] * len(query)
+    for match in intent_matcher.scan(query):
+        if match.label == "remove_word":
+            removed[match.start:match.end] = [True] * (match.end - match.start)
+    result = "".join(ch for ch, skip in zip(query, removed) if not skip)
     
     # 조사 제거 (은/는/이/가 등)
     result = re.sub(r'(은|는|이|가|을|를|의|에|로)$', '', result.strip())
@@ -72,14 +75,11 @@ def is_celebrity_search(query: str) -> bool:
     """연예인/인물 검색인지 판단"""
     if not query:
         return False
-        
-    # 패션 관련 키워드와 함께 사용된 경우
-    fashion_keywords = ["패션", "스타일", "코디", "룩", "공항", "착장", "의상", "옷"]
     
-    # 한글 이름 패턴 (2-4글자)
+    # 한글 이름 패턴 (2-4글자) + 패션 관련 키워드와 함께 사용된 경우
     korean_name = re.search(r'[가-힣]{2,4}', query)
     
-    if korean_name and any(k in query for k in fashion_keywords):
+    if korean_name and "fashion_keyword" in intent_matcher.labels(query):
         return True
     
     return False
@@ -103,6 +103,15 @@ async def fetch_image_as_base64(url: str) -> Optional[str]:
         logger.warning(f"⚠️ Failed to proxy image ({url}): {e}")
     return None
 
+async def proxy_reference_image(ref_image_url: Optional[str]) -> Optional[str]:
+    """외부 이미지 URL이면 프록시 처리 (실패 시 원래 URL 유지)"""
+    if ref_image_url and ref_image_url.startswith("http"):
+        logger.info("🔄 Proxying reference image...")
+        proxy_image = await fetch_image_as_base64(ref_image_url)
+        if proxy_image:
+            return proxy_image
+    return ref_image_url
+
 def filter_by_negative_prompt(products: List[Any], negative_prompt: Optional[str]) -> List[Any]:
     """네거티브 프롬프트로 상품 필터링"""
     if not negative_prompt or not negative_prompt.strip():
@@ -152,6 +161,8 @@ def map_product_to_response(product) -> Optional[ProductResponse]:
             "stock_quantity": int(product.stock_quantity) if product.stock_quantity else 0,
             "category": product.category or "Etc",
             "image_url": product.image_url or "",
+            "image_variants": getattr(product, "image_variants", None),
+            "wishlist_count": getattr(product, "wishlist_count", None) or 0,
             "gender": product.gender or "Unisex",
             "is_active": product.is_active if product.is_active is not None else True,
             "created_at": product.created_at,
@@ -165,6 +176,143 @@ def map_product_to_response(product) -> Optional[ProductResponse]:
         return None
 
 
+def _ai_service_api_url() -> str:
+    raw_url = settings.AI_SERVICE_API_URL.rstrip("/")
+    return raw_url if "/api/v1" in raw_url else f"{raw_url}/api/v1"
+
+def _parse_ai_result(data: Dict[str, Any]) -> Dict[str, Any]:
+    """AI 서비스 응답(/process-*, 스트림 이벤트)에서 벡터와 분석 결과 추출"""
+    parsed: Dict[str, Any] = {"bert_vec": None, "clip_vec": None}
+    if "vectors" in data:
+        parsed["bert_vec"] = data["vectors"].get("bert")
+        parsed["clip_vec"] = data["vectors"].get("clip")
+    elif "vector" in data:
+        parsed["bert_vec"] = data["vector"]
+
+    if "ai_analysis" in data and data["ai_analysis"]:
+        analysis = data["ai_analysis"]
+        parsed["summary"] = analysis.get("summary")
+        parsed["ref_image_url"] = analysis.get("reference_image")
+        parsed["candidates"] = analysis.get("candidates", [])
+    else:
+        parsed["summary"] = data.get("description") or data.get("reason")
+        parsed["ref_image_url"] = data.get("ref_image")
+        parsed["candidates"] = []
+    return parsed
+
+async def _search_products(
+    db: AsyncSession,
+    *,
+    query: str,
+    core_keyword: str,
+    search_path: str,
+    search_strategy: str,
+    bert_vec: Optional[List[float]],
+    clip_vec: Optional[List[float]],
+    limit: int,
+    negative_prompt: Optional[str],
+    target_gender: Optional[str],
+) -> Dict[str, Any]:
+    """벡터/키워드 기반 DB 검색 + 네거티브 필터링 + 응답 매핑"""
+    results = []
+    gender_filtered = True # 성별 필터 적용 여부 추적
+
+    # 네거티브 프롬프트가 있으면 더 많은 후보 검색
+    search_limit = limit * 2 if negative_prompt else limit
+
+    try:
+        # Case A: EXTERNAL 경로이면서 CLIP 벡터가 있는 경우
+        if search_path == "EXTERNAL" and clip_vec and len(clip_vec) == 512:
+            logger.info(f"🖼️ Using CLIP image vector search (512-dim)")
+
+            results = await crud_product.search_by_clip_vector(
+                db,
+                clip_vector=clip_vec,
+                limit=search_limit,
+                filter_gender=target_gender
+            )
+            
+            if results:
+                search_strategy = "CLIP_VISUAL_SEARCH"
+                logger.info(f"✅ CLIP search found {len(results)} products")
+            else:
+                logger.info(f"⚠️ CLIP search empty, falling back to BERT")
+                if bert_vec and len(bert_vec) == 768:
+                    results = await crud_product.search_hybrid(
+                        db,
+                        bert_vector=bert_vec,
+                        limit=search_limit,
+                        filter_gender=target_gender
+                    )
+                    search_strategy = "BERT_FALLBACK"
+
+        # Case B: INTERNAL 경로 또는 벡터 검색 실패 시 -> 스마트 하이브리드
+        if not results:
+            results = await crud_product.search_smart_hybrid(
+                db,
+                query=core_keyword,
+                bert_vector=bert_vec,
+                clip_vector=clip_vec,
+                limit=search_limit,
+                filter_gender=target_gender
+            )
+            
+            # 결과 없으면 성별 필터를 완화
+            if not results:
+                logger.info(f"⚠️ No results with gender filter '{target_gender}', trying relaxed search")
+                results = await crud_product.search_smart_hybrid(
+                    db,
+                    query=query,
+                    bert_vector=bert_vec,
+                    clip_vector=clip_vec,
+                    limit=search_limit,
+                    filter_gender=None
+                )
+                if results:
+                    search_strategy = "RELAXED_SEARCH"
+                    gender_filtered = False
+                    logger.info(f"⚠️ Relaxed search found {len(results)} products (gender filter removed)")
+
+        # Case C: 최후의 수단 (최신 상품)
+        if not results:
+            results = await crud_product.get_multi(db, limit=search_limit)
+            search_strategy = "FALLBACK_LATEST"
+            gender_filtered = False
+
+    except Exception as e:
+        logger.error(f"❌ DB Search Error: {e}")
+        raise HTTPException(status_code=500, detail="Database Search Failed")
+
+    # 네거티브 프롬프트 필터링
+    filtered_count = 0
+    if negative_prompt and results:
+        original_count = len(results)
+        results = filter_by_negative_prompt(results, negative_prompt)
+        filtered_count = original_count - len(results)
+        logger.info(f"🚫 Negative filtering removed {filtered_count} products")
+
+    # 최종 결과 자르기 + Response 매핑
+    product_responses = []
+    for p in results[:limit]:
+        response = map_product_to_response(p)
+        if response:
+            product_responses.append(response)
+
+    logger.info(f"✅ Search Complete: {len(product_responses)} products found (Strategy: {search_strategy})")
+
+    return {
+        "search_path": search_strategy,
+        "gender_filter_applied": gender_filtered,
+        "detected_gender": target_gender,
+        "negative_prompt_applied": negative_prompt is not None and negative_prompt.strip() != "",
+        "filtered_count": filtered_count,
+        "products": product_responses,
+    }
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data), ensure_ascii=False)}\n\n"
+
+
 # ------------------------------------------------------------------
 # Endpoints
 # ------------------------------------------------------------------
@@ -173,6 +321,7 @@ def map_product_to_response(product) -> Optional[ProductResponse]:
 async def search_by_clip_image(
     request: ClipSearchRequest,
     db: AsyncSession = Depends(deps.get_db),
+    current_user: Optional[Principal] = Depends(deps.get_optional_principal),
 ):
     """
     이미지 기반 상품 검색 (CLIP Vector)
@@ -204,7 +353,7 @@ async def search_by_clip_image(
     
     try:
         # 2. AI 서비스에서 CLIP 벡터 생성
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with pooled_client(30.0) as client:
             clip_res = await client.post(
                 f"{AI_SERVICE_API_URL}/generate-fashion-clip-vector",
                 json={
@@ -249,6 +398,7 @@ async def search_by_clip_image(
             response = map_product_to_response(p)
             if response:
                 product_responses.append(response)
+        await mark_wished(db, current_user, product_responses)
         
         return {
             "status": "SUCCESS",
@@ -275,7 +425,7 @@ async def analyze_image_proxy(request: ImageAnalysisRequest):
         AI_SERVICE_API_URL = raw_url
 
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with pooled_client(60.0) as client:
             target_url = f"{AI_SERVICE_API_URL}/analyze-image-detail"
             logger.info(f"📤 Calling AI Service: {target_url}")
 
@@ -300,6 +450,7 @@ async def ai_search(
     limit: int = Form(12),
     negative_prompt: Optional[str] = Form(None, description="제외할 키워드 (쉼표로 구분)"),
     db: AsyncSession = Depends(deps.get_db),
+    current_user: Optional[Principal] = Depends(deps.get_optional_principal),
 ) -> Any:
     """
     [Upgraded v3] 스마트 하이브리드 검색
@@ -323,12 +474,7 @@ async def ai_search(
             raise HTTPException(status_code=400, detail="Invalid image file")
 
     # 3. AI Service 호출 (경로 판단 및 벡터 생성)
-    # ✅ [FIX] URL 보정 로직 (핵심 수정 사항)
-    raw_url = settings.AI_SERVICE_API_URL.rstrip("/")
-    if "/api/v1" not in raw_url:
-        AI_SERVICE_API_URL = f"{raw_url}/api/v1"
-    else:
-        AI_SERVICE_API_URL = raw_url
+    AI_SERVICE_API_URL = _ai_service_api_url()
     
     search_strategy = "SMART_HYBRID"
     search_path = "INTERNAL"
@@ -342,9 +488,8 @@ async def ai_search(
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
+            async with pooled_client(120.0) as client:
                 # 3-1. 경로 결정 API 호출
-                # 이제 AI_SERVICE_API_URL 뒤에 /api/v1이 붙어있으므로 정상 작동함
                 path_res = await client.post(
                     f"{AI_SERVICE_API_URL}/determine-path",
                     json={"query": query}
@@ -366,33 +511,17 @@ async def ai_search(
                 ai_res.raise_for_status()
                 
                 data = ai_res.json()
-                
-                # 벡터 추출
-                if "vectors" in data:
-                    bert_vec = data["vectors"].get("bert")
-                    clip_vec = data["vectors"].get("clip")
-                    logger.info(f"📊 Vectors received - BERT: {len(bert_vec) if bert_vec else 0}dim, CLIP: {len(clip_vec) if clip_vec else 0}dim")
-                elif "vector" in data:
-                    bert_vec = data["vector"]
-                
-                # AI 분석 결과 추출
-                if "ai_analysis" in data and data["ai_analysis"]:
-                    analysis = data["ai_analysis"]
-                    ai_summary = analysis.get("summary") or ai_summary
-                    ref_image_url = analysis.get("reference_image")
-                    candidates = analysis.get("candidates", [])
-                else:
-                    ai_summary = data.get("description") or data.get("reason") or ai_summary
-                    ref_image_url = data.get("ref_image")
-                
+                parsed = _parse_ai_result(data)
+                bert_vec, clip_vec = parsed["bert_vec"], parsed["clip_vec"]
+                logger.info(f"📊 Vectors received - BERT: {len(bert_vec) if bert_vec else 0}dim, CLIP: {len(clip_vec) if clip_vec else 0}dim")
+
+                ai_summary = parsed["summary"] or ai_summary
+                ref_image_url = parsed["ref_image_url"]
+                candidates = parsed["candidates"]
                 search_strategy = data.get("strategy", search_path).upper()
                 
                 # 외부 이미지 URL이면 프록시 처리
-                if ref_image_url and ref_image_url.startswith("http"):
-                    logger.info(f"🔄 Proxying reference image...")
-                    proxy_image = await fetch_image_as_base64(ref_image_url)
-                    if proxy_image:
-                        ref_image_url = proxy_image
+                ref_image_url = await proxy_reference_image(ref_image_url)
                 
                 break # 성공 시 재시도 루프 탈출
 
@@ -403,107 +532,148 @@ async def ai_search(
                 logger.error(f"❌ AI Service failed after {max_retries} retries")
             await asyncio.sleep(1)
 
-    # 4. 🌟 검색 실행 - DB 조회
-    results = []
-    gender_filtered = True # 성별 필터 적용 여부 추적
-
-    # 네거티브 프롬프트가 있으면 더 많은 후보 검색
-    search_limit = limit * 2 if negative_prompt else limit
-
-    try:
-        # Case A: EXTERNAL 경로이면서 CLIP 벡터가 있는 경우
-        if search_path == "EXTERNAL" and clip_vec and len(clip_vec) == 512:
-            logger.info(f"🖼️ Using CLIP image vector search (512-dim)")
-
-            results = await crud_product.search_by_clip_vector(
-                db,
-                clip_vector=clip_vec,
-                limit=search_limit,
-                filter_gender=target_gender
-            )
-            
-            if results:
-                search_strategy = "CLIP_VISUAL_SEARCH"
-                logger.info(f"✅ CLIP search found {len(results)} products")
-            else:
-                logger.info(f"⚠️ CLIP search empty, falling back to BERT")
-                if bert_vec and len(bert_vec) == 768:
-                    results = await crud_product.search_hybrid(
-                        db,
-                        bert_vector=bert_vec,
-                        limit=search_limit,
-                        filter_gender=target_gender
-                    )
-                    search_strategy = "BERT_FALLBACK"
-
-        # Case B: INTERNAL 경로 또는 벡터 검색 실패 시 -> 스마트 하이브리드
-        if not results:
-            results = await crud_product.search_smart_hybrid(
-                db,
-                query=core_keyword,
-                bert_vector=bert_vec,
-                clip_vector=clip_vec,
-                limit=search_limit,
-                filter_gender=target_gender
-            )
-            
-            # 결과 없으면 성별 필터를 완화
-            if not results:
-                logger.info(f"⚠️ No results with gender filter '{target_gender}', trying relaxed search")
-                results = await crud_product.search_smart_hybrid(
-                    db,
-                    query=query,
-                    bert_vector=bert_vec,
-                    clip_vector=clip_vec,
-                    limit=search_limit,
-                    filter_gender=None
-                )
-                if results:
-                    search_strategy = "RELAXED_SEARCH"
-                    gender_filtered = False
-                    logger.info(f"⚠️ Relaxed search found {len(results)} products (gender filter removed)")
-
-        # Case C: 최후의 수단 (최신 상품)
-        if not results:
-            results = await crud_product.get_multi(db, limit=search_limit)
-            search_strategy = "FALLBACK_LATEST"
-            gender_filtered = False
-
-    except Exception as e:
-        logger.error(f"❌ DB Search Error: {e}")
-        raise HTTPException(status_code=500, detail="Database Search Failed")
-
-    # 5. 네거티브 프롬프트 필터링
-    filtered_count = 0
-    if negative_prompt and results:
-        original_count = len(results)
-        results = filter_by_negative_prompt(results, negative_prompt)
-        filtered_count = original_count - len(results)
-        logger.info(f"🚫 Negative filtering removed {filtered_count} products")
-
-    # 6. 최종 결과 자르기
-    results = results[:limit]
-
-    # 7. Response 매핑
-    product_responses = []
-    for p in results:
-        response = map_product_to_response(p)
-        if response:
-            product_responses.append(response)
-
-    logger.info(f"✅ Search Complete: {len(product_responses)} products found (Strategy: {search_strategy})")
+    # 4. 🌟 검색 실행 - DB 조회 / 필터링 / 매핑
+    search_result = await _search_products(
+        db,
+        query=query,
+        core_keyword=core_keyword,
+        search_path=search_path,
+        search_strategy=search_strategy,
+        bert_vec=bert_vec,
+        clip_vec=clip_vec,
+        limit=limit,
+        negative_prompt=negative_prompt,
+        target_gender=target_gender,
+    )
+    await mark_wished(db, current_user, search_result["products"])
 
     return {
         "status": "SUCCESS",
-        "search_path": search_strategy,
-        "gender_filter_applied": gender_filtered,
-        "detected_gender": target_gender,
-        "negative_prompt_applied": negative_prompt is not None and negative_prompt.strip() != "",
-        "filtered_count": filtered_count,
+        **{k: v for k, v in search_result.items() if k != "products"},
         "ai_analysis": {
             "summary": ai_summary,
             "reference_image": ref_image_url,
             "candidates": candidates
         },
-        "products": product_responses
-    }
\ No newline at end of file
+        "products": search_result["products"]
+    }
+
+
+@router.post("/ai-search/stream")
+async def ai_search_stream(
+    query: str = Form(..., description="사용자 검색 쿼리"),
+    image_file: Optional[UploadFile] = File(None),
+    limit: int = Form(12),
+    negative_prompt: Optional[str] = Form(None, description="제외할 키워드 (쉼표로 구분)"),
+    current_user: Optional[Principal] = Depends(deps.get_optional_principal),
+):
+    """
+    스마트 하이브리드 검색 (SSE 스트리밍)
+    - products: 상품 목록 (EXTERNAL 경로는 CLIP 단계가 끝나는 즉시 전송)
+    - summary: AI 요약 (VLM 분석 완료 시 전송)
+    - done: 스트림 종료
+    """
+    logger.info(f"🔍 AI Search Stream Request: '{query}' (Image: {image_file is not None}, Negative: {negative_prompt})")
+
+    target_gender = detect_gender_intent(query)
+    core_keyword = extract_core_keyword(query)
+
+    image_b64: Optional[str] = None
+    if image_file:
+        try:
+            image_b64 = base64.b64encode(await image_file.read()).decode("utf-8")
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid image file")
+
+    AI_SERVICE_API_URL = _ai_service_api_url()
+    payload = {"query": query, "image_b64": image_b64}
+
+    async def search(session: AsyncSession, search_path: str, strategy: str, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        result = await _search_products(
+            session,
+            query=query,
+            core_keyword=core_keyword,
+            search_path=search_path,
+            search_strategy=strategy,
+            bert_vec=parsed.get("bert_vec"),
+            clip_vec=parsed.get("clip_vec"),
+            limit=limit,
+            negative_prompt=negative_prompt,
+            target_gender=target_gender,
+        )
+        await mark_wished(session, current_user, result["products"])
+        return result
+
+    def products_event(result: Dict[str, Any], parsed: Dict[str, Any]) -> str:
+        return _sse("products", {
+            "status": "SUCCESS",
+            **result,
+            "ai_analysis": {
+                "summary": parsed.get("summary"),
+                "reference_image": parsed.get("ref_image_url"),
+                "candidates": parsed.get("candidates", [])
+            },
+        })
+
+    async def event_stream():
+        # 스트리밍 응답은 의존성(get_db) 종료 이후에도 이어지므로 세션을 직접 관리
+        products_sent = False
+        async with async_session_maker() as session:
+            try:
+                async with pooled_client(httpx.Timeout(120.0, connect=5.0)) as client:
+                    path_res = await client.post(f"{AI_SERVICE_API_URL}/determine-path", json={"query": query})
+                    search_path = path_res.json().get("path", "INTERNAL") if path_res.status_code == 200 else "INTERNAL"
+                    logger.info(f"🛤️ Search Path Decision (stream): {search_path}")
+
+                    if search_path != "EXTERNAL":
+                        ai_res = await client.post(f"{AI_SERVICE_API_URL}/process-internal", json=payload)
+                        ai_res.raise_for_status()
+                        data = ai_res.json()
+                        parsed = _parse_ai_result(data)
+                        parsed["ref_image_url"] = await proxy_reference_image(parsed["ref_image_url"])
+                        result = await search(session, search_path, data.get("strategy", search_path).upper(), parsed)
+                        yield products_event(result, parsed)
+                        products_sent = True
+                        yield _sse("summary", {"summary": parsed["summary"] or "검색 결과입니다."})
+                    else:
+                        # ai-service가 단계별로 내보내는 NDJSON 이벤트를 그대로 SSE로 중계
+                        async with client.stream("POST", f"{AI_SERVICE_API_URL}/process-external-stream", json=payload) as ai_res:
+                            ai_res.raise_for_status()
+                            async for line in ai_res.aiter_lines():
+                                if not line.strip():
+                                    continue
+                                event = json.loads(line)
+                                kind = event.pop("event", None)
+
+                                if kind in ("candidates", "fallback"):
+                                    path = "EXTERNAL" if kind == "candidates" else "INTERNAL"
+                                    parsed = _parse_ai_result(event)
+                                    parsed["ref_image_url"] = await proxy_reference_image(parsed["ref_image_url"])
+                                    result = await search(session, path, event.get("strategy", path).upper(), parsed)
+                                    yield products_event(result, parsed)
+                                    products_sent = True
+                                    if kind == "fallback":
+                                        yield _sse("summary", {"summary": parsed["summary"] or "검색 결과입니다."})
+                                elif kind == "summary":
+                                    yield _sse("summary", {"summary": event.get("summary")})
+                                elif kind == "error":
+                                    logger.warning(f"⚠️ AI stream error: {event.get('detail')}")
+            except Exception as e:
+                logger.error(f"❌ AI Search Stream failed: {e}")
+                if not products_sent:
+                    # 실패한 세션은 트랜잭션이 중단됐을 수 있으므로 새 세션으로 키워드 검색
+                    try:
+                        async with async_session_maker() as fallback_session:
+                            result = await search(fallback_session, "INTERNAL", "KEYWORD_FALLBACK", {})
+                        yield products_event(result, {})
+                    except Exception as search_error:
+                        logger.error(f"❌ Fallback search failed: {search_error}")
+                        yield _sse("error", {"detail": "Database Search Failed"})
+
+        yield _sse("done", {})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,10 +1,9 @@
 from typing import Any
 from fastapi import APIRouter, UploadFile, File, HTTPException
-import shutil
-import os
-from uuid import uuid4
 import logging
 
+from src.services.storage import content_path, file_digest, get_storage_service
+
 # 로거 설정
 logger = logging.getLogger(__name__)
 
@@ -13,15 +12,7 @@ router = APIRouter()
 @router.post("/upload/image")
 async def upload_image(file: UploadFile = File(...)) -> Any:
     try:
-        # 1. 저장 경로 설정 (Docker Volume 경로)
-        UPLOAD_DIR = "/app/src/static/images"
-        
-        # 2. 폴더가 없으면 생성 (권한 문제 방지)
-        if not os.path.exists(UPLOAD_DIR):
-            os.makedirs(UPLOAD_DIR, exist_ok=True)
-            logger.info(f"📁 Created directory: {UPLOAD_DIR}")
-
-        # 3. 파일명 안전하게 변경 (UUID 사용)
+        # 1. 파일명 안전하게 변경 (내용 hash 사용 → 같은 이미지는 같은 경로, immutable 캐시 가능)
         # 확장자가 없는 경우를 대비한 안전장치 추가
         filename = file.filename or "unknown.jpg"
         file_extension = filename.split(".")[-1].lower()
@@ -30,19 +21,20 @@ async def upload_image(file: UploadFile = File(...)) -> Any:
         if file_extension not in ["jpg", "jpeg", "png", "webp"]:
             file_extension = "jpg" # 기본값 설정
 
-        new_filename = f"{uuid4()}.{file_extension}"
-        file_path = os.path.join(UPLOAD_DIR, new_filename)
+        path = content_path("images", await file_digest(file), f"upload.{file_extension}")
 
-        # 4. 파일 저장
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # 2. 파일 저장 (StorageService: 청크 단위 논블로킹 쓰기, Local/S3 공용)
+        # 이미 같은 내용이 저장돼 있으면 다시 쓰지 않음
+        storage = get_storage_service()
+        if not await storage.exists(path):
+            path = await storage.upload(file, path)
 
-        logger.info(f"✅ [Upload] Saved to: {file_path}")
+        logger.info(f"✅ [Upload] Saved to: {path}")
 
-        # 5. URL 반환
+        # 3. URL 반환
         # 프론트엔드에서 이 URL을 받아서 'Create Product' 할 때 사용합니다.
-        return {"url": f"/static/images/{new_filename}"}
+        return {"url": storage.public_url(path)}
 
     except Exception as e:
         logger.error(f"❌ Upload Failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Image upload failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Image upload failed: {str(e)}")
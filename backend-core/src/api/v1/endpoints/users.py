@@ -6,10 +6,11 @@ from src.api import deps
 from src.crud import crud_user
 from src.schemas.user import User, UserUpdate
 from src.models.user import User as UserModel
+from src.services.principal_cache import Principal, invalidate_principal
 
 router = APIRouter()
 
-def check_superuser(current_user: UserModel = Depends(deps.get_current_user)) -> UserModel:
+def check_superuser(current_user: Principal = Depends(deps.get_current_principal)) -> Principal:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -42,6 +43,7 @@ async def update_user_me(
             )
 
     updated_user = await crud_user.update_user(db, db_obj=current_user, obj_in=user_in)
+    await invalidate_principal(current_user.id)
 
     return updated_user
 
@@ -53,7 +55,7 @@ async def get_users_list(
     search: Optional[str] = Query(None, description="이메일 또는 이름 검색"),
     is_active: Optional[bool] = Query(None, description="활성화 상태 필터"),
     db: AsyncSession = Depends(deps.get_db),
-    current_user: UserModel = Depends(check_superuser),
+    current_user: Principal = Depends(check_superuser),
 ) -> Any:
     """관리자용 사용자 목록 조회"""
     offset = (page - 1) * limit
@@ -115,7 +117,7 @@ async def update_user_status(
     user_id: int,
     status_data: dict,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: UserModel = Depends(check_superuser),
+    current_user: Principal = Depends(check_superuser),
 ) -> Any:
     """관리자용 사용자 상태 업데이트 (활성화/비활성화, 관리자 권한)"""
     # 사용자 조회
@@ -138,5 +140,7 @@ async def update_user_status(
 
     await db.commit()
     await db.refresh(user)
+    # 비활성화/권한 변경이 다음 요청부터 반영되도록 인증 캐시 삭제
+    await invalidate_principal(user.id)
 
     return user
\ No newline at end of file
@@ -1,12 +1,16 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, desc
+from sqlalchemy import select, delete, desc, exists, literal, Integer
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 
 from src.api import deps
+from src.config.settings import settings
 from src.models.wishlist import Wishlist
 from src.models.product import Product
-from src.models.user import User
+from src.services.principal_cache import Principal
+from src.services.wishlist_cache import record_toggle, wished_product_ids
 from src.schemas.product import ProductResponse
 
 router = APIRouter()
@@ -18,30 +22,52 @@ router = APIRouter()
 async def toggle_wishlist(
     product_id: int,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     이미 찜한 상태면 삭제(OFF), 아니면 추가(ON)합니다.
+    단일 SQL 문으로 처리 (조회 → 삭제/추가 왕복 없음):
+      1) DELETE ... RETURNING 으로 삭제 시도
+      2) 삭제된 행이 없을 때만 INSERT ... ON CONFLICT DO NOTHING (uq_wishlist_user_product)
+    동시에 두 번 눌러 INSERT가 충돌해도 에러 없이 '찜한 상태'로 응답합니다.
+    product_stats.wishlist_count 는 wishlists 트리거가 같은 트랜잭션에서 갱신합니다.
     """
-    # 1. 이미 존재하는지 확인
-    stmt = select(Wishlist).where(
-        Wishlist.user_id == current_user.id,
-        Wishlist.product_id == product_id
+    deleted = (
+        delete(Wishlist)
+        .where(Wishlist.user_id == current_user.id, Wishlist.product_id == product_id)
+        .returning(Wishlist.id)
+        .cte("deleted")
+    )
+    inserted = (
+        pg_insert(Wishlist)
+        .from_select(
+            ["user_id", "product_id"],
+            select(literal(current_user.id, Integer), literal(product_id, Integer))
+            .where(~exists(select(deleted.c.id))),
+        )
+        .on_conflict_do_nothing(constraint="uq_wishlist_user_product")
+        .returning(Wishlist.id)
+        .cte("inserted")
+    )
+    stmt = select(
+        exists(select(deleted.c.id)).label("removed"),
+        exists(select(inserted.c.id)).label("added"),
     )
-    result = await db.execute(stmt)
-    existing_wish = result.scalars().first()
 
-    if existing_wish:
-        # 2. 존재하면 삭제 (찜 취소)
-        await db.delete(existing_wish)
+    try:
+        row = (await db.execute(stmt)).one()
         await db.commit()
+    except IntegrityError:
+        # 존재하지 않는 상품 (FK 위반)
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="상품을 찾을 수 없습니다.")
+
+    is_wished = not row.removed
+    await record_toggle(current_user.id, product_id, is_wished)
+    if row.removed:
         return {"status": "removed", "is_wished": False}
-    else:
-        # 3. 없으면 생성 (찜 하기)
-        new_wish = Wishlist(user_id=current_user.id, product_id=product_id)
-        db.add(new_wish)
-        await db.commit()
-        return {"status": "added", "is_wished": True}
+    # added=False 이면 동시 요청이 먼저 추가한 경우 (이미 찜한 상태)
+    return {"status": "added", "is_wished": True}
 
 # ------------------------------------------------------------------
 # 2. 단일 상품 찜 여부 확인 (하트 색상 결정용)
@@ -50,29 +76,43 @@ async def toggle_wishlist(
 async def check_wishlist_status(
     product_id: int,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     현재 로그인한 유저가 특정 상품을 찜했는지 확인합니다.
     """
-    stmt = select(Wishlist).where(
-        Wishlist.user_id == current_user.id,
-        Wishlist.product_id == product_id
-    )
-    result = await db.execute(stmt)
-    existing_wish = result.scalars().first()
-    
-    return {"is_wished": existing_wish is not None}
+    wished = await wished_product_ids(db, current_user.id, [product_id])
+    return {"is_wished": product_id in wished}
+
+# ------------------------------------------------------------------
+# 3. 여러 상품 찜 여부 일괄 확인 (상품 목록/검색 결과 그리드용)
+# ------------------------------------------------------------------
+@router.get("/status")
+async def check_wishlist_status_bulk(
+    product_ids: List[int] = Query(..., description="확인할 상품 ID 목록 (?product_ids=1&product_ids=2)"),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_principal),
+) -> Any:
+    """
+    요청한 상품 중 찜한 상품 ID 목록을 반환합니다. (카드마다 /check 를 호출하지 않도록)
+    """
+    if len(product_ids) > settings.WISHLIST_STATUS_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {settings.WISHLIST_STATUS_MAX_IDS}개 상품까지 조회할 수 있습니다.",
+        )
+    wished = await wished_product_ids(db, current_user.id, product_ids)
+    return {"wished_ids": sorted(wished)}
 
 # ------------------------------------------------------------------
-# 3. 내 위시리스트 목록 조회 (모달용)
+# 4. 내 위시리스트 목록 조회 (모달용)
 # ------------------------------------------------------------------
 @router.get("/", response_model=List[ProductResponse])
 async def read_wishlist(
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     내가 찜한 상품들의 상세 정보를 최신순으로 가져옵니다.
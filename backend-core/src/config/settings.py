@@ -1,5 +1,5 @@
 import os
-from typing import Literal, Any, Dict, List
+from typing import Literal, Any, Dict, List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator, EmailStr, Field
 
@@ -44,7 +44,54 @@ class Settings(BaseSettings):
     REDIS_HOST: str
     REDIS_PORT: int = 6379
     CELERY_TASK_TIME_LIMIT: int = 600
-    
+
+    # Embedding Repair Queue (Self-Healing 백그라운드 처리)
+    EMBEDDING_REPAIR_BATCH_SIZE: int = Field(32, description="워커가 한 번에 복구하는 상품 수")
+    EMBEDDING_REPAIR_MAX_ATTEMPTS: int = Field(3, description="상품별 최대 복구 시도 횟수")
+    EMBEDDING_REPAIR_LLM_CONCURRENCY: int = Field(4, description="설명 생성 LLM 동시 호출 수")
+
+    # CSV Product Import (백그라운드 대량 등록)
+    IMPORT_TMP_DIR: str = Field("/app/tmp/imports", description="업로드된 CSV 임시 저장 경로 (API/워커 공유 볼륨)")
+    IMPORT_BATCH_SIZE: int = Field(100, description="배치당 처리/INSERT 행 수")
+    IMPORT_DOWNLOAD_CONCURRENCY: int = Field(8, description="이미지 다운로드 동시 실행 수")
+    IMPORT_JOB_TTL: int = Field(86400, description="작업 상태/에러 리포트 보관 시간(초)")
+
+    # Re-embedding (모델 업그레이드 시 shadow 컬럼 채우기)
+    REEMBED_BATCH_SIZE: int = Field(64, description="재임베딩 배치당 상품 수")
+    REEMBED_THROTTLE_SECONDS: float = Field(2.0, description="배치 사이 대기 시간 (서비스 부하 제한)")
+
+    # Replicate 호출 제한 (0: 제한 없음)
+    REPLICATE_DAILY_QUOTA: int = Field(0, description="Replicate 일일 허용 호출 수")
+    REPLICATE_RATE_PER_SEC: float = Field(1.0, description="Replicate 초당 허용 호출 수 (토큰 보충 속도)")
+    REPLICATE_BURST: int = Field(3, description="Replicate 순간 최대 호출 수 (버킷 용량)")
+
+    # Virtual Fitting (Replicate prediction 비동기 작업)
+    REPLICATE_API_TOKEN: Optional[str] = Field(None, description="Replicate API 토큰")
+    REPLICATE_API_BASE: str = Field("https://api.replicate.com/v1", description="Replicate API 주소 (로컬 스텁으로 교체 가능)")
+    FITTING_WEBHOOK_BASE_URL: Optional[str] = Field(None, description="Replicate webhook 수신용 백엔드 외부 주소 (미설정 시 폴링만 사용)")
+    FITTING_POLL_INTERVAL: float = Field(2.0, description="prediction 상태 폴링 간격 (초)")
+    FITTING_JOB_TIMEOUT: int = Field(600, description="prediction 최대 대기 시간 (초)")
+    FITTING_JOB_TTL: int = Field(86400, description="작업 상태 보관 시간 (초)")
+    FITTING_CACHE_TTL: int = Field(3000, description="동일 입력 결과 캐시 시간 (초, Replicate 결과 URL 만료 시간 이내)")
+    FITTING_THUMBNAIL_SIZE: int = Field(384, description="피팅 결과 썸네일 긴 변 길이 (px)")
+    FITTING_INGEST_CHUNK_SIZE: int = Field(1024 * 1024, description="결과 이미지 스트리밍 복사 청크 크기 (bytes)")
+
+    # 인증 주체 캐시 (get_current_principal)
+    PRINCIPAL_CACHE_TTL: int = Field(300, description="Redis 캐시 시간 (초, 0: 캐시 비활성화)")
+    PRINCIPAL_LOCAL_TTL: float = Field(5.0, description="프로세스 내 LRU 캐시 시간 (초, 다른 프로세스의 변경 반영 지연 상한)")
+    PRINCIPAL_LOCAL_SIZE: int = Field(10000, description="프로세스 내 LRU 최대 항목 수")
+
+    # 위시리스트 찜 상태 캐시 (사용자별 Redis Set)
+    WISHLIST_CACHE_TTL: int = Field(600, description="찜 상품 ID 캐시 시간 (초, 0: 캐시 비활성화)")
+    WISHLIST_STATUS_MAX_IDS: int = Field(200, description="찜 상태 일괄 조회 1회당 최대 상품 수")
+
+    # 라우팅 사전 핫 리로드 (성별/불용어/패션 키워드)
+    INTENT_DICT_POLL_SECONDS: float = Field(5.0, description="사전 버전 확인 주기 (초)")
+
+    # 내부 서비스 HTTP 커넥션 풀 (API 프로세스 공용)
+    HTTP_POOL_MAX_CONNECTIONS: int = Field(100, description="공용 HTTP 클라이언트 최대 동시 연결 수")
+    HTTP_POOL_MAX_KEEPALIVE: int = Field(20, description="유지할 keep-alive 연결 수")
+
     # AI & Vector DB
     EMBEDDING_DIMENSION: int = 768 # 벡터 차원 (768D)
     
@@ -71,6 +118,26 @@ class Settings(BaseSettings):
     
     # Storage
     STORAGE_TYPE: Literal["local", "s3"] = "local"
+    LOCAL_STORAGE_PATH: str = Field("/app/src/static", description="로컬 저장소 루트 (/static 으로 서빙되는 경로)")
+    LOCAL_STORAGE_URL: str = Field("/static", description="로컬 저장소 파일의 공개 URL prefix")
+    AWS_ACCESS_KEY_ID: Optional[str] = Field(None, description="S3 접근 키")
+    AWS_SECRET_ACCESS_KEY: Optional[str] = Field(None, description="S3 시크릿 키")
+    AWS_REGION: str = Field("ap-northeast-2", description="S3 리전")
+    AWS_BUCKET_NAME: Optional[str] = Field(None, description="S3 버킷 이름")
+    S3_PUBLIC_URL: Optional[str] = Field(None, description="S3 파일 공개 URL prefix (CDN 등, 미설정 시 버킷 기본 주소)")
+    S3_ENDPOINT_URL: Optional[str] = Field(None, description="S3 호환 서버 주소 (MinIO/moto 등, 미설정 시 AWS)")
+    S3_MAX_CONCURRENT_PARTS: int = Field(4, description="multipart 업로드 시 동시 전송 파트 수")
+    STORAGE_CHUNK_SIZE: int = Field(1024 * 1024, description="업로드 스트리밍 청크 크기 (bytes)")
+
+    # 정적 파일(/static) 전송
+    STATIC_DELIVERY: Literal["app", "x-accel"] = Field("app", description="app: uvicorn이 전송 / x-accel: X-Accel-Redirect로 nginx가 전송")
+    STATIC_ACCEL_PREFIX: str = Field("/_static_files/", description="nginx internal location 경로 (X-Accel-Redirect 대상)")
+    STATIC_IMMUTABLE_MAX_AGE: int = Field(31536000, description="내용 hash 파일명 캐시 시간 (초, immutable)")
+    STATIC_MAX_AGE: int = Field(3600, description="그 외 정적 파일 캐시 시간 (초, ETag 재검증)")
+
+    # 상품 이미지 파생본 (썸네일/카드/상세/모델 입력)
+    IMAGE_VARIANT_FORMATS: str = Field("avif,webp", description="표시용 파생본 포맷 (쉼표 구분, Pillow가 지원하지 않는 포맷은 건너뜀)")
+    IMAGE_VARIANT_CONCURRENCY: int = Field(4, description="파생본 생성 동시 처리 상품 수")
     
     #Frontend URL 환경 변수 추가
     FRONTEND_URL: str = Field(
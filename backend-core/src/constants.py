@@ -1,5 +1,10 @@
 from enum import Enum
 
+# 🚨 [CRITICAL FIX] ECS 환경에서 DNS 이슈 방지를 위한 강제 로컬호스트 주소
+# settings.py가 환경변수를 잘못 읽더라도, 코드는 무조건 127.0.0.1을 바라봅니다.
+# (API 엔드포인트와 Celery 워커가 같은 주소를 사용하도록 여기서 공유)
+SAFE_AI_URL = "http://127.0.0.1:8001/api/v1"
+
 class ProductCategory(str, Enum):
     TOPS = "Tops"
     BOTTOMS = "Bottoms"
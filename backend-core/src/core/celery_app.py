@@ -4,13 +4,24 @@ from sqlalchemy import select
 from src.config.settings import settings
 from src.db.session import async_session_maker # 세션 메이커 필요
 from src.models.user import User
+# User의 관계 대상 모델 (API 프로세스는 라우터가 import하지만 워커는 직접 등록해야 매퍼 구성 가능)
+from src.models.fitting import FittingResult  # noqa: F401
+from src.models.order import Order, OrderItem  # noqa: F401
+from src.models.product import Product  # noqa: F401
 from src.services.email_service import send_email_async
 
 # Celery 설정
 celery_app = Celery(
     "modify_backend_worker",
     broker=settings.REDIS_URL,
-    backend=settings.REDIS_URL
+    backend=settings.REDIS_URL,
+    include=[
+        "src.tasks.embedding_repair",
+        "src.tasks.fitting",
+        "src.tasks.image_variants",
+        "src.tasks.product_import",
+        "src.tasks.reembedding",
+    ],
 )
 
 celery_app.conf.update(
@@ -19,8 +30,25 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="Asia/Seoul",
     enable_utc=False,
+    beat_schedule={
+        # 큐에 들어오지 못한(조회되지 않은) 손상 상품을 주기적으로 수집
+        "sweep-broken-products": {
+            "task": "tasks.sweep_broken_products",
+            "schedule": 600.0,
+        },
+    },
 )
 
+
+def run_async(coro):
+    """Async 코루틴을 Sync 환경(Celery)에서 실행"""
+    loop = asyncio.get_event_loop()
+    if loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
+
+
 @celery_app.task(name="tasks.broadcast_email")
 def broadcast_email_task(subject: str, body: str, filter_type: str = "all"):
     """
@@ -51,9 +79,4 @@ def broadcast_email_task(subject: str, body: str, filter_type: str = "all"):
             return f"Sent emails to {len(emails)} users."
 
     # Async 함수를 Sync 환경(Celery)에서 실행
-    loop = asyncio.get_event_loop()
-    if loop.is_closed():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    
-    return loop.run_until_complete(_process_email_sending())
\ No newline at end of file
+    return run_async(_process_email_sending())
@@ -0,0 +1,67 @@
+from typing import Any, Optional
+
+import httpx
+
+from src.config.settings import settings
+
+# --------------------------------------------------------------------------
+# 공용 비동기 HTTP 클라이언트 (ai-service 등 내부 서비스 호출용)
+# - 요청마다 AsyncClient를 만들지 않고 keep-alive 커넥션 풀을 재사용
+# - API 프로세스(이벤트 루프 1개) 전용: Celery 태스크는 run_async가 매번 새 루프를 만들므로 사용 금지
+# - 종료는 main.py lifespan에서 close_http_client()
+# --------------------------------------------------------------------------
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=60.0,
+            ),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+class _PooledClient:
+    """
+    `async with httpx.AsyncClient(timeout=...) as client:` 자리에 그대로 쓰는 어댑터.
+    블록이 끝나도 공용 클라이언트를 닫지 않고, 지정한 timeout을 요청마다 기본값으로 적용합니다.
+    """
+    def __init__(self, timeout: Any):
+        self._client = get_http_client()
+        self._timeout = timeout
+
+    async def __aenter__(self) -> "_PooledClient":
+        return self
+
+    async def __aexit__(self, *exc) -> bool:
+        return False
+
+    def _with_timeout(self, kwargs: dict) -> dict:
+        kwargs.setdefault("timeout", self._timeout)
+        return kwargs
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self._client.get(url, **self._with_timeout(kwargs))
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self._client.post(url, **self._with_timeout(kwargs))
+
+    def stream(self, method: str, url: str, **kwargs):
+        return self._client.stream(method, url, **self._with_timeout(kwargs))
+
+
+def pooled_client(timeout: Any = 30.0) -> _PooledClient:
+    return _PooledClient(timeout)
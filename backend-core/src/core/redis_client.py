@@ -0,0 +1,10 @@
+import redis.asyncio as redis
+
+from src.config.settings import settings
+
+# --------------------------------------------------------------------------
+# 공용 비동기 Redis 클라이언트
+# - 큐/캐시/메트릭 등 백엔드 서비스 레이어에서 공통으로 사용
+# - 커넥션 풀은 redis-py가 내부적으로 관리합니다.
+# --------------------------------------------------------------------------
+redis_client = redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
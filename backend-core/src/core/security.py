@@ -5,10 +5,8 @@ from passlib.context import CryptContext
 from jose import jwt
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from src.config.settings import settings
-from src.models.user import User
 from src.schemas.user import UserCreate
 
 # --------------------------------------------------------------------------
@@ -79,6 +77,8 @@ async def setup_superuser(db: AsyncSession) -> None:
             user.is_superuser = True
             db.add(user)
             await db.commit()
+            from src.services.principal_cache import invalidate_principal
+            await invalidate_principal(user.id)
             print(f"INFO: User {settings.SUPERUSER_EMAIL} upgraded to superuser.")
         return
 
@@ -0,0 +1,62 @@
+import os
+import re
+from typing import Union
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from src.config.settings import settings
+
+# --------------------------------------------------------------------------
+# 정적 파일(/static) 전송
+# - 내용 hash / UUID 파일명(한 번 쓰면 바뀌지 않는 파일): Cache-Control immutable, 1년
+#   그 외(과거 원본 파일명 업로드 등): 짧은 max-age + ETag 재검증
+# - ETag / Last-Modified / If-None-Match → 304 는 Starlette StaticFiles 기본 동작 사용
+# - STATIC_DELIVERY="x-accel": 파일 존재/캐시 헤더만 앱이 결정하고 바이트 전송은 nginx가 담당
+#   (X-Accel-Redirect → nginx internal location, Deploy/nginx.conf 참고)
+# --------------------------------------------------------------------------
+
+# 32자리 이상 hex(내용 hash) 또는 UUID 파일명, 파생본/피팅 결과 디렉토리
+IMMUTABLE_PATTERN = re.compile(
+    r"(^|/)("
+    r"[0-9a-f]{32,}"
+    r"|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+    r")\.[a-z0-9]+$"
+    r"|^(variants|fitting)/"
+)
+
+
+def cache_control(path: str) -> str:
+    if IMMUTABLE_PATTERN.search(path):
+        return f"public, max-age={settings.STATIC_IMMUTABLE_MAX_AGE}, immutable"
+    return f"public, max-age={settings.STATIC_MAX_AGE}, must-revalidate"
+
+
+class AssetStaticFiles(StaticFiles):
+    def file_response(
+        self,
+        full_path: Union[str, "os.PathLike[str]"],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        relative_path = os.path.relpath(full_path, os.path.abspath(self.directory)).replace(os.sep, "/")
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        response.headers["Cache-Control"] = cache_control(relative_path)
+
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+
+        if settings.STATIC_DELIVERY == "x-accel":
+            # 본문 없이 헤더만 반환 → nginx가 같은 파일을 sendfile 로 전송
+            headers = {
+                key: value
+                for key, value in response.headers.items()
+                if key in ("cache-control", "etag", "last-modified", "content-type")
+            }
+            headers["X-Accel-Redirect"] = f"{settings.STATIC_ACCEL_PREFIX.rstrip('/')}/{relative_path}"
+            return Response(status_code=status_code, headers=headers)
+
+        return response
@@ -15,6 +15,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.product import Product
 from src.schemas.product import ProductCreate, ProductUpdate 
+from src.services.reembedding import notify_vectors_written, shadow_reset_values
+from src.utils.intent_matcher import intent_matcher
+
+VECTOR_COLUMNS = ("embedding", "embedding_clip", "embedding_clip_upper", "embedding_clip_lower")
 
 class CRUDProduct:
     # 기본 CRUD 메서드
@@ -37,6 +41,8 @@ class CRUDProduct:
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        if any(create_data.get(c) is not None for c in VECTOR_COLUMNS):
+            await notify_vectors_written([db_obj.id])
         return db_obj
 
     async def update(self, db: AsyncSession, *, db_obj: Product, obj_in: Union[ProductUpdate, Dict[str, Any]]) -> Product:
@@ -44,11 +50,16 @@ class CRUDProduct:
             update_data = obj_in
         else: 
             update_data = obj_in.model_dump(exclude_unset=True)
+        # 원본 벡터가 바뀌면 재임베딩 shadow 값은 stale → 초기화 후 dual-write 큐에 등록
+        written_vectors = [c for c in VECTOR_COLUMNS if c in update_data]
+        update_data = {**update_data, **shadow_reset_values(written_vectors)}
         for field, value in update_data.items(): 
             setattr(db_obj, field, value)
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        if written_vectors:
+            await notify_vectors_written([db_obj.id])
         return db_obj
 
     async def soft_delete(self, db: AsyncSession, *, product_id: int) -> Optional[Product]:
@@ -183,13 +194,6 @@ class CRUDProduct:
         """검색어에서 핵심 키워드 추출 (조사 제거)"""
         import re
         
-        # 불용어 정의
-        stop_words = {
-            "추천", "해줘", "보여줘", "찾아줘", "알려줘", "어때", 
-            "사진", "이미지", "스타일", "패션", "옷", "의류",
-            "남자", "여자", "남성", "여성", "용"
-        }
-        
         # 조사 패턴
         particle_pattern = r'(은|는|이|가|을|를|의|에|로|으로|과|와|도|만|부터|까지|에서|보다|처럼|같은|위한|에게|한테|께)$'
         
@@ -201,7 +205,7 @@ class CRUDProduct:
             clean_word = re.sub(particle_pattern, '', word)
             
             # 불용어 제외, 2글자 이상
-            if clean_word and len(clean_word) >= 2 and clean_word not in stop_words:
+            if clean_word and len(clean_word) >= 2 and not intent_matcher.is_term("stop_word", clean_word):
                 keywords.append(clean_word)
         
         # 원본 쿼리도 키워드로 추가 (복합어 검색용)
@@ -5,10 +5,13 @@ import redis.asyncio as redis
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi_limiter import FastAPILimiter
-from fastapi.staticfiles import StaticFiles
 
 from src.config.settings import settings
 from src.core.security import setup_superuser
+from src.core.http_client import close_http_client
+from src.core.static_files import AssetStaticFiles
+from src.services.dictionary_store import dictionary_watcher
+from src.services.principal_cache import principal_listener
 from src.db.session import engine, async_session_maker
 from src.middleware.exception_handler import global_exception_handler
 from src.api.v1 import api_router
@@ -49,11 +52,20 @@ async def lifespan(app: FastAPI):
     # except Exception as e:
     #     logger.warning(f"⚠️ Model pre-loading skipped: {e}")
 
+    # [Startup 4] 라우팅 사전 핫 리로드 (Redis 버전 폴링)
+    dictionary_watcher.start()
+
+    # [Startup 5] 다른 워커의 인증 주체 캐시 무효화 구독 (Redis Pub/Sub)
+    principal_listener.start()
+
     yield # 애플리케이션 실행 구간
 
     # [Shutdown] 리소스 해제
+    await dictionary_watcher.stop()
+    await principal_listener.stop()
     if redis_connection:
         await redis_connection.close()
+    await close_http_client()
     await engine.dispose()
     logger.info("🛑 Application shutdown complete.")
 
@@ -110,9 +122,10 @@ try:
     os.makedirs(image_dir, exist_ok=True)
     
     # /static 경로로 들어오는 요청을 static_dir 폴더로 연결
-    app.mount("/static", StaticFiles(directory=static_dir), name="static")
+    # (immutable 캐시 헤더 + ETag, STATIC_DELIVERY=x-accel 이면 nginx가 바이트 전송)
+    app.mount("/static", AssetStaticFiles(directory=static_dir), name="static")
     
-    logger.info(f"✅ Static file serving enabled: /static -> {static_dir}")
+    logger.info(f"✅ Static file serving enabled: /static -> {static_dir} (delivery={settings.STATIC_DELIVERY})")
 except Exception as e:
     logger.error(f"❌ Failed to setup static file serving: {e}")
 
@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, Integer, Float, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from src.db.session import Base
+
+
+class EmbeddingSpace(Base):
+    """
+    벡터 컬럼별 모델 버전 및 재임베딩 진행 상황
+    - column_name: products 테이블의 벡터 컬럼 (예: embedding, embedding_clip_upper)
+    - space: 같은 모델을 공유하는 컬럼 묶음 ('bert' | 'clip')
+    """
+    __tablename__ = "embedding_spaces"
+
+    column_name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    space: Mapped[str] = mapped_column(String(32), index=True, nullable=False)
+
+    # 현재 컬럼에 저장된 벡터를 만든 모델
+    model_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    # 재임베딩 중인 대상 모델 (shadow 컬럼에 기록)
+    target_model_id: Mapped[Optional[str]] = mapped_column(String(255))
+
+    # idle → migrating → ready → (swap) → idle
+    status: Mapped[str] = mapped_column(String(20), default="idle", nullable=False)
+    processed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    items_per_sec: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+
+    started_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True))
+    swapped_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
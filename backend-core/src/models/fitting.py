@@ -9,9 +9,12 @@ class FittingResult(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
-    # 결과 이미지 URL (Replicate에서 받은 주소)
+    # 결과 이미지 URL (Replicate 주소 → 자체 저장소 복사 후 고정 URL로 교체)
     result_image_url = Column(String, nullable=False)
 
+    # 히스토리 목록용 썸네일 (자체 저장소 복사 완료 후 채워짐)
+    thumbnail_url = Column(String, nullable=True)
+
     category = Column(String, nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,11 +1,13 @@
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import String, Integer, Boolean, TIMESTAMP, Text, CheckConstraint, Index, text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, Boolean, TIMESTAMP, Text, CheckConstraint, Index, text, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, column_property
 from sqlalchemy.sql import func
 from pgvector.sqlalchemy import Vector
 from src.db.session import Base 
 from src.config.settings import settings
+from src.models.product_stats import ProductStats
 
 class Product(Base):
     __tablename__ = "products"
@@ -19,6 +21,9 @@ class Product(Base):
     # [수정] 카테고리 제약조건 완화 (문자열로 자유롭게 받되 인덱스 유지)
     category: Mapped[Optional[str]] = mapped_column(String(100), index=True)
     image_url: Mapped[Optional[str]] = mapped_column(String(500))
+
+    # 🖼️ 이미지 파생본 URL (thumb/card/detail: AVIF·WebP, model: 224px JPEG) - services/image_variants.py
+    image_variants: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
     
     # [수정] 성별 필터링 (기본값 Unisex 설정)
     gender: Mapped[Optional[str]] = mapped_column(String(20), index=True, default="Unisex", nullable=True)
@@ -35,6 +40,23 @@ class Product(Base):
     # ✅ [NEW] CLIP Lower Vector (512차원 - 하의 영역)
     embedding_clip_lower: Mapped[Optional[List[float]]] = mapped_column(Vector(512))
 
+    # 🔄 [Re-embedding] Shadow 컬럼 - 모델 업그레이드 시 새 모델 벡터를 미리 채운 뒤 원자적으로 스왑
+    embedding_next: Mapped[Optional[List[float]]] = mapped_column(Vector(768), deferred=True)
+    embedding_clip_next: Mapped[Optional[List[float]]] = mapped_column(Vector(512), deferred=True)
+    embedding_clip_upper_next: Mapped[Optional[List[float]]] = mapped_column(Vector(512), deferred=True)
+    embedding_clip_lower_next: Mapped[Optional[List[float]]] = mapped_column(Vector(512), deferred=True)
+
+    # ❤️ 찜 수 - product_stats(트리거가 갱신)에서 PK 조회로 읽기 전용 로드 (행이 없으면 0)
+    wishlist_count: Mapped[int] = column_property(
+        func.coalesce(
+            select(ProductStats.wishlist_count)
+            .where(ProductStats.product_id == id)
+            .correlate_except(ProductStats)
+            .scalar_subquery(),
+            0,
+        )
+    )
+
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
@@ -0,0 +1,19 @@
+from sqlalchemy import Integer, ForeignKey, text
+from sqlalchemy.orm import Mapped, mapped_column
+from src.db.session import Base
+
+
+class ProductStats(Base):
+    """
+    상품별 집계 (products 와 분리된 좁은 테이블)
+    - 찜 토글마다 갱신되므로 products 행(벡터 컬럼 포함)을 다시 쓰지 않도록 분리
+    - wishlist_count: wishlists INSERT/DELETE 트리거가 갱신 (찜이 한 번도 없던 상품은 행 없음)
+    """
+    __tablename__ = "product_stats"
+
+    product_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    wishlist_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default=text("0"), nullable=False, index=True
+    )
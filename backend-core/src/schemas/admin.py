@@ -1,6 +1,7 @@
 # backend-core/src/schemas/admin.py
 
-from typing import List
+from datetime import datetime
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 # 차트 데이터 모델
@@ -21,4 +22,34 @@ class DashboardStatsResponse(BaseModel):
     category_sales_pie: List[SalesData] = Field(..., description="카테고리별 판매 데이터")
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# 임베딩 복구 큐 메트릭
+class EmbeddingRepairMetrics(BaseModel):
+    broken_products: int = Field(..., description="DB 기준 임베딩/설명이 누락된 상품 수")
+    queued: int = Field(..., description="복구 대기 중인 상품 수")
+    retrying: int = Field(..., description="복구 실패 후 재시도 대기 중인 상품 수")
+    gave_up: int = Field(..., description="최대 시도 횟수를 초과한 상품 수")
+
+# 재임베딩(모델 업그레이드) 컬럼별 상태
+class EmbeddingSpaceStatus(BaseModel):
+    column_name: str = Field(..., description="products 벡터 컬럼")
+    space: str = Field(..., description="모델을 공유하는 컬럼 묶음 (bert/clip)")
+    model_id: str = Field(..., description="현재 저장된 벡터의 모델")
+    target_model_id: Optional[str] = Field(None, description="재임베딩 대상 모델")
+    status: str = Field(..., description="idle / migrating / ready")
+    processed: int = Field(..., description="shadow 컬럼이 채워진 상품 수")
+    total: int = Field(..., description="재임베딩 대상 상품 수")
+    failed: int = Field(..., description="재임베딩 불가 상품 수 (있으면 스왑 거절, force 스왑 시 해당 상품 벡터를 NULL로 초기화)")
+    coverage: float = Field(..., description="진행률 (%)")
+    items_per_sec: float = Field(..., description="최근 배치 처리량")
+    started_at: Optional[datetime] = None
+    swapped_at: Optional[datetime] = None
+
+# 라우팅 사전 (핫 리로드)
+class DictionaryUpdate(BaseModel):
+    words: List[str] = Field(..., description="사전 단어 목록 (기존 목록을 교체)")
+
+class DictionaryState(BaseModel):
+    version: int = Field(..., description="사전 버전 (갱신 시 증가)")
+    dictionaries: Dict[str, List[str]] = Field(..., description="Redis에 저장된 label별 단어 목록 (없는 label은 코드 기본값 사용)")
@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, Field, ConfigDict, computed_field
+from typing import Any, Dict, Optional, List
+from pydantic import BaseModel, Field, ConfigDict, computed_field, model_validator
 
 # --- 기본 상품 스키마 ---
 class ProductBase(BaseModel):
@@ -27,6 +27,12 @@ class ProductUpdate(ProductBase):
 class ProductResponse(ProductBase):
     id: int
     gender: Optional[str] = None
+    # {"source": 원본 URL, "thumb"/"card"/"detail": {"avif", "webp"}, "model": {"jpeg"}} (생성 전이면 None)
+    image_variants: Optional[Dict[str, Any]] = None
+    # 로그인 사용자의 찜 여부 (목록/검색 응답에서만 채움, 비로그인이면 None)
+    is_wished: Optional[bool] = None
+    # 전체 사용자 찜 수 (product_stats, wishlists 트리거가 갱신)
+    wishlist_count: int = 0
     created_at: datetime
     updated_at: datetime
     
@@ -35,6 +41,13 @@ class ProductResponse(ProductBase):
     def in_stock(self) -> bool:
         return self.stock_quantity > 0
 
+    @model_validator(mode="after")
+    def drop_stale_variants(self):
+        # 이미지가 교체된 뒤 재생성 전이면 이전 이미지의 파생본을 내보내지 않음
+        if self.image_variants and self.image_variants.get("source") != self.image_url:
+            self.image_variants = None
+        return self
+
     model_config = ConfigDict(from_attributes=True)
 
 # --- 검색 관련 스키마 ---
@@ -0,0 +1,130 @@
+import json
+import asyncio
+import logging
+from typing import Dict, List, Mapping, Optional, Set
+
+from src.config.settings import settings
+from src.constants import ProductCategory
+from src.core.redis_client import redis_client
+from src.utils.intent_matcher import DEFAULT_DICTIONARIES, IntentMatcher, intent_matcher
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# 라우팅 사전 저장소 (Redis, 버전 관리)
+# - intent:dict          : hash (label → JSON 단어 목록)
+# - intent:dict:version  : 갱신할 때마다 INCR (사전 갱신과 같은 트랜잭션)
+# - 관리자 API가 갱신 → backend-core / ai-service 프로세스가 버전을 폴링해 매처 재컴파일
+# - Redis에 없는 label은 각 서비스 코드의 기본 사전을 사용
+# ai-service(src/services/dictionary_store.py)와 같은 키를 사용합니다.
+# --------------------------------------------------------------------------
+DICT_KEY = "intent:dict"
+VERSION_KEY = "intent:dict:version"
+
+# ai-service 전용 사전 (ai-service src/core/intent_matcher.py DEFAULT_DICTIONARIES)
+AI_SERVICE_LABELS = frozenset({"celebrity", "common_word", "fashion_context"})
+CATEGORY_PREFIX = "category:"
+
+
+def is_known_label(label: str) -> bool:
+    """두 서비스 중 한 곳이라도 사용하는 label인지 (오타 label은 저장돼도 무시되므로 거부)"""
+    if label.startswith(CATEGORY_PREFIX):
+        return label[len(CATEGORY_PREFIX):] in ProductCategory.list()
+    return label in DEFAULT_DICTIONARIES or label in AI_SERVICE_LABELS
+
+
+def normalize_words(words: List[str]) -> List[str]:
+    return sorted({w.strip() for w in words if w and w.strip()})
+
+
+async def get_dictionaries() -> Dict[str, object]:
+    """현재 버전 + Redis에 저장된 사전 (기본 사전은 포함하지 않음)"""
+    async with redis_client.pipeline(transaction=True) as pipe:
+        version, stored = await pipe.get(VERSION_KEY).hgetall(DICT_KEY).execute()
+    return {
+        "version": int(version or 0),
+        "dictionaries": {label: json.loads(raw) for label, raw in stored.items()},
+    }
+
+
+async def put_dictionary(label: str, words: List[str]) -> int:
+    """label 사전을 교체하고 새 버전 반환"""
+    if not is_known_label(label):
+        raise ValueError(f"Unknown dictionary label: {label}")
+    words = normalize_words(words)
+    if not words:
+        raise ValueError("Dictionary must contain at least one word")
+    async with redis_client.pipeline(transaction=True) as pipe:
+        _, version = await pipe.hset(DICT_KEY, label, json.dumps(words, ensure_ascii=False)).incr(VERSION_KEY).execute()
+    logger.info(f"📚 Dictionary '{label}' updated ({len(words)} words, version={version})")
+    return version
+
+
+async def delete_dictionary(label: str) -> int:
+    """저장된 사전 삭제 (각 서비스의 기본 사전으로 복귀)"""
+    async with redis_client.pipeline(transaction=True) as pipe:
+        _, version = await pipe.hdel(DICT_KEY, label).incr(VERSION_KEY).execute()
+    logger.info(f"📚 Dictionary '{label}' reset to default (version={version})")
+    return version
+
+
+class DictionaryWatcher:
+    """버전 폴링 → 변경 시 사전 재로딩 + 매처 원자적 교체"""
+
+    def __init__(self, matcher: IntentMatcher, defaults: Mapping[str, Set[str]]):
+        self.matcher = matcher
+        self.defaults = defaults
+        self.version: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _merge(self, stored: Mapping[str, str]) -> Dict[str, Set[str]]:
+        dictionaries = {label: set(words) for label, words in self.defaults.items()}
+        for label, raw in stored.items():
+            # 이 서비스가 사용하는 label만 컴파일 (ai-service 전용 사전은 제외)
+            if label not in self.defaults:
+                continue
+            try:
+                dictionaries[label] = {str(w) for w in json.loads(raw) if w}
+            except (ValueError, TypeError) as e:
+                logger.warning(f"⚠️ Invalid dictionary '{label}' ignored: {e}")
+        return dictionaries
+
+    async def refresh(self) -> bool:
+        version = await redis_client.get(VERSION_KEY)
+        if version == self.version:
+            return False
+
+        async with redis_client.pipeline(transaction=True) as pipe:
+            version, stored = await pipe.get(VERSION_KEY).hgetall(DICT_KEY).execute()
+
+        dictionaries = self._merge(stored)
+        await asyncio.to_thread(self.matcher.reload, dictionaries)
+        self.version = version
+        logger.info(f"📚 Routing dictionaries loaded (version={version or 0})")
+        return True
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Dictionary refresh failed, keeping current version: {e}")
+            await asyncio.sleep(settings.INTENT_DICT_POLL_SECONDS)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+dictionary_watcher = DictionaryWatcher(intent_matcher, DEFAULT_DICTIONARIES)
@@ -0,0 +1,110 @@
+import logging
+from typing import Any, Dict
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.redis_client import redis_client
+from src.models.product import Product
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# Embedding Repair Queue
+# - 읽기 경로(상세/추천 API)는 손상된 상품을 큐에 "등록만" 하고 즉시 반환
+# - 실제 복구(LLM 설명 생성 + 배치 임베딩)는 Celery 워커가 배치 단위로 처리
+# --------------------------------------------------------------------------
+REPAIR_QUEUE_KEY = "embedding_repair:pending"        # SET: 중복 없이 대기 중인 상품 ID
+REPAIR_ATTEMPTS_KEY = "embedding_repair:attempts"    # HASH: 상품 ID -> 실패 횟수
+REPAIR_FAILED_KEY = "embedding_repair:failed"        # SET: 최대 시도 횟수 초과 상품 ID
+REPAIR_SCHEDULE_LOCK = "embedding_repair:scheduled"  # 워커 중복 스케줄 방지 락
+REPAIR_SCHEDULE_LOCK_TTL = 30
+
+FAILED_DESCRIPTION = "AI 분석 실패"
+
+# KEYS: queue, failed / ARGV: 상품 ID
+# 최대 시도 횟수를 넘긴 상품은 읽기 경로에서 다시 큐에 넣지 않음 (조회마다 LLM/임베딩 재시도 방지)
+# return: 1(새로 등록) / 0(이미 대기 중이거나 포기한 상품)
+ENQUEUE_SCRIPT = """
+if redis.call('SISMEMBER', KEYS[2], ARGV[1]) == 1 then
+    return 0
+end
+return redis.call('SADD', KEYS[1], ARGV[1])
+"""
+
+_enqueue_script = redis_client.register_script(ENQUEUE_SCRIPT)
+
+
+def _has_vector(vector: Any) -> bool:
+    # pgvector는 numpy 배열을 반환하므로 truthiness 대신 길이로 판단
+    if vector is None:
+        return False
+    try:
+        return len(vector) > 0
+    except TypeError:
+        return False
+
+
+def is_product_broken(product: Any) -> bool:
+    """임베딩 또는 설명이 누락된 상품인지 판별"""
+    return (
+        not _has_vector(product.embedding)
+        or not product.description
+        or product.description == FAILED_DESCRIPTION
+    )
+
+
+def _schedule_drain() -> None:
+    # 순환 import 방지를 위해 태스크 이름으로 발행
+    from src.core.celery_app import celery_app
+    celery_app.send_task("tasks.drain_embedding_repair")
+
+
+async def enqueue_repair(product_id: int) -> bool:
+    """복구 큐에 상품 등록. 새로 등록된 경우에만 True (포기한 상품은 등록하지 않음)"""
+    added = await _enqueue_script(keys=[REPAIR_QUEUE_KEY, REPAIR_FAILED_KEY], args=[product_id])
+    if added:
+        # 짧은 시간 동안 들어온 요청은 하나의 drain 태스크로 묶어서 처리
+        if await redis_client.set(REPAIR_SCHEDULE_LOCK, "1", nx=True, ex=REPAIR_SCHEDULE_LOCK_TTL):
+            _schedule_drain()
+    return bool(added)
+
+
+async def enqueue_if_broken(product: Any) -> bool:
+    """
+    읽기 경로용 Non-blocking 훅.
+    큐 등록 실패(Redis 장애 등)가 API 응답을 막지 않도록 예외를 삼킵니다.
+    """
+    if product is None or not is_product_broken(product):
+        return False
+    try:
+        queued = await enqueue_repair(product.id)
+        if queued:
+            logger.warning(f"🚑 [Repair Queue] Product ID {product.id} queued for embedding repair.")
+        return queued
+    except Exception as e:
+        logger.error(f"Repair enqueue failed (product {product.id}): {e}")
+        return False
+
+
+def broken_product_filter():
+    """손상 상품 조회 조건 (스윕/메트릭 공용)"""
+    return or_(
+        Product.embedding.is_(None),
+        Product.description.is_(None),
+        Product.description == "",
+        Product.description == FAILED_DESCRIPTION,
+    )
+
+
+async def get_repair_backlog(db: AsyncSession) -> Dict[str, int]:
+    """손상 상품 백로그 메트릭"""
+    broken_total = await db.scalar(
+        select(func.count(Product.id)).where(Product.deleted_at.is_(None), broken_product_filter())
+    )
+    return {
+        "broken_products": broken_total or 0,
+        "queued": await redis_client.scard(REPAIR_QUEUE_KEY),
+        "retrying": await redis_client.hlen(REPAIR_ATTEMPTS_KEY),
+        "gave_up": await redis_client.scard(REPAIR_FAILED_KEY),
+    }
@@ -0,0 +1,105 @@
+import io
+import asyncio
+import logging
+import tempfile
+from typing import AsyncIterator, BinaryIO, Optional
+
+import httpx
+from PIL import Image
+from sqlalchemy import update
+
+from src.config.settings import settings
+from src.db.session import async_session_maker
+from src.models.fitting import FittingResult
+from src.services import fitting_jobs
+from src.services.storage import StorageService, get_storage_service
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# Fitting Result Asset Ingestion (Celery 워커)
+# - Replicate 결과 URL은 만료되므로 완료 직후 자체 저장소(StorageService)로 복사
+# - 다운로드 청크를 그대로 저장소에 업로드 (전체 파일을 메모리에 올리지 않음)
+#   동시에 임시 파일(디스크)에 기록해 두고 썸네일은 그 파일에서 생성
+# - 복사 완료 후: 결과 캐시 → 같은 원본 URL을 가진 모든 행 → 작업 상태 순으로 고정 URL 반영
+#   (캐시 적중으로 만들어진 다른 유저의 히스토리 행도 함께 교체됨)
+# --------------------------------------------------------------------------
+CONTENT_EXTENSIONS = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/webp": "webp",
+}
+
+
+def _is_stored(storage: StorageService, url: str) -> bool:
+    return url.startswith(storage.public_url(""))
+
+
+def _make_thumbnail(source: BinaryIO, size: int) -> bytes:
+    """긴 변 size px JPEG 썸네일 (CPU 작업 → 스레드에서 실행)"""
+    with Image.open(source) as img:
+        img.draft("RGB", (size, size))   # JPEG 원본이면 디코딩 단계에서 축소
+        img.thumbnail((size, size), Image.Resampling.LANCZOS)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=80, optimize=True)
+        return buffer.getvalue()
+
+
+async def _single_chunk(data: bytes) -> AsyncIterator[bytes]:
+    yield data
+
+
+async def ingest_result(result_id: int, job_id: Optional[str] = None) -> Optional[str]:
+    """결과 이미지를 자체 저장소로 스트리밍 복사 + 썸네일 생성. 고정 URL 반환"""
+    async with async_session_maker() as db:
+        row = await db.get(FittingResult, result_id)
+    if row is None:
+        return None
+
+    storage = get_storage_service()
+    source_url = row.result_image_url
+    if _is_stored(storage, source_url) and row.thumbnail_url:
+        return source_url
+
+    base_path = f"fitting/{row.user_id}/{result_id}"
+    with tempfile.TemporaryFile() as spool:
+        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0, connect=5.0), follow_redirects=True) as client:
+            async with client.stream("GET", source_url) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("content-type", "image/png").split(";")[0].strip()
+                extension = CONTENT_EXTENSIONS.get(content_type, "png")
+
+                async def chunks() -> AsyncIterator[bytes]:
+                    async for chunk in response.aiter_bytes(settings.FITTING_INGEST_CHUNK_SIZE):
+                        spool.write(chunk)
+                        yield chunk
+
+                image_path = await storage.upload_stream(chunks(), f"{base_path}.{extension}", content_type)
+
+        spool.seek(0)
+        thumbnail = await asyncio.to_thread(_make_thumbnail, spool, settings.FITTING_THUMBNAIL_SIZE)
+
+    thumbnail_path = await storage.upload_stream(_single_chunk(thumbnail), f"{base_path}_thumb.jpg", "image/jpeg")
+    result_url = storage.public_url(image_path)
+    thumbnail_url = storage.public_url(thumbnail_path)
+
+    # 캐시를 먼저 교체해야 이후 캐시 적중으로 생기는 행이 만료될 URL을 받지 않음
+    job = await fitting_jobs.get_job(job_id) if job_id else None
+    if job:
+        await fitting_jobs.replace_cached_result(job, result_id, result_url, thumbnail_url)
+
+    async with async_session_maker() as db:
+        await db.execute(
+            update(FittingResult)
+            .where(FittingResult.result_image_url == source_url)
+            .values(result_image_url=result_url, thumbnail_url=thumbnail_url)
+        )
+        await db.commit()
+
+    if job:
+        await fitting_jobs.replace_job_result(job_id, result_url, thumbnail_url)
+
+    logger.info(f"🗄️ Fitting result {result_id} stored: {result_url}")
+    return result_url
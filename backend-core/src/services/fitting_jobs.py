@@ -0,0 +1,336 @@
+import hashlib
+import hmac
+import json
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import httpx
+
+from src.config.settings import settings
+from src.core.celery_app import celery_app
+from src.core.redis_client import redis_client
+from src.db.session import async_session_maker
+from src.models.fitting import FittingResult
+from src.services import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# Virtual Fitting Jobs
+# - API는 Replicate prediction 생성(비동기 HTTP)만 하고 작업 ID를 즉시 반환
+# - 완료 감지: Replicate webhook(FITTING_WEBHOOK_BASE_URL 설정 시) + Celery 폴링 (둘 중 먼저 온 쪽이 확정)
+#   폴링 태스크는 1회 조회 후 FITTING_POLL_INTERVAL 뒤로 자신을 재예약 (대기 중 워커 슬롯 점유 없음)
+# - 상태는 Redis HASH, 상태 변경은 Pub/Sub 채널로 SSE 구독자에게 전달
+# - 성공 시 fitting_results 행 기록, 실패 시 Replicate 쿼터 반환
+# - REPLICATE_API_BASE를 로컬 스텁(tests/replicate_stub.py)으로 바꾸면 오프라인 테스트 가능
+# - 결과 캐시: 전처리된 사람/의류 이미지 hash + 카테고리 + 프롬프트 + 모델 버전 (seed 고정 → 결과 동일)
+# - 진행 중 중복 방지: 같은 유저가 같은 입력으로 다시 요청하면 기존 작업 ID 반환
+# - 성공 후 결과 이미지는 워커가 자체 저장소로 복사 (services/fitting_assets.py) → 고정 URL로 교체
+# --------------------------------------------------------------------------
+JOB_KEY = "fitting_job:{job_id}"
+JOB_CHANNEL = "fitting_job:{job_id}:events"
+CACHE_KEY = "fitting:cache:{key}"
+INFLIGHT_KEY = "fitting:inflight:{user_id}:{key}"
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+REPLICATE_TERMINAL = ("succeeded", "failed", "canceled")
+
+
+# ------------------------------------------------------------------
+# [Job State]
+# ------------------------------------------------------------------
+async def create_job(user_id: int, category: str, cache_key: str = "", **fields: Any) -> str:
+    job_id = uuid.uuid4().hex
+    key = JOB_KEY.format(job_id=job_id)
+    await redis_client.hset(key, mapping={
+        "job_id": job_id,
+        "user_id": user_id,
+        "category": category,
+        "cache_key": cache_key,
+        "status": "queued",
+        "created_at": datetime.now().isoformat(),
+        **fields,
+    })
+    await redis_client.expire(key, settings.FITTING_JOB_TTL)
+    return job_id
+
+
+async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    data = await redis_client.hgetall(JOB_KEY.format(job_id=job_id))
+    if not data:
+        return None
+    data["user_id"] = int(data["user_id"])
+    if data.get("result_id"):
+        data["result_id"] = int(data["result_id"])
+    return data
+
+
+async def _update_job(job_id: str, **fields: Any) -> Dict[str, Any]:
+    """상태 갱신 + 구독자에게 전체 상태 publish"""
+    await redis_client.hset(JOB_KEY.format(job_id=job_id), mapping=fields)
+    job = await get_job(job_id)
+    await redis_client.publish(JOB_CHANNEL.format(job_id=job_id), json.dumps(public_view(job)))
+    return job
+
+
+def public_view(job: Dict[str, Any]) -> Dict[str, Any]:
+    """클라이언트에 노출할 필드만"""
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "image_url": job.get("result_url"),
+        "thumbnail_url": job.get("thumbnail_url"),
+        "id": job.get("result_id"),
+        "error": job.get("error"),
+    }
+
+
+# ------------------------------------------------------------------
+# [Dedup] 결과 캐시 + 진행 중 작업
+# ------------------------------------------------------------------
+def fitting_cache_key(human_pixels: bytes, garm_pixels: bytes, category: str, prompt: str, model_id: str) -> str:
+    digest = hashlib.sha256()
+    for part in (
+        hashlib.blake2b(human_pixels, digest_size=16).digest(),
+        hashlib.blake2b(garm_pixels, digest_size=16).digest(),
+        category.encode(),
+        prompt.encode(),
+        model_id.encode(),
+    ):
+        digest.update(len(part).to_bytes(4, "big") + part)
+    return digest.hexdigest()
+
+
+async def get_cached_result(cache_key: str) -> Optional[Dict[str, Any]]:
+    raw = await redis_client.get(CACHE_KEY.format(key=cache_key))
+    return json.loads(raw) if raw else None
+
+
+async def create_cached_job(user_id: int, category: str, cache_key: str, cached: Dict[str, Any]) -> Dict[str, Any]:
+    """캐시 적중: Replicate 호출 없이 완료된 작업 생성 (다른 유저의 결과면 히스토리 행 추가)"""
+    result_id = cached.get("result_id")
+    if cached.get("user_id") != user_id:
+        async with async_session_maker() as db:
+            history = FittingResult(
+                user_id=user_id,
+                result_image_url=cached["result_url"],
+                thumbnail_url=cached.get("thumbnail_url"),
+                category=category,
+                created_at=datetime.utcnow(),
+            )
+            db.add(history)
+            await db.commit()
+            await db.refresh(history)
+        result_id = history.id
+
+    job_id = await create_job(
+        user_id, category, cache_key,
+        status="succeeded", finalized=1, cached=1,
+        result_url=cached["result_url"], result_id=result_id,
+        **({"thumbnail_url": cached["thumbnail_url"]} if cached.get("thumbnail_url") else {}),
+    )
+    return await get_job(job_id)
+
+
+async def find_inflight(user_id: int, cache_key: str) -> Optional[Dict[str, Any]]:
+    job_id = await redis_client.get(INFLIGHT_KEY.format(user_id=user_id, key=cache_key))
+    if not job_id:
+        return None
+    job = await get_job(job_id)
+    if job is None or job["status"] in TERMINAL_STATUSES:
+        return None
+    return job
+
+
+async def claim_inflight(user_id: int, cache_key: str, job_id: str) -> Optional[str]:
+    """진행 중 작업으로 등록. 이미 다른 작업이 등록돼 있으면 그 작업 ID 반환"""
+    key = INFLIGHT_KEY.format(user_id=user_id, key=cache_key)
+    if await redis_client.set(key, job_id, nx=True, ex=settings.FITTING_JOB_TIMEOUT):
+        return None
+    return await redis_client.get(key)
+
+
+async def discard_job(job_id: str) -> None:
+    await redis_client.delete(JOB_KEY.format(job_id=job_id))
+
+
+async def _release(job: Dict[str, Any], result: Optional[Dict[str, Any]] = None) -> None:
+    """작업 종료: 진행 중 표시 해제 + 성공 결과 캐시"""
+    cache_key = job.get("cache_key")
+    if not cache_key:
+        return
+    inflight_key = INFLIGHT_KEY.format(user_id=job["user_id"], key=cache_key)
+    if await redis_client.get(inflight_key) == job["job_id"]:
+        await redis_client.delete(inflight_key)
+    if result:
+        await redis_client.set(
+            CACHE_KEY.format(key=cache_key),
+            json.dumps(result),
+            ex=settings.FITTING_CACHE_TTL,
+        )
+
+
+async def replace_cached_result(job: Dict[str, Any], result_id: int, result_url: str, thumbnail_url: str) -> None:
+    """자체 저장소 복사 완료: 캐시된 결과 URL을 고정 URL로 교체 (남은 TTL 유지)"""
+    cache_key = job.get("cache_key")
+    if not cache_key:
+        return
+    cached = await get_cached_result(cache_key)
+    if not cached or cached.get("result_id") != result_id:
+        return
+    cached.update(result_url=result_url, thumbnail_url=thumbnail_url)
+    await redis_client.set(CACHE_KEY.format(key=cache_key), json.dumps(cached), keepttl=True)
+
+
+async def replace_job_result(job_id: str, result_url: str, thumbnail_url: str) -> None:
+    if await redis_client.exists(JOB_KEY.format(job_id=job_id)):
+        await _update_job(job_id, result_url=result_url, thumbnail_url=thumbnail_url)
+
+
+def _schedule_ingest(result_id: int, job_id: str) -> None:
+    """결과 이미지 자체 저장소 복사 예약 (실패해도 작업 결과에는 영향 없음)"""
+    try:
+        celery_app.send_task("tasks.ingest_fitting_result", args=[result_id, job_id])
+    except Exception as e:
+        logger.warning(f"⚠️ Fitting result {result_id} ingest scheduling failed: {e}")
+
+
+# ------------------------------------------------------------------
+# [Replicate HTTP API]
+# ------------------------------------------------------------------
+def _headers() -> Dict[str, str]:
+    return {"Authorization": f"Bearer {settings.REPLICATE_API_TOKEN}", "Content-Type": "application/json"}
+
+
+def webhook_token(job_id: str) -> str:
+    return hmac.new(settings.JWT_SECRET_KEY.encode(), job_id.encode(), hashlib.sha256).hexdigest()
+
+
+def verify_webhook_token(job_id: str, token: str) -> bool:
+    return hmac.compare_digest(webhook_token(job_id), token or "")
+
+
+def _webhook_url(job_id: str) -> Optional[str]:
+    if not settings.FITTING_WEBHOOK_BASE_URL:
+        return None
+    base = settings.FITTING_WEBHOOK_BASE_URL.rstrip("/")
+    return f"{base}/api/v1/fitting/webhook/{job_id}?token={webhook_token(job_id)}"
+
+
+async def create_prediction(client: Any, job_id: str, model_id: str, input_data: Dict[str, Any]) -> str:
+    """prediction 생성 요청만 보내고 ID 반환 (생성 완료를 기다리지 않음)"""
+    payload: Dict[str, Any] = {"version": model_id.split(":", 1)[-1], "input": input_data}
+    webhook = _webhook_url(job_id)
+    if webhook:
+        payload["webhook"] = webhook
+        payload["webhook_events_filter"] = ["completed"]
+
+    response = await client.post(f"{settings.REPLICATE_API_BASE}/predictions", json=payload, headers=_headers())
+    if response.status_code >= 400:
+        raise RuntimeError(f"Replicate prediction create failed ({response.status_code}): {response.text[:200]}")
+    prediction = response.json()
+
+    await _update_job(job_id, status="processing", prediction_id=prediction["id"])
+    return prediction["id"]
+
+
+async def fetch_prediction(client: httpx.AsyncClient, prediction_id: str) -> Dict[str, Any]:
+    response = await client.get(f"{settings.REPLICATE_API_BASE}/predictions/{prediction_id}", headers=_headers())
+    response.raise_for_status()
+    return response.json()
+
+
+def _output_url(output: Any) -> Optional[str]:
+    if isinstance(output, list):
+        output = output[-1] if output else None
+    return str(output) if output else None
+
+
+# ------------------------------------------------------------------
+# [Completion] webhook / 폴링 공용 (먼저 도착한 쪽만 반영)
+# ------------------------------------------------------------------
+async def complete_job(job_id: str, prediction: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    status = prediction.get("status")
+    if status not in REPLICATE_TERMINAL:
+        return None
+
+    key = JOB_KEY.format(job_id=job_id)
+    if not await redis_client.hsetnx(key, "finalized", 1):
+        return await get_job(job_id)
+
+    job = await get_job(job_id)
+    if job is None:
+        return None
+
+    result_url = _output_url(prediction.get("output")) if status == "succeeded" else None
+    if not result_url:
+        await rate_limiter.refund("replicate")
+        await _release(job)
+        error = prediction.get("error") or f"prediction {status}"
+        logger.warning(f"⚠️ Fitting job {job_id} failed: {error}")
+        return await _update_job(job_id, status="failed", error=str(error)[:500])
+
+    try:
+        async with async_session_maker() as db:
+            history = FittingResult(
+                user_id=job["user_id"],
+                result_image_url=result_url,
+                category=job.get("category"),
+                created_at=datetime.utcnow(),
+            )
+            db.add(history)
+            await db.commit()
+            await db.refresh(history)
+    except Exception as e:
+        logger.error(f"❌ Fitting job {job_id} result save failed: {e}")
+        await _release(job)
+        return await _update_job(job_id, status="failed", result_url=result_url, error="결과 저장 실패")
+
+    await _release(job, {"result_url": result_url, "result_id": history.id, "user_id": job["user_id"]})
+    _schedule_ingest(history.id, job_id)
+    logger.info(f"✅ Fitting job {job_id} completed (result ID: {history.id})")
+    return await _update_job(job_id, status="succeeded", result_url=result_url, result_id=history.id)
+
+
+async def fail_job(job_id: str, error: str) -> Optional[Dict[str, Any]]:
+    """prediction 생성 실패/타임아웃 등 Replicate 응답 없이 종료"""
+    if not await redis_client.hsetnx(JOB_KEY.format(job_id=job_id), "finalized", 1):
+        return await get_job(job_id)
+    await rate_limiter.refund("replicate")
+    job = await get_job(job_id)
+    if job:
+        await _release(job)
+    return await _update_job(job_id, status="failed", error=error[:500])
+
+
+def poll_deadline() -> float:
+    return time.time() + settings.FITTING_JOB_TIMEOUT
+
+
+async def poll_job(job_id: str, deadline: float) -> bool:
+    """
+    Celery 워커: webhook이 오지 않아도 완료되도록 prediction 상태를 1회 조회.
+    아직 진행 중이면 True (호출 측이 FITTING_POLL_INTERVAL 뒤 재예약), 종료됐으면 False
+    deadline은 epoch 초 (재예약돼도 워커 간에 같은 기준 유지)
+    """
+    job = await get_job(job_id)
+    if job is None or job.get("finalized"):
+        return False
+    if time.time() >= deadline:
+        await fail_job(job_id, "timeout")
+        return False
+
+    try:
+        async with httpx.AsyncClient(timeout=httpx.Timeout(30.0, connect=5.0)) as client:
+            prediction = await fetch_prediction(client, job["prediction_id"])
+    except Exception as e:
+        logger.warning(f"⚠️ Fitting job {job_id} poll failed: {e}")
+        return True
+
+    if prediction.get("status") in REPLICATE_TERMINAL:
+        await complete_job(job_id, prediction)
+        return False
+    return True
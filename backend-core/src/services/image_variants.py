@@ -0,0 +1,211 @@
+import io
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from PIL import Image, ImageOps, features
+from sqlalchemy import select, update
+
+from src.config.settings import settings
+from src.db.session import async_session_maker
+from src.models.product import Product
+from src.services.storage import StorageService, content_digest, get_storage_service
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# 상품 이미지 파생본 (Image Variants)
+# - 원본 1회 디코딩 → 큰 크기부터 차례로 축소하며 표시용(AVIF/WebP) + 모델 입력(JPEG) 생성
+# - 저장 경로는 원본 내용 hash 기준 (variants/{digest}/{name}.{ext}) → 같은 이미지는 재사용
+# - products.image_variants (JSONB):
+#     {"source": 원본 URL, "thumb": {"avif": url, "webp": url}, "card": {...}, "detail": {...}, "model": {"jpeg": url}}
+#   source가 현재 image_url과 다르면(이미지 교체) 무효 → 재생성 대상
+# - 업로드/수정: Celery 태스크(tasks.generate_image_variants)에서 생성
+#   CSV 대량 등록: 이미 내려받은 원본 바이트로 워커 안에서 바로 생성 (중복 다운로드 없음)
+# - 모델 파이프라인은 원본 대신 파생본 사용
+#     model  : 짧은 변 224px JPEG (CLIP 전체 이미지 벡터 입력 크기)
+#     detail : 긴 변 1280px (ai-service INGEST_MAX_SIDE와 동일 → YOLO crop 벡터용)
+#   CSV 대량 등록의 CLIP 벡터는 YOLO 경로를 거치므로 detail 크기 JPEG을 전달
+#   (224px 입력을 크롭하면 다시 확대돼 벡터 품질이 떨어짐)
+# --------------------------------------------------------------------------
+
+# 이름 → 긴 변 길이 (px), 큰 것부터
+DISPLAY_VARIANTS: List[Tuple[str, int]] = [
+    ("detail", 1280),
+    ("card", 480),
+    ("thumb", 160),
+]
+MODEL_VARIANT = "model"
+MODEL_SHORT_SIDE = 224
+
+CONTENT_TYPES = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg"}
+EXTENSIONS = {"avif": "avif", "webp": "webp", "jpeg": "jpg"}
+ENCODE_OPTIONS: Dict[str, Dict[str, Any]] = {
+    "avif": {"quality": 60, "speed": 8},
+    "webp": {"quality": 80, "method": 4},
+    "jpeg": {"quality": 90, "optimize": True},
+}
+
+
+def display_formats() -> List[str]:
+    """설정된 포맷 중 현재 Pillow 빌드가 인코딩할 수 있는 것만"""
+    formats = []
+    for fmt in (f.strip().lower() for f in settings.IMAGE_VARIANT_FORMATS.split(",")):
+        if fmt in ("avif", "webp") and features.check(fmt):
+            formats.append(fmt)
+    return formats
+
+
+def _fit_within(img: Image.Image, max_side: int) -> Image.Image:
+    if max(img.size) <= max_side:
+        return img
+    scale = max_side / max(img.size)
+    size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+    return img.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+
+def _encode(img: Image.Image, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, format=fmt.upper(), **ENCODE_OPTIONS[fmt])
+    return buffer.getvalue()
+
+
+def render_variants(data: bytes, formats: List[str]) -> Tuple[Dict[str, Dict[str, bytes]], bytes]:
+    """원본 바이트 → ({이름: {포맷: 바이트}}, YOLO 경로 입력용 detail 크기 JPEG) (CPU 작업 → 스레드에서 실행)"""
+    with Image.open(io.BytesIO(data)) as source:
+        if source.format == "JPEG":
+            source.draft("RGB", (DISPLAY_VARIANTS[0][1], DISPLAY_VARIANTS[0][1]))
+        img = ImageOps.exif_transpose(source).convert("RGB")
+
+    rendered: Dict[str, Dict[str, bytes]] = {}
+    detail_jpeg = b""
+    current = img
+    for name, max_side in DISPLAY_VARIANTS:
+        # 직전(더 큰) 파생본에서 축소 → 매번 원본에서 줄이는 것보다 빠름
+        current = _fit_within(current, max_side)
+        rendered[name] = {fmt: _encode(current, fmt) for fmt in formats}
+        if not detail_jpeg:
+            detail_jpeg = _encode(current, "jpeg")
+
+    scale = MODEL_SHORT_SIDE / min(img.size)
+    if scale < 1:
+        model_img = img.resize(
+            (max(1, round(img.width * scale)), max(1, round(img.height * scale))),
+            Image.Resampling.BICUBIC,
+            reducing_gap=3.0,
+        )
+    else:
+        model_img = img
+    rendered[MODEL_VARIANT] = {"jpeg": _encode(model_img, "jpeg")}
+    return rendered, detail_jpeg
+
+
+async def store_variants(
+    data: bytes, source_url: str, storage: Optional[StorageService] = None
+) -> Tuple[Dict[str, Any], bytes]:
+    """파생본 생성 + 저장. 반환: (image_variants 값, YOLO 경로 입력용 detail 크기 JPEG 바이트)"""
+    storage = storage or get_storage_service()
+    rendered, detail_jpeg = await asyncio.to_thread(render_variants, data, display_formats())
+    digest = content_digest(data)
+
+    uploads = []
+    keys = []
+    for name, encoded in rendered.items():
+        for fmt, body in encoded.items():
+            path = f"variants/{digest}/{name}.{EXTENSIONS[fmt]}"
+            keys.append((name, fmt, path))
+            uploads.append(storage.upload_bytes(body, path, CONTENT_TYPES[fmt]))
+    await asyncio.gather(*uploads)
+
+    variants: Dict[str, Any] = {"source": source_url}
+    for name, fmt, path in keys:
+        variants.setdefault(name, {})[fmt] = storage.public_url(path)
+    return variants, detail_jpeg
+
+
+def variant_url(product: Any, name: str, fmt: Optional[str] = None) -> Optional[str]:
+    """유효한 파생본 URL (없거나 이미지가 바뀌었으면 원본 URL)"""
+    variants = getattr(product, "image_variants", None) or {}
+    image_url = getattr(product, "image_url", None)
+    if variants.get("source") != image_url or name not in variants:
+        return image_url
+    urls = variants[name]
+    return (urls.get(fmt) if fmt else next(iter(urls.values()), None)) or image_url
+
+
+def needs_variants(product: Any) -> bool:
+    image_url = getattr(product, "image_url", None)
+    if not image_url or image_url.startswith("https://placehold"):
+        return False
+    variants = getattr(product, "image_variants", None) or {}
+    return variants.get("source") != image_url
+
+
+def schedule_variants(product_ids: List[int]) -> None:
+    """파생본 생성 예약 (실패해도 원본으로 서비스되므로 요청은 그대로 진행)"""
+    if not product_ids:
+        return
+    try:
+        # 순환 import 방지를 위해 태스크 이름으로 발행
+        from src.core.celery_app import celery_app
+        celery_app.send_task("tasks.generate_image_variants", args=[list(product_ids)])
+    except Exception as e:
+        logger.warning(f"⚠️ Image variant scheduling failed for {product_ids}: {e}")
+
+
+# ------------------------------------------------------------------
+# [Worker] 업로드/수정된 상품의 파생본 생성
+# ------------------------------------------------------------------
+async def load_image(client: httpx.AsyncClient, storage: StorageService, url: str) -> bytes:
+    """자체 저장소 URL이면 저장소에서 직접 읽고, 외부 URL이면 다운로드"""
+    path = storage.path_from_url(url)
+    if path is not None:
+        return await storage.read(path)
+    res = await client.get(url, timeout=15.0, follow_redirects=True)
+    res.raise_for_status()
+    return res.content
+
+
+async def _generate_one(
+    client: httpx.AsyncClient, storage: StorageService, semaphore: asyncio.Semaphore, product_id: int, image_url: str
+) -> bool:
+    async with semaphore:
+        try:
+            data = await load_image(client, storage, image_url)
+            variants, _ = await store_variants(data, image_url, storage)
+        except Exception as e:
+            logger.warning(f"⚠️ Image variants failed for product {product_id}: {e}")
+            return False
+
+    # 생성 중 이미지가 교체됐으면 덮어쓰지 않음 (새 이미지의 태스크가 처리)
+    async with async_session_maker() as session:
+        await session.execute(
+            update(Product)
+            .where(Product.id == product_id, Product.image_url == image_url)
+            .values(image_variants=variants)
+        )
+        await session.commit()
+    return True
+
+
+async def generate_variants(product_ids: List[int]) -> Dict[str, int]:
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(Product.id, Product.image_url, Product.image_variants).where(Product.id.in_(product_ids))
+        )
+        targets = [(row.id, row.image_url) for row in result if needs_variants(row)]
+
+    if not targets:
+        return {"generated": 0, "failed": 0}
+
+    storage = get_storage_service()
+    semaphore = asyncio.Semaphore(settings.IMAGE_VARIANT_CONCURRENCY)
+    async with httpx.AsyncClient() as client:
+        results = await asyncio.gather(*[
+            _generate_one(client, storage, semaphore, product_id, image_url) for product_id, image_url in targets
+        ])
+
+    generated = sum(results)
+    logger.info(f"🖼️ Image variants generated for {generated}/{len(targets)} products")
+    return {"generated": generated, "failed": len(targets) - generated}
@@ -0,0 +1,204 @@
+import json
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+
+from src.config.settings import settings
+from src.core.redis_client import redis_client
+from src.db.session import async_session_maker
+from src.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# 인증 주체(Principal) 캐시
+# - 권한 판단에 필요한 필드(id, is_active, is_superuser)만 캐시 → 요청마다 users 조회 생략
+# - 1단계: 프로세스 내 LRU (PRINCIPAL_LOCAL_TTL, 짧게 → 다른 프로세스의 변경도 곧 반영)
+#   2단계: Redis (PRINCIPAL_CACHE_TTL)
+#   3단계: DB (필요한 컬럼만 SELECT)
+# - 사용자 상태/정보 변경 시 invalidate_principal() 호출
+#   버전 증가 + Redis 삭제 + 현재 프로세스 LRU 삭제 + Pub/Sub으로 다른 프로세스 LRU 삭제 (principal_listener)
+#   리스너가 없는 프로세스(Celery 워커 등)나 Redis 장애 중에는 최대 PRINCIPAL_LOCAL_TTL 동안 이전 값 사용
+# - 적재 경쟁 방지: auth:principal:{user_id}:version 을 무효화마다 INCR
+#   DB 조회 전에 읽은 버전이 그대로일 때만 Redis/LRU에 저장 (Lua 1회, wishlist_cache 와 같은 방식)
+#   → 무효화 전에 읽은 이전 권한이 무효화 후 다시 캐시되지 않음
+# - PRINCIPAL_CACHE_TTL=0 이면 캐시 비활성화 (매 요청 DB 조회)
+# --------------------------------------------------------------------------
+PRINCIPAL_KEY = "auth:principal:{user_id}"
+VERSION_KEY = "auth:principal:{user_id}:version"
+INVALIDATE_CHANNEL = "auth:principal:invalidate"
+LISTENER_RETRY_SECONDS = 1.0
+
+# KEYS: principal, version / ARGV: DB 조회 전 버전("" = 없음), ttl, principal JSON
+# return: 1(저장) / 0(그 사이 무효화됨 → 건너뜀)
+STORE_SCRIPT = """
+local current = redis.call('GET', KEYS[2]) or ''
+if current ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[3], 'EX', tonumber(ARGV[2]))
+return 1
+"""
+
+_store_script = redis_client.register_script(STORE_SCRIPT)
+
+
+class Principal(NamedTuple):
+    id: int
+    is_active: bool
+    is_superuser: bool
+
+
+class _LocalLRU:
+    """만료 시간이 있는 단순 LRU (이벤트 루프 단일 스레드에서만 사용)"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: "OrderedDict[int, Tuple[float, Principal]]" = OrderedDict()
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        item = self._items.get(user_id)
+        if item is None:
+            return None
+        expires_at, principal = item
+        if expires_at < time.monotonic():
+            del self._items[user_id]
+            return None
+        self._items.move_to_end(user_id)
+        return principal
+
+    def set(self, principal: Principal, ttl: float) -> None:
+        self._items[principal.id] = (time.monotonic() + ttl, principal)
+        self._items.move_to_end(principal.id)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def pop(self, user_id: int) -> None:
+        self._items.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+_local = _LocalLRU(settings.PRINCIPAL_LOCAL_SIZE)
+
+
+async def _load_from_db(user_id: int) -> Optional[Principal]:
+    async with async_session_maker() as session:
+        row = (await session.execute(
+            select(User.id, User.is_active, User.is_superuser).where(User.id == user_id)
+        )).first()
+    if row is None:
+        return None
+    return Principal(row.id, bool(row.is_active), bool(row.is_superuser))
+
+
+async def get_principal(user_id: int) -> Optional[Principal]:
+    if settings.PRINCIPAL_CACHE_TTL <= 0:
+        return await _load_from_db(user_id)
+
+    principal = _local.get(user_id)
+    if principal is not None:
+        return principal
+
+    key = PRINCIPAL_KEY.format(user_id=user_id)
+    version_key = VERSION_KEY.format(user_id=user_id)
+    try:
+        raw, version = await redis_client.mget(key, version_key)
+        version = version or ""
+    except Exception as e:
+        # Redis 장애 시 DB로 진행 (인증은 계속 동작해야 함)
+        logger.warning(f"⚠️ Principal cache read failed: {e}")
+        raw, version = None, None
+
+    if raw:
+        principal = Principal(*json.loads(raw))
+    else:
+        principal = await _load_from_db(user_id)
+        if principal is None:
+            return None
+        if version is not None:
+            try:
+                stored = await _store_script(
+                    keys=[key, version_key],
+                    args=[version, settings.PRINCIPAL_CACHE_TTL, json.dumps(principal)],
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Principal cache write failed: {e}")
+            else:
+                if not stored:
+                    # 조회 중 무효화됨 → 이 요청은 조회한 값을 쓰되 LRU에도 남기지 않음
+                    logger.info(f"🔁 Principal cache refill skipped for user {user_id} (invalidated during load)")
+                    return principal
+
+    _local.set(principal, min(settings.PRINCIPAL_LOCAL_TTL, settings.PRINCIPAL_CACHE_TTL))
+    return principal
+
+
+async def invalidate_principal(user_id: int) -> None:
+    version_key = VERSION_KEY.format(user_id=user_id)
+    try:
+        pipe = redis_client.pipeline(transaction=True)
+        # 진행 중인 적재가 무효화 전 값을 다시 저장하지 못하도록 버전 증가
+        pipe.incr(version_key)
+        pipe.expire(version_key, max(settings.PRINCIPAL_CACHE_TTL, 1))
+        pipe.delete(PRINCIPAL_KEY.format(user_id=user_id))
+        await pipe.execute()
+        await redis_client.publish(INVALIDATE_CHANNEL, user_id)
+    except Exception as e:
+        logger.warning(f"⚠️ Principal cache invalidation failed for user {user_id}: {e}")
+    # 버전 증가 이후에 삭제 → 그 전에 저장을 마친 같은 프로세스의 적재도 LRU에 남지 않음
+    _local.pop(user_id)
+
+
+class PrincipalInvalidationListener:
+    """다른 프로세스의 invalidate_principal() 발행을 구독 → 이 프로세스 LRU에서도 삭제"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def handle(data: str) -> None:
+        try:
+            _local.pop(int(data))
+        except (TypeError, ValueError):
+            logger.warning(f"⚠️ Invalid principal invalidation message: {data!r}")
+
+    async def _run(self):
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATE_CHANNEL)
+                # 구독 전 / 연결이 끊긴 동안 놓친 메시지가 있을 수 있으므로 LRU를 비우고 시작
+                _local.clear()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.handle(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Principal invalidation listener disconnected: {e}")
+                _local.clear()
+            finally:
+                await pubsub.close()
+            await asyncio.sleep(LISTENER_RETRY_SECONDS)
+
+    def start(self):
+        if self._task is None and settings.PRINCIPAL_CACHE_TTL > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+principal_listener = PrincipalInvalidationListener()
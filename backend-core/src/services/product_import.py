@@ -0,0 +1,340 @@
+import asyncio
+import base64
+import codecs
+import csv
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import insert
+
+from src.config.settings import settings
+from src.constants import SAFE_AI_URL
+from src.core.redis_client import redis_client
+from src.db.session import async_session_maker
+from src.models.product import Product
+from src.services.image_variants import store_variants
+from src.services.reembedding import notify_vectors_written
+from src.services.storage import get_storage_service
+from src.utils.text import sanitize_string
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# CSV Product Import Pipeline
+# - API는 파일을 디스크에 스트리밍 저장 후 작업 ID만 반환
+# - 워커가 CSV를 스트리밍 파싱 → 배치 단위로 임베딩/이미지 처리 → 멀티 로우 INSERT
+# - 내려받은 원본으로 이미지 파생본을 바로 만들고, CLIP에는 224px 모델 입력 파생본을 전송
+# - 진행 상황은 Redis HASH, 행 단위 에러는 Redis LIST에 기록
+# --------------------------------------------------------------------------
+JOB_KEY = "product_import:{job_id}"
+JOB_ERRORS_KEY = "product_import:{job_id}:errors"
+
+PLACEHOLDER_IMAGE = "https://placehold.co/400x500?text=No+Image"
+SNIFF_BYTES = 64 * 1024
+
+
+# ------------------------------------------------------------------
+# [Job State] Redis 기반 진행 상황 관리
+# ------------------------------------------------------------------
+def new_job_path(filename: Optional[str]) -> Tuple[str, str]:
+    """작업 ID와 임시 파일 경로 생성"""
+    job_id = uuid.uuid4().hex
+    os.makedirs(settings.IMPORT_TMP_DIR, exist_ok=True)
+    ext = os.path.splitext(filename or "")[1] or ".csv"
+    return job_id, os.path.join(settings.IMPORT_TMP_DIR, f"{job_id}{ext}")
+
+
+async def create_job(job_id: str, filename: Optional[str]) -> None:
+    key = JOB_KEY.format(job_id=job_id)
+    await redis_client.hset(key, mapping={
+        "job_id": job_id,
+        "filename": filename or "",
+        "status": "queued",
+        "total": 0,
+        "processed": 0,
+        "success": 0,
+        "failed": 0,
+        "created_at": datetime.now().isoformat(),
+    })
+    await redis_client.expire(key, settings.IMPORT_JOB_TTL)
+
+
+async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    data = await redis_client.hgetall(JOB_KEY.format(job_id=job_id))
+    if not data:
+        return None
+    for field in ("total", "processed", "success", "failed"):
+        data[field] = int(data.get(field, 0))
+    return data
+
+
+async def get_job_errors(job_id: str, offset: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    raw = await redis_client.lrange(JOB_ERRORS_KEY.format(job_id=job_id), offset, offset + limit - 1)
+    return [json.loads(item) for item in raw]
+
+
+async def _update_job(job_id: str, **fields: Any) -> None:
+    await redis_client.hset(JOB_KEY.format(job_id=job_id), mapping=fields)
+
+
+async def _record_progress(job_id: str, processed: int, success: int, errors: List[Dict[str, Any]]) -> None:
+    key = JOB_KEY.format(job_id=job_id)
+    errors_key = JOB_ERRORS_KEY.format(job_id=job_id)
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.hincrby(key, "processed", processed)
+        pipe.hincrby(key, "success", success)
+        pipe.hincrby(key, "failed", len(errors))
+        if errors:
+            pipe.rpush(errors_key, *[json.dumps(e, ensure_ascii=False) for e in errors])
+            pipe.expire(errors_key, settings.IMPORT_JOB_TTL)
+        await pipe.execute()
+
+
+# ------------------------------------------------------------------
+# [Parsing] 스트리밍 CSV 파싱
+# ------------------------------------------------------------------
+def _detect_encoding(path: str) -> Tuple[str, str]:
+    """앞부분만 읽어서 인코딩 판별 (utf-8 → cp949 → cp949 ignore)"""
+    with open(path, "rb") as f:
+        head = f.read(SNIFF_BYTES)
+    for encoding in ("utf-8-sig", "cp949"):
+        try:
+            # 잘린 멀티바이트 문자는 final=False로 허용
+            codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+            return encoding, "strict"
+        except UnicodeDecodeError:
+            continue
+    return "cp949", "ignore"
+
+
+def _to_int(raw: Any, default: int) -> int:
+    try:
+        return int(str(raw).replace(",", "").strip())
+    except (TypeError, ValueError):
+        return default
+
+
+def _parse_row(row: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """CSV 행 → 상품 데이터 (이름이 없으면 None)"""
+    name = row.get("name") or row.get("상품명")
+    if not name:
+        return None
+
+    gender = row.get("gender") or row.get("성별") or "Unisex"
+    return {
+        "name": sanitize_string(name),
+        "category": sanitize_string(row.get("category") or row.get("카테고리") or "Uncategorized"),
+        "description": sanitize_string(row.get("description") or row.get("설명") or ""),
+        "price": _to_int(row.get("price") or row.get("가격") or "0", 0),
+        "stock_quantity": _to_int(row.get("stock_quantity") or row.get("재고") or "100", 100),
+        "image_url": row.get("image_url") or row.get("이미지") or PLACEHOLDER_IMAGE,
+        "gender": gender,
+        "is_active": True,
+    }
+
+
+def _iter_batches(path: str, encoding: str, errors: str) -> Iterator[List[Tuple[int, Dict[str, str]]]]:
+    """파일 전체를 메모리에 올리지 않고 (행 번호, 행) 배치를 생성"""
+    with open(path, newline="", encoding=encoding, errors=errors) as f:
+        reader = csv.DictReader(f)
+        # 헤더가 1행이므로 데이터는 2행부터
+        numbered = ((reader.line_num, row) for row in reader)
+        while True:
+            batch = list(islice(numbered, settings.IMPORT_BATCH_SIZE))
+            if not batch:
+                return
+            yield batch
+
+
+def _count_rows(path: str, encoding: str, errors: str) -> int:
+    with open(path, newline="", encoding=encoding, errors=errors) as f:
+        return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+
+
+# ------------------------------------------------------------------
+# [AI] 배치 임베딩 / 이미지 처리
+# ------------------------------------------------------------------
+async def _embed_texts(client: httpx.AsyncClient, texts: List[str]) -> List[Optional[List[float]]]:
+    try:
+        res = await client.post(f"{SAFE_AI_URL}/embed-text-batch", json={"texts": texts}, timeout=60.0)
+        if res.status_code == 200:
+            vectors = res.json().get("vectors", [])
+            if len(vectors) == len(texts):
+                # /embed-text 실패 값([0.0]*768)은 None 으로 저장 → 복구 sweep 대상 (embedding_repair 와 같은 검사)
+                return [v if v and len(v) == 768 and any(v) else None for v in vectors]
+    except Exception as e:
+        logger.warning(f"⚠️ Batch text embedding failed: {e}")
+    return [None] * len(texts)
+
+
+async def _download_image(
+    client: httpx.AsyncClient, semaphore: asyncio.Semaphore, url: str
+) -> Optional[bytes]:
+    if not url or url.startswith("https://placehold"):
+        return None
+    async with semaphore:
+        try:
+            res = await client.get(url, timeout=10.0, follow_redirects=True)
+            if res.status_code == 200:
+                return res.content
+        except Exception as e:
+            logger.warning(f"⚠️ Image download failed ({url}): {e}")
+    return None
+
+
+async def _download_variants(
+    client: httpx.AsyncClient, semaphore: asyncio.Semaphore, url: str
+) -> Optional[Tuple[Optional[Dict[str, Any]], bytes]]:
+    """
+    원본 다운로드 → 파생본 생성/저장. 반환: (image_variants, CLIP 벡터 입력 이미지)
+    파생본 실패는 치명적이지 않음 → 원본 바이트로 임베딩 (ai-service가 INGEST_MAX_SIDE로 축소 디코딩),
+    image_variants는 비워 둠 (표시는 variant_url이 원본 URL로 대체)
+    """
+    content = await _download_image(client, semaphore, url)
+    if not content:
+        return None
+    async with semaphore:
+        try:
+            return await store_variants(content, url, get_storage_service())
+        except Exception as e:
+            logger.warning(f"⚠️ Image variants failed ({url}), embedding original: {e}")
+            return None, content
+
+
+async def _embed_images(
+    client: httpx.AsyncClient, semaphore: asyncio.Semaphore, urls: List[str]
+) -> Tuple[List[Optional[List[float]]], List[Optional[Dict[str, Any]]]]:
+    """
+    반환: (CLIP 벡터 목록, image_variants 목록)
+    /generate-clip-vector-batch 는 YOLO 크롭을 거치므로 detail 크기(1280px) 이미지를 전달
+    """
+    prepared = await asyncio.gather(*[_download_variants(client, semaphore, url) for url in urls])
+    variants = [p[0] if p else None for p in prepared]
+    indexed = [(i, p[1]) for i, p in enumerate(prepared) if p]
+    vectors: List[Optional[List[float]]] = [None] * len(urls)
+    if not indexed:
+        return vectors, variants
+
+    try:
+        res = await client.post(
+            f"{SAFE_AI_URL}/generate-clip-vector-batch",
+            json={"images_b64": [base64.b64encode(c).decode("utf-8") for _, c in indexed]},
+            timeout=120.0,
+        )
+        if res.status_code == 200:
+            for (i, _), v in zip(indexed, res.json().get("vectors", [])):
+                if v and len(v) == 512:
+                    vectors[i] = v
+    except Exception as e:
+        logger.warning(f"⚠️ Batch CLIP vector generation failed: {e}")
+    return vectors, variants
+
+
+# ------------------------------------------------------------------
+# [DB] 멀티 로우 INSERT
+# ------------------------------------------------------------------
+async def _bulk_insert(rows: List[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    배치 전체를 INSERT ... VALUES (...), (...) 한 문장으로 저장.
+    실패 시 SAVEPOINT로 행 단위 재시도해서 문제 행만 에러 리포트로 분리.
+    """
+    errors: List[Dict[str, Any]] = []
+    inserted_ids: List[int] = []
+    async with async_session_maker() as session:
+        try:
+            result = await session.execute(
+                insert(Product).values([data for _, data in rows]).returning(Product.id)
+            )
+            inserted_ids = list(result.scalars().all())
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.warning(f"⚠️ Bulk insert failed, retrying row by row: {e}")
+
+            for line, data in rows:
+                try:
+                    async with session.begin_nested():
+                        result = await session.execute(insert(Product).values(data).returning(Product.id))
+                        inserted_ids.append(result.scalar_one())
+                except Exception as e:
+                    errors.append({"row": line, "name": data.get("name"), "error": str(e).splitlines()[0]})
+            await session.commit()
+
+    # 재임베딩 진행 중이면 새 상품도 대상 모델로 dual-write
+    await notify_vectors_written(inserted_ids)
+    return errors
+
+
+# ------------------------------------------------------------------
+# [Pipeline] 배치 처리
+# ------------------------------------------------------------------
+async def _process_batch(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    batch: List[Tuple[int, Dict[str, str]]],
+) -> Tuple[int, List[Dict[str, Any]]]:
+    errors: List[Dict[str, Any]] = []
+    rows: List[Tuple[int, Dict[str, Any]]] = []
+    for line, raw in batch:
+        try:
+            data = _parse_row(raw)
+        except Exception as e:
+            errors.append({"row": line, "name": raw.get("name"), "error": str(e)})
+            continue
+        if data is None:
+            continue  # 상품명 없는 행은 기존과 동일하게 건너뜀
+        rows.append((line, data))
+
+    if not rows:
+        return 0, errors
+
+    # 텍스트 임베딩(1회 배치 호출)과 이미지 다운로드/CLIP 인코딩을 동시에 실행
+    texts = [f"[{d['gender']}] {d['name']} {d['category']} {d['description']}" for _, d in rows]
+    text_vectors, (clip_vectors, image_variants) = await asyncio.gather(
+        _embed_texts(client, texts),
+        _embed_images(client, semaphore, [d["image_url"] for _, d in rows]),
+    )
+    for (_, data), vector, vector_clip, variants in zip(rows, text_vectors, clip_vectors, image_variants):
+        data["embedding"] = vector
+        data["embedding_clip"] = vector_clip
+        data["image_variants"] = variants
+
+    insert_errors = await _bulk_insert(rows)
+    return len(rows) - len(insert_errors), errors + insert_errors
+
+
+async def run_import(job_id: str, path: str) -> Dict[str, Any]:
+    """CSV 파일을 처리하고 최종 작업 상태를 반환"""
+    try:
+        encoding, decode_errors = _detect_encoding(path)
+        await _update_job(
+            job_id,
+            status="running",
+            encoding=encoding,
+            total=_count_rows(path, encoding, decode_errors),
+            started_at=datetime.now().isoformat(),
+        )
+
+        semaphore = asyncio.Semaphore(settings.IMPORT_DOWNLOAD_CONCURRENCY)
+        limits = httpx.Limits(max_connections=settings.IMPORT_DOWNLOAD_CONCURRENCY + 4)
+        async with httpx.AsyncClient(limits=limits) as client:
+            for batch in _iter_batches(path, encoding, decode_errors):
+                success, errors = await _process_batch(client, semaphore, batch)
+                await _record_progress(job_id, len(batch), success, errors)
+
+        await _update_job(job_id, status="completed", finished_at=datetime.now().isoformat())
+        logger.info(f"✅ CSV import {job_id} completed.")
+    except Exception as e:
+        logger.error(f"❌ CSV import {job_id} failed: {e}")
+        await _update_job(job_id, status="failed", error=str(e), finished_at=datetime.now().isoformat())
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+    return await get_job(job_id)
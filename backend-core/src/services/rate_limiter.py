@@ -0,0 +1,132 @@
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Tuple
+
+from fastapi import HTTPException
+
+from src.config.settings import settings
+from src.core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# 외부 API 쿼터/속도 제한 (Redis Lua 스크립트 1회 호출로 원자적 처리)
+# - ai-service(src/services/quota_monitor.py)와 같은 키 규칙/스크립트 사용
+#   (빌드 컨텍스트가 달라 공유 모듈 대신 복제본 → 수정 시 양쪽을 함께 변경)
+# - 일일 쿼터: quota:{provider}:daily:{YYYY-MM-DD}
+# - 초당 속도: quota:{provider}:bucket 토큰 버킷
+# - reserve로 선차감 → 호출 실패 시 refund
+# --------------------------------------------------------------------------
+RESERVE_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local cost = tonumber(ARGV[3])
+local rate = tonumber(ARGV[4])
+local capacity = tonumber(ARGV[5])
+local now = tonumber(ARGV[6])
+
+local used = tonumber(redis.call('GET', KEYS[1]) or '0')
+if limit > 0 and used + cost > limit then
+    return {0, limit - used, -1}
+end
+
+if rate > 0 then
+    local state = redis.call('HMGET', KEYS[2], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) / 1000 * rate)
+    local ttl = math.ceil(capacity / rate * 1000) + 1000
+    if tokens < cost then
+        redis.call('HSET', KEYS[2], 'tokens', tokens, 'ts', now)
+        redis.call('PEXPIRE', KEYS[2], ttl)
+        local remaining = -1
+        if limit > 0 then remaining = limit - used end
+        return {0, remaining, math.ceil((cost - tokens) / rate * 1000)}
+    end
+    redis.call('HSET', KEYS[2], 'tokens', tokens - cost, 'ts', now)
+    redis.call('PEXPIRE', KEYS[2], ttl)
+end
+
+if limit > 0 then
+    used = redis.call('INCRBY', KEYS[1], cost)
+    if used == cost then redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2])) end
+    return {1, limit - used, 0}
+end
+return {1, -1, 0}
+"""
+
+REFUND_SCRIPT = """
+local cost = tonumber(ARGV[1])
+local used = tonumber(redis.call('GET', KEYS[1]) or '0')
+if used > 0 then
+    redis.call('DECRBY', KEYS[1], math.min(cost, used))
+end
+local tokens = tonumber(redis.call('HGET', KEYS[2], 'tokens'))
+if tokens then
+    redis.call('HSET', KEYS[2], 'tokens', math.min(tonumber(ARGV[2]), tokens + cost))
+end
+return 1
+"""
+
+DAILY_TTL = 86400 + 3600
+
+_reserve = redis_client.register_script(RESERVE_SCRIPT)
+_refund = redis_client.register_script(REFUND_SCRIPT)
+
+
+@dataclass
+class Reservation:
+    allowed: bool
+    remaining: int       # 일일 잔여량 (-1: 무제한)
+    retry_after: float   # 초당 제한 대기 시간(초), 일일 쿼터 소진 시 -1
+
+
+def _limits() -> Dict[str, Tuple[int, float, int]]:
+    """provider → (일일 쿼터, 초당 보충 토큰, 버킷 용량). 0은 제한 없음"""
+    return {
+        "replicate": (settings.REPLICATE_DAILY_QUOTA, settings.REPLICATE_RATE_PER_SEC, settings.REPLICATE_BURST),
+    }
+
+
+def _keys(provider: str):
+    today = datetime.now().strftime("%Y-%m-%d")
+    return [f"quota:{provider}:daily:{today}", f"quota:{provider}:bucket"]
+
+
+async def reserve(provider: str, cost: int = 1) -> Reservation:
+    daily, rate, burst = _limits()[provider]
+    try:
+        raw = await _reserve(
+            keys=_keys(provider),
+            args=[daily, DAILY_TTL, cost, rate, max(burst, cost), int(time.time() * 1000)],
+        )
+    except Exception as e:
+        # Redis 장애 시 외부 호출을 막지 않음 (fail-open)
+        logger.error(f"❌ Quota reserve failed ({provider}), allowing call: {e}")
+        return Reservation(True, -1, 0)
+    allowed, remaining, retry_ms = (int(v) for v in raw)
+    return Reservation(bool(allowed), remaining, retry_ms / 1000 if retry_ms >= 0 else -1)
+
+
+async def refund(provider: str, cost: int = 1) -> None:
+    _, _, burst = _limits()[provider]
+    try:
+        await _refund(keys=_keys(provider), args=[cost, max(burst, cost)])
+    except Exception as e:
+        logger.error(f"❌ Quota refund failed ({provider}): {e}")
+
+
+async def reserve_or_429(provider: str, cost: int = 1) -> Reservation:
+    """선차감 실패 시 429 (Retry-After 포함)"""
+    reservation = await reserve(provider, cost)
+    if not reservation.allowed:
+        if reservation.retry_after < 0:
+            raise HTTPException(status_code=429, detail="오늘의 AI 생성 한도를 초과했습니다.")
+        raise HTTPException(
+            status_code=429,
+            detail="요청이 많아 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(max(1, round(reservation.retry_after)))},
+        )
+    return reservation
+
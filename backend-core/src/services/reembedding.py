@@ -0,0 +1,310 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+import httpx
+from fastapi import HTTPException
+from sqlalchemy import and_, func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.constants import SAFE_AI_URL
+from src.core.redis_client import redis_client
+from src.models.embedding_space import EmbeddingSpace
+from src.models.product import Product
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# Re-embedding Engine (모델 업그레이드)
+# 1. migrate: 대상 모델(ai-service의 *_NEXT_MODEL_NAME)로 shadow 컬럼을 배치 단위로 채움
+# 2. dual-write: 진행 중 새로 쓰인 상품은 우선순위 큐로 즉시 shadow 생성
+# 3. swap: 커버리지 100% 도달 시 한 트랜잭션에서 원본 ← shadow 교체,
+#    커밋 후 Redis 승격 플래그 기록 → ai-service 각 프로세스가 모델 교체 (ModelWatcher)
+# --------------------------------------------------------------------------
+SPACES: Dict[str, Dict[str, str]] = {
+    "bert": {"embedding": "embedding_next"},
+    "clip": {
+        "embedding_clip": "embedding_clip_next",
+        "embedding_clip_upper": "embedding_clip_upper_next",
+        "embedding_clip_lower": "embedding_clip_lower_next",
+    },
+}
+# 진행률 판단 기준 컬럼 (같은 공간의 컬럼은 함께 기록됨)
+PRIMARY_COLUMN = {"bert": "embedding", "clip": "embedding_clip"}
+
+ACTIVE_STATUSES = ("migrating", "ready")
+PRIORITY_KEY = "reembed:{space}:priority"   # SET: dual-write로 먼저 처리할 상품 ID
+FAILED_KEY = "reembed:{space}:failed"       # SET: 재임베딩 불가 상품 (이미지 없음 등)
+SCHEDULE_LOCK = "reembed:{space}:scheduled"
+ACTIVE_SPACES_KEY = "reembed:active_spaces"  # SET: 진행 중인 공간 (dual-write 훅이 참조)
+# ai-service(src/core/model_engine.py)와 같은 키: 공간별 활성 모델명 + 승격 버전
+ACTIVE_MODEL_KEY = "embedding_model:active"
+ACTIVE_MODEL_VERSION_KEY = "embedding_model:version"
+
+
+def validate_space(space: str) -> None:
+    if space not in SPACES:
+        raise HTTPException(status_code=404, detail=f"Unknown embedding space: {space}")
+
+
+def embedding_text(product: Any) -> str:
+    """BERT 임베딩 입력 텍스트 (CSV 대량 등록과 동일한 형식)"""
+    return f"[{product.gender}] {product.name} {product.category} {product.description or ''}"
+
+
+def shadow_reset_values(columns: Iterable[str]) -> Dict[str, None]:
+    """원본 벡터가 다시 쓰일 때 stale해지는 shadow 컬럼 초기화 값"""
+    shadows = {primary: shadow for mapping in SPACES.values() for primary, shadow in mapping.items()}
+    return {shadows[c]: None for c in columns if c in shadows}
+
+
+async def pending_ids_filter(space: str):
+    primary = getattr(Product, PRIMARY_COLUMN[space])
+    shadow = getattr(Product, SPACES[space][PRIMARY_COLUMN[space]])
+    failed = [int(pid) for pid in await redis_client.smembers(FAILED_KEY.format(space=space))]
+    condition = and_(Product.deleted_at.is_(None), primary.is_not(None), shadow.is_(None))
+    if failed:
+        condition = and_(condition, Product.id.notin_(failed))
+    return condition
+
+
+# ------------------------------------------------------------------
+# [Status / Progress]
+# ------------------------------------------------------------------
+async def _space_rows(db: AsyncSession, space: str) -> List[EmbeddingSpace]:
+    result = await db.execute(select(EmbeddingSpace).where(EmbeddingSpace.space == space))
+    rows = list(result.scalars().all())
+    if not rows:
+        raise HTTPException(status_code=404, detail=f"Embedding space not initialized: {space}")
+    return rows
+
+
+async def refresh_progress(db: AsyncSession, space: str, items_per_sec: float = None) -> Dict[str, int]:
+    primary = getattr(Product, PRIMARY_COLUMN[space])
+    shadow = getattr(Product, SPACES[space][PRIMARY_COLUMN[space]])
+    alive = Product.deleted_at.is_(None)
+
+    total = await db.scalar(select(func.count(Product.id)).where(alive, primary.is_not(None))) or 0
+    processed = await db.scalar(
+        select(func.count(Product.id)).where(alive, primary.is_not(None), shadow.is_not(None))
+    ) or 0
+    pending = await db.scalar(select(func.count(Product.id)).where(await pending_ids_filter(space))) or 0
+
+    values: Dict[str, Any] = {"processed": processed, "total": total}
+    if items_per_sec is not None:
+        values["items_per_sec"] = round(items_per_sec, 2)
+    await db.execute(
+        update(EmbeddingSpace)
+        .where(EmbeddingSpace.space == space, EmbeddingSpace.status.in_(ACTIVE_STATUSES))
+        .values(status="ready" if pending == 0 else "migrating", **values)
+    )
+    await db.commit()
+    return {"processed": processed, "total": total, "pending": pending}
+
+
+async def get_status(db: AsyncSession) -> List[Dict[str, Any]]:
+    result = await db.execute(select(EmbeddingSpace).order_by(EmbeddingSpace.space, EmbeddingSpace.column_name))
+    rows = result.scalars().all()
+    failed = {space: await redis_client.scard(FAILED_KEY.format(space=space)) for space in SPACES}
+    return [
+        {
+            "column_name": r.column_name,
+            "space": r.space,
+            "model_id": r.model_id,
+            "target_model_id": r.target_model_id,
+            "status": r.status,
+            "processed": r.processed,
+            "total": r.total,
+            "failed": failed.get(r.space, 0),
+            "coverage": round(r.processed / r.total * 100, 2) if r.total else 0.0,
+            "items_per_sec": r.items_per_sec,
+            "started_at": r.started_at,
+            "swapped_at": r.swapped_at,
+        }
+        for r in rows
+    ]
+
+
+# ------------------------------------------------------------------
+# [Scheduling] 배치 태스크 예약 (dual-write 훅 포함)
+# ------------------------------------------------------------------
+def _schedule_batch(space: str, countdown: float = 0) -> None:
+    # 순환 import 방지를 위해 태스크 이름으로 발행
+    from src.core.celery_app import celery_app
+    celery_app.send_task("tasks.reembed_batch", args=[space], countdown=countdown)
+
+
+async def schedule_batch(space: str, countdown: float = 0) -> None:
+    if await redis_client.set(SCHEDULE_LOCK.format(space=space), "1", nx=True, ex=int(countdown) + 60):
+        _schedule_batch(space, countdown)
+
+
+async def release_schedule_lock(space: str) -> None:
+    await redis_client.delete(SCHEDULE_LOCK.format(space=space))
+
+
+async def notify_vectors_written(product_ids: List[int]) -> None:
+    """
+    Dual-write 훅: 원본 벡터가 새로 쓰인 상품을 진행 중인 재임베딩의 우선순위 큐에 등록.
+    재임베딩이 없으면 Redis 조회 1회로 끝납니다.
+    """
+    if not product_ids:
+        return
+    try:
+        for space in await redis_client.smembers(ACTIVE_SPACES_KEY):
+            await redis_client.sadd(PRIORITY_KEY.format(space=space), *product_ids)
+            await schedule_batch(space)
+    except Exception as e:
+        logger.error(f"Re-embedding dual-write notify failed: {e}")
+
+
+# ------------------------------------------------------------------
+# [Control] migrate / swap
+# ------------------------------------------------------------------
+async def fetch_model_info() -> Dict[str, Any]:
+    try:
+        async with httpx.AsyncClient(timeout=120.0) as client:
+            res = await client.get(f"{SAFE_AI_URL}/model-info")
+            res.raise_for_status()
+            return res.json()
+    except Exception as e:
+        logger.error(f"Model info fetch failed: {e}")
+        raise HTTPException(status_code=503, detail="AI 서비스 통신 오류")
+
+
+async def start_migration(db: AsyncSession, space: str) -> List[Dict[str, Any]]:
+    validate_space(space)
+    rows = await _space_rows(db, space)
+    info = (await fetch_model_info()).get(space, {})
+
+    target = info.get("next")
+    if not target:
+        raise HTTPException(status_code=409, detail=f"ai-service에 '{space}' 다음 모델이 설정되지 않았습니다.")
+    if target == rows[0].model_id:
+        raise HTTPException(status_code=409, detail="대상 모델이 현재 모델과 같습니다.")
+    # shadow 컬럼은 원본과 같은 차원으로 생성되어 있음 → 차원이 다른 모델은 별도 마이그레이션 필요
+    if info.get("next_dimension") != info.get("dimension"):
+        raise HTTPException(
+            status_code=409,
+            detail=f"차원 불일치: {info.get('dimension')} → {info.get('next_dimension')}"
+        )
+
+    if rows[0].target_model_id != target:
+        # 이전 대상 모델로 채워진 shadow 값 폐기
+        await db.execute(
+            update(Product)
+            .values(**{shadow: None for shadow in SPACES[space].values()})
+            .execution_options(synchronize_session=False)
+        )
+        await redis_client.delete(FAILED_KEY.format(space=space), PRIORITY_KEY.format(space=space))
+
+    await db.execute(
+        update(EmbeddingSpace).where(EmbeddingSpace.space == space).values(
+            target_model_id=target, status="migrating", items_per_sec=0.0, started_at=datetime.now()
+        )
+    )
+    await db.commit()
+    await redis_client.sadd(ACTIVE_SPACES_KEY, space)
+    await refresh_progress(db, space)
+    await schedule_batch(space)
+    logger.info(f"🔄 Re-embedding started: {space} → {target}")
+    return [s for s in await get_status(db) if s["space"] == space]
+
+
+async def publish_promotion(space: str, model_id: str) -> None:
+    """승격 플래그 기록 (ai-service 프로세스들이 버전 변경을 감지해 모델 교체)"""
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.hset(ACTIVE_MODEL_KEY, space, model_id)
+        pipe.incr(ACTIVE_MODEL_VERSION_KEY)
+        await pipe.execute()
+
+
+async def _failed_ids_for_swap(db: AsyncSession, space: str, force: bool) -> List[int]:
+    failed_ids = [int(pid) for pid in await redis_client.smembers(FAILED_KEY.format(space=space))]
+    if failed_ids and not force:
+        await db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail=f"재임베딩 실패 상품 {len(failed_ids)}개가 이전 모델 벡터를 갖고 있습니다. "
+                   "force=true 로 스왑하면 해당 상품의 벡터를 초기화합니다.",
+        )
+    return failed_ids
+
+
+async def swap(db: AsyncSession, space: str, force: bool = False) -> List[Dict[str, Any]]:
+    """
+    force=False: 재임베딩 실패 상품(FAILED_KEY)이 있으면 409 (스왑하면 한 컬럼에 두 모델의 벡터가 섞임)
+    force=True: 실패 상품의 벡터를 NULL로 초기화하고 스왑 (BERT는 임베딩 복구 sweep이 새 모델로 다시 생성)
+    """
+    validate_space(space)
+    rows = await _space_rows(db, space)
+    if rows[0].status not in ACTIVE_STATUSES or not rows[0].target_model_id:
+        raise HTTPException(status_code=409, detail="진행 중인 재임베딩이 없습니다.")
+    target = rows[0].target_model_id
+
+    # 승격할 모델이 ai-service의 다음 모델과 같은지 먼저 확인 (스왑 후 승격 불가 상태 방지)
+    info = (await fetch_model_info()).get(space, {})
+    if info.get("next") != target:
+        raise HTTPException(
+            status_code=409,
+            detail=f"ai-service의 다음 모델({info.get('next')})이 대상 모델({target})과 다릅니다."
+        )
+
+    await _failed_ids_for_swap(db, space, force)
+
+    # 락 없이 먼저 확인 → 미달이면 쓰기를 막지 않고 바로 거절
+    pending = await db.scalar(select(func.count(Product.id)).where(await pending_ids_filter(space)))
+    if pending:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=f"커버리지 미달: {pending}개 상품이 남아 있습니다.")
+
+    # 스왑 트랜잭션 동안만 새 쓰기를 막아서 커버리지 재확인과 교체를 원자적으로 수행
+    await db.execute(text("LOCK TABLE products IN SHARE ROW EXCLUSIVE MODE"))
+    # 락 대기 중 배치가 실패 상품을 추가했을 수 있으므로 다시 조회
+    failed_ids = await _failed_ids_for_swap(db, space, force)
+    pending = await db.scalar(select(func.count(Product.id)).where(await pending_ids_filter(space)))
+    if pending:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=f"커버리지 미달: {pending}개 상품이 남아 있습니다.")
+
+    # shadow가 채워진 상품은 교체. 재임베딩에 실패한 상품(force)은 이전 모델 벡터가 새 모델 벡터와
+    # 비교되지 않도록 NULL로 초기화
+    mapping = SPACES[space]
+    shadow_primary = getattr(Product, mapping[PRIMARY_COLUMN[space]])
+    if failed_ids:
+        await db.execute(
+            update(Product)
+            .where(Product.id.in_(failed_ids), shadow_primary.is_(None))
+            .values(**{col: None for col in mapping})
+            .execution_options(synchronize_session=False)
+        )
+    await db.execute(
+        update(Product)
+        .where(shadow_primary.is_not(None))
+        .values(**{col: getattr(Product, shadow) for col, shadow in mapping.items()},
+                **{shadow: None for shadow in mapping.values()})
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        update(EmbeddingSpace).where(EmbeddingSpace.space == space).values(
+            model_id=target, target_model_id=None, status="idle", swapped_at=datetime.now()
+        )
+    )
+    await db.commit()
+
+    await redis_client.srem(ACTIVE_SPACES_KEY, space)
+    await redis_client.delete(PRIORITY_KEY.format(space=space), FAILED_KEY.format(space=space))
+    if failed_ids:
+        logger.warning(f"⚠️ {len(failed_ids)} products in '{space}' had vectors reset (re-embedding failed)")
+
+    # 커밋 이후 승격: 모델 로딩은 ai-service 각 프로세스가 백그라운드에서 수행
+    try:
+        await publish_promotion(space, target)
+    except Exception as e:
+        logger.error(f"❌ Swap committed but model promotion flag was not written: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="컬럼 스왑은 완료되었지만 모델 승격 플래그 기록에 실패했습니다. ai-service POST /model-promote 를 다시 호출하세요.",
+        )
+    logger.info(f"✅ Embedding space swapped: {space} → {target}")
+    return [s for s in await get_status(db) if s["space"] == space]
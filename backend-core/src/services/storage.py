@@ -1,19 +1,97 @@
 import abc
 import os
-import shutil
+import uuid
+import hashlib
+import asyncio
+import functools
+import aiofiles
+import aiofiles.os
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from typing import Optional
+from typing import AsyncIterator, Optional
 from fastapi import UploadFile
 from src.config.settings import settings
 
+# --------------------------------------------------------------------------
+# Storage Service (논블로킹 I/O)
+# - Local: aiofiles 로 청크 단위 기록 → 완료 후 rename (쓰는 도중의 파일이 서빙되지 않음)
+# - S3: boto3 호출은 전부 스레드로 오프로드 (이벤트 루프 블로킹 없음)
+#   S3_PART_SIZE 미만이면 put_object 1회, 이상이면 multipart (파트 동시 전송 수 제한)
+# - 업로드 원본은 항상 청크 스트림 (UploadFile / bytes / 다운로드 스트림 공용)
+# - S3_ENDPOINT_URL 로 MinIO / moto 등 S3 호환 서버 사용 가능
+# - 새 파일명은 내용 hash (같은 내용 = 같은 경로 → 덮어쓰기 없음 → /static 에서 immutable 캐시)
+# --------------------------------------------------------------------------
+
+# S3 multipart 파트 크기 (마지막 파트 제외 최소 5MB)
+S3_PART_SIZE = 8 * 1024 * 1024
+
+
+async def iter_upload_file(file: UploadFile, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+    """UploadFile → 청크 스트림 (UploadFile.read 는 스레드풀에서 실행됨)"""
+    chunk_size = chunk_size or settings.STORAGE_CHUNK_SIZE
+    await file.seek(0)
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def iter_bytes(data: bytes, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+    chunk_size = chunk_size or settings.STORAGE_CHUNK_SIZE
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+async def file_digest(file: UploadFile) -> str:
+    """UploadFile 내용 hash (청크 단위로 읽어 전체를 메모리에 올리지 않음)"""
+    digest = hashlib.blake2b(digest_size=16)
+    async for chunk in iter_upload_file(file):
+        digest.update(chunk)
+    await file.seek(0)
+    return digest.hexdigest()
+
+
+def content_path(prefix: str, digest: str, filename: Optional[str]) -> str:
+    """{prefix}/{내용 hash}.{원본 확장자}"""
+    extension = os.path.splitext(filename or "")[1].lower() or ".jpg"
+    return f"{prefix}/{digest}{extension}"
+
+
 class StorageService(abc.ABC):
     """
     Abstract Base Class for Storage Strategies
     """
-    @abc.abstractmethod
     async def upload(self, file: UploadFile, destination: str) -> str:
         """Upload a file and return its path/key"""
+        return await self.upload_stream(
+            iter_upload_file(file), destination, file.content_type or "application/octet-stream"
+        )
+
+    async def upload_bytes(self, data: bytes, destination: str, content_type: str) -> str:
+        """Upload in-memory bytes and return its path/key"""
+        return await self.upload_stream(iter_bytes(data), destination, content_type)
+
+    async def upload_content(self, data: bytes, prefix: str, filename: Optional[str], content_type: str) -> str:
+        """내용 hash 경로로 저장 (이미 있으면 업로드 생략)"""
+        path = content_path(prefix, content_digest(data), filename)
+        if await self.exists(path):
+            return path
+        return await self.upload_bytes(data, path, content_type)
+
+    @abc.abstractmethod
+    async def upload_stream(self, chunks: AsyncIterator[bytes], destination: str, content_type: str) -> str:
+        """Upload chunks as they arrive (whole file is never buffered) and return its path/key"""
+        pass
+
+    @abc.abstractmethod
+    async def read(self, path: str) -> bytes:
+        """Read a whole file"""
         pass
 
     @abc.abstractmethod
@@ -31,84 +109,183 @@ class StorageService(abc.ABC):
         """Generate a temporary accessible URL"""
         pass
 
+    @abc.abstractmethod
+    def public_url(self, path: str) -> str:
+        """Stable (non-expiring) URL to store in DB"""
+        pass
+
+    def path_from_url(self, url: Optional[str]) -> Optional[str]:
+        """public_url()로 만든 URL이면 저장소 경로 반환 (외부 URL이면 None)"""
+        prefix = self.public_url("")
+        if url and url.startswith(prefix):
+            return url[len(prefix):]
+        return None
+
 
 class LocalStorage(StorageService):
     def __init__(self):
-        self.base_path = settings.LOCAL_STORAGE_PATH
+        self.base_path = os.path.abspath(settings.LOCAL_STORAGE_PATH)
         os.makedirs(self.base_path, exist_ok=True)
 
-    async def upload(self, file: UploadFile, destination: str) -> str:
-        full_path = os.path.join(self.base_path, destination)
-        directory = os.path.dirname(full_path)
-        os.makedirs(directory, exist_ok=True)
-        
+    def _full_path(self, path: str) -> str:
+        full_path = os.path.abspath(os.path.join(self.base_path, path))
+        # 저장소 루트 밖으로 나가는 경로 차단 (../ 등)
+        if os.path.commonpath([self.base_path, full_path]) != self.base_path:
+            raise ValueError(f"Invalid storage path: {path}")
+        return full_path
+
+    async def upload_stream(self, chunks: AsyncIterator[bytes], destination: str, content_type: str) -> str:
+        full_path = self._full_path(destination)
+        await aiofiles.os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+        # 동시 업로드가 같은 임시 파일을 쓰지 않도록 고유 이름 사용
+        tmp_path = f"{full_path}.{uuid.uuid4().hex}.part"
         try:
-            with open(full_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            async with aiofiles.open(tmp_path, "wb") as buffer:
+                async for chunk in chunks:
+                    await buffer.write(chunk)
+            await aiofiles.os.replace(tmp_path, full_path)
             return destination
         except Exception as e:
             # 실무에서는 로깅 처리 필수
             print(f"Local upload failed: {e}")
             raise e
+        finally:
+            # 실패/취소 시 남은 임시 파일 정리
+            if await aiofiles.os.path.exists(tmp_path):
+                await aiofiles.os.remove(tmp_path)
+
+    async def read(self, path: str) -> bytes:
+        async with aiofiles.open(self._full_path(path), "rb") as f:
+            return await f.read()
 
     async def delete(self, path: str) -> bool:
-        full_path = os.path.join(self.base_path, path)
-        if os.path.exists(full_path):
-            os.remove(full_path)
+        full_path = self._full_path(path)
+        if await aiofiles.os.path.exists(full_path):
+            await aiofiles.os.remove(full_path)
             return True
         return False
 
     async def exists(self, path: str) -> bool:
-        full_path = os.path.join(self.base_path, path)
-        return os.path.exists(full_path)
+        return await aiofiles.os.path.exists(self._full_path(path))
 
     def generate_presigned_url(self, path: str, expiration: int = 3600) -> str:
         # Local 환경에서는 정적 파일 서빙 URL 반환 (개발용)
         # Nginx나 FastAPI StaticFiles 설정 필요
         return f"http://localhost:8000/static/{path}"
 
+    def public_url(self, path: str) -> str:
+        return f"{settings.LOCAL_STORAGE_URL.rstrip('/')}/{path}"
+
 
 class S3Storage(StorageService):
     def __init__(self):
+        # boto3 client는 스레드 안전 → 프로세스당 1개를 스레드에서 공유
         self.client = boto3.client(
             's3',
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
+            region_name=settings.AWS_REGION,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            config=Config(max_pool_connections=max(10, settings.S3_MAX_CONCURRENT_PARTS * 4)),
         )
         self.bucket = settings.AWS_BUCKET_NAME
 
-    async def upload(self, file: UploadFile, destination: str) -> str:
+    async def _call(self, method: str, **kwargs):
+        return await asyncio.to_thread(getattr(self.client, method), **kwargs)
+
+    async def upload_stream(self, chunks: AsyncIterator[bytes], destination: str, content_type: str) -> str:
+        extra = {'ServerSideEncryption': 'AES256', 'ContentType': content_type}  # 보안 요구사항 충족
+        buffer = bytearray()
+        iterator = chunks.__aiter__()
+
+        # 1) 첫 파트 크기만큼 읽어보고 작으면 put_object 1회로 끝냄 (대부분의 상품 이미지)
         try:
-            self.client.upload_fileobj(
-                file.file,
-                self.bucket,
-                destination,
-                ExtraArgs={
-                    'ServerSideEncryption': 'AES256', # 보안 요구사항 충족
-                    'ContentType': file.content_type
-                }
-            )
-            return destination
+            async for chunk in iterator:
+                buffer.extend(chunk)
+                if len(buffer) >= S3_PART_SIZE:
+                    break
+            else:
+                await self._call('put_object', Bucket=self.bucket, Key=destination, Body=bytes(buffer), **extra)
+                return destination
         except ClientError as e:
             print(f"S3 upload failed: {e}")
             raise e
 
+        # 2) multipart: 읽기와 파트 전송을 겹쳐 진행 (동시 전송 파트 수 제한 → 메모리 상한)
+        upload = await self._call('create_multipart_upload', Bucket=self.bucket, Key=destination, **extra)
+        upload_id = upload["UploadId"]
+        parts = {}
+        pending = set()
+        part_count = 0
+
+        async def send(part_number: int, body: bytes):
+            response = await self._call(
+                'upload_part',
+                Bucket=self.bucket,
+                Key=destination,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=body,
+            )
+            parts[part_number] = response["ETag"]
+
+        async def flush():
+            nonlocal part_count
+            if len(pending) >= settings.S3_MAX_CONCURRENT_PARTS:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending.difference_update(done)
+                for task in done:
+                    task.result()
+            part_count += 1
+            pending.add(asyncio.create_task(send(part_count, bytes(buffer))))
+            buffer.clear()
+
+        try:
+            await flush()
+            async for chunk in iterator:
+                buffer.extend(chunk)
+                if len(buffer) >= S3_PART_SIZE:
+                    await flush()
+            if buffer:
+                await flush()
+            await asyncio.gather(*pending)
+            await self._call(
+                'complete_multipart_upload',
+                Bucket=self.bucket,
+                Key=destination,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": [{"ETag": parts[n], "PartNumber": n} for n in sorted(parts)]},
+            )
+            return destination
+        except (Exception, asyncio.CancelledError) as e:
+            print(f"S3 upload failed: {e!r}")
+            for task in pending:
+                task.cancel()
+            await self._call('abort_multipart_upload', Bucket=self.bucket, Key=destination, UploadId=upload_id)
+            raise e
+
+    async def read(self, path: str) -> bytes:
+        def _get() -> bytes:
+            return self.client.get_object(Bucket=self.bucket, Key=path)["Body"].read()
+        return await asyncio.to_thread(_get)
+
     async def delete(self, path: str) -> bool:
         try:
-            self.client.delete_object(Bucket=self.bucket, Key=path)
+            await self._call('delete_object', Bucket=self.bucket, Key=path)
             return True
         except ClientError:
             return False
 
     async def exists(self, path: str) -> bool:
         try:
-            self.client.head_object(Bucket=self.bucket, Key=path)
+            await self._call('head_object', Bucket=self.bucket, Key=path)
             return True
         except ClientError:
             return False
 
     def generate_presigned_url(self, path: str, expiration: int = 3600) -> str:
+        # 서명 계산만 하고 네트워크 호출은 없음
         try:
             response = self.client.generate_presigned_url(
                 'get_object',
@@ -119,7 +296,15 @@ class S3Storage(StorageService):
         except ClientError:
             return ""
 
+    def public_url(self, path: str) -> str:
+        if settings.S3_PUBLIC_URL:
+            return f"{settings.S3_PUBLIC_URL.rstrip('/')}/{path}"
+        return f"https://{self.bucket}.s3.{settings.AWS_REGION}.amazonaws.com/{path}"
+
+
+@functools.lru_cache
 def get_storage_service() -> StorageService:
+    """프로세스당 1개 (boto3 client 생성 비용이 커서 요청마다 만들지 않음)"""
     if settings.STORAGE_TYPE == "s3":
         return S3Storage()
-    return LocalStorage()
\ No newline at end of file
+    return LocalStorage()
@@ -0,0 +1,133 @@
+import logging
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.settings import settings
+from src.core.redis_client import redis_client
+from src.models.wishlist import Wishlist
+from src.services.principal_cache import Principal
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# 사용자별 찜 상품 ID 캐시 (Redis Set)
+# - wishlist:{user_id} = {"0", 찜한 상품 ID...}
+#   "0"(상품 ID는 1부터)은 적재 완료 표시 → 찜이 하나도 없는 사용자도 캐시 적중
+# - 조회: SMISMEMBER 1회로 적재 여부 + 요청한 상품들의 찜 여부를 함께 확인
+#   미스: 해당 사용자의 찜 목록을 1회 조회(uq_wishlist_user_product 인덱스)해 Set 전체 적재
+# - 토글 시 SADD/SREM 으로 갱신 (적재 표시가 없는 Set은 다음 조회 때 다시 적재)
+# - 적재 경쟁 방지: wishlist:{user_id}:version 을 토글마다 INCR
+#   적재는 DB 조회 전에 읽은 버전이 그대로일 때만 Set을 교체 (Lua 1회)
+#   → 토글 커밋 전에 읽은 이전 스냅샷이 토글 반영 후 덮어쓰지 않음 (다음 조회에서 재적재)
+# - WISHLIST_CACHE_TTL=0 이면 캐시 없이 요청한 상품만 DB 조회
+# --------------------------------------------------------------------------
+WISHLIST_KEY = "wishlist:{user_id}"
+VERSION_KEY = "wishlist:{user_id}:version"
+LOADED_MARKER = "0"
+
+# KEYS: set, version / ARGV: 적재 시작 시점 버전("" = 없음), ttl, 상품 ID...
+# return: 1(교체) / 0(그 사이 토글됨 → 건너뜀)
+STORE_SCRIPT = """
+local current = redis.call('GET', KEYS[2]) or ''
+if current ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+for i = 3, #ARGV, 1000 do
+    redis.call('SADD', KEYS[1], unpack(ARGV, i, math.min(i + 999, #ARGV)))
+end
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+return 1
+"""
+
+_store_script = redis_client.register_script(STORE_SCRIPT)
+
+
+async def _load_all(db: AsyncSession, user_id: int) -> Set[int]:
+    result = await db.execute(select(Wishlist.product_id).where(Wishlist.user_id == user_id))
+    return set(result.scalars().all())
+
+
+async def _load_version(user_id: int) -> Optional[str]:
+    """DB 조회 전 버전 (Redis 장애 시 None → 적재 생략)"""
+    try:
+        return await redis_client.get(VERSION_KEY.format(user_id=user_id)) or ""
+    except Exception as e:
+        logger.warning(f"⚠️ Wishlist cache version read failed for user {user_id}: {e}")
+        return None
+
+
+async def _store(user_id: int, product_ids: Set[int], version: str) -> None:
+    keys = [WISHLIST_KEY.format(user_id=user_id), VERSION_KEY.format(user_id=user_id)]
+    try:
+        stored = await _store_script(
+            keys=keys, args=[version, settings.WISHLIST_CACHE_TTL, LOADED_MARKER, *product_ids]
+        )
+        if not stored:
+            logger.info(f"🔁 Wishlist cache refill skipped for user {user_id} (toggled during load)")
+    except Exception as e:
+        logger.warning(f"⚠️ Wishlist cache write failed for user {user_id}: {e}")
+
+
+async def wished_product_ids(db: AsyncSession, user_id: int, product_ids: Iterable[int]) -> Set[int]:
+    """product_ids 중 사용자가 찜한 상품 ID"""
+    ids = list(dict.fromkeys(product_ids))
+    if not ids:
+        return set()
+
+    if settings.WISHLIST_CACHE_TTL <= 0:
+        result = await db.execute(
+            select(Wishlist.product_id).where(Wishlist.user_id == user_id, Wishlist.product_id.in_(ids))
+        )
+        return set(result.scalars().all())
+
+    key = WISHLIST_KEY.format(user_id=user_id)
+    try:
+        flags = await redis_client.smismember(key, [LOADED_MARKER, *ids])
+        if flags[0]:
+            return {product_id for product_id, hit in zip(ids, flags[1:]) if hit}
+    except Exception as e:
+        logger.warning(f"⚠️ Wishlist cache read failed for user {user_id}: {e}")
+
+    version = await _load_version(user_id)
+    wished = await _load_all(db, user_id)
+    if version is not None:
+        await _store(user_id, wished, version)
+    return wished.intersection(ids)
+
+
+async def record_toggle(user_id: int, product_id: int, is_wished: bool) -> None:
+    """토글 커밋 후 호출 → 캐시된 Set에 반영"""
+    if settings.WISHLIST_CACHE_TTL <= 0:
+        return
+    key = WISHLIST_KEY.format(user_id=user_id)
+    version_key = VERSION_KEY.format(user_id=user_id)
+    try:
+        pipe = redis_client.pipeline(transaction=True)
+        # 진행 중인 적재가 이전 스냅샷으로 덮어쓰지 못하도록 버전 증가
+        pipe.incr(version_key)
+        pipe.expire(version_key, settings.WISHLIST_CACHE_TTL)
+        if is_wished:
+            pipe.sadd(key, product_id)
+        else:
+            pipe.srem(key, product_id)
+        pipe.expire(key, settings.WISHLIST_CACHE_TTL)
+        await pipe.execute()
+    except Exception as e:
+        # 갱신 실패 시 이전 상태가 남지 않도록 삭제 시도 (다음 조회에서 재적재)
+        logger.warning(f"⚠️ Wishlist cache update failed for user {user_id}: {e}")
+        try:
+            await redis_client.delete(key)
+        except Exception:
+            pass
+
+
+async def mark_wished(db: AsyncSession, principal: Optional[Principal], products: List) -> None:
+    """상품 응답 목록에 is_wished 채우기 (비로그인이면 그대로 None)"""
+    if principal is None or not products:
+        return
+    wished = await wished_product_ids(db, principal.id, [p.id for p in products])
+    for product in products:
+        product.is_wished = product.id in wished
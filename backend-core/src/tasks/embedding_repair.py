@@ -0,0 +1,186 @@
+import asyncio
+import logging
+from typing import List, Optional
+
+import httpx
+from sqlalchemy import select
+
+from src.config.settings import settings
+from src.constants import SAFE_AI_URL
+from src.core.celery_app import celery_app, run_async
+from src.core.redis_client import redis_client
+from src.db.session import async_session_maker
+from src.models.product import Product
+from src.services.reembedding import notify_vectors_written
+from src.services.embedding_repair import (
+    FAILED_DESCRIPTION,
+    REPAIR_ATTEMPTS_KEY,
+    REPAIR_FAILED_KEY,
+    REPAIR_QUEUE_KEY,
+    REPAIR_SCHEDULE_LOCK,
+    broken_product_filter,
+    is_product_broken,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# --------------------------------------------------------------------------
+# [Helper] AI 서비스 호출
+# --------------------------------------------------------------------------
+async def _generate_description(
+    client: httpx.AsyncClient, semaphore: asyncio.Semaphore, product: Product
+) -> Optional[str]:
+    if product.description and product.description != FAILED_DESCRIPTION:
+        return product.description
+
+    async with semaphore:
+        try:
+            prompt = f"상품명: {product.name}, 카테고리: {product.category}. 매력적인 쇼핑몰 상세 설명을 5문장 작성해줘."
+            res = await client.post(f"{SAFE_AI_URL}/llm-generate-response", json={"prompt": prompt}, timeout=20.0)
+            if res.status_code == 200:
+                return res.json().get("answer") or product.name
+        except Exception as e:
+            logger.error(f"Repair Description Failed (product {product.id}): {e}")
+    return product.description
+
+
+async def _embed_batch(client: httpx.AsyncClient, texts: List[str]) -> List[Optional[List[float]]]:
+    try:
+        res = await client.post(f"{SAFE_AI_URL}/embed-text-batch", json={"texts": texts}, timeout=60.0)
+        if res.status_code == 200:
+            vectors = res.json().get("vectors", [])
+            if len(vectors) == len(texts):
+                # 영벡터는 AI 서비스 내부 실패이므로 복구 실패로 간주
+                return [v if v and len(v) == 768 and any(v) else None for v in vectors]
+    except Exception as e:
+        logger.error(f"Repair Batch Embedding Failed: {e}")
+    return [None] * len(texts)
+
+
+# --------------------------------------------------------------------------
+# [Core] 배치 복구
+# --------------------------------------------------------------------------
+async def _repair_batch(client: httpx.AsyncClient, product_ids: List[int]) -> List[int]:
+    """배치 하나를 복구하고, 재시도가 필요한 상품 ID 목록을 반환"""
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(Product).where(Product.id.in_(product_ids), Product.deleted_at.is_(None))
+        )
+        # 큐에 있는 동안 다른 경로로 이미 복구된 상품은 건너뜀
+        products = [p for p in result.scalars().all() if is_product_broken(p)]
+        if not products:
+            return []
+
+        semaphore = asyncio.Semaphore(settings.EMBEDDING_REPAIR_LLM_CONCURRENCY)
+        descriptions = await asyncio.gather(
+            *[_generate_description(client, semaphore, p) for p in products]
+        )
+        texts = [f"{p.name} {p.category} {d or ''}" for p, d in zip(products, descriptions)]
+        vectors = await _embed_batch(client, texts)
+
+        repaired, failed = [], []
+        for product, description, vector in zip(products, descriptions, vectors):
+            if vector is None:
+                failed.append(product.id)
+                continue
+            product.embedding = vector
+            product.embedding_next = None  # 재임베딩 shadow 값 무효화
+            if description and description != product.description:
+                product.description = description
+            repaired.append(product.id)
+
+        # 배치 전체를 한 번의 트랜잭션으로 커밋
+        await session.commit()
+
+    if repaired:
+        await redis_client.hdel(REPAIR_ATTEMPTS_KEY, *repaired)
+        await notify_vectors_written(repaired)
+        logger.info(f"✅ [Repair Queue] {len(repaired)} products healed.")
+
+    return await _record_failures(failed)
+
+
+async def _record_failures(product_ids: List[int]) -> List[int]:
+    """실패 횟수를 올리고, 아직 재시도할 상품 ID 목록을 반환"""
+    retry = []
+    for product_id in product_ids:
+        attempts = await redis_client.hincrby(REPAIR_ATTEMPTS_KEY, product_id, 1)
+        if attempts >= settings.EMBEDDING_REPAIR_MAX_ATTEMPTS:
+            await redis_client.hdel(REPAIR_ATTEMPTS_KEY, product_id)
+            await redis_client.sadd(REPAIR_FAILED_KEY, product_id)
+            logger.error(f"❌ [Repair Queue] Product ID {product_id} gave up after {attempts} attempts.")
+        else:
+            retry.append(product_id)
+    return retry
+
+
+async def _drain_repair_queue() -> dict:
+    # 락을 먼저 해제해서, 처리 도중 새로 들어온 요청이 다음 drain을 예약할 수 있게 함
+    await redis_client.delete(REPAIR_SCHEDULE_LOCK)
+
+    processed = 0
+    retry_ids: List[int] = []
+    # SPOP으로 큐에서 꺼낸 뒤 아직 처리가 끝나지 않은 배치
+    in_flight: List[int] = []
+    try:
+        async with httpx.AsyncClient() as client:
+            while True:
+                raw_ids = await redis_client.spop(REPAIR_QUEUE_KEY, settings.EMBEDDING_REPAIR_BATCH_SIZE)
+                if not raw_ids:
+                    break
+                in_flight = [int(pid) for pid in raw_ids]
+                try:
+                    retry_ids.extend(await _repair_batch(client, in_flight))
+                except Exception as e:
+                    # DB/네트워크 오류 등 배치 전체 실패 → 꺼낸 ID를 잃지 않도록 재시도 대상으로 되돌리고
+                    # 같은 원인으로 남은 배치도 실패할 가능성이 높으므로 이번 drain은 중단
+                    logger.error(f"❌ [Repair Queue] Batch of {len(in_flight)} failed, requeueing: {e}")
+                    failed, in_flight = in_flight, []
+                    retry_ids.extend(await _record_failures(failed))
+                    break
+                processed += len(in_flight)
+                in_flight = []
+    finally:
+        # 처리 도중 중단(워커 종료/취소)된 배치도 큐로 되돌림
+        retry_ids.extend(in_flight)
+
+        # 실패 건은 AI 서비스가 회복할 시간을 두고 재시도
+        if retry_ids:
+            await redis_client.sadd(REPAIR_QUEUE_KEY, *retry_ids)
+            if await redis_client.set(REPAIR_SCHEDULE_LOCK, "1", nx=True, ex=120):
+                drain_embedding_repair_task.apply_async(countdown=60)
+
+    return {"processed": processed, "retry": len(retry_ids)}
+
+
+async def _sweep_broken_products() -> dict:
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(Product.id).where(Product.deleted_at.is_(None), broken_product_filter())
+        )
+        ids = [row[0] for row in result.all()]
+
+    # 이미 포기한 상품은 스윕 대상에서 제외 (관리자가 수동 확인)
+    gave_up = {int(pid) for pid in await redis_client.smembers(REPAIR_FAILED_KEY)}
+    ids = [pid for pid in ids if pid not in gave_up]
+    if ids:
+        await redis_client.sadd(REPAIR_QUEUE_KEY, *ids)
+        if await redis_client.set(REPAIR_SCHEDULE_LOCK, "1", nx=True, ex=30):
+            drain_embedding_repair_task.delay()
+    return {"queued": len(ids)}
+
+
+# --------------------------------------------------------------------------
+# Celery Tasks
+# --------------------------------------------------------------------------
+@celery_app.task(name="tasks.drain_embedding_repair")
+def drain_embedding_repair_task():
+    """복구 큐를 배치 단위로 비움"""
+    return run_async(_drain_repair_queue())
+
+
+@celery_app.task(name="tasks.sweep_broken_products")
+def sweep_broken_products_task():
+    """DB 전체에서 손상 상품을 찾아 복구 큐에 등록"""
+    return run_async(_sweep_broken_products())
@@ -0,0 +1,29 @@
+from typing import Optional
+
+from src.config.settings import settings
+from src.core.celery_app import celery_app, run_async
+from src.services.fitting_assets import ingest_result
+from src.services.fitting_jobs import poll_deadline, poll_job
+
+
+@celery_app.task(name="tasks.poll_fitting_job")
+def poll_fitting_job_task(job_id: str, deadline: Optional[float] = None):
+    """
+    가상 피팅 prediction 완료 폴링 (webhook 누락 대비)
+    1회 조회 후 미완료면 FITTING_POLL_INTERVAL 뒤로 재예약 → 대기 시간 동안 워커 슬롯을 점유하지 않음
+    """
+    if deadline is None:
+        deadline = poll_deadline()
+    if run_async(poll_job(job_id, deadline)):
+        poll_fitting_job_task.apply_async(args=[job_id, deadline], countdown=settings.FITTING_POLL_INTERVAL)
+
+
+@celery_app.task(
+    name="tasks.ingest_fitting_result",
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=3,
+)
+def ingest_fitting_result_task(result_id: int, job_id: str = None):
+    """피팅 결과 이미지를 자체 저장소로 복사 + 썸네일 생성 (Replicate URL 만료 대비)"""
+    return run_async(ingest_result(result_id, job_id))
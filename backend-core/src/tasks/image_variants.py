@@ -0,0 +1,10 @@
+from typing import List
+
+from src.core.celery_app import celery_app, run_async
+from src.services.image_variants import generate_variants
+
+
+@celery_app.task(name="tasks.generate_image_variants")
+def generate_image_variants_task(product_ids: List[int]):
+    """상품 이미지 파생본 생성 (썸네일/카드/상세 AVIF·WebP + 모델 입력 224px JPEG)"""
+    return run_async(generate_variants(product_ids))
@@ -0,0 +1,8 @@
+from src.core.celery_app import celery_app, run_async
+from src.services.product_import import run_import
+
+
+@celery_app.task(name="tasks.import_products_csv")
+def import_products_csv_task(job_id: str, path: str):
+    """CSV 상품 대량 등록 (스트리밍 파싱 + 배치 임베딩 + 멀티 로우 INSERT)"""
+    return run_async(run_import(job_id, path))
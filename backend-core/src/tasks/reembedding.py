@@ -0,0 +1,168 @@
+import asyncio
+import base64
+import logging
+import time
+from typing import Dict, List, Optional
+
+import httpx
+from sqlalchemy import select, update
+
+from src.config.settings import settings
+from src.constants import SAFE_AI_URL
+from src.core.celery_app import celery_app, run_async
+from src.core.redis_client import redis_client
+from src.db.session import async_session_maker
+from src.models.embedding_space import EmbeddingSpace
+from src.models.product import Product
+from src.services.image_variants import load_image, variant_url
+from src.services.storage import get_storage_service
+from src.services.reembedding import (
+    ACTIVE_STATUSES,
+    FAILED_KEY,
+    PRIORITY_KEY,
+    SPACES,
+    embedding_text,
+    pending_ids_filter,
+    refresh_progress,
+    release_schedule_lock,
+    schedule_batch,
+)
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_CONCURRENCY = 8
+
+
+# --------------------------------------------------------------------------
+# [Helper] 대상 모델(model="next")로 벡터 생성
+# --------------------------------------------------------------------------
+async def _embed_bert(client: httpx.AsyncClient, products: List[Product]) -> List[Optional[Dict[str, List[float]]]]:
+    res = await client.post(
+        f"{SAFE_AI_URL}/embed-text-batch",
+        json={"texts": [embedding_text(p) for p in products], "model": "next"},
+        timeout=120.0,
+    )
+    res.raise_for_status()
+    return [{"embedding_next": v} if v and any(v) else None for v in res.json().get("vectors", [])]
+
+
+async def _download(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, url: Optional[str]) -> Optional[str]:
+    if not url or url.startswith("https://placehold"):
+        return None
+    async with semaphore:
+        try:
+            data = await load_image(client, get_storage_service(), url)
+            return base64.b64encode(data).decode("utf-8")
+        except Exception as e:
+            logger.debug(f"Re-embedding image download failed ({url}): {e}")
+    return None
+
+
+async def _embed_clip(client: httpx.AsyncClient, products: List[Product]) -> List[Optional[Dict[str, List[float]]]]:
+    semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+    # 원본 대신 상세 파생본(긴 변 1280px = ai-service 디코딩 상한) 사용 → 다운로드/디코딩 비용 절감
+    images = await asyncio.gather(*[
+        _download(client, semaphore, variant_url(p, "detail", "webp")) for p in products
+    ])
+    results: List[Optional[Dict[str, List[float]]]] = [None] * len(products)
+    indexed = [(i, img) for i, img in enumerate(images) if img]
+    if not indexed:
+        return results
+
+    res = await client.post(
+        f"{SAFE_AI_URL}/generate-fashion-clip-vectors-batch",
+        json={"images_b64": [img for _, img in indexed], "model": "next"},
+        timeout=300.0,
+    )
+    res.raise_for_status()
+    for (i, _), v in zip(indexed, res.json().get("vectors", [])):
+        if v and all(v.get(k) for k in ("full", "upper", "lower")):
+            results[i] = {
+                "embedding_clip_next": v["full"],
+                "embedding_clip_upper_next": v["upper"],
+                "embedding_clip_lower_next": v["lower"],
+            }
+    return results
+
+
+# --------------------------------------------------------------------------
+# [Core] 배치 1회 처리
+# --------------------------------------------------------------------------
+async def _select_batch(session, space: str) -> List[Product]:
+    batch_size = settings.REEMBED_BATCH_SIZE
+    pending = await pending_ids_filter(space)
+
+    # Dual-write 우선순위 상품 먼저
+    priority = [int(pid) for pid in await redis_client.spop(PRIORITY_KEY.format(space=space), batch_size) or []]
+    products: List[Product] = []
+    if priority:
+        result = await session.execute(select(Product).where(pending, Product.id.in_(priority)))
+        products = list(result.scalars().all())
+
+    if len(products) < batch_size:
+        stmt = select(Product).where(pending).order_by(Product.id).limit(batch_size - len(products))
+        if products:
+            stmt = stmt.where(Product.id.notin_([p.id for p in products]))
+        result = await session.execute(stmt)
+        products.extend(result.scalars().all())
+    return products
+
+
+async def _reembed_batch(space: str) -> dict:
+    await release_schedule_lock(space)
+
+    async with async_session_maker() as session:
+        status = await session.scalar(
+            select(EmbeddingSpace.status).where(EmbeddingSpace.space == space).limit(1)
+        )
+        if status not in ACTIVE_STATUSES:
+            return {"space": space, "skipped": status}
+
+        products = await _select_batch(session, space)
+        if not products:
+            progress = await refresh_progress(session, space)
+            return {"space": space, **progress}
+
+        started = time.monotonic()
+        try:
+            async with httpx.AsyncClient() as client:
+                embed = _embed_bert if space == "bert" else _embed_clip
+                vectors = await embed(client, products)
+        except Exception as e:
+            # AI 서비스 장애: 같은 배치를 나중에 다시 시도
+            logger.error(f"❌ Re-embedding batch failed ({space}): {e}")
+            await schedule_batch(space, countdown=60)
+            return {"space": space, "error": str(e)}
+
+        rows, failed = [], []
+        for product, values in zip(products, vectors):
+            if values is None:
+                failed.append(product.id)
+            else:
+                rows.append({"id": product.id, **values})
+
+        # ORM bulk UPDATE (PK 기준 executemany)
+        if rows:
+            await session.execute(update(Product), rows)
+            await session.commit()
+        if failed:
+            await redis_client.sadd(FAILED_KEY.format(space=space), *failed)
+
+        elapsed = time.monotonic() - started
+        progress = await refresh_progress(session, space, items_per_sec=len(rows) / elapsed if elapsed else 0.0)
+
+    logger.info(
+        f"🔄 [Re-embedding:{space}] +{len(rows)} (failed {len(failed)}) "
+        f"{progress['processed']}/{progress['total']}"
+    )
+    if progress["pending"]:
+        await schedule_batch(space, countdown=settings.REEMBED_THROTTLE_SECONDS)
+    return {"space": space, "updated": len(rows), "failed": len(failed), **progress}
+
+
+@celery_app.task(name="tasks.reembed_batch")
+def reembed_batch_task(space: str):
+    """재임베딩 배치 1회 처리 후, 남은 상품이 있으면 스로틀 간격을 두고 다음 배치 예약"""
+    if space not in SPACES:
+        return {"space": space, "error": "unknown space"}
+    return run_async(_reembed_batch(space))
@@ -0,0 +1,174 @@
+import logging
+from collections import deque
+from typing import Callable, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------
+# Intent Matcher (Aho–Corasick)
+# - 사전(성별/불용어/패션 키워드 등)을 시작 시 1회 오토마톤으로 컴파일
+# - 검색어를 한 번만 훑어서 모든 사전의 매칭 결과를 반환 (사전 크기와 무관한 선형 시간)
+# - reload()는 새 오토마톤을 만든 뒤 참조만 교체 → 요청 경로에 락 없음
+# ai-service(src/core/intent_matcher.py)와 같은 구현을 사용합니다.
+# --------------------------------------------------------------------------
+
+
+class Match(NamedTuple):
+    label: str
+    term: str
+    start: int
+    end: int
+
+
+class _Automaton:
+    """label별 단어 목록 → goto/fail/output 테이블"""
+
+    def __init__(self, dictionaries: Mapping[str, Iterable[str]]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[tuple] = [()]
+        self.terms: Dict[str, FrozenSet[str]] = {}
+        self.fragments: Dict[str, FrozenSet[str]] = {}
+
+        for label, words in dictionaries.items():
+            terms = frozenset(w for w in words if w)
+            self.terms[label] = terms
+            for term in terms:
+                self._insert(term, label)
+        self._build_fail_links()
+
+    def _insert(self, term: str, label: str):
+        state = 0
+        for ch in term:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+            state = nxt
+        self.output[state] += ((label, term, len(term)),)
+
+    def _build_fail_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                # 접미사 상태의 출력도 함께 보고 (예: "출근룩" 안의 "룩")
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def hits(self, text: str) -> List[Tuple[int, int]]:
+        """출력이 있는 (끝 위치, 상태) 목록. Match 객체 생성 없이 상태 전이만 수행"""
+        goto, fail, output = self.goto, self.fail, self.output
+        hits = []
+        state = 0
+        for i, ch in enumerate(text):
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            if output[state]:
+                hits.append((i, state))
+        return hits
+
+class IntentMatcher:
+    def __init__(self, dictionaries: Mapping[str, Iterable[str]]):
+        self._automaton = _Automaton(dictionaries)
+
+    def reload(self, dictionaries: Mapping[str, Iterable[str]]):
+        """새 사전으로 재컴파일 후 원자적으로 교체"""
+        automaton = _Automaton(dictionaries)
+        self._automaton = automaton
+        logger.info(f"🔁 Intent matcher reloaded: { {k: len(v) for k, v in automaton.terms.items()} }")
+
+    def scan(self, text: str) -> List[Match]:
+        """text 안의 모든 사전 단어 매칭 (겹치는 매칭 포함, 끝 위치 순)"""
+        if not text:
+            return []
+        output = self._automaton.output
+        return [
+            tuple.__new__(Match, (label, term, end - size + 1, end + 1))
+            for end, state in self._automaton.hits(text)
+            for label, term, size in output[state]
+        ]
+
+    def labels(self, text: str) -> Set[str]:
+        """text에 등장한 사전 label 집합"""
+        if not text:
+            return set()
+        output = self._automaton.output
+        return {label for _, state in self._automaton.hits(text) for label, _, _ in output[state]}
+
+    def first(self, text: str, label: str) -> Optional[str]:
+        """label 사전 단어 중 text에서 가장 먼저 끝나는 것"""
+        match = self.first_match(text, lambda match_label: match_label == label)
+        return match.term if match else None
+
+    def first_match(self, text: str, predicate: Callable[[str], bool]) -> Optional[Match]:
+        """label이 predicate를 만족하는 첫 매칭 (예: "category:" 접두사 묶음)"""
+        if not text:
+            return None
+        output = self._automaton.output
+        for end, state in self._automaton.hits(text):
+            for label, term, size in output[state]:
+                if predicate(label):
+                    return Match(label, term, end - size + 1, end + 1)
+        return None
+
+    def label_of(self, word: str, predicate: Callable[[str], bool]) -> Optional[str]:
+        """word와 정확히 일치하는 사전 단어의 label"""
+        for label, terms in self._automaton.terms.items():
+            if predicate(label) and word in terms:
+                return label
+        return None
+
+    def terms(self, label: str) -> FrozenSet[str]:
+        return self._automaton.terms.get(label, frozenset())
+
+    def is_term(self, label: str, word: str) -> bool:
+        return word in self.terms(label)
+
+    def is_fragment(self, label: str, word: str) -> bool:
+        """word가 label 사전 단어의 부분 문자열인지 ('겨울' in '겨울에' 같은 역방향 검사)"""
+        automaton = self._automaton
+        fragments = automaton.fragments.get(label)
+        if fragments is None:
+            fragments = frozenset(
+                t[i:j] for t in automaton.terms.get(label, ()) for i in range(len(t)) for j in range(i + 1, len(t) + 1)
+            )
+            automaton.fragments[label] = fragments
+        return word in fragments
+
+
+# --------------------------------------------------------------------------
+# 기본 사전
+# --------------------------------------------------------------------------
+DEFAULT_DICTIONARIES: Dict[str, Set[str]] = {
+    # 성별 의도 (소문자 기준)
+    "gender_male": {"남자", "남성", "맨", "men", "male", "boy"},
+    "gender_female": {"여자", "여성", "우먼", "women", "female", "girl"},
+    # 핵심 키워드 추출 시 제거할 단어 ("옷"은 검색어로 유의미하므로 제외)
+    "remove_word": {
+        "남자", "여자", "남성", "여성", "남성용", "여성용",
+        "추천", "해줘", "보여줘", "찾아줘", "알려줘",
+        "스타일", "패션", "의류", "용",
+    },
+    # 인물 검색 판단용 패션 키워드 (ai-service의 fashion_context와 별도 사전)
+    "fashion_keyword": {"패션", "스타일", "코디", "룩", "공항", "착장", "의상", "옷"},
+    # 키워드 검색 불용어
+    "stop_word": {
+        "추천", "해줘", "보여줘", "찾아줘", "알려줘", "어때",
+        "사진", "이미지", "스타일", "패션", "옷", "의류",
+        "남자", "여자", "남성", "여성", "용",
+    },
+}
+
+
+intent_matcher = IntentMatcher(DEFAULT_DICTIONARIES)
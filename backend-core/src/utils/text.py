@@ -0,0 +1,8 @@
+from typing import Any
+
+
+def sanitize_string(value: Any) -> Any:
+    """DB 저장 전 문자열 정리 (NULL 바이트 제거 + 공백 트림)"""
+    if isinstance(value, str):
+        return value.replace("\x00", "").strip()
+    return value
@@ -0,0 +1,21 @@
+# backend-core/tests/conftest.py
+# 컨테이너 밖에서도 settings를 로드할 수 있도록 필수 환경 변수 기본값 지정 (실제 .env 값이 있으면 그대로 사용)
+
+import os
+
+for _name, _value in {
+    "JWT_SECRET_KEY": "test-secret-key-for-pytest-only-0123456789",
+    "ENCRYPTION_KEY": "test-encryption-key",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "REDIS_HOST": "localhost",
+    "SUPERUSER_EMAIL": "admin@example.com",
+    "SUPERUSER_PASSWORD": "test",
+    "MAIL_USERNAME": "test",
+    "MAIL_PASSWORD": "test",
+    "MAIL_FROM": "noreply@example.com",
+    "MAIL_SERVER": "localhost",
+}.items():
+    os.environ.setdefault(_name, _value)
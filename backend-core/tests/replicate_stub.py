@@ -0,0 +1,70 @@
+# backend-core/tests/replicate_stub.py
+"""
+Replicate Predictions API 로컬 스텁 (가상 피팅 작업 오프라인 테스트용)
+
+실행:
+    uvicorn tests.replicate_stub:app --port 9100
+백엔드 설정:
+    REPLICATE_API_BASE=http://localhost:9100/v1   (docker: http://host.docker.internal:9100/v1)
+
+- POST /v1/predictions : prediction 생성 → 즉시 "starting" 응답
+- GET  /v1/predictions/{id} : STUB_DELAY_SECONDS 경과 후 "succeeded" (출력 = STUB_OUTPUT_URL)
+- 요청에 webhook이 있으면 완료 시점에 prediction JSON을 POST
+- STUB_FAIL=1 이면 "failed" 로 종료
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from typing import Any, Dict
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+DELAY_SECONDS = float(os.getenv("STUB_DELAY_SECONDS", "3"))
+OUTPUT_URL = os.getenv("STUB_OUTPUT_URL", "https://placehold.co/768x1024.png?text=Fitting+Result")
+FAIL = os.getenv("STUB_FAIL", "0") == "1"
+
+app = FastAPI(title="Replicate Stub")
+predictions: Dict[str, Dict[str, Any]] = {}
+
+
+def _view(prediction_id: str) -> Dict[str, Any]:
+    prediction = predictions[prediction_id]
+    done = time.monotonic() - prediction["started"] >= DELAY_SECONDS
+    status = ("failed" if FAIL else "succeeded") if done else "processing"
+    return {
+        "id": prediction_id,
+        "version": prediction["version"],
+        "status": status,
+        "output": OUTPUT_URL if status == "succeeded" else None,
+        "error": "stub failure" if status == "failed" else None,
+    }
+
+
+async def _send_webhook(prediction_id: str, url: str):
+    await asyncio.sleep(DELAY_SECONDS)
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        try:
+            await client.post(url, json=_view(prediction_id))
+        except httpx.HTTPError as e:
+            print(f"⚠️ webhook delivery failed: {e}")
+
+
+@app.post("/v1/predictions", status_code=201)
+async def create_prediction(payload: Dict[str, Any]):
+    if "version" not in payload or "input" not in payload:
+        raise HTTPException(status_code=422, detail="version and input are required")
+    prediction_id = uuid.uuid4().hex[:20]
+    predictions[prediction_id] = {"version": payload["version"], "started": time.monotonic()}
+    if payload.get("webhook"):
+        asyncio.create_task(_send_webhook(prediction_id, payload["webhook"]))
+    return {**_view(prediction_id), "status": "starting"}
+
+
+@app.get("/v1/predictions/{prediction_id}")
+async def get_prediction(prediction_id: str):
+    if prediction_id not in predictions:
+        raise HTTPException(status_code=404, detail="Not found")
+    return _view(prediction_id)
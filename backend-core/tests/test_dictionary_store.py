@@ -0,0 +1,25 @@
+# backend-core/tests/test_dictionary_store.py
+# 관리자 사전 API label 검증: 오타 label은 저장돼도 어느 서비스에서도 쓰이지 않으므로 거부
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("email_validator")  # settings(EmailStr) 의존
+
+from src.services.dictionary_store import is_known_label, put_dictionary
+
+
+@pytest.mark.parametrize("label", ["stop_word", "remove_word", "celebrity", "fashion_context", "category:Shoes"])
+def test_known_labels(label):
+    assert is_known_label(label)
+
+
+@pytest.mark.parametrize("label", ["stopword", "category:Shoess", "category:", "category:shoes", "celebrity:Tops"])
+def test_unknown_labels(label):
+    assert not is_known_label(label)
+
+
+def test_put_rejects_unknown_label_before_redis():
+    with pytest.raises(ValueError):
+        asyncio.run(put_dictionary("stopword", ["추천"]))
@@ -0,0 +1,56 @@
+# backend-core/tests/test_embedding_repair.py
+# 임베딩 복구 큐: 읽기 경로 등록은 중복 없이 1회 drain 예약 / 최대 시도를 넘긴(포기한) 상품은 다시 등록하지 않음
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # Lua 스크립트 실행
+
+from src.services import embedding_repair
+from src.services.embedding_repair import REPAIR_FAILED_KEY, REPAIR_QUEUE_KEY
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(embedding_repair, "redis_client", client)
+    monkeypatch.setattr(embedding_repair, "_enqueue_script", client.register_script(embedding_repair.ENQUEUE_SCRIPT))
+    return client
+
+
+@pytest.fixture
+def drains(monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(embedding_repair, "_schedule_drain", lambda: scheduled.append(1))
+    return scheduled
+
+
+def _broken_product(product_id: int):
+    return SimpleNamespace(id=product_id, embedding=None, description="")
+
+
+def test_broken_product_is_queued_once(redis, drains):
+    async def scenario():
+        first = await embedding_repair.enqueue_if_broken(_broken_product(3))
+        second = await embedding_repair.enqueue_if_broken(_broken_product(3))
+        return first, second, await redis.smembers(REPAIR_QUEUE_KEY)
+
+    first, second, queued = asyncio.run(scenario())
+    assert (first, second) == (True, False)
+    assert queued == {"3"}
+    assert len(drains) == 1
+
+
+def test_gave_up_product_is_not_requeued_by_read(redis, drains):
+    async def scenario():
+        await redis.sadd(REPAIR_FAILED_KEY, 5)
+        queued = [await embedding_repair.enqueue_if_broken(_broken_product(5)) for _ in range(3)]
+        return queued, await redis.exists(REPAIR_QUEUE_KEY)
+
+    queued, exists = asyncio.run(scenario())
+    assert queued == [False, False, False]
+    assert exists == 0
+    assert drains == []
@@ -0,0 +1,252 @@
+# backend-core/tests/test_fitting_jobs.py
+# 가상 피팅 작업: webhook HMAC 토큰 / 1회 폴링 + 재예약 / 완료 확정(중복 방지) 및 실패 시 쿼터 반환
+# Replicate 호출은 tests/replicate_stub.py 앱을 ASGI로 직접 연결해 오프라인으로 수행
+
+import asyncio
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+
+pytest.importorskip("celery")
+
+from src.config.settings import settings
+from src.services import fitting_jobs
+from tests import replicate_stub
+
+STUB_BASE = "http://replicate-stub/v1"
+MODEL_ID = "owner/model:abc123"
+
+
+class FakeRedis:
+    """fitting_jobs가 사용하는 명령만 구현한 인메모리 Redis"""
+
+    def __init__(self):
+        self.data = {}
+        self.published = []
+
+    async def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    async def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    async def hsetnx(self, key, field, value):
+        fields = self.data.setdefault(key, {})
+        if field in fields:
+            return False
+        fields[field] = str(value)
+        return True
+
+    async def expire(self, key, seconds):
+        return True
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, nx=False, ex=None, keepttl=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def exists(self, key):
+        return int(key in self.data)
+
+
+class FakeSession:
+    next_id = 100
+
+    def __init__(self):
+        self.added = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def commit(self):
+        pass
+
+    async def refresh(self, obj):
+        FakeSession.next_id += 1
+        obj.id = FakeSession.next_id
+
+
+@pytest.fixture
+def env(monkeypatch):
+    redis = FakeRedis()
+    refunds = []
+    ingests = []
+
+    async def refund(provider, cost=1):
+        refunds.append(provider)
+
+    real_client = httpx.AsyncClient
+
+    def stub_client(*args, **kwargs):
+        kwargs.pop("transport", None)
+        return real_client(*args, transport=httpx.ASGITransport(app=replicate_stub.app), **kwargs)
+
+    monkeypatch.setattr(fitting_jobs, "redis_client", redis)
+    monkeypatch.setattr(fitting_jobs, "async_session_maker", FakeSession)
+    monkeypatch.setattr(fitting_jobs.rate_limiter, "refund", refund)
+    monkeypatch.setattr(fitting_jobs.celery_app, "send_task", lambda name, args: ingests.append(args))
+    monkeypatch.setattr(fitting_jobs.httpx, "AsyncClient", stub_client)
+    monkeypatch.setattr(settings, "REPLICATE_API_BASE", STUB_BASE)
+    monkeypatch.setattr(settings, "FITTING_WEBHOOK_BASE_URL", None)
+    monkeypatch.setattr(replicate_stub, "DELAY_SECONDS", 3600.0)
+    monkeypatch.setattr(replicate_stub, "FAIL", False)
+    return {"redis": redis, "refunds": refunds, "ingests": ingests}
+
+
+async def _submit(user_id: int = 1, cache_key: str = "k1") -> str:
+    job_id = await fitting_jobs.create_job(user_id, "upper_body", cache_key)
+    assert await fitting_jobs.claim_inflight(user_id, cache_key, job_id) is None
+    async with httpx.AsyncClient() as client:
+        await fitting_jobs.create_prediction(client, job_id, MODEL_ID, {"garm_img": "x"})
+    return job_id
+
+
+# ------------------------------------------------------------------
+# [Webhook HMAC]
+# ------------------------------------------------------------------
+def test_webhook_token_is_bound_to_job(monkeypatch):
+    token = fitting_jobs.webhook_token("job-a")
+    assert fitting_jobs.verify_webhook_token("job-a", token)
+    assert not fitting_jobs.verify_webhook_token("job-b", token)
+    assert not fitting_jobs.verify_webhook_token("job-a", "")
+    assert not fitting_jobs.verify_webhook_token("job-a", None)
+
+    monkeypatch.setattr(settings, "FITTING_WEBHOOK_BASE_URL", "https://api.example.com/")
+    url = urlparse(fitting_jobs._webhook_url("job-a"))
+    assert url.path == "/api/v1/fitting/webhook/job-a"
+    assert fitting_jobs.verify_webhook_token("job-a", parse_qs(url.query)["token"][0])
+
+
+# ------------------------------------------------------------------
+# [Polling] 1회 조회 → 진행 중이면 True, 종료면 False
+# ------------------------------------------------------------------
+def test_poll_job_single_poll_until_succeeded(env, monkeypatch):
+    async def scenario():
+        job_id = await _submit()
+        deadline = fitting_jobs.poll_deadline()
+
+        assert await fitting_jobs.poll_job(job_id, deadline) is True
+        assert (await fitting_jobs.get_job(job_id))["status"] == "processing"
+
+        monkeypatch.setattr(replicate_stub, "DELAY_SECONDS", 0.0)
+        assert await fitting_jobs.poll_job(job_id, deadline) is False
+        job = await fitting_jobs.get_job(job_id)
+        # 이미 확정된 작업은 더 조회하지 않음
+        assert await fitting_jobs.poll_job(job_id, deadline) is False
+        return job
+
+    job = asyncio.run(scenario())
+    assert job["status"] == "succeeded"
+    assert job["result_url"] == replicate_stub.OUTPUT_URL
+    assert env["refunds"] == []
+    assert env["ingests"] == [[job["result_id"], job["job_id"]]]
+    # 진행 중 표시 해제 + 결과 캐시
+    assert fitting_jobs.INFLIGHT_KEY.format(user_id=1, key="k1") not in env["redis"].data
+    assert fitting_jobs.CACHE_KEY.format(key="k1") in env["redis"].data
+
+
+def test_poll_job_times_out_and_refunds(env):
+    async def scenario():
+        job_id = await _submit()
+        assert await fitting_jobs.poll_job(job_id, deadline=0.0) is False
+        return await fitting_jobs.get_job(job_id)
+
+    job = asyncio.run(scenario())
+    assert job["status"] == "failed"
+    assert job["error"] == "timeout"
+    assert env["refunds"] == ["replicate"]
+
+
+def test_poll_job_keeps_polling_when_fetch_fails(env, monkeypatch):
+    async def broken_fetch(client, prediction_id):
+        raise httpx.ConnectError("down")
+
+    async def scenario():
+        job_id = await _submit()
+        monkeypatch.setattr(fitting_jobs, "fetch_prediction", broken_fetch)
+        return await fitting_jobs.poll_job(job_id, fitting_jobs.poll_deadline())
+
+    assert asyncio.run(scenario()) is True
+    assert env["refunds"] == []
+
+
+def test_poll_task_reschedules_instead_of_sleeping(monkeypatch):
+    from src.tasks import fitting as fitting_tasks
+
+    scheduled = []
+    results = iter([True, False])
+    monkeypatch.setattr(fitting_tasks, "run_async", lambda coro: (coro.close(), next(results))[1])
+    monkeypatch.setattr(
+        fitting_tasks.poll_fitting_job_task, "apply_async",
+        lambda args, countdown: scheduled.append((args, countdown)),
+    )
+
+    fitting_tasks.poll_fitting_job_task("job-a", 123.0)
+    assert scheduled == [(["job-a", 123.0], settings.FITTING_POLL_INTERVAL)]
+
+    fitting_tasks.poll_fitting_job_task("job-a", 123.0)
+    assert len(scheduled) == 1
+
+
+# ------------------------------------------------------------------
+# [Finalize] webhook / 폴링 중 먼저 온 쪽만 반영, 실패 시 1회만 환불
+# ------------------------------------------------------------------
+def test_failed_prediction_refunds_once(env, monkeypatch):
+    monkeypatch.setattr(replicate_stub, "DELAY_SECONDS", 0.0)
+    monkeypatch.setattr(replicate_stub, "FAIL", True)
+
+    async def scenario():
+        job_id = await _submit()
+        assert await fitting_jobs.poll_job(job_id, fitting_jobs.poll_deadline()) is False
+        # 뒤늦게 도착한 webhook은 상태를 바꾸지 않음
+        await fitting_jobs.complete_job(job_id, {"status": "succeeded", "output": "https://late.example/x.png"})
+        await fitting_jobs.fail_job(job_id, "late failure")
+        return await fitting_jobs.get_job(job_id)
+
+    job = asyncio.run(scenario())
+    assert job["status"] == "failed"
+    assert job["error"] == "stub failure"
+    assert env["refunds"] == ["replicate"]
+    assert env["ingests"] == []
+    assert fitting_jobs.CACHE_KEY.format(key="k1") not in env["redis"].data
+
+
+def test_webhook_and_poll_finalize_once(env):
+    async def scenario():
+        job_id = await _submit()
+        prediction = {"status": "succeeded", "output": ["https://cdn.example/a.png", "https://cdn.example/b.png"]}
+        first = await fitting_jobs.complete_job(job_id, prediction)
+        second = await fitting_jobs.complete_job(job_id, prediction)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first["status"] == second["status"] == "succeeded"
+    assert first["result_url"] == "https://cdn.example/b.png"
+    assert first["result_id"] == second["result_id"]
+    assert len(env["ingests"]) == 1
+
+
+def test_non_terminal_prediction_is_ignored(env):
+    async def scenario():
+        job_id = await _submit()
+        assert await fitting_jobs.complete_job(job_id, {"status": "processing"}) is None
+        return await fitting_jobs.get_job(job_id)
+
+    assert asyncio.run(scenario()).get("finalized") is None
@@ -0,0 +1,118 @@
+# backend-core/tests/test_principal_cache.py
+# 인증 주체 캐시: 무효화(버전 증가 + Redis 삭제 + 다른 프로세스 LRU 삭제 메시지) / 수신 시 로컬 LRU 삭제
+# / 무효화와 경쟁한 적재가 이전 권한을 다시 캐시하지 않음
+
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # Lua 스크립트 실행
+
+from src.config.settings import settings
+from src.services import principal_cache
+from src.services.principal_cache import INVALIDATE_CHANNEL, PRINCIPAL_KEY, VERSION_KEY, Principal
+
+USER_ID = 7
+
+
+class FakeUsers:
+    """users 테이블 대역: 사용자별 권한과 조회 수"""
+
+    def __init__(self, principal):
+        self.principal = principal
+        self.queries = 0
+
+    async def load(self, user_id):
+        self.queries += 1
+        return self.principal
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(principal_cache, "redis_client", client)
+    monkeypatch.setattr(principal_cache, "_store_script", client.register_script(principal_cache.STORE_SCRIPT))
+    monkeypatch.setattr(settings, "PRINCIPAL_CACHE_TTL", 300)
+    principal_cache._local.clear()
+    yield client
+    principal_cache._local.clear()
+
+
+def test_invalidate_publishes_to_other_processes(redis, monkeypatch):
+    published = []
+
+    async def publish(channel, message):
+        published.append((channel, message))
+
+    monkeypatch.setattr(redis, "publish", publish)
+    principal_cache._local.set(Principal(USER_ID, True, True), ttl=60)
+
+    async def scenario():
+        await redis.set(PRINCIPAL_KEY.format(user_id=USER_ID), "[7, true, true]")
+        await principal_cache.invalidate_principal(USER_ID)
+        return (
+            await redis.exists(PRINCIPAL_KEY.format(user_id=USER_ID)),
+            await redis.get(VERSION_KEY.format(user_id=USER_ID)),
+        )
+
+    exists, version = asyncio.run(scenario())
+    assert principal_cache._local.get(USER_ID) is None
+    assert exists == 0
+    assert version == "1"
+    assert published == [(INVALIDATE_CHANNEL, USER_ID)]
+
+
+def test_listener_drops_local_entry_only_for_that_user():
+    principal_cache._local.clear()
+    principal_cache._local.set(Principal(1, True, False), ttl=60)
+    principal_cache._local.set(Principal(2, True, True), ttl=60)
+
+    principal_cache.principal_listener.handle("2")
+    principal_cache.principal_listener.handle("not-a-user")
+
+    assert principal_cache._local.get(1) == Principal(1, True, False)
+    assert principal_cache._local.get(2) is None
+    principal_cache._local.clear()
+
+
+def test_refill_caches_in_redis_and_local(redis, monkeypatch):
+    users = FakeUsers(Principal(USER_ID, True, False))
+    monkeypatch.setattr(principal_cache, "_load_from_db", users.load)
+
+    async def scenario():
+        first = await principal_cache.get_principal(USER_ID)
+        principal_cache._local.clear()
+        second = await principal_cache.get_principal(USER_ID)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == second == Principal(USER_ID, True, False)
+    assert users.queries == 1
+    assert principal_cache._local.get(USER_ID) == Principal(USER_ID, True, False)
+
+
+def test_refill_racing_invalidation_does_not_cache_old_principal(redis, monkeypatch):
+    users = FakeUsers(Principal(USER_ID, True, True))
+
+    async def load_then_demote(user_id):
+        snapshot = await users.load(user_id)
+        # DB 조회가 끝난 뒤 관리자가 권한을 회수하고 커밋 → 무효화
+        users.principal = Principal(USER_ID, False, False)
+        await principal_cache.invalidate_principal(user_id)
+        return snapshot
+
+    async def scenario():
+        monkeypatch.setattr(principal_cache, "_load_from_db", load_then_demote)
+        stale = await principal_cache.get_principal(USER_ID)
+        cached = await redis.get(PRINCIPAL_KEY.format(user_id=USER_ID))
+        monkeypatch.setattr(principal_cache, "_load_from_db", users.load)
+        fresh = await principal_cache.get_principal(USER_ID)
+        return stale, cached, fresh
+
+    stale, cached, fresh = asyncio.run(scenario())
+    # 경쟁 중인 요청 자체는 자신의 스냅샷을 쓰지만, 그 값이 Redis/LRU에 남지 않음
+    assert stale == Principal(USER_ID, True, True)
+    assert cached is None
+    assert fresh == Principal(USER_ID, False, False)
+    assert users.queries == 2
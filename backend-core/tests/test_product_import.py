@@ -0,0 +1,76 @@
+# backend-core/tests/test_product_import.py
+# CSV 대량 등록 이미지 처리: CLIP(YOLO 경로) 입력 크기 / 파생본 저장 실패 시에도 임베딩 유지
+# 텍스트 임베딩: 실패 값(전부 0)/차원 불일치는 None (복구 sweep 대상)
+
+import asyncio
+import base64
+import io
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from src.services import product_import
+from src.services.image_variants import DISPLAY_VARIANTS, render_variants
+
+
+def _jpeg(size=(3000, 2000)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (10, 200, 30)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def test_embedding_input_is_detail_size():
+    _, embed_jpeg = render_variants(_jpeg(), [])
+    assert max(Image.open(io.BytesIO(embed_jpeg)).size) == DISPLAY_VARIANTS[0][1]
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class _Client:
+    def __init__(self):
+        self.sent = []
+
+    async def post(self, url, json, timeout):
+        self.sent.append(json["images_b64"])
+        return _Response({"vectors": [[0.1] * 512 for _ in json["images_b64"]]})
+
+
+def test_variant_failure_still_embeds_original(monkeypatch):
+    original = _jpeg((800, 600))
+
+    async def download(client, semaphore, url):
+        return original
+
+    async def broken_store(data, url, storage):
+        raise OSError("storage unavailable")
+
+    monkeypatch.setattr(product_import, "_download_image", download)
+    monkeypatch.setattr(product_import, "store_variants", broken_store)
+    monkeypatch.setattr(product_import, "get_storage_service", lambda: None)
+
+    client = _Client()
+    vectors, variants = asyncio.run(
+        product_import._embed_images(client, asyncio.Semaphore(2), ["https://img.example/a.jpg"])
+    )
+    assert variants == [None]
+    assert vectors == [[0.1] * 512]
+    assert base64.b64decode(client.sent[0][0]) == original
+
+
+class _TextClient:
+    async def post(self, url, json, timeout):
+        return _Response({"vectors": [[0.0] * 768, [0.2] * 768, [0.3] * 10]})
+
+
+def test_zero_text_embedding_is_stored_as_none():
+    vectors = asyncio.run(product_import._embed_texts(_TextClient(), ["a", "b", "c"]))
+    assert vectors == [None, [0.2] * 768, None]
@@ -0,0 +1,120 @@
+# backend-core/tests/test_storage.py
+# StorageService: 청크 스트림 업로드 (S3 단일 put / multipart, moto) + 로컬 경로 탈출 차단
+
+import asyncio
+import os
+
+import pytest
+
+pytest.importorskip("moto")
+from moto import mock_aws
+
+from src.config.settings import settings
+from src.services import storage
+from src.services.storage import S3_PART_SIZE, LocalStorage, S3Storage, iter_bytes
+
+BUCKET = "test-bucket"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setattr(settings, "AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setattr(settings, "AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setattr(settings, "AWS_REGION", "us-east-1")
+    monkeypatch.setattr(settings, "AWS_BUCKET_NAME", BUCKET)
+    monkeypatch.setattr(settings, "S3_ENDPOINT_URL", None)
+    with mock_aws():
+        service = S3Storage()
+        service.client.create_bucket(Bucket=BUCKET)
+        yield service
+
+
+def _payload(size: int) -> bytes:
+    return bytes((i * 31 + i // 7) % 256 for i in range(size))
+
+
+def _count_calls(service: S3Storage, monkeypatch):
+    calls = []
+    original = service._call
+
+    async def counting(method, **kwargs):
+        calls.append(method)
+        return await original(method, **kwargs)
+
+    monkeypatch.setattr(service, "_call", counting)
+    return calls
+
+
+def test_small_upload_uses_single_put(s3, monkeypatch):
+    calls = _count_calls(s3, monkeypatch)
+    data = _payload(300 * 1024)
+
+    async def scenario():
+        key = await s3.upload_stream(iter_bytes(data, 64 * 1024), "products/small.jpg", "image/jpeg")
+        return key, await s3.read(key), await s3.exists(key)
+
+    key, stored, exists = asyncio.run(scenario())
+    assert key == "products/small.jpg"
+    assert stored == data and exists
+    assert calls.count("put_object") == 1
+    assert "create_multipart_upload" not in calls
+
+    head = s3.client.head_object(Bucket=BUCKET, Key=key)
+    assert head["ContentType"] == "image/jpeg"
+    assert head["ServerSideEncryption"] == "AES256"
+
+
+def test_large_upload_uses_multipart(s3, monkeypatch):
+    calls = _count_calls(s3, monkeypatch)
+    monkeypatch.setattr(settings, "S3_MAX_CONCURRENT_PARTS", 2)
+    data = _payload(2 * S3_PART_SIZE + 123_457)
+
+    async def scenario():
+        key = await s3.upload_stream(iter_bytes(data, 1024 * 1024), "imports/large.bin", "application/octet-stream")
+        return await s3.read(key)
+
+    assert asyncio.run(scenario()) == data
+    assert calls.count("create_multipart_upload") == 1
+    assert calls.count("upload_part") == 3
+    assert calls.count("complete_multipart_upload") == 1
+    assert "put_object" not in calls
+
+
+def test_failed_stream_aborts_multipart(s3):
+    async def broken_stream():
+        yield b"x" * S3_PART_SIZE
+        raise RuntimeError("client disconnected")
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await s3.upload_stream(broken_stream(), "imports/broken.bin", "application/octet-stream")
+        return await s3.exists("imports/broken.bin")
+
+    assert asyncio.run(scenario()) is False
+    assert s3.client.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
+
+
+def test_local_rejects_paths_outside_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "LOCAL_STORAGE_PATH", str(tmp_path / "root"))
+    local = LocalStorage()
+
+    for path in ("../escape.jpg", "products/../../escape.jpg", "/etc/passwd"):
+        with pytest.raises(ValueError):
+            local._full_path(path)
+        with pytest.raises(ValueError):
+            asyncio.run(local.upload_bytes(b"data", path, "image/jpeg"))
+    assert not (tmp_path / "escape.jpg").exists()
+
+    # 루트 안쪽 경로는 정상 저장 + 임시 파일이 남지 않음
+    assert asyncio.run(local.upload_bytes(b"data", "products/ok.jpg", "image/jpeg")) == "products/ok.jpg"
+    assert os.listdir(tmp_path / "root" / "products") == ["ok.jpg"]
+
+
+def test_get_storage_service_is_cached(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "STORAGE_TYPE", "local")
+    monkeypatch.setattr(settings, "LOCAL_STORAGE_PATH", str(tmp_path))
+    storage.get_storage_service.cache_clear()
+    try:
+        assert storage.get_storage_service() is storage.get_storage_service()
+    finally:
+        storage.get_storage_service.cache_clear()
@@ -0,0 +1,169 @@
+# backend-core/tests/test_wishlist_cache.py
+# 찜 캐시: 적재 표시("0") + SMISMEMBER 1회 조회 / TTL=0 직접 조회 / 토글과 적재 경쟁 시 이전 스냅샷 미반영
+
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # Lua 스크립트 실행
+
+from src.config.settings import settings
+from src.models import fitting, order, product  # noqa: F401  (쿼리 컴파일 시 매퍼 구성)
+from src.services import wishlist_cache
+from src.services.principal_cache import Principal
+from src.services.wishlist_cache import LOADED_MARKER, WISHLIST_KEY
+
+USER_ID = 7
+
+
+class FakeResult:
+    def __init__(self, values):
+        self._values = values
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return list(self._values)
+
+
+class FakeDB:
+    """Wishlist 테이블 대역: 실행된 쿼리 수와 현재 찜 목록"""
+
+    def __init__(self, wished):
+        self.wished = set(wished)
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        params = statement.compile().params
+        requested = next((v for v in params.values() if isinstance(v, (list, tuple))), None)
+        if requested is None:
+            return FakeResult(sorted(self.wished))
+        return FakeResult([pid for pid in requested if pid in self.wished])
+
+
+class Product:
+    def __init__(self, id):
+        self.id = id
+        self.is_wished = None
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(wishlist_cache, "redis_client", client)
+    monkeypatch.setattr(wishlist_cache, "_store_script", client.register_script(wishlist_cache.STORE_SCRIPT))
+    monkeypatch.setattr(settings, "WISHLIST_CACHE_TTL", 600)
+    return client
+
+
+def test_miss_loads_whole_set_with_marker_then_hits(redis):
+    db = FakeDB({3, 5})
+
+    async def scenario():
+        first = await wishlist_cache.wished_product_ids(db, USER_ID, [1, 3, 5, 3])
+        second = await wishlist_cache.wished_product_ids(db, USER_ID, [2, 5])
+        members = await redis.smembers(WISHLIST_KEY.format(user_id=USER_ID))
+        ttl = await redis.ttl(WISHLIST_KEY.format(user_id=USER_ID))
+        return first, second, members, ttl
+
+    first, second, members, ttl = asyncio.run(scenario())
+    assert first == {3, 5}
+    assert second == {5}
+    assert db.queries == 1
+    assert members == {LOADED_MARKER, "3", "5"}
+    assert 0 < ttl <= 600
+
+
+def test_user_without_wishes_is_cached_by_marker(redis):
+    db = FakeDB(set())
+
+    async def scenario():
+        for _ in range(3):
+            assert await wishlist_cache.wished_product_ids(db, USER_ID, [1, 2]) == set()
+
+    asyncio.run(scenario())
+    assert db.queries == 1
+
+
+def test_toggle_without_marker_forces_reload(redis):
+    db = FakeDB({4})
+
+    async def scenario():
+        # 캐시가 없는 상태의 토글은 표시 없는 Set만 만들고, 다음 조회에서 전체 적재
+        await wishlist_cache.record_toggle(USER_ID, 9, True)
+        db.wished.add(9)
+        return await wishlist_cache.wished_product_ids(db, USER_ID, [4, 9])
+
+    assert asyncio.run(scenario()) == {4, 9}
+    assert db.queries == 1
+
+
+def test_toggle_updates_loaded_set(redis):
+    db = FakeDB({4})
+
+    async def scenario():
+        await wishlist_cache.wished_product_ids(db, USER_ID, [4])
+        db.wished.discard(4)
+        await wishlist_cache.record_toggle(USER_ID, 4, False)
+        db.wished.add(8)
+        await wishlist_cache.record_toggle(USER_ID, 8, True)
+        return await wishlist_cache.wished_product_ids(db, USER_ID, [4, 8])
+
+    assert asyncio.run(scenario()) == {8}
+    assert db.queries == 1
+
+
+def test_refill_started_before_toggle_does_not_overwrite(redis, monkeypatch):
+    db = FakeDB({1})
+    original_load = wishlist_cache._load_all
+
+    async def load_then_toggle(session, user_id):
+        snapshot = await original_load(session, user_id)
+        # DB 조회가 끝난 뒤 다른 요청의 토글이 커밋되고 캐시에 반영됨
+        db.wished.discard(1)
+        await wishlist_cache.record_toggle(user_id, 1, False)
+        return snapshot
+
+    async def scenario():
+        monkeypatch.setattr(wishlist_cache, "_load_all", load_then_toggle)
+        stale = await wishlist_cache.wished_product_ids(db, USER_ID, [1])
+        monkeypatch.setattr(wishlist_cache, "_load_all", original_load)
+        fresh = await wishlist_cache.wished_product_ids(db, USER_ID, [1])
+        return stale, fresh
+
+    stale, fresh = asyncio.run(scenario())
+    # 경쟁 중인 요청 자체는 자신의 스냅샷을 반환하지만, 그 스냅샷이 캐시에 남지 않음
+    assert stale == {1}
+    assert fresh == set()
+    assert db.queries == 2
+
+
+def test_zero_ttl_queries_db_only(redis, monkeypatch):
+    monkeypatch.setattr(settings, "WISHLIST_CACHE_TTL", 0)
+    db = FakeDB({2, 3})
+
+    async def scenario():
+        first = await wishlist_cache.wished_product_ids(db, USER_ID, [1, 2])
+        await wishlist_cache.record_toggle(USER_ID, 1, True)
+        second = await wishlist_cache.wished_product_ids(db, USER_ID, [3])
+        return first, second, await redis.keys("*")
+
+    first, second, keys = asyncio.run(scenario())
+    assert first == {2}
+    assert second == {3}
+    assert db.queries == 2
+    assert keys == []
+
+
+def test_mark_wished_fills_flags_only_for_logged_in(redis):
+    db = FakeDB({2})
+    products = [Product(1), Product(2)]
+
+    asyncio.run(wishlist_cache.mark_wished(db, None, products))
+    assert [p.is_wished for p in products] == [None, None]
+
+    asyncio.run(wishlist_cache.mark_wished(db, Principal(USER_ID, True, False), products))
+    assert [p.is_wished for p in products] == [False, True]
@@ -0,0 +1,181 @@
+# backend-core/tests/test_wishlist_toggle.py
+# 찜 토글(단일 SQL: DELETE/INSERT CTE) + product_stats 트리거 - 실제 PostgreSQL 필요 (TEST_DATABASE_URL 미설정 시 건너뜀)
+# 예) TEST_DATABASE_URL=postgresql+asyncpg://postgres@/wishlist_test?host=/tmp/pgdata
+
+import asyncio
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("asyncpg")
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if not DATABASE_URL:
+    pytest.skip("TEST_DATABASE_URL 이 설정되지 않음", allow_module_level=True)
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from fastapi import HTTPException
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.api.v1.endpoints.wishlist import toggle_wishlist
+from src.config.settings import settings
+from src.db.session import Base
+from src.models import embedding_space, fitting, order  # noqa: F401  (메타데이터/매퍼 구성)
+from src.models.product import Product
+from src.models.product_stats import ProductStats
+from src.models.user import User
+from src.models.wishlist import Wishlist
+from src.services.principal_cache import Principal
+
+MIGRATION = Path(__file__).resolve().parents[1] / "alembic" / "versions" / "e5f6a7b8c9d0_add_product_stats.py"
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location("product_stats_migration", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _upgrade(connection):
+    """product_stats 를 제외한 테이블 생성 후 실제 마이그레이션(테이블/백필/트리거) 적용"""
+    Base.metadata.create_all(
+        connection, tables=[t for t in Base.metadata.sorted_tables if t.name != "product_stats"]
+    )
+    with Operations.context(MigrationContext.configure(connection)):
+        _load_migration().upgrade()
+
+
+def _downgrade(connection):
+    with Operations.context(MigrationContext.configure(connection)):
+        _load_migration().downgrade()
+    Base.metadata.drop_all(connection)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    # 토글 후 Redis 캐시 갱신은 이 테스트 범위 밖
+    monkeypatch.setattr(settings, "WISHLIST_CACHE_TTL", 0)
+    # 준비/시나리오/정리가 각각 다른 이벤트 루프(asyncio.run)에서 실행 → 커넥션 재사용 안 함
+    engine = create_async_engine(DATABASE_URL, poolclass=NullPool)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+            await conn.run_sync(_upgrade)
+            user_ids = (await conn.execute(
+                User.__table__.insert().returning(User.id),
+                [{"email": f"user{i}@example.com", "hashed_password": "x"} for i in range(3)],
+            )).scalars().all()
+            product_ids = (await conn.execute(
+                Product.__table__.insert().returning(Product.id),
+                [{"name": f"product{i}", "price": 1000, "stock_quantity": 1} for i in range(2)],
+            )).scalars().all()
+        return user_ids, product_ids
+
+    async def teardown():
+        async with engine.begin() as conn:
+            await conn.run_sync(_downgrade)
+        await engine.dispose()
+
+    user_ids, product_ids = asyncio.run(setup())
+    yield session_maker, user_ids, product_ids
+    asyncio.run(teardown())
+
+
+def _principal(user_id: int) -> Principal:
+    return Principal(user_id, True, False)
+
+
+async def _toggle(session_maker, user_id: int, product_id: int) -> dict:
+    async with session_maker() as session:
+        return await toggle_wishlist(product_id, db=session, current_user=_principal(user_id))
+
+
+async def _counts(session_maker, product_id: int):
+    async with session_maker() as session:
+        rows = (await session.execute(
+            select(Wishlist.id).where(Wishlist.product_id == product_id)
+        )).scalars().all()
+        stats = await session.get(Product, product_id)
+        return len(rows), stats.wishlist_count
+
+
+def test_toggle_adds_then_removes_and_trigger_counts(db):
+    session_maker, (u1, u2, _), (p1, p2) = db
+
+    async def scenario():
+        assert await _toggle(session_maker, u1, p1) == {"status": "added", "is_wished": True}
+        assert await _toggle(session_maker, u2, p1) == {"status": "added", "is_wished": True}
+        assert await _counts(session_maker, p1) == (2, 2)
+
+        assert await _toggle(session_maker, u1, p1) == {"status": "removed", "is_wished": False}
+        assert await _counts(session_maker, p1) == (1, 1)
+        # 찜이 한 번도 없던 상품은 product_stats 행 없이 0
+        assert await _counts(session_maker, p2) == (0, 0)
+
+    asyncio.run(scenario())
+
+
+def test_cascade_delete_decrements_count(db):
+    session_maker, (u1, u2, _), (p1, _) = db
+
+    async def scenario():
+        await _toggle(session_maker, u1, p1)
+        await _toggle(session_maker, u2, p1)
+        async with session_maker() as session:
+            await session.execute(delete(User).where(User.id == u1))
+            await session.commit()
+        assert await _counts(session_maker, p1) == (1, 1)
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_add_returns_added_once_counted(db):
+    session_maker, (u1, _, _), (p1, _) = db
+
+    async def scenario():
+        # 첫 번째 토글이 커밋 전(INSERT 보류 중)일 때 두 번째 토글 → ON CONFLICT 대기 후 DO NOTHING
+        async with session_maker() as first:
+            original_commit = first.commit
+            committed = asyncio.Event()
+            second_started = asyncio.Event()
+
+            async def delayed_commit():
+                second_started.set()
+                await asyncio.sleep(0.3)
+                await original_commit()
+                committed.set()
+
+            first.commit = delayed_commit
+
+            async def second():
+                await second_started.wait()
+                return await _toggle(session_maker, u1, p1)
+
+            results = await asyncio.gather(
+                toggle_wishlist(p1, db=first, current_user=_principal(u1)), second()
+            )
+        assert committed.is_set()
+        assert results == [{"status": "added", "is_wished": True}] * 2
+        assert await _counts(session_maker, p1) == (1, 1)
+
+    asyncio.run(scenario())
+
+
+def test_unknown_product_returns_404(db):
+    session_maker, (u1, _, _), (p1, _) = db
+
+    async def scenario():
+        with pytest.raises(HTTPException) as exc:
+            await _toggle(session_maker, u1, p1 + 1000)
+        assert exc.value.status_code == 404
+        async with session_maker() as session:
+            assert (await session.execute(select(ProductStats))).scalars().all() == []
+
+    asyncio.run(scenario())
@@ -0,0 +1,43 @@
+import client from "./client";
+
+// --------------------------------------------------
+// 찜 여부 일괄 조회
+// 같은 렌더 사이클에 마운트된 카드들의 요청을 모아 /wishlist/status 1회로 처리
+// (백엔드 WISHLIST_STATUS_MAX_IDS 기본값 200 이하로 나눠 요청)
+// --------------------------------------------------
+const MAX_IDS_PER_REQUEST = 200;
+
+let pending = new Map<number, Array<(isWished: boolean) => void>>();
+let scheduled = false;
+
+const flush = async () => {
+  const batch = pending;
+  pending = new Map();
+  scheduled = false;
+
+  const ids = Array.from(batch.keys());
+  for (let i = 0; i < ids.length; i += MAX_IDS_PER_REQUEST) {
+    const chunk = ids.slice(i, i + MAX_IDS_PER_REQUEST);
+    let wished = new Set<number>();
+    try {
+      const params = new URLSearchParams();
+      chunk.forEach((id) => params.append("product_ids", String(id)));
+      const res = await client.get(`/wishlist/status?${params.toString()}`);
+      wished = new Set<number>(res.data.wished_ids);
+    } catch {
+      // 비로그인/오류 시 찜 안 함으로 표시 (기존 /check 동작과 동일)
+    }
+    chunk.forEach((id) => batch.get(id)?.forEach((resolve) => resolve(wished.has(id))));
+  }
+};
+
+export const fetchWishStatus = (productId: number): Promise<boolean> =>
+  new Promise((resolve) => {
+    const waiters = pending.get(productId) ?? [];
+    waiters.push(resolve);
+    pending.set(productId, waiters);
+    if (!scheduled) {
+      scheduled = true;
+      setTimeout(flush, 0);
+    }
+  });
@@ -3,6 +3,8 @@ import { Link, useNavigate } from "react-router-dom";
 import { Heart, ShoppingBag } from "lucide-react";
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 import client from "../../api/client";
+import { fetchWishStatus } from "../../api/wishlistStatus";
+import type { ImageVariants } from "../../types";
 
 interface Product {
   id: number;
@@ -10,6 +12,8 @@ interface Product {
   category: string;
   price: number;
   image_url: string;
+  image_variants?: ImageVariants | null;
+  is_wished?: boolean | null;
 }
 
 interface ProductCardProps {
@@ -19,7 +23,7 @@ interface ProductCardProps {
 export default function ProductCard({ product }: ProductCardProps) {
   const navigate = useNavigate();
   const queryClient = useQueryClient();
-  const [isWished, setIsWished] = useState(false);
+  const [isWished, setIsWished] = useState(product.is_wished ?? false);
 
   // =================================================================
   // 🕵️‍♀️ [DEBUG] 이미지 주소 정규화 및 로그 출력
@@ -46,25 +50,27 @@ export default function ProductCard({ product }: ProductCardProps) {
   };
 
   const displayImage = getImageUrl(product.image_url);
+
+  // 카드 크기 파생본 (AVIF → WebP → 원본 순으로 브라우저가 선택)
+  const cardVariants = product.image_variants?.card;
   // =================================================================
 
   // 1. 초기 찜 상태 확인
+  // 목록/검색 응답에 is_wished가 포함돼 있으면 그대로 사용, 없으면 카드들의 요청을 모아 일괄 조회
   const { data: wishStatus } = useQuery({
     queryKey: ["wishlist-status", product.id],
-    queryFn: async () => {
-      try {
-        const res = await client.get(`/wishlist/check/${product.id}`);
-        return res.data;
-      } catch {
-        return { is_wished: false };
-      }
-    },
+    queryFn: async () => ({ is_wished: await fetchWishStatus(product.id) }),
+    enabled: product.is_wished == null,
   });
 
   useEffect(() => {
     if (wishStatus) setIsWished(wishStatus.is_wished);
   }, [wishStatus]);
 
+  useEffect(() => {
+    if (product.is_wished != null) setIsWished(product.is_wished);
+  }, [product.is_wished]);
+
   // 2. 찜 토글 Mutation
   const toggleWishlistMutation = useMutation({
     mutationFn: async () => {
@@ -97,9 +103,14 @@ export default function ProductCard({ product }: ProductCardProps) {
       {/* 🎨 [Image Wrapper] 둥근 모서리, 부드러운 그림자, 호버 시 떠오름 */}
       <div className="relative aspect-[3/4] w-full overflow-hidden rounded-[1.5rem] bg-gray-100 dark:bg-gray-800 shadow-[0_2px_10px_rgba(0,0,0,0.03)] transition-all duration-500 ease-out group-hover:shadow-[0_20px_40px_-15px_rgba(0,0,0,0.12)] group-hover:-translate-y-1">
         {/* 이미지: 시네마틱 줌 효과 */}
+        <picture>
+        {cardVariants?.avif && <source srcSet={getImageUrl(cardVariants.avif)} type="image/avif" />}
+        {cardVariants?.webp && <source srcSet={getImageUrl(cardVariants.webp)} type="image/webp" />}
         <img
           src={displayImage}
           alt={product.name}
+          loading="lazy"
+          decoding="async"
           className="h-full w-full object-cover object-center transition-transform duration-700 ease-out group-hover:scale-105"
           // 🕵️‍♀️ [DEBUG] 에러 발생 시 상세 로그 출력
           onError={(e) => {
@@ -120,10 +131,12 @@ export default function ProductCard({ product }: ProductCardProps) {
               조치: "placeholder 이미지로 교체합니다.",
             });
 
-            // placeholder 이미지로 교체
+            // placeholder 이미지로 교체 (<source>가 남아 있으면 src 교체가 무시되므로 제거)
+            imgElement.parentElement?.querySelectorAll("source").forEach((source) => source.remove());
             imgElement.src = "/placeholder.png";
           }}
         />
+        </picture>
 
         {/* Overlay Gradient (Hover 시 텍스트 가독성 및 분위기 연출) */}
         <div className="absolute inset-0 bg-gradient-to-t from-black/20 via-transparent to-transparent opacity-0 group-hover:opacity-100 transition-opacity duration-300"></div>
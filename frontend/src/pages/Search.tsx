@@ -17,6 +17,7 @@ import {
   Check, // ✅ Check 아이콘 사용됨
 } from "lucide-react";
 import client from "../api/client";
+import { useAuthStore } from "@/store/authStore";
 import ProductCard from "../components/product/ProductCard";
 import { useSearchStore } from "../store/searchStore";
 
@@ -52,7 +53,48 @@ interface SearchResult {
   products: ProductResponse[];
 }
 
-const API_ENDPOINT = "/search/ai-search";
+const API_ENDPOINT = "/search/ai-search/stream";
+
+// POST + multipart 요청이라 EventSource 대신 fetch 스트림으로 SSE 파싱
+const streamSearch = async (
+  formData: FormData,
+  onEvent: (event: string, data: any) => void
+) => {
+  // fetch는 axios 인터셉터를 거치지 않으므로 Access Token 직접 주입 (로그인 시 is_wished 포함)
+  const { token } = useAuthStore.getState();
+  const response = await fetch(`${client.defaults.baseURL}${API_ENDPOINT}`, {
+    method: "POST",
+    body: formData,
+    credentials: "include",
+    headers: token ? { Authorization: `Bearer ${token}` } : undefined,
+  });
+  if (!response.ok || !response.body) {
+    throw new Error(`Search stream failed: ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    const chunks = buffer.split("\n\n");
+    buffer = chunks.pop() || "";
+    for (const chunk of chunks) {
+      let event = "message";
+      let data = "";
+      for (const line of chunk.split("\n")) {
+        if (line.startsWith("event:")) event = line.slice(6).trim();
+        else if (line.startsWith("data:")) data += line.slice(5).trim();
+      }
+      if (event === "done") return;
+      onEvent(event, data ? JSON.parse(data) : {});
+    }
+  }
+};
 
 const useSearchQuery = () => {
   const [searchParams] = useSearchParams();
@@ -211,31 +253,43 @@ export default function Search() {
       if (negPrompt.trim()) formData.append("negative_prompt", negPrompt.trim());
 
       try {
-        const response = await client.post<SearchResult>(
-          API_ENDPOINT,
-          formData,
-          {
-            headers: { "Content-Type": "multipart/form-data" },
+        // SSE 스트림: 상품(products)이 먼저 오고, AI 요약(summary)은 분석이 끝나면 도착
+        let analysis: SearchResult["ai_analysis"] | undefined;
+        await streamSearch(formData, (event, data) => {
+          if (event === "products") {
+            const payload = data as SearchResult;
+            setResults(payload.products || []);
+            analysis = payload.ai_analysis;
+
+            if (analysis && analysis.reference_image) {
+              setAiAnalysis(analysis);
+              setSelectedImage(analysis.reference_image);
+              if (analysis.summary) {
+                setCurrentText(analysis.summary);
+              } else {
+                setIsAnalyzingImage(true);
+              }
+            } else {
+              setShowProducts(true);
+            }
+            setIsLoading(false); // 첫 결과 도착 시 로딩 화면 해제
+          } else if (event === "summary") {
+            const summary = data.summary as string;
+            if (analysis && analysis.reference_image && summary) {
+              analysis = { ...analysis, summary };
+              setAiAnalysis(analysis);
+              setCurrentText(summary);
+              if (isVoice) speak(summary);
+            }
+            setIsAnalyzingImage(false);
           }
-        );
-
-        const data = response.data;
-        setResults(data.products || []);
-
-        if (data.ai_analysis && data.ai_analysis.reference_image) {
-          setAiAnalysis(data.ai_analysis);
-          setSelectedImage(data.ai_analysis.reference_image);
-          setCurrentText(data.ai_analysis.summary);
-
-          if (isVoice) speak(data.ai_analysis.summary);
-        } else {
-          setShowProducts(true);
-        }
+        });
       } catch (error: any) {
         console.error("Search failed:", error);
         setShowProducts(true); // 에러 나도 빈 결과창 보여줌
       } finally {
         setIsLoading(false);
+        setIsAnalyzingImage(false);
       }
     },
     [speak, addRecentSearch]
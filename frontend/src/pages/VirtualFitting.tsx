@@ -1,11 +1,13 @@
 import React, { useState, useEffect } from "react";
 import client from "@/api/client";
+import { useAuthStore } from "@/store/authStore";
 import { ReactCompareSlider, ReactCompareSliderImage } from "react-compare-slider";
 
 // 히스토리 타입 정의
 interface HistoryItem {
   id: number;
   result_image_url: string;
+  thumbnail_url?: string | null;
   category: string;
   created_at: string;
 }
@@ -21,6 +23,64 @@ const LOADING_MESSAGES = [
   "마무리 픽셀을 다듬는 중... 🎨"
 ];
 
+interface FittingJob {
+  job_id: string;
+  status: "queued" | "processing" | "succeeded" | "failed";
+  image_url?: string | null;
+  id?: number | null;
+  error?: string | null;
+}
+
+const isFinished = (job: FittingJob) => job.status === "succeeded" || job.status === "failed";
+
+// 인증 헤더가 필요해서 EventSource 대신 fetch 스트림으로 SSE 파싱
+const streamFittingJob = async (jobId: string): Promise<FittingJob | null> => {
+  const { token } = useAuthStore.getState();
+  const response = await fetch(`${client.defaults.baseURL}/fitting/jobs/${jobId}/events`, {
+    headers: token ? { Authorization: `Bearer ${token}` } : {},
+    credentials: "include",
+  });
+  if (!response.ok || !response.body) return null;
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) return null;
+    buffer += decoder.decode(value, { stream: true });
+
+    const chunks = buffer.split("\n\n");
+    buffer = chunks.pop() || "";
+    for (const chunk of chunks) {
+      const data = chunk
+        .split("\n")
+        .filter((line) => line.startsWith("data:"))
+        .map((line) => line.slice(5).trim())
+        .join("");
+      if (!data) continue; // keep-alive
+      const job: FittingJob = JSON.parse(data);
+      if (isFinished(job)) return job;
+    }
+  }
+};
+
+const waitForFittingJob = async (jobId: string): Promise<FittingJob> => {
+  try {
+    const job = await streamFittingJob(jobId);
+    if (job) return job;
+  } catch (error) {
+    console.warn("SSE 연결 실패, 폴링으로 전환합니다.", error);
+  }
+  // SSE가 끊기면 상태 조회 API로 폴링 (최대 5분)
+  for (let i = 0; i < 100; i++) {
+    const { data } = await client.get<FittingJob>(`/fitting/jobs/${jobId}`);
+    if (isFinished(data)) return data;
+    await new Promise((resolve) => setTimeout(resolve, 3000));
+  }
+  throw new Error("fitting timeout");
+};
+
 export default function VirtualFitting() {
     const [humanFile, setHumanFile] = useState<File | null>(null);
     const [garmentFile, setGarmentFile] = useState<File | null>(null);
@@ -112,12 +172,17 @@ export default function VirtualFitting() {
         formData.append("category", category); 
 
         try {
-            // API 호출
+            // 작업 제출 → job_id 즉시 반환, 완료는 SSE(실패 시 폴링)로 수신
             const response = await client.post("fitting/generate", formData, {
                 headers: { "Content-Type": "multipart/form-data" },
-                timeout: 300000,    // 5분 타임아웃 설정 (Replicate의 Cold Start 대응)
             });
-            setResultImage(response.data.image_url);
+            // 같은 입력의 이전 결과가 있으면 바로 완료 상태로 응답
+            const submitted: FittingJob = response.data;
+            const job = isFinished(submitted) ? submitted : await waitForFittingJob(submitted.job_id);
+            if (job.status !== "succeeded" || !job.image_url) {
+                throw new Error(job.error || "fitting failed");
+            }
+            setResultImage(job.image_url);
             fetchHistory(); // 히스토리 갱신
         } catch (error) {
             console.error(error);
@@ -323,8 +388,9 @@ export default function VirtualFitting() {
                             {/* 이미지 */}
                             <div className="aspect-[3/4] bg-gray-100 overflow-hidden">
                             <img 
-                                src={item.result_image_url} 
+                                src={item.thumbnail_url ?? item.result_image_url} 
                                 alt="Fitting Result" 
+                                loading="lazy"
                                 className="w-full h-full object-cover group-hover:scale-105 transition-transform duration-300"
                             />
                             </div>
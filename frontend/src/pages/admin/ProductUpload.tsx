@@ -144,12 +144,38 @@ export default function ProductUpload() {
       const formData = new FormData();
       formData.append('file', file);
 
+      // 1. 업로드 → 백그라운드 작업 ID 수신
       const response = await client.post('/products/upload/csv', formData, {
         headers: { 'Content-Type': 'multipart/form-data' },
         timeout: 120000,
       });
+      const { job_id } = response.data;
+      addLog(`🛠️ 백그라운드 작업 등록 (Job: ${job_id})`);
+
+      // 2. 진행 상황 폴링
+      let job: any = null;
+      let lastProcessed = -1;
+      while (true) {
+        await new Promise(resolve => setTimeout(resolve, 2000));
+        const statusRes = await client.get(`/products/upload/csv/${job_id}`);
+        job = statusRes.data;
+
+        if (job.processed !== lastProcessed) {
+          lastProcessed = job.processed;
+          setResults([{
+            fileName: file.name,
+            status: 'uploading',
+            message: `${job.processed}/${job.total}행 처리 중 (성공: ${job.success}, 실패: ${job.failed})`
+          }]);
+        }
+        if (job.status === 'completed' || job.status === 'failed') break;
+      }
 
-      const { success, failed, errors } = response.data;
+      if (job.status === 'failed') {
+        throw new Error(job.error || 'CSV 처리 작업 실패');
+      }
+
+      const { success, failed } = job;
       
       setResults([{ 
         fileName: file.name, 
@@ -159,8 +185,12 @@ export default function ProductUpload() {
 
       addLog(`✅ CSV 처리 완료 - 성공: ${success}건, 실패: ${failed}건`);
       
-      if (errors && errors.length > 0) {
-        errors.slice(0, 5).forEach((err: string) => addLog(`⚠️ ${err}`));
+      // 3. 행 단위 에러 리포트
+      if (failed > 0) {
+        const errorRes = await client.get(`/products/upload/csv/${job_id}/errors`, { params: { limit: 5 } });
+        errorRes.data.errors.forEach((err: { row: number; name: string | null; error: string }) =>
+          addLog(`⚠️ ${err.row}행 ${err.name ?? ''}: ${err.error}`)
+        );
       }
 
     } catch (error: any) {
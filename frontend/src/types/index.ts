@@ -53,9 +53,21 @@ export interface Product {
   description: string;
   price: number;
   image_url: string;
+  image_variants?: ImageVariants | null;
   category: string;
   gender?: string;
   is_active: boolean;
+  is_wished?: boolean | null;  // 로그인 사용자의 찜 여부 (목록/검색 응답, 비로그인이면 null)
+  wishlist_count?: number;     // 전체 찜 수 (인기순 정렬 기준)
+}
+
+// 이미지 파생본 (백엔드 services/image_variants.py), 생성 전이면 null
+export interface ImageVariants {
+  source: string;
+  thumb?: Record<string, string>;   // 긴 변 160px
+  card?: Record<string, string>;    // 긴 변 480px
+  detail?: Record<string, string>;  // 긴 변 1280px
+  model?: Record<string, string>;   // 모델 입력 (224px JPEG)
 }
 
 // [수정] 백엔드 응답 구조 반영